@@ -90,7 +90,9 @@ def get_actuals_balance(user_email, user_roles, tenant, user_tenants):
                 # Group by Parent, Reknum, AccountName for this year
                 if len(year_df) > 0:
                     grouped = year_df.groupby(
-                        ["Parent", "Reknum", "AccountName"], as_index=False
+                        ["Parent", "Reknum", "AccountName"],
+                        as_index=False,
+                        observed=True,
                     ).agg({"Amount": "sum"})
                     grouped = grouped[grouped["Amount"] != 0]
                     grouped["jaar"] = year
@@ -116,7 +118,7 @@ def get_actuals_balance(user_email, user_roles, tenant, user_tenants):
                 filtered = filtered[filtered["jaar"] >= start_year]
 
             grouped = filtered.groupby(
-                ["Parent", "Reknum", "AccountName"], as_index=False
+                ["Parent", "Reknum", "AccountName"], as_index=False, observed=True
             ).agg({"Amount": "sum"})
             grouped = grouped[grouped["Amount"] != 0]
             grouped = grouped.sort_values(["Parent", "Reknum"])
@@ -210,7 +212,9 @@ def get_actuals_profitloss(user_email, user_roles, tenant, user_tenants):
             group_cols.append("ReferenceNumber")
 
         # Group and aggregate
-        grouped = filtered.groupby(group_cols, as_index=False).agg({"Amount": "sum"})
+        grouped = filtered.groupby(group_cols, as_index=False, observed=True).agg(
+            {"Amount": "sum"}
+        )
 
         # Filter out zero amounts
         grouped = grouped[grouped["Amount"] != 0]
@@ -15,6 +15,7 @@ import boto3
 from botocore.exceptions import ClientError
 
 from auth.cognito_utils import cognito_required
+from services.cognito_directory import directory_index
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
 
@@ -291,6 +292,7 @@ def delete_user(username, user_email, user_roles):
     """Delete a user account"""
     try:
         cognito_client.admin_delete_user(UserPoolId=USER_POOL_ID, Username=username)
+        directory_index.remove_user(username)
 
         return jsonify({"success": True, "message": f"User {username} deleted"})
 
@@ -677,6 +677,11 @@ if __name__ == "__main__":
         print("ERROR: Route conflicts detected. Fix before starting.")
         sys.exit(1)
 
+    # Write audit / AI-usage / email log rows in batches off the request threads
+    from log_sink import start_log_sink
+
+    start_log_sink()
+
     # Add request logging
     @app.before_request
     def log_request():
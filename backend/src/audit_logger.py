@@ -11,6 +11,7 @@ import logging
 from datetime import datetime, timedelta
 
 from database import DatabaseManager
+from log_sink import get_log_sink
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -77,7 +78,9 @@ class AuditLogger:
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
 
-            self.db.execute_query(
+            # Queued and written in batches off the request thread (log_sink)
+            get_log_sink().write(
+                self.db,
                 query,
                 (
                     datetime.now(),
@@ -91,8 +94,6 @@ class AuditLogger:
                     session_id,
                     operation_id,
                 ),
-                fetch=False,
-                commit=True,
             )
 
             logger.info(
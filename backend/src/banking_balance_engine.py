@@ -0,0 +1,395 @@
+"""
+Banking Balance Engine
+
+Columnar (pandas/NumPy) implementations of the bank account checks used by
+BankingChecks:
+- Ref2 sequence gap detection for numeric references (Rabobank)
+- Saldo progression check for descriptive Ref2 references (Revolut)
+- Running balance vs. Ref3 statement balance comparison (Revolut)
+
+All functions take the raw rows returned by a dictionary cursor, build one
+DataFrame and work on whole columns (vectorized string parsing, cumulative
+sums, shifted diffs). Python dicts are only built for the rows that are
+actually reported, so multi-year accounts check in milliseconds.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Default number of gap rows returned per page by the Revolut balance check
+DEFAULT_GAP_PAGE_SIZE = 500
+
+# Discrepancies below this amount (in EUR) are treated as rounding noise
+BALANCE_TOLERANCE = 0.01
+
+_INTEGER_PATTERN = r"\s*[+-]?\d+\s*"
+
+
+def _to_frame(transactions, columns):
+    """Build a DataFrame holding only ``columns`` from dict rows (missing -> None)."""
+    count = len(transactions)
+    return pd.DataFrame(
+        {
+            column: np.fromiter(
+                (tx.get(column) for tx in transactions), dtype=object, count=count
+            )
+            for column in columns
+        }
+    )
+
+
+def _to_float(series):
+    """Convert a column of DB values (Decimal/float/str/None) to float64.
+
+    None and unparseable values become NaN.
+    """
+    try:
+        return pd.Series(np.asarray(series, dtype=float), index=series.index)
+    except (TypeError, ValueError):
+        return pd.to_numeric(_text(series).str.strip(), errors="coerce").astype(float)
+
+
+def _text(series):
+    """Return a string series with None/NaN mapped to ''."""
+    return series.astype(object).where(series.notna(), "").astype(str)
+
+
+def _round2(values):
+    """Round a float array to cents."""
+    return np.round(values.astype(float), 2)
+
+
+def split_revolut_ref2(ref2):
+    """Split Revolut Ref2 values (``description_saldo_datetime``) into columns.
+
+    Args:
+        ref2: Series of raw Ref2 values
+
+    Returns:
+        DataFrame with ``has_parts`` (bool, at least three parts), ``saldo``
+        (float, second-to-last part, NaN when unparseable), ``completion``
+        (str, last part) and ``datetime_str`` (str, third part).
+    """
+    text = _text(ref2)
+    tail = text.str.rsplit("_", n=2, expand=True).reindex(columns=[0, 1, 2])
+    has_parts = tail[2].notna()
+
+    saldo = pd.to_numeric(tail[1].where(has_parts, "").str.strip(), errors="coerce")
+    completion = tail[2].where(has_parts, "")
+
+    # The third part equals the completion part unless the description itself
+    # contains "_"; only those (rare) rows need a second split.
+    datetime_str = completion.copy()
+    nested = has_parts & tail[0].fillna("").str.contains("_", regex=False)
+    if nested.any():
+        datetime_str[nested] = text[nested].str.split("_").str[2]
+
+    return pd.DataFrame(
+        {
+            "has_parts": has_parts,
+            "saldo": saldo.astype(float),
+            "completion": completion.astype(str),
+            "datetime_str": datetime_str.astype(str),
+        },
+        index=ref2.index,
+    )
+
+
+def is_numeric_sequence(transactions, sample_size=10):
+    """Return True when any of the first ``sample_size`` Ref2 values is an integer."""
+    sample = [tx.get("Ref2") for tx in transactions[:sample_size]]
+    ref2 = _text(pd.Series(sample, dtype=object))
+    return bool(ref2.str.fullmatch(_INTEGER_PATTERN).any())
+
+
+def find_sequence_gaps(transactions):
+    """Detect gaps in numeric Ref2 sequence numbers.
+
+    Rows are expected in sequence order. Each valid sequence number is compared
+    with the previous valid number + 1; non-integer references are reported as
+    errors without breaking the chain.
+
+    Args:
+        transactions: list of row dicts with Ref2, TransactionDate,
+            TransactionDescription and TransactionAmount
+
+    Returns:
+        dict with ``issues`` (list, in row order), ``first_sequence`` and
+        ``last_sequence`` (int or None)
+    """
+    if not transactions:
+        return {"issues": [], "first_sequence": None, "last_sequence": None}
+
+    df = _to_frame(
+        transactions,
+        ["Ref2", "TransactionDate", "TransactionDescription", "TransactionAmount"],
+    )
+    ref2 = _text(df["Ref2"])
+    is_int = ref2.str.fullmatch(_INTEGER_PATTERN)
+    seq = pd.to_numeric(ref2.str.strip().where(is_int), errors="coerce")
+    is_int = is_int & seq.notna()
+
+    expected = seq.where(is_int).ffill().shift(1) + 1
+    gap_mask = is_int & expected.notna() & (seq != expected)
+    issue_mask = gap_mask | ~is_int
+
+    issues = []
+    for pos in np.flatnonzero(issue_mask.to_numpy()):
+        row = df.iloc[pos]
+        if is_int.iat[pos]:
+            found = int(seq.iat[pos])
+            expected_next = int(expected.iat[pos])
+            issues.append(
+                {
+                    "expected": expected_next,
+                    "found": found,
+                    "gap": found - expected_next,
+                    "date": _py(row["TransactionDate"]),
+                    "description": _py(row["TransactionDescription"]),
+                    "amount": _py(row["TransactionAmount"]),
+                }
+            )
+        else:
+            issues.append(
+                {
+                    "error": f"Invalid sequence number: {row['Ref2']}",
+                    "date": _py(row["TransactionDate"]),
+                    "description": _py(row["TransactionDescription"]),
+                }
+            )
+
+    return {
+        "issues": issues,
+        "first_sequence": int(seq.iat[0]) if is_int.iat[0] else None,
+        "last_sequence": int(seq.iat[-1]) if is_int.iat[-1] else None,
+    }
+
+
+def find_saldo_progression_issues(transactions):
+    """Check the saldo embedded in descriptive Ref2 values (e.g. Revolut).
+
+    Rows are ordered by completion datetime (last Ref2 part). For each row with
+    a parseable saldo, the absolute saldo change versus the previous parseable
+    row must match the absolute transaction amount.
+
+    Returns:
+        list of issue dicts in completion order
+    """
+    if not transactions:
+        return []
+
+    df = _to_frame(
+        transactions,
+        ["Ref2", "TransactionDate", "TransactionDescription", "TransactionAmount"],
+    )
+    parsed = split_revolut_ref2(df["Ref2"])
+    order = np.argsort(parsed["completion"].to_numpy().astype(str), kind="stable")
+
+    # Work on positions (in completion order) of rows with a parseable saldo
+    valid = (parsed["has_parts"] & parsed["saldo"].notna()).to_numpy()[order]
+    positions = order[valid]
+    saldo = parsed["saldo"].to_numpy()[positions]
+    amount = _to_float(df["TransactionAmount"].iloc[positions]).abs()
+    amount = amount.fillna(0.0).to_numpy()
+
+    prev_saldo = np.concatenate(([np.nan], saldo[:-1]))
+    saldo_diff = np.round(saldo - prev_saldo, 2)
+    expected = np.where(saldo_diff < 0, prev_saldo - amount, prev_saldo + amount)
+    with np.errstate(invalid="ignore"):
+        mismatch = (
+            ~np.isnan(prev_saldo)
+            & (amount > 0)
+            & (np.abs(np.abs(saldo_diff) - amount) > BALANCE_TOLERANCE)
+        )
+
+    issues = []
+    for i in np.flatnonzero(mismatch):
+        tx_date = df["TransactionDate"].iat[positions[i]]
+        description = df["TransactionDescription"].iat[positions[i]]
+        issues.append(
+            {
+                "expected": round(float(expected[i]), 2),
+                "found": float(saldo[i]),
+                "gap": round(float(saldo[i] - expected[i]), 2),
+                "date": str(tx_date) if tx_date else "",
+                "description": description if description is not None else "",
+            }
+        )
+    return issues
+
+
+def compute_running_balance(transactions, account_code):
+    """Compute the running balance of a Revolut account and compare with Ref3.
+
+    Rows are ordered by ID (insertion order). The first row seeds the balance
+    from its Ref3 statement balance when present; every other row adds its
+    amount (Debet = account) or subtracts it (Credit = account).
+
+    Args:
+        transactions: list of row dicts from mutaties
+        account_code: ledger account of the bank account
+
+    Returns:
+        DataFrame (one row per transaction, ordered by ID) with the columns
+        needed to build transaction details, plus ``starting_balance_info``
+        stored in ``DataFrame.attrs``.
+    """
+    df = _to_frame(
+        transactions,
+        [
+            "ID",
+            "TransactionDate",
+            "TransactionDescription",
+            "TransactionAmount",
+            "Debet",
+            "Credit",
+            "Ref2",
+            "Ref3",
+        ],
+    )
+    df = df.sort_values("ID", kind="stable").reset_index(drop=True)
+
+    parsed = split_revolut_ref2(df["Ref2"])
+    ref2_dt = pd.to_datetime(
+        parsed["datetime_str"], format="%Y-%m-%d %H:%M:%S", errors="coerce"
+    )
+    tx_date_str = df["TransactionDate"].astype(str)
+    ref2_datetime = parsed["datetime_str"].where(
+        parsed["has_parts"] & ref2_dt.notna(), tx_date_str
+    )
+
+    amount = _to_float(df["TransactionAmount"]).fillna(0.0)
+
+    is_in = (df["Debet"] == account_code).to_numpy()
+    is_out = ~is_in & (df["Credit"] == account_code).to_numpy()
+    balance_change = np.where(is_in, amount, np.where(is_out, -amount, 0.0))
+    direction = np.where(is_in, "IN", np.where(is_out, "OUT", "SKIP"))
+
+    ref3 = _to_float(df["Ref3"])
+
+    increments = balance_change.copy()
+    starting_balance_info = {}
+    if len(df) and df["Ref3"].iat[0]:
+        if pd.notna(ref3.iat[0]):
+            first_ref3 = float(ref3.iat[0])
+            increments[0] = first_ref3
+            starting_balance_info = {
+                "first_ref3": first_ref3,
+                "first_balance_change": float(balance_change[0]),
+                "calculated_balance": first_ref3,
+                "note": "First transaction uses Ref3 directly",
+            }
+        else:
+            increments[0] = 0.0
+            starting_balance_info = {"error": "Could not parse first Ref3"}
+
+    calculated = np.cumsum(increments)
+    discrepancy = _round2(ref3 - calculated)
+    has_gap = (discrepancy.abs() > BALANCE_TOLERANCE).fillna(False)
+
+    result = pd.DataFrame(
+        {
+            "id": df["ID"],
+            "transaction_date": tx_date_str,
+            "ref2_datetime": ref2_datetime,
+            "description": df["TransactionDescription"],
+            "amount": amount,
+            "debet": df["Debet"],
+            "credit": df["Credit"],
+            "direction": direction,
+            "balance_change": _round2(pd.Series(balance_change)),
+            "calculated_balance": _round2(pd.Series(calculated)),
+            "ref3_balance": ref3,
+            "discrepancy": discrepancy,
+            "ref2": df["Ref2"],
+            "has_gap": has_gap,
+        }
+    )
+    result.attrs["starting_balance_info"] = starting_balance_info
+    result.attrs["final_balance"] = float(calculated[-1]) if len(calculated) else 0.0
+    return result
+
+
+def _py(value):
+    """Convert NumPy scalars / NaN to JSON-friendly Python values."""
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+_DETAIL_COLUMNS = [
+    "id",
+    "transaction_date",
+    "ref2_datetime",
+    "description",
+    "amount",
+    "debet",
+    "credit",
+    "direction",
+    "balance_change",
+    "calculated_balance",
+    "ref3_balance",
+    "discrepancy",
+    "ref2",
+]
+
+_GAP_COLUMNS = [
+    ("transaction_id", "id"),
+    ("transaction_date", "transaction_date"),
+    ("ref2_datetime", "ref2_datetime"),
+    ("description", "description"),
+    ("calculated_balance", "calculated_balance"),
+    ("ref3_balance", "ref3_balance"),
+    ("discrepancy", "discrepancy"),
+    ("ref2", "ref2"),
+]
+
+
+def _records(frame, columns):
+    """Convert selected columns to dict records with NaN mapped to None."""
+    subset = frame[columns]
+    return subset.astype(object).where(subset.notna(), None).to_dict("records")
+
+
+def transaction_details(frame):
+    """Render running-balance rows as transaction detail dicts."""
+    return _records(frame, _DETAIL_COLUMNS)
+
+
+def balance_gaps(frame):
+    """Render running-balance rows as balance gap dicts."""
+    gaps = frame[[src for _, src in _GAP_COLUMNS]]
+    gaps.columns = [key for key, _ in _GAP_COLUMNS]
+    return _records(gaps, list(gaps.columns))
+
+
+def page_bounds(total, page=1, page_size=DEFAULT_GAP_PAGE_SIZE):
+    """Compute slice bounds and pagination metadata for ``total`` items.
+
+    Args:
+        total: number of items
+        page: 1-based page number (clamped to >= 1)
+        page_size: items per page (None or <= 0 returns everything)
+
+    Returns:
+        tuple (start, stop, pagination dict)
+    """
+    page = max(int(page or 1), 1)
+    if not page_size or page_size <= 0:
+        page_size = max(total, 1)
+        page = 1
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total)
+    pagination = {
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": max(math.ceil(total / page_size), 1),
+    }
+    return start, max(start, stop), pagination
@@ -10,10 +10,21 @@ Extracted from banking_processor.py for clarity and maintainability.
 """
 
 import logging
-from datetime import datetime
 
+from banking_balance_engine import (
+    DEFAULT_GAP_PAGE_SIZE,
+    balance_gaps,
+    compute_running_balance,
+    find_saldo_progression_issues,
+    find_sequence_gaps,
+    is_numeric_sequence,
+    page_bounds,
+    transaction_details,
+)
 from database import DatabaseManager
 
+logger = logging.getLogger(__name__)
+
 
 def _get_opening_balance_date(db, administration):
     """Get the opening balance date based on the last closed year.
@@ -263,16 +274,8 @@ class BankingChecks:
             conn.close()
             return {"success": False, "message": "No transactions found"}
 
-        # Check if Ref2 values are numeric (sequence check only applies to accounts with numeric Ref2)
-        numeric_count = 0
-        for tx in transactions[:10]:  # Sample first 10 transactions
-            try:
-                int(tx["Ref2"])
-                numeric_count += 1
-            except (ValueError, TypeError):
-                pass
-
-        if numeric_count == 0:
+        # Sequence check only applies to accounts with numeric Ref2 values
+        if not is_numeric_sequence(transactions):
             # Non-numeric Ref2 values (e.g., Revolut descriptive references) — do running balance check
             result = self._check_balance_progression(
                 transactions, iban, account_code, administration, start_date
@@ -281,54 +284,11 @@ class BankingChecks:
             conn.close()
             return result
 
-        # Check for sequence gaps
-        sequence_issues = []
-        expected_next = None
-
-        for i, tx in enumerate(transactions):
-            try:
-                current_seq = int(tx["Ref2"])
-
-                if i == 0:
-                    expected_next = current_seq + 1
-                else:
-                    if current_seq != expected_next:
-                        sequence_issues.append(
-                            {
-                                "expected": expected_next,
-                                "found": current_seq,
-                                "gap": current_seq - expected_next,
-                                "date": tx["TransactionDate"],
-                                "description": tx["TransactionDescription"],
-                                "amount": tx["TransactionAmount"],
-                            }
-                        )
-                    expected_next = current_seq + 1
-
-            except ValueError:
-                sequence_issues.append(
-                    {
-                        "error": f"Invalid sequence number: {tx['Ref2']}",
-                        "date": tx["TransactionDate"],
-                        "description": tx["TransactionDescription"],
-                    }
-                )
-
         cursor.close()
         conn.close()
 
-        # Handle first and last sequence safely
-        first_sequence = None
-        last_sequence = None
-        if transactions:
-            try:
-                first_sequence = int(transactions[0]["Ref2"])
-            except ValueError:
-                pass
-            try:
-                last_sequence = int(transactions[-1]["Ref2"])
-            except ValueError:
-                pass
+        gaps = find_sequence_gaps(transactions)
+        sequence_issues = gaps["issues"]
 
         return {
             "success": True,
@@ -337,8 +297,8 @@ class BankingChecks:
             "administration": administration,
             "start_date": start_date,
             "total_transactions": len(transactions),
-            "first_sequence": first_sequence,
-            "last_sequence": last_sequence,
+            "first_sequence": gaps["first_sequence"],
+            "last_sequence": gaps["last_sequence"],
             "sequence_issues": sequence_issues,
             "has_gaps": len(sequence_issues) > 0,
         }
@@ -347,65 +307,7 @@ class BankingChecks:
         self, transactions, iban, account_code, administration, start_date
     ):
         """Check running balance for accounts with non-numeric Ref2 (e.g., Revolut)."""
-
-        def get_completion_date(tx):
-            if tx.get("Ref2"):
-                parts = tx["Ref2"].split("_")
-                if len(parts) >= 3:
-                    return parts[-1]
-            return ""
-
-        sorted_transactions = sorted(transactions, key=get_completion_date)
-
-        balance_issues = []
-        prev_saldo = None
-
-        for tx in sorted_transactions:
-            if not tx.get("Ref2"):
-                continue
-
-            parts = tx["Ref2"].split("_")
-            if len(parts) < 3:
-                continue
-
-            try:
-                current_saldo = float(parts[-2])
-            except (ValueError, IndexError):
-                continue
-
-            amount = (
-                abs(float(tx["TransactionAmount"]))
-                if tx.get("TransactionAmount")
-                else 0.0
-            )
-
-            if prev_saldo is not None:
-                saldo_diff = round(current_saldo - prev_saldo, 2)
-
-                if amount > 0 and abs(abs(saldo_diff) - amount) > 0.01:
-                    balance_issues.append(
-                        {
-                            "expected": round(prev_saldo - amount, 2)
-                            if saldo_diff < 0
-                            else round(prev_saldo + amount, 2),
-                            "found": current_saldo,
-                            "gap": round(
-                                current_saldo
-                                - (
-                                    prev_saldo - amount
-                                    if saldo_diff < 0
-                                    else prev_saldo + amount
-                                ),
-                                2,
-                            ),
-                            "date": str(tx["TransactionDate"])
-                            if tx.get("TransactionDate")
-                            else "",
-                            "description": tx.get("TransactionDescription", ""),
-                        }
-                    )
-
-            prev_saldo = current_saldo
+        balance_issues = find_saldo_progression_issues(transactions)
 
         return {
             "success": True,
@@ -413,7 +315,7 @@ class BankingChecks:
             "account_code": account_code,
             "administration": administration,
             "start_date": start_date,
-            "total_transactions": len(sorted_transactions),
+            "total_transactions": len(transactions),
             "first_sequence": None,
             "last_sequence": None,
             "has_gaps": len(balance_issues) > 0,
@@ -425,7 +327,13 @@ class BankingChecks:
         }
 
     def check_revolut_balance_gaps(
-        self, iban, account_code, start_date="2025-05-01", expected_final_balance=262.54
+        self,
+        iban,
+        account_code,
+        start_date="2025-05-01",
+        expected_final_balance=262.54,
+        page=1,
+        page_size=DEFAULT_GAP_PAGE_SIZE,
     ):
         """
         Check for gaps in Revolut balance by comparing calculated running balance
@@ -435,11 +343,17 @@ class BankingChecks:
         - Ref2 format: [description]_[balance]_[datetime]
         - Ref3 contains: the balance from the bank statement
 
+        The running balance is computed as a cumulative sum over all rows in ID
+        order (see banking_balance_engine); only the requested page of gap
+        rows is materialized in the response.
+
         Args:
             iban: Revolut IBAN
             account_code: Account code
             start_date: Start date for analysis (default: 2025-05-01)
             expected_final_balance: Expected final balance from Revolut (default: 262.54)
+            page: 1-based page of balance gaps to return (default: 1)
+            page_size: Gaps per page; None or 0 returns all (default: 500)
 
         Returns:
             Dictionary with balance analysis including gaps and discrepancies
@@ -476,151 +390,37 @@ class BankingChecks:
                     "message": f"No transactions found for IBAN {iban} since {start_date}",
                 }
 
-            # Parse Ref2 to extract datetime and sort by it
-            for tx in transactions:
-                ref2_parts = (tx["Ref2"] or "").split("_")
-                if len(ref2_parts) >= 3:
-                    datetime_str = ref2_parts[2]
-                    tx["ref2_datetime_str"] = datetime_str
-                    try:
-                        tx["ref2_datetime_obj"] = datetime.strptime(
-                            datetime_str, "%Y-%m-%d %H:%M:%S"
-                        )
-                    except ValueError:
-                        tx["ref2_datetime_obj"] = datetime.strptime(
-                            str(tx["TransactionDate"]), "%Y-%m-%d"
-                        )
-                        tx["ref2_datetime_str"] = str(tx["TransactionDate"])
-                else:
-                    tx["ref2_datetime_str"] = str(tx["TransactionDate"])
-                    tx["ref2_datetime_obj"] = datetime.strptime(
-                        str(tx["TransactionDate"]), "%Y-%m-%d"
-                    )
-
-            # Sort by ID (database insertion order) - this is the correct sequence
-            transactions.sort(key=lambda x: x["ID"])
-
-            print(
-                f"Total transactions after sorting by ID: {len(transactions)}",
-                flush=True,
+            frame = compute_running_balance(transactions, account_code)
+            logger.debug(
+                "Revolut balance check %s: %d transactions (IDs %s..%s)",
+                iban,
+                len(frame),
+                frame["id"].iat[0],
+                frame["id"].iat[-1],
             )
-            if transactions:
-                print(f"First transaction ID: {transactions[0]['ID']}", flush=True)
-                print(
-                    f"First transaction: {transactions[0]['TransactionDescription']}",
-                    flush=True,
-                )
-                print(f"First Ref3: {transactions[0]['Ref3']}", flush=True)
-                print(f"Last transaction ID: {transactions[-1]['ID']}", flush=True)
-
-            # Calculate running balance and compare with Ref3
-            balance_gaps = []
-            transaction_details = []
-
-            calculated_balance = 0.0
-            starting_balance_info = {}
-
-            for i, tx in enumerate(transactions):
-                amount = float(tx["TransactionAmount"] or 0)
-
-                if tx["Debet"] == account_code:
-                    balance_change = amount
-                    direction = "IN"
-                elif tx["Credit"] == account_code:
-                    balance_change = -amount
-                    direction = "OUT"
-                else:
-                    balance_change = 0
-                    direction = "SKIP"
-
-                if i == 0 and tx["Ref3"]:
-                    try:
-                        ref3_balance = float(tx["Ref3"])
-                        calculated_balance = ref3_balance
-                        starting_balance_info = {
-                            "first_ref3": ref3_balance,
-                            "first_balance_change": balance_change,
-                            "calculated_balance": calculated_balance,
-                            "note": "First transaction uses Ref3 directly",
-                        }
-                        print(
-                            f"First transaction: using Ref3 directly as balance: {calculated_balance}",
-                            flush=True,
-                        )
-                    except (ValueError, TypeError):
-                        calculated_balance = 0.0
-                        starting_balance_info = {"error": "Could not parse first Ref3"}
-                else:
-                    calculated_balance += balance_change
-
-                # Parse Ref3 balance (if available)
-                ref3_balance = None
-                if tx["Ref3"]:
-                    try:
-                        ref3_balance = float(tx["Ref3"])
-                    except (ValueError, TypeError):
-                        ref3_balance = None
-
-                discrepancy = None
-                if ref3_balance is not None:
-                    discrepancy = round(ref3_balance - calculated_balance, 2)
-
-                tx_detail = {
-                    "id": tx["ID"],
-                    "transaction_date": str(tx["TransactionDate"]),
-                    "ref2_datetime": tx["ref2_datetime_str"],
-                    "description": tx["TransactionDescription"],
-                    "amount": amount,
-                    "debet": tx["Debet"],
-                    "credit": tx["Credit"],
-                    "direction": direction,
-                    "balance_change": round(balance_change, 2),
-                    "calculated_balance": round(calculated_balance, 2),
-                    "ref3_balance": ref3_balance,
-                    "discrepancy": discrepancy,
-                    "ref2": tx["Ref2"],
-                }
-                transaction_details.append(tx_detail)
-
-                if discrepancy is not None and abs(discrepancy) > 0.01:
-                    balance_gaps.append(
-                        {
-                            "transaction_id": tx["ID"],
-                            "transaction_date": str(tx["TransactionDate"]),
-                            "ref2_datetime": tx["ref2_datetime_str"],
-                            "description": tx["TransactionDescription"],
-                            "calculated_balance": round(calculated_balance, 2),
-                            "ref3_balance": ref3_balance,
-                            "discrepancy": discrepancy,
-                            "ref2": tx["Ref2"],
-                        }
-                    )
 
-            final_calculated = round(calculated_balance, 2)
-            final_discrepancy = round(expected_final_balance - final_calculated, 2)
+            gap_rows = frame[frame["has_gap"]]
+            start, stop, pagination = page_bounds(len(gap_rows), page, page_size)
+            gap_page = gap_rows.iloc[start:stop]
 
-            cursor.close()
-            conn.close()
+            final_calculated = round(frame.attrs["final_balance"], 2)
+            final_discrepancy = round(expected_final_balance - final_calculated, 2)
 
             return {
                 "success": True,
                 "iban": iban,
                 "account_code": account_code,
                 "start_date": start_date,
-                "starting_balance_debug": starting_balance_info,
-                "total_transactions": len(transactions),
+                "starting_balance_debug": frame.attrs["starting_balance_info"],
+                "total_transactions": len(frame),
                 "calculated_final_balance": final_calculated,
                 "expected_final_balance": expected_final_balance,
                 "final_discrepancy": final_discrepancy,
-                "balance_gaps_found": len(balance_gaps),
-                "balance_gaps": balance_gaps,
-                "first_10_transactions": transaction_details[:10],
-                "transactions_with_gaps": [
-                    tx
-                    for tx in transaction_details
-                    if tx.get("discrepancy") is not None
-                    and abs(tx["discrepancy"]) > 0.01
-                ],
+                "balance_gaps_found": len(gap_rows),
+                "balance_gaps": balance_gaps(gap_page),
+                "first_10_transactions": transaction_details(frame.head(10)),
+                "transactions_with_gaps": transaction_details(gap_page),
+                "pagination": pagination,
                 "summary": {
                     "has_discrepancy": abs(final_discrepancy) > 0.01,
                     "missing_amount": max(0, final_discrepancy),
@@ -631,6 +431,8 @@ class BankingChecks:
             }
 
         except Exception as e:
+            return {"success": False, "error": str(e)}
+
+        finally:
             cursor.close()
             conn.close()
-            return {"success": False, "error": str(e)}
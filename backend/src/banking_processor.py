@@ -14,6 +14,7 @@ from datetime import datetime
 
 import pandas as pd
 
+from banking_balance_engine import DEFAULT_GAP_PAGE_SIZE
 from banking_checks import BankingChecks, _get_opening_balance_date
 from database import DatabaseManager
 from db_exceptions import ClosedPeriodError
@@ -331,7 +332,13 @@ class BankingProcessor:
         )
 
     def check_revolut_balance_gaps(
-        self, iban, account_code, start_date="2025-05-01", expected_final_balance=262.54
+        self,
+        iban,
+        account_code,
+        start_date="2025-05-01",
+        expected_final_balance=262.54,
+        page=1,
+        page_size=DEFAULT_GAP_PAGE_SIZE,
     ):
         """Check Revolut balance gaps (delegated to BankingChecks)."""
         return self._checks.check_revolut_balance_gaps(
@@ -339,6 +346,8 @@ class BankingProcessor:
             account_code=account_code,
             start_date=start_date,
             expected_final_balance=expected_final_balance,
+            page=page,
+            page_size=page_size,
         )
 
     # ──────────────────────────────────────────────────────────────────────────
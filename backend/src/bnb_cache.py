@@ -15,6 +15,15 @@ from threading import Lock
 
 import pandas as pd
 
+from cache_dtypes import (
+    BNB_SCHEMA,
+    DEFAULT_MEMORY_BUDGET_MB,
+    DEFAULT_TENANT_MEMORY_BUDGET_MB,
+    compact_frame,
+    evict_to_budget,
+    frame_memory_bytes,
+)
+from db_stream import read_frame
 from dialect_helpers import dialect
 
 logger = logging.getLogger(__name__)
@@ -27,6 +36,7 @@ class TenantCacheEntry:
     data: pd.DataFrame
     last_accessed: datetime
     last_loaded: datetime
+    memory_bytes: int = 0
 
 
 class BnbCache:
@@ -34,7 +44,10 @@ class BnbCache:
     Thread-safe in-memory cache for BNB booking data, partitioned by tenant.
 
     Each tenant's data is stored independently with its own TTL tracking.
-    Inactive tenants (not accessed for 2× TTL) are evicted to save memory.
+    Inactive tenants (not accessed for 2× TTL) are evicted to save memory,
+    and least recently used tenants are evicted when the combined frames
+    exceed the memory budget. Frames use the compact dtype layout from
+    cache_dtypes.BNB_SCHEMA.
 
     Thread safety model:
     - Global lock protects all writes to _tenant_data
@@ -42,9 +55,16 @@ class BnbCache:
     - Filtering operations (df[mask]) always return new DataFrames, never mutate
     """
 
-    def __init__(self, ttl_minutes=30):
+    def __init__(
+        self,
+        ttl_minutes=30,
+        memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+        tenant_memory_budget_mb=DEFAULT_TENANT_MEMORY_BUDGET_MB,
+    ):
         self._tenant_data: dict[str, TenantCacheEntry] = {}
         self.ttl = timedelta(minutes=ttl_minutes)
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self.tenant_memory_budget_bytes = tenant_memory_budget_mb * 1024 * 1024
         self.lock = Lock()
         logger.info(f"BnbCache initialized with TTL={ttl_minutes} minutes")
 
@@ -213,7 +233,7 @@ class BnbCache:
             """
 
             with db.get_cursor() as (_cursor, conn):
-                data = pd.read_sql(query, conn, params=[tenant])
+                data = read_frame(conn, query, [tenant], categorize_strings=False)
 
             self._process_dataframe(data)
 
@@ -223,6 +243,7 @@ class BnbCache:
                 last_accessed=now,
                 last_loaded=now,
             )
+            self._account_memory(tenant)
 
             elapsed = (datetime.now() - start_time).total_seconds()
             memory_mb = data.memory_usage(deep=True).sum() / 1024 / 1024
@@ -287,7 +308,7 @@ class BnbCache:
             """
 
             with db.get_cursor() as (_cursor, conn):
-                data = pd.read_sql(query, conn)
+                data = read_frame(conn, query, categorize_strings=False)
 
             self._process_dataframe(data)
 
@@ -303,6 +324,7 @@ class BnbCache:
                             last_accessed=now,
                             last_loaded=now,
                         )
+                        self._account_memory(admin)
                 else:
                     # No administration column — store as legacy
                     self._tenant_data["_legacy_"] = TenantCacheEntry(
@@ -368,6 +390,27 @@ class BnbCache:
             if col in data.columns:
                 data[col] = data[col].fillna("")
 
+        compact_frame(data, BNB_SCHEMA)
+
+    def _account_memory(self, tenant):
+        """Record a tenant's frame size and enforce the memory budget.
+
+        Must be called with ``self.lock`` held, after the entry was stored.
+        """
+        entry = self._tenant_data.get(tenant)
+        if entry is None:
+            return
+        entry.memory_bytes = frame_memory_bytes(entry.data)
+        if entry.memory_bytes > self.tenant_memory_budget_bytes:
+            logger.warning(
+                f"BNB tenant '{tenant}' cache uses {entry.memory_bytes / 1024 / 1024:.1f} MB, "
+                f"above the per-tenant budget of "
+                f"{self.tenant_memory_budget_bytes / 1024 / 1024:.0f} MB"
+            )
+        evict_to_budget(
+            self._tenant_data, self.memory_budget_bytes, keep=tenant, label="BNB"
+        )
+
     # ──────────────────────────────────────────────────────────────────────────
     # Eviction
     # ──────────────────────────────────────────────────────────────────────────
@@ -6,6 +6,7 @@ from datetime import datetime
 from database import DatabaseManager
 from google_drive_service import GoogleDriveService
 from mutaties_cache import get_cache
+from report_generators import ledger_totals
 
 
 class BTWProcessor:
@@ -76,11 +77,20 @@ class BTWProcessor:
             elif quarter_month == 3:
                 quarter_end_date = f"{year}-03-31"
 
+            # One pass over the cached ledger serves balance and quarter data
+            totals = self._get_report_totals(
+                administration, year, quarter, quarter_end_date
+            )
+
             # Get balance data (BTW accounts 2010, 2020, 2021)
-            balance_data = self._get_balance_data(administration, quarter_end_date)
+            balance_data = self._get_balance_data(
+                administration, quarter_end_date, totals=totals
+            )
 
             # Get quarter data (BTW accounts + revenue accounts 8001, 8002, 8003)
-            quarter_data = self._get_quarter_data(administration, year, quarter)
+            quarter_data = self._get_quarter_data(
+                administration, year, quarter, totals=totals
+            )
 
             # Calculate BTW amounts
             calculations = self._calculate_btw_amounts(
@@ -117,7 +127,33 @@ class BTWProcessor:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def _get_balance_data(self, administration, end_date):
+    def _get_report_totals(self, administration, year, quarter, end_date):
+        """
+        Ledger totals for every account a quarter's report reads.
+
+        The VAT accounts are resolved per reference date (opening balance,
+        report end date, quarter), so the totals cover all of them plus the
+        revenue accounts.
+        """
+        accounts = set(self._get_vat_accounts(administration, f"{year}-01-01"))
+        accounts.update(self._get_vat_accounts(administration, end_date))
+        accounts.update(self._quarter_accounts(administration, year, quarter))
+        return self._get_account_totals(administration, year, sorted(accounts))
+
+    def _get_account_totals(self, administration, year, accounts):
+        """Ledger totals for one year from the mutaties cache (see ledger_totals)."""
+        return ledger_totals.account_totals(
+            get_cache(), self.db, administration, year, accounts
+        )
+
+    def _quarter_accounts(self, administration, year, quarter):
+        """BTW and revenue accounts shown in the quarter data."""
+        vat_accounts = self._get_vat_accounts(
+            administration, f"{year}-{int(quarter) * 3:02d}-01"
+        )
+        return vat_accounts + ["8001", "8002", "8003"]
+
+    def _get_balance_data(self, administration, end_date, totals=None):
         """
         Get balance data for BTW accounts up to end date.
 
@@ -127,17 +163,28 @@ class BTWProcessor:
         - Calculate ending balance = opening + current year
 
         This prevents showing cumulative balances from unclosed historical years.
+        end_date is a quarter end date; totals are the ledger totals of its
+        year when the caller already has them.
         """
         try:
             # Extract year from end_date
             year = int(end_date.split("-")[0])
 
+            if totals is None:
+                accounts = set(self._get_vat_accounts(administration, f"{year}-01-01"))
+                accounts.update(self._get_vat_accounts(administration, end_date))
+                totals = self._get_account_totals(
+                    administration, year, sorted(accounts)
+                )
+
             # Get opening balance for the year (from Opening Balance transactions)
-            opening_balance = self._get_opening_balance_vat(administration, year)
+            opening_balance = self._get_opening_balance_vat(
+                administration, year, totals=totals
+            )
 
             # Get current year transactions (excluding opening balance)
             current_year_data = self._get_current_year_vat(
-                administration, year, end_date
+                administration, year, end_date, totals=totals
             )
 
             # Combine opening balance + current year data
@@ -164,7 +211,7 @@ class BTWProcessor:
             traceback.print_exc()
             return []
 
-    def _get_opening_balance_vat(self, administration, year):
+    def _get_opening_balance_vat(self, administration, year, totals=None):
         """
         Get the opening balance for VAT accounts for the specified year.
 
@@ -175,30 +222,21 @@ class BTWProcessor:
             dict: {'amount': net_opening_balance} or None
         """
         try:
-            cache = get_cache()
-            df = cache.get_data(self.db, tenant=administration)
-
             vat_accounts = self._get_vat_accounts(administration, f"{year}-01-01")
-            # Filter for opening balance transactions in the specified year
-            df_filtered = df[
-                (df["ReferenceNumber"] == "Opening Balance")
-                & (df["TransactionDate"] == f"{year}-01-01")
-                & (df["administration"] == administration)
-                & (df["Reknum"].isin(vat_accounts))
-            ].copy()
-
-            if df_filtered.empty:
-                return None
+            if totals is None:
+                totals = self._get_account_totals(administration, year, vat_accounts)
 
             # Sum all opening balance amounts (should be just one with netting)
-            total = df_filtered["Amount"].sum()
+            total = ledger_totals.opening_balance(totals, vat_accounts)
+            if total is None:
+                return None
 
             return {"amount": total}
         except Exception as e:
             print(f"Error getting opening balance VAT: {e}", flush=True)
             return None
 
-    def _get_current_year_vat(self, administration, year, end_date):
+    def _get_current_year_vat(self, administration, year, end_date, totals=None):
         """
         Get VAT transactions for the current year only (excluding opening balance).
 
@@ -206,74 +244,33 @@ class BTWProcessor:
             administration: Tenant identifier
             year: Year to get transactions for
             end_date: End date for the report (e.g., '2026-03-31')
+            totals: Optional ledger totals for the year
 
         Returns:
             list: List of dicts with Reknum, AccountName, amount
         """
         try:
-            cache = get_cache()
-            df = cache.get_data(self.db, tenant=administration)
-
             vat_accounts = self._get_vat_accounts(administration, end_date)
-            # Filter by date range (current year up to end_date, excluding opening balance)
-            df_filtered = df[
-                (df["TransactionDate"] >= f"{year}-01-01")
-                & (df["TransactionDate"] <= end_date)
-                & (df["ReferenceNumber"] != "Opening Balance")
-                & (df["administration"] == administration)
-                & (df["Reknum"].isin(vat_accounts))
-            ].copy()
-
-            # Group by account
-            grouped = df_filtered.groupby(
-                ["Reknum", "AccountName"], as_index=False
-            ).agg({"Amount": "sum"})
-
-            # Rename Amount to amount (lowercase for consistency)
-            grouped = grouped.rename(columns={"Amount": "amount"})
-
-            # Convert to list of dicts
-            results = grouped.to_dict("records")
+            if totals is None:
+                totals = self._get_account_totals(administration, year, vat_accounts)
 
-            return results
+            # Current year up to the quarter of end_date, excluding opening balance
+            return ledger_totals.year_to_date_rows(
+                totals, vat_accounts, ledger_totals.quarter_of(end_date)
+            )
         except Exception as e:
             print(f"Error getting current year VAT: {e}", flush=True)
             return []
 
-    def _get_quarter_data(self, administration, year, quarter):
+    def _get_quarter_data(self, administration, year, quarter, totals=None):
         """Get quarter data for BTW and revenue accounts using cache"""
         try:
-            # Get cache instance
-            cache = get_cache()
-            df = cache.get_data(self.db, tenant=administration)
-
-            # Filter by year and quarter
-            df_filtered = df[
-                (df["jaar"] == int(year)) & (df["kwartaal"] == int(quarter))
-            ].copy()
-
-            # Filter by administration (exact match for tenant isolation)
-            df_filtered = df_filtered[df_filtered["administration"] == administration]
-
             # Filter by BTW and revenue accounts
-            vat_accounts = self._get_vat_accounts(
-                administration, f"{year}-{int(quarter) * 3:02d}-01"
-            )
-            all_accounts = vat_accounts + ["8001", "8002", "8003"]
-            df_filtered = df_filtered[df_filtered["Reknum"].isin(all_accounts)]
-
-            # Group by account
-            grouped = df_filtered.groupby(
-                ["Reknum", "AccountName"], as_index=False
-            ).agg({"Amount": "sum"})
-
-            # Rename Amount to amount (lowercase for consistency)
-            grouped = grouped.rename(columns={"Amount": "amount"})
+            all_accounts = self._quarter_accounts(administration, year, quarter)
+            if totals is None:
+                totals = self._get_account_totals(administration, year, all_accounts)
 
-            # Convert to list of dicts
-            results = grouped.to_dict("records")
-
-            return results
+            return ledger_totals.quarter_rows(totals, all_accounts, quarter)
         except Exception as e:
             print(f"Error getting quarter data: {e}", flush=True)
             return []
@@ -587,13 +584,8 @@ class BTWProcessor:
                 drive_service = GoogleDriveService(administration)
 
                 # Find BTW folder
-                folders = drive_service.list_subfolders()
-                btw_folder_id = None
-
-                for folder in folders:
-                    if folder["name"].lower() == "btw":
-                        btw_folder_id = folder["id"]
-                        break
+                btw_folder = drive_service.find_subfolder("btw", ignore_case=True)
+                btw_folder_id = btw_folder["id"] if btw_folder else None
 
                 if not btw_folder_id:
                     return {
@@ -0,0 +1,183 @@
+"""
+Compact dtype layout and memory budget for the in-memory report caches.
+
+MutatiesCache and BnbCache keep one DataFrame per tenant. Loaded as-is,
+repeated strings (account numbers, names, channels) are separate Python
+objects and period columns are int64. ``compact_frame`` normalizes a
+frame at load time:
+
+- low-cardinality strings  -> category (categories sorted, so sorting
+  and ``to_dict`` behave like the object columns they replace)
+- free-text strings        -> object, with identical values interned
+- period columns           -> int16 / int8 (float64 if NULLs remain)
+- amounts                  -> float64
+
+Consumers that group on categorical columns must pass ``observed=True``;
+otherwise pandas emits every category combination.
+
+``evict_to_budget`` implements the LRU side: when the combined size of
+all tenant frames exceeds the budget, least recently accessed tenants are
+dropped first.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET_MB = int(os.getenv("CACHE_MEMORY_BUDGET_MB", "1024"))
+DEFAULT_TENANT_MEMORY_BUDGET_MB = int(os.getenv("CACHE_TENANT_MEMORY_BUDGET_MB", "256"))
+
+
+@dataclass(frozen=True)
+class CacheSchema:
+    """Column groups for ``compact_frame``."""
+
+    categorical: tuple[str, ...] = ()
+    interned: tuple[str, ...] = ()
+    integers: dict[str, str] = field(default_factory=dict)
+    floats: tuple[str, ...] = ()
+
+
+MUTATIES_SCHEMA = CacheSchema(
+    categorical=(
+        "Aangifte",
+        "Reknum",
+        "AccountName",
+        "Parent",
+        "VW",
+        "administration",
+    ),
+    interned=(
+        "TransactionNumber",
+        "TransactionDescription",
+        "ReferenceNumber",
+        "Ref3",
+        "Ref4",
+    ),
+    integers={"jaar": "int16", "kwartaal": "int8", "maand": "int8", "week": "int8"},
+    floats=("Amount",),
+)
+
+BNB_SCHEMA = CacheSchema(
+    categorical=("channel", "listing", "status", "source_type", "administration"),
+    interned=("guestName", "reservationCode"),
+    integers={"year": "int16", "quarter": "int8", "month": "int8"},
+    floats=(
+        "amountGross",
+        "amountNett",
+        "amountChannelFee",
+        "amountTouristTax",
+        "amountVat",
+    ),
+)
+
+
+def _categorical(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if categories.is_monotonic_increasing:
+            return series
+        try:
+            return series.cat.reorder_categories(categories.sort_values())
+        except TypeError:
+            return series
+    try:
+        return series.astype(pd.CategoricalDtype(sorted(series.dropna().unique())))
+    except TypeError:
+        # Mixed types cannot be sorted; keep pandas' own category order
+        return series.astype("category")
+
+
+def _interned(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    if series.dtype != object:
+        return series
+    memo = {}
+    values = np.fromiter(
+        (memo.setdefault(v, v) if isinstance(v, str) else v for v in series),
+        dtype=object,
+        count=len(series),
+    )
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _integer(series, dtype):
+    numeric = pd.to_numeric(series, errors="coerce")
+    if numeric.isna().any():
+        return numeric.astype(np.float64)
+    info = np.iinfo(dtype)
+    if len(numeric) and (numeric.min() < info.min or numeric.max() > info.max):
+        return numeric.astype(np.int64)
+    return numeric.astype(dtype)
+
+
+def compact_frame(df, schema):
+    """Convert ``df`` in place to the compact layout described by ``schema``.
+
+    Columns missing from ``df`` are ignored. Returns ``df`` for chaining.
+    """
+    if df is None or df.empty:
+        return df
+
+    for col in schema.categorical:
+        if col in df.columns:
+            df[col] = _categorical(df[col])
+    for col in schema.interned:
+        if col in df.columns:
+            df[col] = _interned(df[col])
+    for col, dtype in schema.integers.items():
+        if col in df.columns:
+            df[col] = _integer(df[col], dtype)
+    for col in schema.floats:
+        if col in df.columns and df[col].dtype != np.float64:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float64)
+    return df
+
+
+def frame_memory_bytes(df):
+    """Deep memory footprint of a cached frame (0 for None)."""
+    if df is None:
+        return 0
+    return int(df.memory_usage(deep=True).sum())
+
+
+def evict_to_budget(tenant_data, budget_bytes, keep=None, label="cache"):
+    """Drop least recently accessed tenants until the total fits the budget.
+
+    Args:
+        tenant_data: dict of tenant -> entry with ``memory_bytes`` and
+            ``last_accessed`` attributes; modified in place. The caller
+            must hold the cache lock.
+        budget_bytes: total bytes allowed across all tenants
+        keep: tenant that must not be evicted (the one being served)
+        label: cache name for log messages
+
+    Returns:
+        list of evicted tenant keys
+    """
+    total = sum(entry.memory_bytes for entry in tenant_data.values())
+    if total <= budget_bytes:
+        return []
+
+    evicted = []
+    candidates = sorted(
+        (key for key in tenant_data if key != keep),
+        key=lambda key: tenant_data[key].last_accessed,
+    )
+    for key in candidates:
+        if total <= budget_bytes:
+            break
+        entry = tenant_data.pop(key)
+        total -= entry.memory_bytes
+        evicted.append(key)
+        logger.info(
+            f"Evicted {label} tenant '{key}' to stay within memory budget "
+            f"({entry.memory_bytes / 1024 / 1024:.1f} MB freed)"
+        )
+    return evicted
@@ -0,0 +1,373 @@
+"""
+Managed MySQL connection pool with wait metrics, queueing and adaptive sizing
+
+mysql.connector's MySQLConnectionPool has a fixed size, raises PoolError
+the moment it is exhausted (callers then fell back to unpooled connects),
+never checks whether an idle connection is still alive and reports
+nothing about saturation. ManagedConnectionPool replaces it:
+
+- Checkout waits in a FIFO-fair queue for up to checkout_timeout seconds
+  and raises PoolTimeoutError instead of opening unpooled connections.
+- Checkout latency is recorded in a WaitHistogram (p50/p95/p99), and is
+  kept separate from how long callers hold the connection.
+- A connection idle for more than idle_ping_seconds is pinged on checkout
+  and replaced if the ping fails; connections older than recycle_seconds
+  are closed and reopened.
+- The pool limit moves between min_size and max_size: adapt() (called
+  periodically by AdvancedConnectionPool's monitor thread) grows it when
+  callers waited or utilization was high, and shrinks it and closes idle
+  connections when utilization was low.
+
+Connections handed out are PooledConnection proxies; close() returns the
+connection to the pool after rolling back any open transaction.
+
+Usage:
+    pool = ManagedConnectionPool("primary", lambda: mysql.connector.connect(**cfg))
+    conn = pool.checkout()
+    try:
+        ...
+    finally:
+        conn.close()
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from mysql.connector import Error as MySQLError
+
+from db_exceptions import PoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+GROW_UTILIZATION = 0.8  # Grow when the busiest moment used >= 80% of the limit
+SHRINK_UTILIZATION = 0.3  # Shrink when it stayed below 30%
+
+
+class WaitHistogram:
+    """Fixed-bucket latency histogram (not thread-safe; guarded by the pool)."""
+
+    def __init__(self, buckets_ms: tuple[int, ...] = WAIT_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)  # last bucket: overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Upper bound (ms) of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                if index < len(self.buckets_ms):
+                    return float(self.buckets_ms[index])
+                return round(self.max * 1000, 2)
+        return round(self.max * 1000, 2)
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"<={b}ms" for b in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max * 1000, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class _Slot:
+    """A physical connection and its bookkeeping."""
+
+    __slots__ = ("created_at", "last_used", "raw")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """Connection proxy whose close() returns the connection to its pool."""
+
+    def __init__(self, pool: "ManagedConnectionPool", slot: _Slot, checked_out_at):
+        self._pool = pool
+        self._slot = slot
+        self._checked_out_at = checked_out_at
+
+    def close(self) -> None:
+        if self._slot is not None:
+            slot, self._slot = self._slot, None
+            self._pool._release(slot, self._checked_out_at)
+
+    def __getattr__(self, name):
+        slot = self.__dict__.get("_slot")
+        if slot is None:
+            raise AttributeError(f"{name} (connection already returned to the pool)")
+        return getattr(slot.raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ManagedConnectionPool:
+    """Bounded, adaptively sized connection pool with checkout queueing."""
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Any],
+        min_size: int = 2,
+        max_size: int = 20,
+        checkout_timeout: float = 30.0,
+        idle_ping_seconds: float = 30.0,
+        recycle_seconds: float = 3600.0,
+        prefill: bool = True,
+    ):
+        if min_size < 0 or max_size < max(min_size, 1):
+            raise ValueError(f"Invalid pool bounds: min={min_size}, max={max_size}")
+        self.name = name
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_ping_seconds = idle_ping_seconds
+        self.recycle_seconds = recycle_seconds
+
+        self._cond = threading.Condition()
+        self._idle: deque[_Slot] = deque()
+        self._waiters: deque[object] = deque()
+        self.limit = max(min_size, 1)
+        self.open = 0
+        self.in_use = 0
+
+        self.wait_histogram = WaitHistogram()
+        self.hold_histogram = WaitHistogram()
+        self.counters = {
+            "checkouts": 0,
+            "waited": 0,
+            "timeouts": 0,
+            "connect_errors": 0,
+            "pings": 0,
+            "ping_failures": 0,
+            "recycled": 0,
+            "grown": 0,
+            "shrunk": 0,
+        }
+        # Busiest moment since the last adapt() call
+        self._window_peak = 0
+        self._window_waited = 0
+
+        if prefill:
+            # Fail fast (and let callers fall back) if the database is unreachable
+            for _ in range(min_size):
+                slot = self._open_slot()
+                with self._cond:
+                    self.open += 1
+                    self._idle.append(slot)
+
+    # ------------------------------------------------------------------
+    # Checkout / release
+    # ------------------------------------------------------------------
+
+    def checkout(self, timeout: float | None = None) -> PooledConnection:
+        """Borrow a connection, waiting up to timeout seconds for one."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        ticket = object()
+
+        with self._cond:
+            slot = None
+            create = False
+            queued = False
+            while True:
+                # FIFO fairness: only the head of the wait queue may take a slot
+                my_turn = not self._waiters or self._waiters[0] is ticket
+                if my_turn and self._idle:
+                    slot = self._idle.pop()  # most recently used: warmest
+                    break
+                if my_turn and self.open < self.limit:
+                    self.open += 1
+                    create = True
+                    break
+                if not queued:
+                    self._waiters.append(ticket)
+                    self.counters["waited"] += 1
+                    self._window_waited += 1
+                    queued = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiters.remove(ticket)
+                    self.counters["timeouts"] += 1
+                    self._cond.notify_all()
+                    raise PoolTimeoutError(
+                        f"No connection available in pool '{self.name}' after "
+                        f"{timeout:.1f}s ({self.in_use}/{self.limit} in use, "
+                        f"{len(self._waiters)} waiting)"
+                    )
+                self._cond.wait(remaining)
+            if queued:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+            self.in_use += 1
+            self._window_peak = max(self._window_peak, self.in_use)
+
+        try:
+            slot = self._open_slot() if create else self._validate(slot)
+        except Exception:
+            with self._cond:
+                self.open -= 1
+                self.in_use -= 1
+                self._cond.notify_all()
+            raise
+
+        checked_out_at = time.monotonic()
+        with self._cond:
+            self.counters["checkouts"] += 1
+            self.wait_histogram.observe(checked_out_at - start)
+        return PooledConnection(self, slot, checked_out_at)
+
+    def _release(self, slot: _Slot, checked_out_at: float) -> None:
+        healthy = True
+        try:
+            if getattr(slot.raw, "in_transaction", False):
+                slot.raw.rollback()
+        except (MySQLError, OSError) as e:
+            logger.debug(f"Discarding connection from pool '{self.name}': {e}")
+            healthy = False
+
+        now = time.monotonic()
+        with self._cond:
+            self.in_use -= 1
+            self.hold_histogram.observe(now - checked_out_at)
+            if healthy and self.open <= self.limit:
+                slot.last_used = now
+                self._idle.append(slot)
+                slot = None
+            else:
+                self.open -= 1
+            self._cond.notify_all()
+        if slot is not None:
+            self._close_raw(slot.raw)
+
+    def _open_slot(self) -> _Slot:
+        try:
+            return _Slot(self._connect())
+        except Exception:
+            with self._cond:
+                self.counters["connect_errors"] += 1
+            raise
+
+    def _validate(self, slot: _Slot) -> _Slot:
+        """Recycle old connections and ping ones that sat idle."""
+        now = time.monotonic()
+        if now - slot.created_at >= self.recycle_seconds:
+            self._close_raw(slot.raw)
+            with self._cond:
+                self.counters["recycled"] += 1
+            return self._open_slot()
+        if now - slot.last_used >= self.idle_ping_seconds:
+            with self._cond:
+                self.counters["pings"] += 1
+            try:
+                slot.raw.ping(reconnect=False)
+            except (MySQLError, OSError) as e:
+                logger.info(f"Replacing dead connection in pool '{self.name}': {e}")
+                with self._cond:
+                    self.counters["ping_failures"] += 1
+                self._close_raw(slot.raw)
+                return self._open_slot()
+        return slot
+
+    @staticmethod
+    def _close_raw(raw) -> None:
+        try:
+            raw.close()
+        except (MySQLError, OSError) as e:
+            logger.debug(f"Ignoring error while closing pooled connection: {e}")
+
+    # ------------------------------------------------------------------
+    # Adaptive sizing
+    # ------------------------------------------------------------------
+
+    def adapt(self) -> int:
+        """Resize the limit from utilization since the last call; returns it."""
+        to_close = []
+        with self._cond:
+            peak = max(self._window_peak, self.in_use)
+            waited = self._window_waited
+            self._window_peak = self.in_use
+            self._window_waited = 0
+            step = max(1, self.limit // 4)
+
+            if (waited or peak >= GROW_UTILIZATION * self.limit) and (
+                self.limit < self.max_size
+            ):
+                self.limit = min(self.max_size, self.limit + step)
+                self.counters["grown"] += 1
+                self._cond.notify_all()
+            elif peak < SHRINK_UTILIZATION * self.limit and self.limit > self.min_size:
+                self.limit = max(self.min_size, self.limit - step, 1)
+                self.counters["shrunk"] += 1
+
+            # Close idle connections above the new limit (oldest idle first)
+            while self._idle and self.open > max(self.limit, self.min_size):
+                to_close.append(self._idle.popleft())
+                self.open -= 1
+            limit = self.limit
+
+        for slot in to_close:
+            self._close_raw(slot.raw)
+        return limit
+
+    def close_all(self) -> None:
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self.open -= len(idle)
+        for slot in idle:
+            self._close_raw(slot.raw)
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def statistics(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "name": self.name,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "limit": self.limit,
+                "open": self.open,
+                "idle": len(self._idle),
+                "in_use": self.in_use,
+                "waiting": len(self._waiters),
+                "utilization": round(self.in_use / self.limit, 3) if self.limit else 0,
+                "checkout_wait": self.wait_histogram.snapshot(),
+                "hold_time": self.hold_histogram.snapshot(),
+                **self.counters,
+            }
@@ -7,13 +7,23 @@ import mysql.connector
 from dotenv import load_dotenv
 from mysql.connector import pooling
 
+import query_metrics
 from database_banking_queries import DatabaseBankingQueriesMixin
+from db_batch import (
+    DEFAULT_MAX_PACKET_BYTES,
+    chunk_params,
+    group_statements,
+    is_insert,
+    is_read_query,
+)
 from db_exceptions import (
     ConnectionError,
     DatabaseError,
     IntegrityError,
     OperationalError,
+    PoolTimeoutError,
 )
+from db_stream import DEFAULT_CHUNK_SIZE, concat_frames, iter_frames, iter_rows
 
 load_dotenv()
 
@@ -108,13 +118,26 @@ class DatabaseManager(DatabaseBankingQueriesMixin):
         return self.config
 
     def get_connection(self, pool_type="primary"):
-        """Get database connection with scalability improvements"""
+        """Get database connection with scalability improvements
+
+        While a request is measured (query_metrics) the connection's cursors
+        are instrumented, so queries on cursors opened by callers count too.
+        """
+        wait_start = time.time()
+        conn = self._checkout_connection(pool_type)
+        query_metrics.record_pool_wait(time.time() - wait_start)
+        return query_metrics.wrap_connection(conn)
+
+    def _checkout_connection(self, pool_type):
         # Try scalability manager first (advanced pooling)
         if DatabaseManager._scalability_manager:
             try:
-                return DatabaseManager._scalability_manager.get_database_connection(
+                return DatabaseManager._scalability_manager.connection_pool.checkout(
                     pool_type
                 )
+            except PoolTimeoutError:
+                # Saturated pool: surface it instead of opening unpooled connections
+                raise
             except Exception as e:
                 logger.warning(
                     f"⚠️ Scalability manager connection failed, falling back to legacy: {e}"
@@ -163,7 +186,10 @@ class DatabaseManager(DatabaseBankingQueriesMixin):
                 with DatabaseManager._scalability_manager.get_database_connection(
                     pool_type
                 ) as conn:
-                    cursor = conn.cursor(dictionary=dictionary)
+                    query_metrics.record_pool_wait(time.time() - start_time)
+                    cursor = query_metrics.wrap_cursor(
+                        conn.cursor(dictionary=dictionary)
+                    )
                     try:
                         _yielded = True
                         yield cursor, conn
@@ -218,9 +244,9 @@ class DatabaseManager(DatabaseBankingQueriesMixin):
                     f"⚠️ Scalability manager cursor failed, falling back: {e}"
                 )
 
-        # Fallback to legacy approach
+        # Fallback to legacy approach (get_connection records the pool wait)
         conn = self.get_connection()
-        cursor = conn.cursor(dictionary=dictionary)
+        cursor = query_metrics.wrap_cursor(conn.cursor(dictionary=dictionary))
         try:
             yield cursor, conn
         except mysql.connector.IntegrityError as e:
@@ -330,46 +356,122 @@ class DatabaseManager(DatabaseBankingQueriesMixin):
         """
         return self.execute_query(statement, fetch=False, commit=True)
 
-    def execute_batch_queries(self, queries_with_params, commit=True):
-        """Execute multiple queries in batch for better performance"""
+    def execute_batch_queries(
+        self,
+        queries_with_params,
+        commit=True,
+        parallel_reads=False,
+        max_packet_bytes=DEFAULT_MAX_PACKET_BYTES,
+    ):
+        """Execute many statements on one connection inside one transaction.
+
+        Consecutive statements with identical SQL are sent with
+        ``executemany`` so INSERTs are rewritten into multi-row INSERTs,
+        chunked to stay below ``max_packet_bytes``. Any failure rolls back
+        the whole batch.
+
+        Args:
+            queries_with_params: list of ``(query, params)`` tuples
+            commit: commit the transaction when all statements succeeded;
+                ``False`` rolls the batch back (dry run)
+            parallel_reads: run independent read-only queries concurrently on
+                separate pooled connections; raises ValueError if any
+                statement writes
+            max_packet_bytes: approximate size limit per multi-row statement
+
+        Returns:
+            list with one entry per input statement: the affected row count,
+            or ``None`` when a multi-row INSERT chunk reported a total that
+            cannot be attributed to individual rows (e.g. ON DUPLICATE KEY
+            UPDATE). With ``parallel_reads`` each entry is the fetched rows.
+        """
         if not queries_with_params:
             return []
 
-        # Use scalability manager for batch processing if available
-        if DatabaseManager._scalability_manager:
-            try:
-
-                def execute_single_query(query_params):
-                    query, params = query_params
-                    return self.execute_query(query, params, fetch=False, commit=False)
-
-                results = DatabaseManager._scalability_manager.batch_process_items(
-                    queries_with_params, execute_single_query
-                )
-
-                # Commit all changes at once
-                if commit:
-                    with self.get_cursor() as (cursor, conn):
-                        conn.commit()
-
-                return results
-            except Exception as e:
-                logger.warning(
-                    f"⚠️ Batch processing failed, falling back to sequential: {e}"
-                )
+        if parallel_reads:
+            return self._execute_parallel_reads(queries_with_params)
 
-        # Fallback to sequential processing
-        results = []
+        results = [None] * len(queries_with_params)
         with self.get_cursor() as (cursor, conn):
-            for query, params in queries_with_params:
-                cursor.execute(query, params or ())
-                results.append(cursor.rowcount)
+            for query, param_rows, indexes in group_statements(queries_with_params):
+                if len(param_rows) > 1 and is_insert(query):
+                    offset = 0
+                    for chunk in chunk_params(query, param_rows, max_packet_bytes):
+                        cursor.executemany(query, chunk)
+                        if cursor.rowcount == len(chunk):
+                            for index in indexes[offset : offset + len(chunk)]:
+                                results[index] = 1
+                        offset += len(chunk)
+                    continue
+
+                for index, params in zip(indexes, param_rows):
+                    cursor.execute(query, params or ())
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                    results[index] = cursor.rowcount
 
             if commit:
                 conn.commit()
+            else:
+                conn.rollback()
 
         return results
 
+    def _execute_parallel_reads(self, queries_with_params):
+        """Run independent read-only queries concurrently and return their rows."""
+        writes = [q for q, _ in queries_with_params if not is_read_query(q)]
+        if writes:
+            raise ValueError(
+                "parallel_reads only supports read-only queries; "
+                f"got {len(writes)} write statement(s)"
+            )
+
+        def execute_single_query(query_params):
+            query, params = query_params
+            return self.execute_query(query, params, fetch=True)
+
+        if DatabaseManager._scalability_manager:
+            return DatabaseManager._scalability_manager.batch_process_items(
+                list(queries_with_params), execute_single_query
+            )
+        return [execute_single_query(item) for item in queries_with_params]
+
+    def stream_frames(
+        self,
+        query,
+        params=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        categorize_strings=True,
+        pool_type="readonly",
+    ):
+        """Yield typed DataFrame chunks for a large read.
+
+        Rows are fetched through an unbuffered cursor ``chunk_size`` at a
+        time; see ``db_stream`` for the column type mapping.
+        """
+        with self.get_cursor(pool_type=pool_type) as (_cursor, conn):
+            yield from iter_frames(conn, query, params, chunk_size, categorize_strings)
+
+    def stream_rows(
+        self, query, params=None, chunk_size=DEFAULT_CHUNK_SIZE, pool_type="readonly"
+    ):
+        """Yield lists of dict rows, ``chunk_size`` rows at a time."""
+        with self.get_cursor(pool_type=pool_type) as (_cursor, conn):
+            yield from iter_rows(conn, query, params, chunk_size)
+
+    def read_frame(
+        self,
+        query,
+        params=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        categorize_strings=True,
+        pool_type="readonly",
+    ):
+        """Read a large result set into a single typed DataFrame."""
+        return concat_frames(
+            self.stream_frames(query, params, chunk_size, categorize_strings, pool_type)
+        )
+
     def execute_async_query(self, query, params=None, fetch=True, commit=False):
         """Execute query asynchronously using scalability manager"""
         if DatabaseManager._scalability_manager:
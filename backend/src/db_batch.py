@@ -0,0 +1,116 @@
+"""Batch statement helpers for DatabaseManager.
+
+Groups consecutive statements that share the same SQL text so they can be
+sent with ``cursor.executemany`` (which mysql-connector rewrites into a
+single multi-row ``INSERT ... VALUES (...), (...)``), and splits large
+parameter lists into chunks that stay below the server's packet limit.
+
+Usage:
+    from db_batch import executemany_chunked
+
+    with db.transaction() as (cursor, conn):
+        executemany_chunked(cursor, "INSERT INTO t (a, b) VALUES (%s, %s)", rows)
+"""
+
+import re
+
+# Conservative default; MySQL's max_allowed_packet is 4 MiB (5.7) / 64 MiB (8.0)
+DEFAULT_MAX_PACKET_BYTES = 1024 * 1024
+DEFAULT_MAX_ROWS_PER_CHUNK = 1000
+
+# Per-value overhead for quoting, escaping and the separating comma
+_VALUE_OVERHEAD_BYTES = 4
+
+_INSERT_RE = re.compile(r"^\s*(INSERT|REPLACE)\b", re.IGNORECASE)
+_READ_RE = re.compile(r"^\s*(SELECT|SHOW|DESCRIBE|EXPLAIN|WITH)\b", re.IGNORECASE)
+
+
+def is_insert(query):
+    """Return True for INSERT/REPLACE statements that executemany can rewrite."""
+    return bool(_INSERT_RE.match(query))
+
+
+def is_read_query(query):
+    """Return True for statements that only read data."""
+    return bool(_READ_RE.match(query))
+
+
+def estimate_params_size(params):
+    """Approximate the number of bytes a parameter row adds to a statement."""
+    if params is None:
+        return 0
+    values = params.values() if isinstance(params, dict) else params
+    size = 0
+    for value in values:
+        if isinstance(value, (bytes, bytearray)):
+            size += len(value)
+        elif isinstance(value, str):
+            size += len(value.encode("utf-8"))
+        else:
+            size += len(str(value))
+        size += _VALUE_OVERHEAD_BYTES
+    return size
+
+
+def chunk_params(
+    query,
+    param_rows,
+    max_packet_bytes=DEFAULT_MAX_PACKET_BYTES,
+    max_rows=DEFAULT_MAX_ROWS_PER_CHUNK,
+):
+    """Split ``param_rows`` into lists that fit in one packet.
+
+    A single row that is larger than ``max_packet_bytes`` still gets its own
+    chunk; the server will reject it exactly as it would a lone execute().
+    """
+    base = len(query.encode("utf-8"))
+    chunk, size = [], base
+    for params in param_rows:
+        row_size = estimate_params_size(params)
+        if chunk and (size + row_size > max_packet_bytes or len(chunk) >= max_rows):
+            yield chunk
+            chunk, size = [], base
+        chunk.append(params)
+        size += row_size
+    if chunk:
+        yield chunk
+
+
+def group_statements(queries_with_params):
+    """Group consecutive ``(query, params)`` pairs that share the same SQL text.
+
+    Only adjacent statements are merged so the original execution order
+    (e.g. an INSERT followed by an UPDATE of the same row) is preserved.
+
+    Returns:
+        list of ``(query, [params, ...], [input_index, ...])`` tuples
+    """
+    groups = []
+    for index, (query, params) in enumerate(queries_with_params):
+        if groups and groups[-1][0] == query:
+            groups[-1][1].append(params)
+            groups[-1][2].append(index)
+        else:
+            groups.append((query, [params], [index]))
+    return groups
+
+
+def executemany_chunked(
+    cursor,
+    query,
+    param_rows,
+    max_packet_bytes=DEFAULT_MAX_PACKET_BYTES,
+    max_rows=DEFAULT_MAX_ROWS_PER_CHUNK,
+):
+    """Run ``cursor.executemany`` in packet-sized chunks on one cursor.
+
+    The caller owns the transaction; nothing is committed here.
+
+    Returns:
+        Total number of affected rows reported by the server.
+    """
+    total = 0
+    for chunk in chunk_params(query, param_rows, max_packet_bytes, max_rows):
+        cursor.executemany(query, chunk)
+        total += max(cursor.rowcount or 0, 0)
+    return total
@@ -33,6 +33,10 @@ class OperationalError(DatabaseError):
     """Raised on operational issues (timeout, deadlock, server gone)."""
 
 
+class PoolTimeoutError(OperationalError):
+    """Raised when no pooled connection became available within the checkout timeout."""
+
+
 class ClosedPeriodError(DatabaseError):
     """Raised when transactions target a closed fiscal year.
 
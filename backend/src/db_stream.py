@@ -0,0 +1,255 @@
+"""Streaming reads from MySQL into typed pandas DataFrames.
+
+``pd.read_sql`` on a mysql-connector connection buffers the full result,
+materialises every row as a Python tuple/dict and then builds object
+columns, so peak memory is several times the final DataFrame. The helpers
+here read through an unbuffered cursor in fixed-size chunks and convert
+each chunk straight into typed NumPy columns using the column types the
+server reports:
+
+- DECIMAL / FLOAT / DOUBLE      -> float64 (NULL -> NaN)
+- integer types                 -> int32, or int64 when out of range,
+                                   float64 when the chunk contains NULLs
+- DATE / DATETIME / TIMESTAMP   -> datetime64[ns] (NULL -> NaT)
+- strings                       -> category (optional) or object
+
+Usage:
+    from db_stream import read_frame
+
+    conn = db_manager.get_connection()
+    try:
+        df = read_frame(conn, "SELECT ... WHERE administration = %s", [tenant])
+    finally:
+        conn.close()
+"""
+
+import logging
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from mysql.connector import Error as MySQLError
+from mysql.connector.constants import FieldType
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+_FLOAT_TYPES = frozenset(
+    {FieldType.DECIMAL, FieldType.NEWDECIMAL, FieldType.FLOAT, FieldType.DOUBLE}
+)
+_INT_TYPES = frozenset(
+    {
+        FieldType.TINY,
+        FieldType.SHORT,
+        FieldType.LONG,
+        FieldType.INT24,
+        FieldType.LONGLONG,
+        FieldType.YEAR,
+    }
+)
+_DATE_TYPES = frozenset(
+    {FieldType.DATE, FieldType.NEWDATE, FieldType.DATETIME, FieldType.TIMESTAMP}
+)
+_STRING_TYPES = frozenset(FieldType.get_string_types()) | {FieldType.VARCHAR}
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MICROS_PER_DAY = 86_400_000_000
+_NAT_INT = np.iinfo(np.int64).min
+
+_INT32_MIN = np.iinfo(np.int32).min
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _float_column(values):
+    n = len(values)
+    try:
+        return np.fromiter(
+            (np.nan if v is None else v for v in values), dtype=np.float64, count=n
+        )
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(
+            dtype=np.float64
+        )
+
+
+def _int_column(values):
+    if any(v is None for v in values):
+        return _float_column(values)
+    try:
+        arr = np.fromiter(values, dtype=np.int64, count=len(values))
+    except (TypeError, ValueError, OverflowError):
+        return np.array(values, dtype=object)
+    if arr.size and (arr.min() < _INT32_MIN or arr.max() > _INT32_MAX):
+        return arr
+    return arr.astype(np.int32)
+
+
+def _to_epoch_micros(value):
+    if value is None:
+        return _NAT_INT
+    micros = (value.toordinal() - _EPOCH_ORDINAL) * _MICROS_PER_DAY
+    if isinstance(value, datetime):
+        micros += (
+            (value.hour * 60 + value.minute) * 60 + value.second
+        ) * 1_000_000 + value.microsecond
+    return micros
+
+
+def _date_column(values):
+    # Integer arithmetic on ordinals is much faster than numpy/pandas
+    # parsing of date objects; the int64 minimum is NaT in datetime64.
+    try:
+        micros = np.fromiter(
+            map(_to_epoch_micros, values), dtype=np.int64, count=len(values)
+        )
+    except (AttributeError, TypeError):
+        return pd.to_datetime(
+            pd.Series(values, dtype=object), errors="coerce"
+        ).to_numpy()
+    return micros.view("datetime64[us]").astype("datetime64[ns]")
+
+
+def _string_column(values, categorize):
+    arr = np.array(values, dtype=object)
+    return pd.Categorical(arr) if categorize else arr
+
+
+def _column_kind(type_code):
+    if type_code in _FLOAT_TYPES:
+        return "float"
+    if type_code in _INT_TYPES:
+        return "int"
+    if type_code in _DATE_TYPES:
+        return "date"
+    if type_code in _STRING_TYPES:
+        return "string"
+    return "object"
+
+
+def rows_to_frame(rows, columns, kinds, categorize_strings=True):
+    """Build a DataFrame from a list of row tuples using per-column kinds."""
+    if not rows:
+        return empty_frame(columns, kinds, categorize_strings)
+
+    data = {}
+    for name, kind, values in zip(columns, kinds, zip(*rows)):
+        if kind == "float":
+            data[name] = _float_column(values)
+        elif kind == "int":
+            data[name] = _int_column(values)
+        elif kind == "date":
+            data[name] = _date_column(values)
+        elif kind == "string":
+            data[name] = _string_column(values, categorize_strings)
+        else:
+            data[name] = np.array(values, dtype=object)
+    return pd.DataFrame(data, columns=columns, copy=False)
+
+
+def empty_frame(columns, kinds, categorize_strings=True):
+    """Return an empty DataFrame with the dtypes the columns would get."""
+    dtypes = {
+        "float": np.float64,
+        "int": np.int32,
+        "date": "datetime64[ns]",
+        "string": "category" if categorize_strings else object,
+        "object": object,
+    }
+    return pd.DataFrame(
+        {name: pd.Series(dtype=dtypes[kind]) for name, kind in zip(columns, kinds)},
+        columns=columns,
+    )
+
+
+def iter_frames(
+    conn, query, params=None, chunk_size=DEFAULT_CHUNK_SIZE, categorize_strings=True
+):
+    """Execute ``query`` on ``conn`` and yield one typed DataFrame per chunk.
+
+    Uses an unbuffered tuple cursor so at most ``chunk_size`` rows are held
+    as Python objects at a time. At least one (possibly empty) frame is
+    always yielded so callers get the column layout.
+    """
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(query, params or ())
+        description = cursor.description or []
+        columns = [col[0] for col in description]
+        kinds = [_column_kind(col[1]) for col in description]
+
+        yielded = False
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yielded = True
+            yield rows_to_frame(rows, columns, kinds, categorize_strings)
+
+        if not yielded:
+            yield empty_frame(columns, kinds, categorize_strings)
+    finally:
+        # An abandoned generator leaves unread rows on the connection
+        try:
+            if getattr(conn, "unread_result", False):
+                conn.consume_results()
+        except MySQLError as e:
+            logger.debug(f"Could not consume unread results: {e}")
+        cursor.close()
+
+
+def iter_rows(conn, query, params=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Execute ``query`` on ``conn`` and yield lists of dict rows per chunk.
+
+    For consumers that work on plain rows rather than DataFrames; like
+    ``iter_frames`` at most ``chunk_size`` rows are held at a time.
+    """
+    cursor = conn.cursor(buffered=False, dictionary=True)
+    try:
+        cursor.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        try:
+            if getattr(conn, "unread_result", False):
+                conn.consume_results()
+        except MySQLError as e:
+            logger.debug(f"Could not consume unread results: {e}")
+        cursor.close()
+
+
+def concat_frames(frames):
+    """Concatenate chunk frames, merging per-chunk categoricals."""
+    frames = list(frames)
+    if len(frames) == 1:
+        return frames[0]
+
+    first = frames[0]
+    category_columns = [
+        name
+        for name in first.columns
+        if isinstance(first[name].dtype, pd.CategoricalDtype)
+    ]
+    merged = {
+        name: union_categoricals([frame[name] for frame in frames])
+        for name in category_columns
+    }
+    result = pd.concat(
+        [frame.drop(columns=category_columns) for frame in frames], ignore_index=True
+    )
+    for name, values in merged.items():
+        result[name] = values
+    return result[list(first.columns)]
+
+
+def read_frame(
+    conn, query, params=None, chunk_size=DEFAULT_CHUNK_SIZE, categorize_strings=True
+):
+    """Execute ``query`` on ``conn`` and return one typed DataFrame."""
+    return concat_frames(
+        iter_frames(conn, query, params, chunk_size, categorize_strings)
+    )
@@ -6,12 +6,18 @@ by checking for existing transactions with matching ReferenceNumber, Transaction
 """
 
 import logging
+import time
 import traceback
-from datetime import datetime
+from datetime import date, datetime
+
+from mysql.connector import Error as MySQLError
 
 from database import DatabaseManager
+from db_exceptions import DatabaseError
 from dialect_helpers import dialect
 from duplicate_performance_monitor import get_performance_monitor
+from duplicate_query_optimizer import get_query_optimizer
+from log_sink import get_log_sink
 
 # Configure logger for duplicate detection
 logger = logging.getLogger(__name__)
@@ -19,6 +25,44 @@ logger = logging.getLogger(__name__)
 # Get performance monitor for metrics collection
 _performance_monitor = get_performance_monitor()
 
+# Columns needed by format_duplicate_info (avoids SELECT * on mutaties)
+DUPLICATE_COLUMNS = (
+    "ID",
+    "TransactionNumber",
+    "TransactionDate",
+    "TransactionDescription",
+    "TransactionAmount",
+    "Debet",
+    "Credit",
+    "ReferenceNumber",
+    "Ref1",
+    "Ref2",
+    "Ref3",
+    "Ref4",
+    "Administration",
+)
+
+# Upper bound of (ReferenceNumber, TransactionDate, TransactionAmount) tuples
+# per IN list; larger batches are split to keep the statement size bounded.
+MAX_BATCH_CANDIDATES = 1000
+
+
+def _candidate_key(
+    reference_number, transaction_date, transaction_amount
+) -> tuple[str, str, float]:
+    """Normalize a duplicate candidate so DB rows map back to their request.
+
+    ReferenceNumber is compared case-insensitively (MySQL collation), dates as
+    ISO strings and amounts rounded to cents (DECIMAL vs. float).
+    """
+    if isinstance(transaction_date, (date, datetime)):
+        transaction_date = transaction_date.strftime("%Y-%m-%d")
+    return (
+        str(reference_number or "").strip().casefold(),
+        str(transaction_date or "").strip(),
+        round(float(transaction_amount or 0), 2),
+    )
+
 
 class DuplicateDetectionError(Exception):
     """Custom exception for duplicate detection errors."""
@@ -156,6 +200,130 @@ class DuplicateChecker:
             self._log_graceful_degradation(operation_id, "unexpected_error", str(e))
             return []
 
+    def check_for_duplicates_batch(
+        self,
+        candidates: list[tuple[str, str, float]],
+        table_name: str = "mutaties",
+        use_cache: bool = False,
+    ) -> dict[tuple[str, str, float], list[dict]]:
+        """
+        Check many (ReferenceNumber, TransactionDate, TransactionAmount) triples at once.
+
+        Resolves all candidates with a single row-constructor IN query that is
+        served by the idx_duplicate_check composite index, selecting only the
+        columns in DUPLICATE_COLUMNS. Identical candidates are queried once.
+
+        Args:
+            candidates: List of (reference_number, transaction_date, transaction_amount)
+            table_name: The database table to search (default: 'mutaties')
+            use_cache: Serve/store results via the shared QueryCache. Off by
+                default because inserts do not invalidate cached "no duplicate"
+                results.
+
+        Returns:
+            Dict mapping each input triple to its matching records (ID DESC).
+            All lists are empty if a database or connection error occurs
+            (graceful degradation).
+
+        Raises:
+            ValidationError: If any candidate has invalid parameters
+        """
+        operation_id = f"dup_batch_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        start_time = time.time()
+        results = {tuple(candidate): [] for candidate in candidates}
+        error = None
+        cache_hit = False
+
+        try:
+            for reference_number, transaction_date, transaction_amount in results:
+                self._validate_duplicate_check_params(
+                    reference_number, transaction_date, transaction_amount
+                )
+
+            pending = {}
+            cache = get_query_optimizer(self.db).cache if use_cache else None
+            for candidate in results:
+                if cache is not None:
+                    cached = cache.get(*candidate)
+                    if cached is not None:
+                        results[candidate] = cached
+                        cache_hit = True
+                        continue
+                pending.setdefault(_candidate_key(*candidate), []).append(candidate)
+
+            logger.info(
+                f"[{operation_id}] Starting batch duplicate check: "
+                f"{len(results)} candidates, {len(pending)} to query"
+            )
+
+            # One representative (as supplied by the caller) per normalized key
+            unique = [group[0] for group in pending.values()]
+            for offset in range(0, len(unique), MAX_BATCH_CANDIDATES):
+                chunk = unique[offset : offset + MAX_BATCH_CANDIDATES]
+                for row in self._query_duplicate_batch(chunk, table_name):
+                    key = _candidate_key(
+                        row.get("ReferenceNumber"),
+                        row.get("TransactionDate"),
+                        row.get("TransactionAmount"),
+                    )
+                    for candidate in pending.get(key, []):
+                        results[candidate].append(row)
+
+            if cache is not None:
+                for candidates_for_key in pending.values():
+                    for candidate in candidates_for_key:
+                        cache.set(*candidate, results[candidate])
+
+            logger.info(
+                f"[{operation_id}] Batch duplicate check completed: "
+                f"{sum(1 for rows in results.values() if rows)} candidates with matches"
+            )
+            return results
+
+        except ValidationError as ve:
+            error = str(ve)
+            logger.error(
+                f"[{operation_id}] Validation error in batch duplicate check: {ve}"
+            )
+            raise
+
+        except (DatabaseError, MySQLError, DatabaseConnectionError, OSError) as e:
+            error = str(e)
+            logger.error(
+                f"[{operation_id}] Database error in batch duplicate check: "
+                f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+            )
+            error_type = (
+                "database_connection"
+                if self._is_database_connection_error(e)
+                else "unexpected_error"
+            )
+            self._log_graceful_degradation(operation_id, error_type, str(e))
+            return {candidate: [] for candidate in results}
+
+        finally:
+            _performance_monitor.metrics.record_duplicate_check(
+                execution_time=time.time() - start_time,
+                duplicates_found=sum(len(rows) for rows in results.values()),
+                cache_hit=cache_hit,
+                error=error,
+            )
+
+    def _query_duplicate_batch(
+        self, candidates: list[tuple[str, str, float]], table_name: str
+    ) -> list[dict]:
+        """Run one duplicate lookup for a chunk of candidate triples."""
+        columns = ", ".join(DUPLICATE_COLUMNS)
+        tuples = ", ".join(["(%s, %s, %s)"] * len(candidates))
+        query = f"""
+            SELECT {columns} FROM {table_name}
+            WHERE (ReferenceNumber, TransactionDate, TransactionAmount) IN ({tuples})
+            AND TransactionDate > ({dialect.current_date()} - INTERVAL 2 YEAR)
+            ORDER BY ID DESC
+        """
+        params = [value for candidate in candidates for value in candidate]
+        return self.db.execute_query(query, params, fetch=True) or []
+
     def format_duplicate_info(self, duplicates: list[dict]) -> dict:
         """
         Format duplicate information for frontend display.
@@ -282,10 +450,13 @@ class DuplicateChecker:
             """
 
             # Attempt to log with retry logic for transient database issues
+            # (only synchronous writes can fail here; queued rows are retried
+            # by the log sink's flush thread)
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    self.db.execute_query(
+                    get_log_sink().write(
+                        self.db,
                         log_query,
                         (
                             datetime.now(),
@@ -299,8 +470,6 @@ class DuplicateChecker:
                             session_id,
                             operation_id,
                         ),
-                        fetch=False,
-                        commit=True,
                     )
 
                     logger.info(
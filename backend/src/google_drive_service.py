@@ -6,11 +6,21 @@ from dotenv import load_dotenv
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 
+from services.folder_index import CursorExpired, get_folder_index
+from storage.client_registry import (
+    TOKEN_REFRESH_MARGIN_SECONDS,
+    credential_version,
+    expires_within,
+    get_client_registry,
+)
+
 load_dotenv()
 
 SCOPES = ["https://www.googleapis.com/auth/drive"]
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +59,7 @@ class GoogleDriveService:
         """
         self.administration = administration
         self.parameter_service = parameter_service
+        self.db = None  # Set by _authenticate; persists the folder index
         self.service = self._authenticate()
 
     def _authenticate(self):
@@ -72,6 +83,7 @@ class GoogleDriveService:
             # Initialize database and credential service
             db = DatabaseManager()
             credential_service = CredentialService(db)
+            self.db = db
 
             # Retrieve credentials from database
             logger.info(
@@ -94,10 +106,20 @@ class GoogleDriveService:
                 self.administration, "google_drive_token"
             )
 
-            creds = None
+            # Credentials and services are reused until the OAuth client or
+            # refresh token changes; a refreshed access token keeps the version
+            registry = get_client_registry()
+            key = ("google_drive", self.administration)
+            refresh_token = (
+                token_data.get("refresh_token")
+                if isinstance(token_data, dict)
+                else None
+            )
+            version = credential_version(oauth_creds, refresh_token)
+            cached = creds = registry.credentials(key, version)
 
             # If we have a token, try to use it
-            if token_data:
+            if cached is None and token_data:
                 try:
                     # Ensure token_data has client_id and client_secret from oauth_creds
                     if "client_id" not in token_data and "installed" in oauth_creds:
@@ -120,56 +142,33 @@ class GoogleDriveService:
                     logger.warning(f"Failed to load token: {e}")
                     creds = None
 
-            # Check if credentials are valid or need refresh
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    # Refresh the token
-                    logger.info(
-                        f"Refreshing expired token for administration: {self.administration}"
-                    )
-                    try:
-                        creds.refresh(Request())
-
-                        # Store the refreshed token back to database
-                        token_info = json.loads(creds.to_json())
-                        credential_service.store_credential(
-                            self.administration, "google_drive_token", token_info
-                        )
-                        logger.info(
-                            f"✅ Refreshed token stored for administration: {self.administration}"
-                        )
-                    except Exception as refresh_error:
-                        # Token refresh failed - likely the refresh token is invalid/expired
-                        logger.error(
-                            f"❌ Token refresh failed for {self.administration}: {refresh_error}"
-                        )
-                        logger.error(
-                            "⚠️  The refresh token may have expired or been revoked."
-                        )
-
-                        # Provide user-friendly error message
-                        raise GoogleDriveAuthenticationError(
-                            administration=self.administration,
-                            error_type="refresh_token_expired",
-                            message="Google Drive access has expired. Please contact your system administrator to renew access.",
-                            admin_action="Run: python backend/refresh_google_token.py && python scripts/credentials/migrate_credentials_to_db.py --tenant {self.administration}",
-                        )
-                else:
-                    # Need to do OAuth flow
-                    logger.warning(
-                        f"⚠️  No valid token found for administration: {self.administration}"
-                    )
-
-                    # Provide user-friendly error message
-                    raise GoogleDriveAuthenticationError(
-                        administration=self.administration,
-                        error_type="no_token",
-                        message="Google Drive is not configured. Please contact your system administrator to set up Google Drive access.",
-                        admin_action=f"Run: python backend/refresh_google_token.py && python scripts/credentials/migrate_credentials_to_db.py --tenant {self.administration}",
-                    )
-
-            # Build and return the service
-            service = build("drive", "v3", credentials=creds)
+            if not creds:
+                self._raise_no_token()
+
+            # Refresh expired tokens, and tokens about to expire, once per
+            # process: other threads wait for the refresh and then reuse it
+            if expires_within(creds, TOKEN_REFRESH_MARGIN_SECONDS):
+                with registry.refresh_lock(key):
+                    if expires_within(creds, TOKEN_REFRESH_MARGIN_SECONDS):
+                        if creds.refresh_token and (creds.valid or creds.expired):
+                            try:
+                                self._refresh_token(creds, credential_service)
+                            except GoogleDriveAuthenticationError:
+                                if not creds.valid:
+                                    raise
+                                logger.warning(
+                                    f"Using current token for {self.administration} "
+                                    "until it expires"
+                                )
+                        elif not creds.valid:
+                            self._raise_no_token()
+            if cached is None:
+                registry.store_credentials(key, version, creds)
+
+            # Build the service once per thread (httplib2 is not thread-safe)
+            service = registry.per_thread(
+                key, version, lambda: build("drive", "v3", credentials=creds)
+            )
             logger.info(
                 f"Successfully authenticated Google Drive for administration: {self.administration}"
             )
@@ -181,7 +180,50 @@ class GoogleDriveService:
             )
             raise
 
-    def list_subfolders(self):
+    def _refresh_token(self, creds, credential_service):
+        """Refresh the access token and store it back to the database."""
+        logger.info(f"Refreshing token for administration: {self.administration}")
+        try:
+            creds.refresh(Request())
+
+            # Store the refreshed token back to database
+            token_info = json.loads(creds.to_json())
+            credential_service.store_credential(
+                self.administration, "google_drive_token", token_info
+            )
+            logger.info(
+                f"✅ Refreshed token stored for administration: {self.administration}"
+            )
+        except Exception as refresh_error:
+            # Token refresh failed - likely the refresh token is invalid/expired
+            logger.error(
+                f"❌ Token refresh failed for {self.administration}: {refresh_error}"
+            )
+            logger.error("⚠️  The refresh token may have expired or been revoked.")
+
+            # Provide user-friendly error message
+            raise GoogleDriveAuthenticationError(
+                administration=self.administration,
+                error_type="refresh_token_expired",
+                message="Google Drive access has expired. Please contact your system administrator to renew access.",
+                admin_action="Run: python backend/refresh_google_token.py && python scripts/credentials/migrate_credentials_to_db.py --tenant {self.administration}",
+            )
+
+    def _raise_no_token(self):
+        # Need to do OAuth flow
+        logger.warning(
+            f"⚠️  No valid token found for administration: {self.administration}"
+        )
+
+        # Provide user-friendly error message
+        raise GoogleDriveAuthenticationError(
+            administration=self.administration,
+            error_type="no_token",
+            message="Google Drive is not configured. Please contact your system administrator to set up Google Drive access.",
+            admin_action=f"Run: python backend/refresh_google_token.py && python scripts/credentials/migrate_credentials_to_db.py --tenant {self.administration}",
+        )
+
+    def _facturen_folder_id(self):
         # Resolve folder ID from parameter service, then env vars
         facturen_folder_id = None
         if self.parameter_service:
@@ -195,52 +237,24 @@ class GoogleDriveService:
                 if use_test
                 else os.getenv("FACTUREN_FOLDER_ID", "")
             )
+        return facturen_folder_id
 
-        try:
-            all_subfolders = []
-            page_token = None
-            page_count = 0
-
-            while True:
-                page_count += 1
-                print(
-                    f"📄 Fetching page {page_count} from Google Drive (pageToken: {page_token})",
-                    flush=True,
-                )
-
-                results = (
-                    self.service.files()
-                    .list(
-                        q=f"'{facturen_folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false",
-                        fields="nextPageToken, files(id, name, webViewLink)",
-                        pageSize=1000,
-                        pageToken=page_token,
-                    )
-                    .execute()
-                )
-
-                subfolders = results.get("files", [])
-                print(
-                    f"📦 Page {page_count} returned {len(subfolders)} folders",
-                    flush=True,
-                )
+    def _folder_index(self, parent_id):
+        return get_folder_index(
+            "google_drive", self.administration, parent_id, db=self.db
+        )
 
-                for folder in subfolders:
-                    all_subfolders.append(
-                        {
-                            "id": folder["id"],
-                            "name": folder["name"],
-                            "url": folder.get("webViewLink", ""),
-                        }
-                    )
+    def list_subfolders(self, refresh=False):
+        """Subfolders of the Facturen folder, served from the tenant's folder index.
 
-                page_token = results.get("nextPageToken")
-                if not page_token:
-                    print(
-                        f"✅ Pagination complete. Total folders: {len(all_subfolders)}",
-                        flush=True,
-                    )
-                    break
+        The index catches up at most every FOLDER_INDEX_REFRESH_SECONDS; pass
+        refresh=True to catch up first (e.g. after a user created a folder).
+        """
+        facturen_folder_id = self._facturen_folder_id()
+        try:
+            all_subfolders = self._folder_index(facturen_folder_id).folders(
+                DriveFolderSource(self.service, facturen_folder_id), refresh
+            )
 
             # Log if we found duplicate folder names (shouldn't happen but good to know)
             folder_names = [f["name"] for f in all_subfolders]
@@ -257,11 +271,18 @@ class GoogleDriveService:
                     f"Folder details: {[f for f in all_subfolders if f['name'] in duplicates]}"
                 )
 
-            return sorted(all_subfolders, key=lambda x: x["name"].lower())
+            return all_subfolders
         except Exception as e:
             print(f"Could not access Facturen folder: {e}")
             return []
 
+    def find_subfolder(self, name, ignore_case=False):
+        """Facturen subfolder with this name, or None (index lookup, no listing)."""
+        facturen_folder_id = self._facturen_folder_id()
+        return self._folder_index(facturen_folder_id).find(
+            name, DriveFolderSource(self.service, facturen_folder_id), ignore_case
+        )
+
     def upload_file(self, file_path, filename, folder_id):
         media = MediaFileUpload(file_path, resumable=True)
         file_metadata = {"name": filename, "parents": [folder_id]}
@@ -370,8 +391,113 @@ class GoogleDriveService:
             .execute()
         )
 
-        return {
+        created = {
             "id": folder["id"],
             "name": folder["name"],
             "url": folder.get("webViewLink", ""),
         }
+        self._folder_index(parent_id).add(created)
+        return created
+
+
+class DriveFolderSource:
+    """Folder source for FolderIndex: subfolders of one Google Drive folder."""
+
+    CHANGE_FIELDS = (
+        "nextPageToken, newStartPageToken, changes(fileId, removed, "
+        "file(id, name, mimeType, parents, trashed, webViewLink))"
+    )
+
+    def __init__(self, service, parent_id):
+        self.service = service
+        self.parent_id = parent_id
+
+    def list_folders(self):
+        """Full listing, plus the changes-feed token to continue from."""
+        # Taken before listing so folders created meanwhile show up as changes
+        cursor = (
+            self.service.changes().getStartPageToken().execute().get("startPageToken")
+        )
+        all_subfolders = []
+        page_token = None
+        page_count = 0
+
+        while True:
+            page_count += 1
+            print(
+                f"📄 Fetching page {page_count} from Google Drive (pageToken: {page_token})",
+                flush=True,
+            )
+
+            results = (
+                self.service.files()
+                .list(
+                    q=f"'{self.parent_id}' in parents and mimeType='{FOLDER_MIME_TYPE}' and trashed=false",
+                    fields="nextPageToken, files(id, name, webViewLink)",
+                    pageSize=1000,
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+
+            subfolders = results.get("files", [])
+            print(
+                f"📦 Page {page_count} returned {len(subfolders)} folders",
+                flush=True,
+            )
+            all_subfolders.extend(_folder_entry(folder) for folder in subfolders)
+
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                print(
+                    f"✅ Pagination complete. Total folders: {len(all_subfolders)}",
+                    flush=True,
+                )
+                return all_subfolders, cursor
+
+    def list_changes(self, cursor):
+        """Folders added/renamed and ids removed under the parent since cursor."""
+        changed, removed = [], []
+        page_token = cursor
+        while True:
+            try:
+                results = (
+                    self.service.changes()
+                    .list(
+                        pageToken=page_token,
+                        spaces="drive",
+                        includeRemoved=True,
+                        pageSize=1000,
+                        fields=self.CHANGE_FIELDS,
+                    )
+                    .execute()
+                )
+            except HttpError as e:
+                if e.resp.status in (400, 404, 410):
+                    raise CursorExpired(str(e)) from e
+                raise
+
+            for change in results.get("changes", []):
+                file = change.get("file") or {}
+                if (
+                    not change.get("removed")
+                    and not file.get("trashed")
+                    and file.get("mimeType") == FOLDER_MIME_TYPE
+                    and self.parent_id in file.get("parents", [])
+                ):
+                    changed.append(_folder_entry(file))
+                else:
+                    # Deleted, trashed, moved away or not a folder: drop if indexed
+                    removed.append(change["fileId"])
+
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return changed, removed, results.get("newStartPageToken", cursor)
+
+
+def _folder_entry(folder):
+    return {
+        "id": folder["id"],
+        "name": folder["name"],
+        "url": folder.get("webViewLink", ""),
+    }
@@ -66,6 +66,23 @@ def on_reload(server):
 def worker_int(worker):
     """Called just after a worker exited on SIGINT or SIGQUIT."""
     worker.log.info("🔄 Worker interrupted, scalability manager will handle gracefully")
+    _flush_log_sink(worker)
+
+
+def worker_exit(server, worker):
+    """Called just after a worker has been exited (graceful shutdown, restarts)."""
+    _flush_log_sink(worker)
+
+
+def _flush_log_sink(worker):
+    # Write queued audit / AI-usage / email log rows before the worker goes away;
+    # log_sink.SHUTDOWN_TIMEOUT stays well below graceful_timeout
+    from log_sink import get_log_sink, stop_log_sink
+
+    pending = get_log_sink().stats()["pending"]
+    stop_log_sink()
+    if pending:
+        worker.log.info(f"📝 Flushed {pending} queued log rows")
 
 
 def on_exit(server):
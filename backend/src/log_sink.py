@@ -0,0 +1,308 @@
+"""
+Asynchronous batched writer for audit and usage log rows
+
+Audit trails (duplicate_decision_log), AI usage (ai_usage_log) and email
+delivery logs (email_log) used to be written with one INSERT + COMMIT on
+the request thread. LogSink takes those writes off the request path:
+
+- write() puts the statement on a bounded in-process queue and returns.
+- A background thread drains the queue every FLUSH_INTERVAL_MS or as soon
+  as BATCH_SIZE records are waiting, and writes them per DatabaseManager
+  with execute_batch_queries(), so rows for the same table become one
+  multi-row INSERT in one transaction.
+- Backpressure: when the queue is full, write() waits up to
+  ENQUEUE_TIMEOUT_MS for space and then writes the row synchronously.
+- A batch that fails is retried row by row so one bad row cannot drop
+  the others; rows that still fail are logged and counted as dropped.
+- stop() drains what is queued; it runs at interpreter exit and from the
+  gunicorn worker_int / worker_exit hooks (within graceful_timeout).
+
+The sink only queues once start_log_sink() has been called (wsgi.py and
+the development server do this). Until then, and when ASYNC_LOG_WRITES is
+false, write() is a plain synchronous execute_query(commit=True), which is
+what scripts and tests get. After a fork the sink restarts its thread in
+the child on first use.
+
+Usage:
+    from log_sink import get_log_sink
+
+    get_log_sink().write(db, "INSERT INTO ai_usage_log (...) VALUES (...)", params)
+"""
+
+import atexit
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any
+
+from mysql.connector import Error as MySQLError
+
+from db_exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+ASYNC_LOG_WRITES = os.getenv("ASYNC_LOG_WRITES", "true").lower() == "true"
+QUEUE_SIZE = int(os.getenv("LOG_SINK_QUEUE_SIZE", "10000"))
+BATCH_SIZE = int(os.getenv("LOG_SINK_BATCH_SIZE", "200"))
+FLUSH_INTERVAL_MS = int(os.getenv("LOG_SINK_FLUSH_INTERVAL_MS", "250"))
+ENQUEUE_TIMEOUT_MS = int(os.getenv("LOG_SINK_ENQUEUE_TIMEOUT_MS", "50"))
+SHUTDOWN_TIMEOUT = 10.0  # Seconds; must stay below gunicorn's graceful_timeout
+
+_TABLE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|UPDATE)\s+`?(\w+)", re.IGNORECASE
+)
+# Failures that drop a row; execute_query reports FK violations as ValueError
+_WRITE_ERRORS = (DatabaseError, MySQLError, ValueError)
+
+
+class _Record:
+    __slots__ = ("db", "params", "query", "table")
+
+    def __init__(self, db, query: str, params):
+        self.db = db
+        self.query = query
+        self.params = params
+        match = _TABLE.match(query)
+        self.table = match.group(1).lower() if match else ""
+
+
+_WAKE = object()  # Queued by stop() so a waiting flush thread notices at once
+
+
+class LogSink:
+    """Bounded queue of log statements flushed in batches by a worker thread."""
+
+    def __init__(
+        self,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL_MS / 1000,
+        enqueue_timeout: float = ENQUEUE_TIMEOUT_MS / 1000,
+    ):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._enabled = False
+        self._stats = {
+            "queued": 0,
+            "written": 0,
+            "batches": 0,
+            "sync_fallbacks": 0,
+            "row_retries": 0,
+            "dropped": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Queue writes from now on and start the flush thread."""
+        with self._lock:
+            self._enabled = True
+            self._ensure_thread()
+
+    def _ensure_thread(self) -> None:
+        # Caller holds self._lock
+        pid = os.getpid()
+        if self._pid != pid:
+            # Forked child: the parent's thread and queued rows do not exist here
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._thread = None
+            self._pid = pid
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="log-sink", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Flush everything queued, then stop; later writes are synchronous."""
+        with self._lock:
+            self._enabled = False
+            thread = self._thread if self._pid == os.getpid() else None
+            self._stop.set()
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass  # The thread is busy writing and sees _stop afterwards
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(
+                    f"Log sink did not drain within {timeout}s; "
+                    f"{self._queue.qsize()} rows still queued"
+                )
+                return
+        # Rows enqueued while the thread was exiting
+        self._drain()
+
+    @property
+    def running(self) -> bool:
+        return self._enabled and self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(self, db, query: str, params=None) -> Any:
+        """Queue a log statement, or execute it now when the sink is not running.
+
+        Returns None when the row was queued, otherwise execute_query()'s
+        result (last row id or row count). Synchronous writes raise like
+        execute_query() does, so callers keep their error handling.
+        """
+        if self._enabled:
+            with self._lock:
+                if self._enabled:
+                    self._ensure_thread()
+            try:
+                record = _Record(db, query, params)
+                self._queue.put(record, timeout=self.enqueue_timeout)
+                self._count("queued")
+                return None
+            except queue.Full:
+                self._count("sync_fallbacks")
+                logger.warning("Log sink queue full, writing log row synchronously")
+        return db.execute_query(query, params, fetch=False, commit=True)
+
+    def flush(self, timeout: float = SHUTDOWN_TIMEOUT) -> bool:
+        """Block until every row queued so far has been written (or dropped)."""
+        if not self.running:
+            self._drain()
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "pending": self._queue.qsize(),
+                "running": self.running,
+            }
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    # ------------------------------------------------------------------
+    # Flush thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._collect()
+            if batch:
+                self._write_batch(batch)
+        self._drain()
+
+    def _collect(self) -> list:
+        """Wait for the first item, then gather more until full or the interval ends."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        # A flush() event or stop()'s wake-up marker ends the batch early
+        while len(batch) < self.batch_size and isinstance(batch[-1], _Record):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self) -> None:
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: list) -> None:
+        records = [item for item in batch if isinstance(item, _Record)]
+        by_db: dict[int, list[_Record]] = {}
+        for record in records:
+            by_db.setdefault(id(record.db), []).append(record)
+        try:
+            for group in by_db.values():
+                # Stable sort keeps each table's INSERT/UPDATE order intact
+                group.sort(key=lambda record: record.table)
+                self._write_group(group)
+        finally:
+            # Release flush() callers even if an unexpected error escapes
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_group(self, records: list[_Record]) -> None:
+        db = records[0].db
+        try:
+            db.execute_batch_queries([(r.query, r.params) for r in records])
+            self._count("written", len(records))
+            self._count("batches")
+            return
+        except _WRITE_ERRORS as e:
+            if len(records) == 1:
+                self._drop(records[0], e)
+                return
+            logger.warning(
+                f"Log sink batch of {len(records)} rows failed ({e}); "
+                "retrying row by row"
+            )
+        for record in records:
+            self._count("row_retries")
+            try:
+                db.execute_query(record.query, record.params, fetch=False, commit=True)
+                self._count("written")
+            except _WRITE_ERRORS as e:
+                self._drop(record, e)
+
+    def _drop(self, record: _Record, error: Exception) -> None:
+        self._count("dropped")
+        logger.error(f"Log sink dropped a {record.table or 'log'} row: {error}")
+
+
+_sink = LogSink()
+
+
+def get_log_sink() -> LogSink:
+    return _sink
+
+
+def start_log_sink() -> bool:
+    """Start queued log writes for this process (unless ASYNC_LOG_WRITES=false)."""
+    if not ASYNC_LOG_WRITES:
+        logger.info("Async log writes disabled; audit and usage logs are synchronous")
+        return False
+    _sink.start()
+    atexit.unregister(stop_log_sink)
+    atexit.register(stop_log_sink)
+    return True
+
+
+def stop_log_sink(timeout: float = SHUTDOWN_TIMEOUT) -> None:
+    """Flush queued log rows and stop the flush thread (graceful shutdown)."""
+    _sink.stop(timeout)
@@ -17,6 +17,12 @@ from threading import Lock
 
 import pandas as pd
 
+from cache_dtypes import (
+    DEFAULT_MEMORY_BUDGET_MB,
+    DEFAULT_TENANT_MEMORY_BUDGET_MB,
+    evict_to_budget,
+    frame_memory_bytes,
+)
 from mutaties_cache_loader import MutatisCacheLoaderMixin
 from mutaties_cache_models import TenantCacheEntry
 from mutaties_cache_queries import MutatisCacheQueriesMixin
@@ -29,7 +35,10 @@ class MutatiesCache(MutatisCacheLoaderMixin, MutatisCacheQueriesMixin):
     Thread-safe in-memory cache for vw_mutaties data, partitioned by tenant.
 
     Each tenant's data is stored independently with its own TTL tracking.
-    Inactive tenants (not accessed for 2× TTL) are evicted to save memory.
+    Inactive tenants (not accessed for 2× TTL) are evicted to save memory,
+    and least recently used tenants are evicted when the combined frames
+    exceed the memory budget. Frames use the compact dtype layout from
+    cache_dtypes.MUTATIES_SCHEMA.
 
     Thread safety model:
     - Global lock protects all writes to _tenant_data
@@ -37,15 +46,24 @@ class MutatiesCache(MutatisCacheLoaderMixin, MutatisCacheQueriesMixin):
     - Filtering operations (df[mask]) always return new DataFrames, never mutate
     """
 
-    def __init__(self, ttl_minutes=30):
+    def __init__(
+        self,
+        ttl_minutes=30,
+        memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+        tenant_memory_budget_mb=DEFAULT_TENANT_MEMORY_BUDGET_MB,
+    ):
         """
         Initialize the cache.
 
         Args:
             ttl_minutes: Time to live in minutes before auto-refresh (default: 30)
+            memory_budget_mb: Combined size of all tenant frames before LRU eviction
+            tenant_memory_budget_mb: Size above which a single tenant is logged
         """
         self._tenant_data: dict[str, TenantCacheEntry] = {}
         self.ttl = timedelta(minutes=ttl_minutes)
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self.tenant_memory_budget_bytes = tenant_memory_budget_mb * 1024 * 1024
         self.lock = Lock()
         self._loading = False
 
@@ -209,6 +227,25 @@ class MutatiesCache(MutatisCacheLoaderMixin, MutatisCacheQueriesMixin):
                                 f"({rows:,} rows, last accessed: {entry.last_accessed})"
                             )
 
+    def _account_memory(self, tenant):
+        """Record a tenant's frame size and enforce the memory budget.
+
+        Must be called with ``self.lock`` held, after the entry was stored.
+        """
+        entry = self._tenant_data.get(tenant)
+        if entry is None:
+            return
+        entry.memory_bytes = frame_memory_bytes(entry.data)
+        if entry.memory_bytes > self.tenant_memory_budget_bytes:
+            logger.warning(
+                f"Tenant '{tenant}' cache uses {entry.memory_bytes / 1024 / 1024:.1f} MB, "
+                f"above the per-tenant budget of "
+                f"{self.tenant_memory_budget_bytes / 1024 / 1024:.0f} MB"
+            )
+        evict_to_budget(
+            self._tenant_data, self.memory_budget_bytes, keep=tenant, label="mutaties"
+        )
+
     def invalidate(self, tenant=None):
         """
         Force cache refresh on next request.
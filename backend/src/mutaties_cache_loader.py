@@ -10,30 +10,23 @@ Contains all database interaction for cache population:
 """
 
 import logging
-import warnings
 from datetime import datetime
 
 import pandas as pd
 
+from cache_dtypes import MUTATIES_SCHEMA, compact_frame
+from db_stream import read_frame
+
 logger = logging.getLogger(__name__)
 
 
 def _read_sql_safe(query, conn, params=None):
-    """Wrapper around pd.read_sql that suppresses the SQLAlchemy connection warning.
+    """Stream a cache query into a typed DataFrame.
 
-    We use mysql-connector-python directly via DatabaseManager — switching to
-    SQLAlchemy is not warranted for read-only cache loading.
+    Reads through an unbuffered cursor in chunks (see db_stream) instead of
+    pd.read_sql, which buffers the whole result as Python rows first.
     """
-    with warnings.catch_warnings():
-        warnings.filterwarnings(
-            "ignore",
-            message="pandas only supports SQLAlchemy connectable",
-            category=UserWarning,
-        )
-        return pd.read_sql(query, conn, params=params)
-
-
-logger = logging.getLogger(__name__)
+    return read_frame(conn, query, params, categorize_strings=False)
 
 
 class MutatisCacheLoaderMixin:
@@ -170,6 +163,7 @@ class MutatisCacheLoaderMixin:
             # Convert date column
             if "TransactionDate" in data.columns:
                 data["TransactionDate"] = pd.to_datetime(data["TransactionDate"])
+            compact_frame(data, MUTATIES_SCHEMA)
 
             now = datetime.now()
             self._tenant_data[tenant] = TenantCacheEntry(
@@ -178,6 +172,7 @@ class MutatisCacheLoaderMixin:
                 last_loaded=now,
                 years_loaded=years_to_load if years_to_load else set(),
             )
+            self._account_memory(tenant)
 
             load_time = (datetime.now() - start_time).total_seconds()
             logger.info(
@@ -237,6 +232,7 @@ class MutatisCacheLoaderMixin:
 
             if "TransactionDate" in data.columns:
                 data["TransactionDate"] = pd.to_datetime(data["TransactionDate"])
+            compact_frame(data, MUTATIES_SCHEMA)
 
             # Split by tenant into individual entries
             now = datetime.now()
@@ -254,6 +250,7 @@ class MutatisCacheLoaderMixin:
                         last_loaded=now,
                         years_loaded=tenant_years,
                     )
+                    self._account_memory(admin)
 
             load_time = (datetime.now() - start_time).total_seconds()
             logger.info(
@@ -332,8 +329,12 @@ class MutatisCacheLoaderMixin:
                         new_data["TransactionDate"] = pd.to_datetime(
                             new_data["TransactionDate"]
                         )
-                    entry.data = pd.concat([entry.data, new_data], ignore_index=True)
+                    entry.data = compact_frame(
+                        pd.concat([entry.data, new_data], ignore_index=True),
+                        MUTATIES_SCHEMA,
+                    )
                     entry.years_loaded.update(missing_years)
+                    self._account_memory(tenant)
                     logger.info(
                         f"Loaded {len(new_data):,} rows for tenant '{tenant}' "
                         f"years {sorted(missing_years)}. "
@@ -407,17 +408,19 @@ class MutatisCacheLoaderMixin:
                         ].copy()
                         if admin in self._tenant_data:
                             entry = self._tenant_data[admin]
-                            entry.data = pd.concat(
-                                [entry.data, tenant_df], ignore_index=True
+                            entry.data = compact_frame(
+                                pd.concat([entry.data, tenant_df], ignore_index=True),
+                                MUTATIES_SCHEMA,
                             )
                             entry.years_loaded.add(int(year))
                         else:
                             self._tenant_data[admin] = TenantCacheEntry(
-                                data=tenant_df,
+                                data=compact_frame(tenant_df, MUTATIES_SCHEMA),
                                 last_accessed=now,
                                 last_loaded=now,
                                 years_loaded={int(year)},
                             )
+                        self._account_memory(admin)
 
                 return True
             except Exception as e:
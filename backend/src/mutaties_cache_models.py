@@ -18,3 +18,4 @@ class TenantCacheEntry:
     last_accessed: datetime
     last_loaded: datetime
     years_loaded: set[int] = field(default_factory=set)
+    memory_bytes: int = 0
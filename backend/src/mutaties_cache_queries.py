@@ -95,7 +95,11 @@ class MutatisCacheQueriesMixin:
             df = df[df["administration"] == administration]
 
         # Group by Parent and Aangifte
-        summary = df.groupby(["Parent", "Aangifte"])["Amount"].sum().reset_index()
+        summary = (
+            df.groupby(["Parent", "Aangifte"], observed=True)["Amount"]
+            .sum()
+            .reset_index()
+        )
         summary.columns = ["Parent", "Aangifte", "Amount"]
         summary = summary.sort_values(["Parent", "Aangifte"], ascending=[True, True])
 
@@ -167,7 +171,11 @@ class MutatisCacheQueriesMixin:
         df = df[(df["Parent"] == parent) & (df["Aangifte"] == aangifte)]
 
         # Group by account
-        details = df.groupby(["Reknum", "AccountName"])["Amount"].sum().reset_index()
+        details = (
+            df.groupby(["Reknum", "AccountName"], observed=True)["Amount"]
+            .sum()
+            .reset_index()
+        )
         details.columns = ["Reknum", "AccountName", "Amount"]
 
         return details.to_dict("records")
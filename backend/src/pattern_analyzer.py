@@ -24,6 +24,7 @@ from pattern_detection import (
     analyze_credit_patterns,
     analyze_debet_patterns,
     analyze_reference_patterns,
+    analyze_transaction_patterns,
     extract_company_name,
     extract_compound_verb_from_description,
     extract_keywords,
@@ -121,14 +122,78 @@ class PatternAnalyzer:
 
         # Get transactions from last 1 year with optional filtering
         one_year_ago = datetime.now() - timedelta(days=365)
+        query, query_params = self.build_history_query(
+            administration,
+            one_year_ago,
+            reference_number,
+            debet_account,
+            credit_account,
+        )
+
+        transactions = self.db.execute_query(query, query_params)
 
-        # Build dynamic query with filters
+        if not transactions:
+            return {
+                "total_transactions": 0,
+                "patterns_discovered": 0,
+                "debet_patterns": {},
+                "credit_patterns": {},
+                "reference_patterns": {},
+                "statistics": {},
+            }
+
+        print(f"📊 Processing {len(transactions)} transactions from last 1 year...")
+
+        # Analyze patterns in one pass (delegated to pattern_detection module)
+        patterns = analyze_transaction_patterns(
+            transactions, administration, self.is_bank_account
+        )
+        debet_patterns = patterns["debet"]
+        credit_patterns = patterns["credit"]
+        reference_patterns_result = patterns["reference"]
+
+        # Generate statistics (delegated to pattern_scoring module)
+        statistics = generate_pattern_statistics(
+            transactions,
+            debet_patterns,
+            credit_patterns,
+            reference_patterns_result,
+            self.is_bank_account,
+        )
+
+        result = self.build_analysis_result(
+            len(transactions), patterns, statistics, one_year_ago
+        )
+
+        if not reference_number and not debet_account and not credit_account:
+            self.save_full_analysis(administration, result)
+        else:
+            # Cache the results with filter-specific key for backward compatibility
+            cache_key = build_cache_key(
+                administration, reference_number, debet_account, credit_account
+            )
+            self.patterns_cache[cache_key] = result
+
+        print(
+            f"✅ Pattern analysis complete: {result['patterns_discovered']} patterns discovered"
+        )
+        return result
+
+    def build_history_query(
+        self,
+        administration: str,
+        since: datetime,
+        reference_number: str | None = None,
+        debet_account: str | None = None,
+        credit_account: str | None = None,
+    ) -> tuple[str, tuple]:
+        """Build the transaction query used for historical pattern analysis"""
         query_conditions = [
             "administration = %s",
             "TransactionDate >= %s",
             "(Debet IS NOT NULL OR Credit IS NOT NULL)",
         ]
-        query_params = [administration, one_year_ago.strftime("%Y-%m-%d")]
+        query_params = [administration, since.strftime("%Y-%m-%d")]
 
         # Add optional filters per REQ-PAT-002
         if reference_number:
@@ -150,81 +215,42 @@ class PatternAnalyzer:
             WHERE {" AND ".join(query_conditions)}
             ORDER BY TransactionDate DESC
         """
+        return query, tuple(query_params)
 
-        transactions = self.db.execute_query(query, tuple(query_params))
-
-        if not transactions:
-            return {
-                "total_transactions": 0,
-                "patterns_discovered": 0,
-                "debet_patterns": {},
-                "credit_patterns": {},
-                "reference_patterns": {},
-                "statistics": {},
-            }
-
-        print(f"📊 Processing {len(transactions)} transactions from last 1 year...")
-
-        # Analyze patterns (delegated to pattern_detection module)
-        debet_patterns = analyze_debet_patterns(
-            transactions, administration, self.is_bank_account
-        )
-        credit_patterns = analyze_credit_patterns(
-            transactions, administration, self.is_bank_account
-        )
-        reference_patterns_result = analyze_reference_patterns(
-            transactions, administration, self.is_bank_account
-        )
-
-        # Generate statistics (delegated to pattern_scoring module)
-        statistics = generate_pattern_statistics(
-            transactions,
-            debet_patterns,
-            credit_patterns,
-            reference_patterns_result,
-            self.is_bank_account,
-        )
-
-        result = {
-            "total_transactions": len(transactions),
-            "patterns_discovered": len(debet_patterns)
-            + len(credit_patterns)
-            + len(reference_patterns_result),
-            "debet_patterns": debet_patterns,
-            "credit_patterns": credit_patterns,
-            "reference_patterns": reference_patterns_result,
+    def build_analysis_result(
+        self,
+        total_transactions: int,
+        patterns: dict[str, dict],
+        statistics: dict[str, Any],
+        since: datetime,
+    ) -> dict[str, Any]:
+        """Assemble the analysis result from analyze_transaction_patterns output"""
+        return {
+            "total_transactions": total_transactions,
+            "patterns_discovered": sum(len(p) for p in patterns.values()),
+            "debet_patterns": patterns["debet"],
+            "credit_patterns": patterns["credit"],
+            "reference_patterns": patterns["reference"],
             "statistics": statistics,
             "analysis_date": datetime.now().isoformat(),
             "date_range": {
-                "from": one_year_ago.strftime("%Y-%m-%d"),
+                "from": since.strftime("%Y-%m-%d"),
                 "to": datetime.now().strftime("%Y-%m-%d"),
             },
         }
 
-        # Store patterns in database for persistent storage (REQ-PAT-005)
+    def save_full_analysis(self, administration: str, result: dict[str, Any]):
+        """Persist an unfiltered analysis result (REQ-PAT-005)"""
         # Guard: only store if patterns were actually discovered (avoid overwriting good data with nothing)
-        if (
-            not reference_number
-            and not debet_account
-            and not credit_account
-            and len(reference_patterns_result) > 0
-        ):
+        if len(result["reference_patterns"]) > 0:
             store_verb_patterns_to_database(
-                self.db, administration, reference_patterns_result, result
+                self.db, administration, result["reference_patterns"], result
             )
             # Invalidate persistent cache since we have new patterns
             self.persistent_cache.invalidate_cache(administration)
 
-        # Cache the results with filter-specific key for backward compatibility
-        cache_key = build_cache_key(
-            administration, reference_number, debet_account, credit_account
-        )
-        self.patterns_cache[cache_key] = result
-
-        print(
-            f"✅ Pattern analysis complete: {result['patterns_discovered']} patterns discovered"
-        )
-        return result
+        # Cache the results for backward compatibility
+        self.patterns_cache[build_cache_key(administration)] = result
 
     def apply_patterns_to_transactions(
         self, transactions: list[dict], administration: str
@@ -0,0 +1,341 @@
+"""
+Batch pattern analysis across administrations
+
+Pattern analysis is pure-Python regex and dict aggregation, so analyzing
+tenants one at a time on a request thread is CPU-bound and GIL-limited.
+This job spreads the work over a process pool:
+
+- Each tenant's transactions are streamed from the database in chunks
+  (unbuffered cursor), so no tenant's full history is held in memory.
+- Every chunk is analyzed in a worker process into PatternCounters.
+- The parent merges the chunk counters in query order (the result equals a
+  single pass), finalizes them and stores the patterns as a full analysis.
+
+Refreshing all tenants therefore scales with the process pool size
+(ScalabilityConfig.process_pool_size, PROCESS_POOL_SIZE in the environment).
+Every gunicorn worker owns its own pool, so the default stays small.
+Progress and timing are reported per tenant.
+
+Usage:
+    from pattern_batch import PatternBatchAnalyzer
+
+    reports = PatternBatchAnalyzer().run()                # all tenants
+    reports = PatternBatchAnalyzer().run(["TenantA"])     # selected tenants
+
+    python pattern_batch.py [--test] [administration ...]
+
+    POST /api/patterns/analyze-all (SysAdmin) runs it from the API.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from mysql.connector import Error as MySQLError
+
+from database import DatabaseManager
+from db_exceptions import DatabaseError
+from db_stream import DEFAULT_CHUNK_SIZE
+from pattern_analyzer import PatternAnalyzer
+from pattern_detection import PatternCounters
+from pattern_scoring import generate_pattern_statistics
+from scalability_manager import ScalabilityConfig
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DAYS = 365  # Same window as PatternAnalyzer.analyze_historical_patterns
+
+# Errors that fail a single tenant without stopping the batch: database
+# failures, a broken worker pool, and bad rows raised back from a worker
+TENANT_ERRORS = (
+    DatabaseError,
+    MySQLError,
+    BrokenProcessPool,
+    OSError,
+    KeyError,
+    TypeError,
+    ValueError,
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class TenantAnalysisReport:
+    """Progress and timing for one administration in a batch run."""
+
+    administration: str
+    status: str = "pending"  # pending | running | done | failed
+    transactions: int = 0
+    chunks: int = 0
+    patterns_discovered: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def analyze_pattern_chunk(
+    transactions: list[dict], administration: str, bank_account_keys: frozenset
+) -> tuple[PatternCounters, dict[str, dict[str, int]]]:
+    """
+    Analyze one chunk of transactions (runs in a worker process)
+
+    Args:
+        transactions: Chunk of transaction rows, in query order
+        administration: The administration the rows belong to
+        bank_account_keys: Lowercased "<administration>_<account>" keys of
+            bank accounts, as built by PatternAnalyzer.get_bank_accounts()
+
+    Returns:
+        (counters, counts) where counts holds the additive statistics
+    """
+
+    def is_bank_account(account_number, admin):
+        return bool(account_number) and (
+            f"{admin}_{account_number}".lower() in bank_account_keys
+        )
+
+    counters = PatternCounters(administration).add(transactions, is_bank_account)
+    statistics = generate_pattern_statistics(transactions, {}, {}, {}, is_bank_account)
+    counts = {
+        "missing_fields": statistics["missing_fields"],
+        "bank_account_transactions": statistics["bank_account_transactions"],
+    }
+    return counters, counts
+
+
+def _merge_counts(total: dict, counts: dict) -> None:
+    for section, values in counts.items():
+        target = total.setdefault(section, {})
+        for name, value in values.items():
+            target[name] = target.get(name, 0) + value
+
+
+def _local_submit(func: Callable, *args) -> Future:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=ScalabilityConfig().process_pool_size
+                )
+    return _executor.submit(func, *args)
+
+
+def _default_submit() -> Callable[..., Future]:
+    """Submit to the scalability manager's process pool when it is running"""
+    manager = DatabaseManager._scalability_manager
+    if manager is not None:
+        return manager.async_manager.submit_process_task
+    return _local_submit
+
+
+class _TenantJob:
+    """One tenant's chunk futures, merged into its counters in query order"""
+
+    def __init__(self, report: TenantAnalysisReport, started: float):
+        self.report = report
+        self.started = started
+        self.futures: deque[Future] = deque()
+        self.counters = PatternCounters(report.administration)
+        self.counts: dict[str, dict[str, int]] = {}
+
+    def merge(self, block: bool = False) -> bool:
+        """
+        Merge finished chunks from the front and drop their futures
+
+        Returns True when every submitted chunk has been merged.
+        """
+        while self.futures and (block or self.futures[0].done()):
+            chunk_counters, chunk_counts = self.futures.popleft().result()
+            self.counters.merge(chunk_counters)
+            _merge_counts(self.counts, chunk_counts)
+        return not self.futures
+
+
+class PatternBatchAnalyzer:
+    """Full pattern analysis for many administrations on a process pool"""
+
+    def __init__(
+        self,
+        analyzer: PatternAnalyzer | None = None,
+        submit: Callable[..., Future] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_pending_chunks: int | None = None,
+    ):
+        """
+        Args:
+            analyzer: PatternAnalyzer used for DB access, bank accounts and storage
+            submit: Callable(func, *args) -> Future running func in a worker
+                process; defaults to AsyncProcessingManager.submit_process_task
+            chunk_size: Transactions per chunk sent to a worker
+            max_pending_chunks: Chunks in flight before streaming waits
+                (bounds memory); defaults to twice the process pool size
+        """
+        self.analyzer = analyzer or PatternAnalyzer()
+        self.submit = submit or _default_submit()
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = (
+            max_pending_chunks or 2 * ScalabilityConfig().process_pool_size
+        )
+
+    def list_administrations(self) -> list[str]:
+        rows = self.analyzer.db.execute_query(
+            "SELECT administration FROM tenants ORDER BY administration"
+        )
+        return [row["administration"] for row in rows or []]
+
+    def _bank_account_keys(self, administration: str) -> frozenset:
+        prefix = f"{administration}_".lower()
+        return frozenset(
+            key for key in self.analyzer.get_bank_accounts() if key.startswith(prefix)
+        )
+
+    def run(
+        self,
+        administrations: Iterable[str] | None = None,
+        on_progress: Callable[[TenantAnalysisReport], None] | None = None,
+    ) -> dict[str, TenantAnalysisReport]:
+        """
+        Analyze and store patterns for the given administrations (default: all)
+
+        Chunks are analyzed concurrently while the next tenant streams.
+        Finished chunk results are merged into their tenant's counters in
+        query order and released; a tenant is stored as soon as all of its
+        chunks are merged, and at most one earlier tenant is left waiting for
+        its chunks, so memory stays bounded regardless of the number of
+        tenants. on_progress is called whenever a tenant's report changes
+        status.
+        """
+        if administrations is None:
+            administrations = self.list_administrations()
+        since = datetime.now() - timedelta(days=HISTORY_DAYS)
+        started = time.time()
+
+        reports = {}
+        jobs: deque[_TenantJob] = deque()
+        pending: set[Future] = set()
+
+        def notify(report):
+            if on_progress:
+                on_progress(report)
+
+        def finish(job):
+            try:
+                job.merge(block=True)
+                self._complete(job, since)
+            except TENANT_ERRORS as e:
+                self._fail(job.report, e, job.started)
+            else:
+                report = job.report
+                report.status = "done"
+                report.seconds = round(time.time() - job.started, 3)
+                logger.info(
+                    f"✅ Patterns for {report.administration}: "
+                    f"{report.patterns_discovered} patterns from "
+                    f"{report.transactions} transactions in {report.chunks} "
+                    f"chunks ({report.seconds:.2f}s)"
+                )
+            notify(job.report)
+
+        def finish_ready():
+            while jobs and jobs[0].merge():
+                finish(jobs.popleft())
+
+        for administration in administrations:
+            report = reports[administration] = TenantAnalysisReport(administration)
+            report.status = "running"
+            notify(report)
+            job = _TenantJob(report, time.time())
+            try:
+                bank_account_keys = self._bank_account_keys(administration)
+                query, params = self.analyzer.build_history_query(administration, since)
+                for chunk in self.analyzer.db.stream_rows(
+                    query, params, chunk_size=self.chunk_size
+                ):
+                    while len(pending) >= self.max_pending_chunks:
+                        _done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    future = self.submit(
+                        analyze_pattern_chunk, chunk, administration, bank_account_keys
+                    )
+                    job.futures.append(future)
+                    pending.add(future)
+                    report.chunks += 1
+                    report.transactions += len(chunk)
+                    job.merge()
+            except TENANT_ERRORS as e:
+                job.futures.clear()
+                self._fail(report, e, job.started)
+                notify(report)
+                continue
+            jobs.append(job)
+
+            # Store tenants whose chunks are all merged, then wait for all
+            # but the latest so earlier tenants do not accumulate
+            finish_ready()
+            while len(jobs) > 1:
+                finish(jobs.popleft())
+
+        while jobs:
+            finish(jobs.popleft())
+
+        done = sum(1 for r in reports.values() if r.status == "done")
+        logger.info(
+            f"📊 Batch pattern analysis: {done}/{len(reports)} administrations "
+            f"in {time.time() - started:.2f}s"
+        )
+        return reports
+
+    def _complete(self, job, since) -> None:
+        counters = job.counters
+        if not counters.transactions:
+            return  # Nothing to analyze; keep the stored patterns
+
+        patterns = counters.finalize()
+        statistics = generate_pattern_statistics(
+            [], patterns["debet"], patterns["credit"], patterns["reference"], None
+        )
+        statistics.update(job.counts)
+        statistics["total_transactions"] = counters.transactions
+
+        result = self.analyzer.build_analysis_result(
+            counters.transactions, patterns, statistics, since
+        )
+        self.analyzer.save_full_analysis(job.report.administration, result)
+        job.report.patterns_discovered = result["patterns_discovered"]
+
+    @staticmethod
+    def _fail(report, error, tenant_start) -> None:
+        report.status = "failed"
+        report.error = str(error)
+        report.seconds = round(time.time() - tenant_start, 3)
+        logger.error(f"❌ Pattern analysis failed for {report.administration}: {error}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    test_mode = "--test" in sys.argv
+    selected = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    print(f"Running in {'TEST' if test_mode else 'PRODUCTION'} mode")
+    batch = PatternBatchAnalyzer(PatternAnalyzer(test_mode=test_mode))
+    results = batch.run(
+        selected or None,
+        on_progress=lambda r: print(
+            f"{r.administration}: {r.status} "
+            f"({r.transactions} transactions, {r.seconds:.2f}s)"
+        ),
+    )
+    failed = [a for a, r in results.items() if r.status == "failed"]
+    sys.exit(1 if failed else 0)
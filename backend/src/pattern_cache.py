@@ -12,7 +12,6 @@ REQ-PAT-006: Implement pattern caching for performance
 - Persistent Pattern Cache: Pattern cache survives application restarts and is shared between instances
 """
 
-import json
 import logging
 import threading
 import time
@@ -20,10 +19,14 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from pattern_file_store import ShardedFileStore
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CACHE_TTL_HOURS = 24
+
 
 class PersistentPatternCache:
     """
@@ -32,7 +35,7 @@ class PersistentPatternCache:
     Cache Levels:
     1. Memory Cache (L1) - Fastest access, volatile
     2. Database Cache (L2) - Persistent, shared between instances
-    3. File Cache (L3) - Backup persistence, local to instance
+    3. File Cache (L3) - Backup persistence, one binary file per cache key
 
     Features:
     - Automatic cache warming on startup
@@ -61,10 +64,9 @@ class PersistentPatternCache:
         self._memory_access_times = {}
         self._cache_lock = threading.RLock()
 
-        # L3 Cache: File system (backup persistence)
+        # L3 Cache: File system (backup persistence), sharded per cache key
         self.cache_dir.mkdir(exist_ok=True)
-        self.patterns_file = self.cache_dir / "patterns_cache.json"
-        self.metadata_file = self.cache_dir / "cache_metadata.json"
+        self.file_store = ShardedFileStore(self.cache_dir / "patterns")
 
         # Cache statistics
         self.stats = {
@@ -218,10 +220,7 @@ class PersistentPatternCache:
             self._memory_access_times.clear()
 
             # Clear file cache
-            if self.patterns_file.exists():
-                self.patterns_file.unlink()
-            if self.metadata_file.exists():
-                self.metadata_file.unlink()
+            self.file_store.clear()
 
             logger.info("🗑️ Cleared all cache levels")
 
@@ -236,7 +235,7 @@ class PersistentPatternCache:
                 "cache_levels": {
                     "memory_entries": len(self._memory_cache),
                     "database_active": True,  # L2 is always active via pattern_analyzer
-                    "file_cache_exists": self.patterns_file.exists(),
+                    "file_cache_exists": self.file_store.exists(),
                 },
                 "performance": {
                     "hit_rate_percent": round(hit_rate, 2),
@@ -283,7 +282,7 @@ class PersistentPatternCache:
         cache_entry = {
             "data": patterns,
             "timestamp": time.time(),
-            "ttl_hours": 24,  # Cache valid for 24 hours
+            "ttl_hours": CACHE_TTL_HOURS,
         }
 
         self._memory_cache[cache_key] = cache_entry
@@ -403,19 +402,21 @@ class PersistentPatternCache:
     def _load_from_file_cache(self):
         """Load cache from file system (L3) during startup"""
         try:
-            if not self.patterns_file.exists():
-                return
+            self.file_store.purge_expired()
 
-            with open(self.patterns_file, "r", encoding="utf-8") as f:
-                file_cache = json.load(f)
-
-            # Load into memory cache with validation
             loaded_count = 0
-            for cache_key, entry in file_cache.items():
-                if self._is_cache_entry_valid(entry):
-                    self._memory_cache[cache_key] = entry
-                    self._memory_access_times[cache_key] = time.time()
-                    loaded_count += 1
+            for cache_key in self.file_store:
+                entry = self.file_store.get_entry(cache_key)
+                if entry is None:
+                    continue
+                header, patterns = entry
+                self._memory_cache[cache_key] = {
+                    "data": patterns,
+                    "timestamp": header.created_at,
+                    "ttl_hours": (header.expires_at - header.created_at) / 3600,
+                }
+                self._memory_access_times[cache_key] = time.time()
+                loaded_count += 1
 
             logger.info(f"📁 Loaded {loaded_count} entries from file cache")
 
@@ -425,19 +426,7 @@ class PersistentPatternCache:
     def _load_from_file_cache_key(self, cache_key: str) -> dict[str, Any] | None:
         """Load specific key from file cache"""
         try:
-            if not self.patterns_file.exists():
-                return None
-
-            with open(self.patterns_file, "r", encoding="utf-8") as f:
-                file_cache = json.load(f)
-
-            if cache_key in file_cache:
-                entry = file_cache[cache_key]
-                if self._is_cache_entry_valid(entry):
-                    return entry["data"]
-
-            return None
-
+            return self.file_store.get(cache_key)
         except Exception as e:
             logger.error(f"Error loading from file cache key {cache_key}: {e}")
             return None
@@ -445,58 +434,14 @@ class PersistentPatternCache:
     def _store_in_file_cache(self, cache_key: str, patterns: dict[str, Any]):
         """Store patterns in file cache (L3)"""
         try:
-            # Load existing cache
-            file_cache = {}
-            if self.patterns_file.exists():
-                with open(self.patterns_file, "r", encoding="utf-8") as f:
-                    file_cache = json.load(f)
-
-            # Add new entry
-            cache_entry = {"data": patterns, "timestamp": time.time(), "ttl_hours": 24}
-            file_cache[cache_key] = cache_entry
-
-            # Clean up expired entries
-            _current_time = time.time()
-            file_cache = {
-                k: v for k, v in file_cache.items() if self._is_cache_entry_valid(v)
-            }
-
-            # Write back to file
-            with open(self.patterns_file, "w", encoding="utf-8") as f:
-                json.dump(file_cache, f, indent=2, default=str)
-
-            # Update metadata
-            metadata = {
-                "last_updated": datetime.now().isoformat(),
-                "total_entries": len(file_cache),
-                "cache_version": "1.0",
-            }
-            with open(self.metadata_file, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
-
+            self.file_store.put(cache_key, patterns, ttl_seconds=CACHE_TTL_HOURS * 3600)
         except Exception as e:
             logger.error(f"Error storing in file cache: {e}")
 
     def _remove_from_file_cache(self, administration: str):
         """Remove entries for specific administration from file cache"""
         try:
-            if not self.patterns_file.exists():
-                return
-
-            with open(self.patterns_file, "r", encoding="utf-8") as f:
-                file_cache = json.load(f)
-
-            # Remove entries for this administration
-            keys_to_remove = [
-                key for key in file_cache if key.startswith(f"{administration}_")
-            ]
-            for key in keys_to_remove:
-                del file_cache[key]
-
-            # Write back
-            with open(self.patterns_file, "w", encoding="utf-8") as f:
-                json.dump(file_cache, f, indent=2, default=str)
-
+            self.file_store.delete_prefix(f"{administration}_")
         except Exception as e:
             logger.error(f"Error removing from file cache: {e}")
 
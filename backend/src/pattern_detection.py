@@ -14,15 +14,18 @@ They do NOT score/rank patterns or manage caching.
 """
 
 import re
-from collections import defaultdict
 from collections.abc import Callable
-from typing import Any
+from functools import lru_cache
+from typing import Any, NamedTuple
 
 # Majority voting threshold for company-level pattern detection.
 # If one (debet, credit) combination has >= this fraction of all occurrences
 # for a company key, it wins and is stored as the pattern.
 MAJORITY_VOTING_THRESHOLD = 0.90  # 90% agreement required
 
+# Distinct descriptions kept in the extraction memo (shared by all tenants)
+DESCRIPTION_CACHE_SIZE = 50_000
+
 
 # ============================================================================
 # Description Normalization / Cleaning Utilities
@@ -398,156 +401,103 @@ def extract_verb_from_description(
     return None
 
 
-# ============================================================================
-# Pattern Analysis Functions
-# ============================================================================
+class DescriptionFeatures(NamedTuple):
+    """Everything the pattern analyzers extract from one description."""
 
+    keywords: tuple[str, ...]
+    company: str | None
+    reference: str | None
+    compound_verb: str | None
+    verb: str | None
 
-def analyze_debet_patterns(
-    transactions: list[dict],
-    administration: str,
-    is_bank_account_fn: Callable[[str, str], bool],
-) -> dict[str, Any]:
-    """
-    Analyze patterns for predicting Debet account numbers
 
-    REQ-PAT-002: Use ReferenceNumber and bank account logic:
-    - If Credit is bank account → predict Debet from historical patterns
-    - Use ReferenceNumber matching in transaction descriptions
+@lru_cache(maxsize=DESCRIPTION_CACHE_SIZE)
+def description_features(description: str) -> DescriptionFeatures:
+    """
+    Memoized single extraction of keywords, company, reference and verbs
 
-    Args:
-        transactions: List of transaction dictionaries
-        administration: The administration to analyze for
-        is_bank_account_fn: Callable to check if an account is a bank account
+    Bank descriptions repeat heavily (subscriptions, payouts), so the regex
+    work runs once per distinct description. Results match
+    extract_keywords / extract_company_name /
+    extract_compound_verb_from_description / extract_verb_from_description.
     """
-    debet_patterns = defaultdict(
-        lambda: {
-            "occurrences": 0,
-            "descriptions": [],
-            "reference_numbers": set(),
-            "amounts": [],
-            "confidence": 0.0,
-            "last_seen": None,
-        }
+    keywords = tuple(extract_keywords(description))
+    if not description:
+        return DescriptionFeatures(keywords, None, None, None, None)
+
+    description_upper = description.upper().strip()
+    company = extract_company_name(description_upper)
+    reference = (
+        extract_reference_number_from_description(description_upper)
+        if company
+        else None
     )
+    compound_verb = f"{company}|{reference}" if company and reference else company
 
-    for tx in transactions:
-        debet = tx.get("Debet")
-        credit = tx.get("Credit")
-        description = tx.get("TransactionDescription", "").strip()
-        ref_num = tx.get("ReferenceNumber", "").strip()
-        amount = tx.get("TransactionAmount", 0)
-        date = tx.get("TransactionDate")
+    if compound_verb and "|" in compound_verb:
+        verb = compound_verb
+    elif company and is_valid_verb(company):
+        verb = company
+    else:
+        verb = None
+    return DescriptionFeatures(keywords, company, reference, compound_verb, verb)
 
-        # Skip if no debet
-        if not debet:
-            continue
 
-        # REQ-PAT-004: Bank account lookup logic
-        # Only create debet patterns when credit is a bank account
-        # (so we can predict debet when we know credit is bank account)
-        if not is_bank_account_fn(credit, administration):
-            continue
+@lru_cache(maxsize=DESCRIPTION_CACHE_SIZE)
+def _cached_keywords(text: str) -> tuple[str, ...]:
+    return tuple(extract_keywords(text))
 
-        # Create pattern key using multiple criteria (REQ-PAT-002)
-        desc_keywords = extract_keywords(description)
-        ref_keywords = extract_keywords(ref_num) if ref_num else []
-
-        # Combine description and reference keywords for better matching
-        all_keywords = desc_keywords + ref_keywords
-        pattern_key = f"bank_credit_{credit}_{'-'.join(sorted(set(all_keywords[:3])))}"
-
-        pattern = debet_patterns[pattern_key]
-        pattern["occurrences"] += 1
-        pattern["descriptions"].append(description)
-        pattern["reference_numbers"].add(ref_num)
-        pattern["amounts"].append(float(amount) if amount else 0.0)
-        pattern["predicted_debet"] = debet
-        pattern["credit_account"] = credit
-        pattern["last_seen"] = date
-        pattern["is_bank_credit"] = True  # Mark that credit is bank account
-
-    # Calculate confidence scores and filter patterns
-    filtered_patterns = {}
-    for key, pattern in debet_patterns.items():
-        if pattern["occurrences"] >= 1:  # Minimum 1 occurrence (learn from first entry)
-            pattern["confidence"] = min(
-                pattern["occurrences"] / 10.0, 1.0
-            )  # Max confidence 1.0
-            pattern["reference_numbers"] = list(pattern["reference_numbers"])
-            pattern["avg_amount"] = sum(pattern["amounts"]) / len(pattern["amounts"])
-            filtered_patterns[key] = dict(pattern)
 
-    return filtered_patterns
+# ============================================================================
+# Pattern Analysis Functions
+# ============================================================================
 
 
-def analyze_credit_patterns(
-    transactions: list[dict],
-    administration: str,
-    is_bank_account_fn: Callable[[str, str], bool],
-) -> dict[str, Any]:
-    """
-    Analyze patterns for predicting Credit account numbers
+def _new_side_pattern() -> dict[str, Any]:
+    return {
+        "occurrences": 0,
+        "descriptions": [],
+        "reference_numbers": set(),
+        "amounts": [],
+        "confidence": 0.0,
+        "last_seen": None,
+    }
 
-    REQ-PAT-002: Use ReferenceNumber and bank account logic:
-    - If Debet is bank account → predict Credit from historical patterns
-    - Use ReferenceNumber matching in transaction descriptions
 
-    Args:
-        transactions: List of transaction dictionaries
-        administration: The administration to analyze for
-        is_bank_account_fn: Callable to check if an account is a bank account
-    """
-    credit_patterns = defaultdict(
-        lambda: {
-            "occurrences": 0,
-            "descriptions": [],
-            "reference_numbers": set(),
-            "amounts": [],
-            "confidence": 0.0,
-            "last_seen": None,
-        }
-    )
+def _add_side_occurrence(pattern, description, ref_num, amount, date) -> None:
+    pattern["occurrences"] += 1
+    pattern["descriptions"].append(description)
+    pattern["reference_numbers"].add(ref_num)
+    pattern["amounts"].append(amount)
+    pattern["last_seen"] = date
 
-    for tx in transactions:
-        debet = tx.get("Debet")
-        credit = tx.get("Credit")
-        description = tx.get("TransactionDescription", "").strip()
-        ref_num = tx.get("ReferenceNumber", "").strip()
-        amount = tx.get("TransactionAmount", 0)
-        date = tx.get("TransactionDate")
 
-        # Skip if no credit
-        if not credit:
-            continue
+_SIDE_AGGREGATE_FIELDS = frozenset(
+    {"occurrences", "descriptions", "reference_numbers", "amounts"}
+)
 
-        # REQ-PAT-004: Bank account lookup logic
-        # Only create credit patterns when debet is a bank account
-        # (so we can predict credit when we know debet is bank account)
-        if not is_bank_account_fn(debet, administration):
-            continue
 
-        # Create pattern key using multiple criteria (REQ-PAT-002)
-        desc_keywords = extract_keywords(description)
-        ref_keywords = extract_keywords(ref_num) if ref_num else []
-
-        # Combine description and reference keywords for better matching
-        all_keywords = desc_keywords + ref_keywords
-        pattern_key = f"bank_debet_{debet}_{'-'.join(sorted(set(all_keywords[:3])))}"
-
-        pattern = credit_patterns[pattern_key]
-        pattern["occurrences"] += 1
-        pattern["descriptions"].append(description)
-        pattern["reference_numbers"].add(ref_num)
-        pattern["amounts"].append(float(amount) if amount else 0.0)
-        pattern["predicted_credit"] = credit
-        pattern["debet_account"] = debet
-        pattern["last_seen"] = date
-        pattern["is_bank_debet"] = True  # Mark that debet is bank account
-
-    # Calculate confidence scores and filter patterns
+def _merge_side_patterns(patterns: dict, later: dict) -> None:
+    """Fold debet/credit patterns from a later chunk into patterns"""
+    for key, theirs in later.items():
+        mine = patterns.get(key)
+        if mine is None:
+            patterns[key] = theirs
+            continue
+        mine["occurrences"] += theirs["occurrences"]
+        mine["descriptions"].extend(theirs["descriptions"])
+        mine["reference_numbers"] |= theirs["reference_numbers"]
+        mine["amounts"].extend(theirs["amounts"])
+        # Remaining fields are last-write-wins, as in a single pass
+        for field, value in theirs.items():
+            if field not in _SIDE_AGGREGATE_FIELDS:
+                mine[field] = value
+
+
+def _finalize_side_patterns(patterns: dict) -> dict[str, Any]:
+    """Calculate confidence scores and filter debet/credit patterns"""
     filtered_patterns = {}
-    for key, pattern in credit_patterns.items():
+    for key, pattern in patterns.items():
         if pattern["occurrences"] >= 1:  # Minimum 1 occurrence (learn from first entry)
             pattern["confidence"] = min(
                 pattern["occurrences"] / 10.0, 1.0
@@ -555,129 +505,27 @@ def analyze_credit_patterns(
             pattern["reference_numbers"] = list(pattern["reference_numbers"])
             pattern["avg_amount"] = sum(pattern["amounts"]) / len(pattern["amounts"])
             filtered_patterns[key] = dict(pattern)
-
     return filtered_patterns
 
 
-def analyze_reference_patterns(
-    transactions: list[dict],
-    administration: str,
-    is_bank_account_fn: Callable[[str, str], bool],
-) -> dict[str, Any]:
-    """
-    Analyze patterns for predicting ReferenceNumber values using verb-based logic
-
-    Logic: Administration + BankAccount + Verb → ReferenceNumber + Debet/Credit accounts
-    Example: "ExampleTenant" + "1300" + "Picnic" → "Picnic" + debet="1003", credit="1300"
-
-    REQ-PAT-002: Use historical ReferenceNumbers to match transaction descriptions
-
-    Args:
-        transactions: List of transaction dictionaries
-        administration: The administration to analyze for
-        is_bank_account_fn: Callable to check if an account is a bank account
-    """
-    verb_patterns = {}
-    # Frequency tracker: company_key -> (debet, credit) -> variant data
-    company_variants = defaultdict(
-        lambda: defaultdict(
-            lambda: {
-                "occurrences": 0,
-                "last_seen": None,
-                "reference_number": None,
-                "sample_description": None,
-                "administration": None,
-                "bank_account": None,
-                "verb_company": None,
-                "verb_reference": None,
-                "is_compound": None,
-                "other_account": None,
-            }
-        )
-    )
-
-    for tx in transactions:
-        debet = tx.get("Debet")
-        credit = tx.get("Credit")
-        description = tx.get("TransactionDescription", "").strip()
-        ref_num = tx.get("ReferenceNumber", "").strip()
-        date = tx.get("TransactionDate")
-
-        if not ref_num or not description:
-            continue
-
-        # Identify the bank account (either debet or credit)
-        bank_account = None
-        other_account = None
-
-        if is_bank_account_fn(debet, administration):
-            bank_account = debet
-            other_account = credit
-        elif is_bank_account_fn(credit, administration):
-            bank_account = credit
-            other_account = debet
-        else:
-            continue  # Skip if no bank account involved
-
-        # Extract verb from description (company/vendor name)
-        verb = extract_verb_from_description(description, ref_num)
-        if not verb:
-            continue
-
-        # Parse compound verb if applicable
-        is_compound = "|" in verb
-        verb_company = None
-        verb_reference = None
-
-        if is_compound:
-            parts = verb.split("|", 1)
-            verb_company = parts[0]
-            verb_reference = parts[1] if len(parts) > 1 else None
-        else:
-            verb_company = verb
-
-        # Create pattern keys at two levels:
-        # 1. Compound key (company + reference) for multi-product vendors (e.g., ASR with 5 insurances)
-        # 2. Company-only key as fallback for single-product vendors
-        if is_compound and verb_reference:
-            compound_key = (
-                f"{administration}_{bank_account}_{verb_company}|{verb_reference}"
-            )
-            verb_patterns[compound_key] = {
-                "administration": administration,
-                "bank_account": bank_account,
-                "verb": f"{verb_company}|{verb_reference}",
-                "verb_company": verb_company,
-                "verb_reference": verb_reference,
-                "is_compound": True,
-                "reference_number": ref_num,
-                "debet_account": debet,
-                "credit_account": credit,
-                "other_account": other_account,
-                "occurrences": verb_patterns.get(compound_key, {}).get("occurrences", 0)
-                + 1,
-                "confidence": 1.0,
-                "last_seen": date,
-                "sample_description": description,
-            }
+def _new_variant() -> dict[str, Any]:
+    return {
+        "occurrences": 0,
+        "last_seen": None,
+        "reference_number": None,
+        "sample_description": None,
+        "administration": None,
+        "bank_account": None,
+        "verb_company": None,
+        "verb_reference": None,
+        "is_compound": None,
+        "other_account": None,
+    }
 
-        # Company-only key (fallback for simple verbs, or aggregated for single-product vendors)
-        company_key = f"{administration}_{bank_account}_{verb_company}"
-
-        # Track all (debet, credit) combinations for this company key
-        variant_key = (debet, credit)
-        variant = company_variants[company_key][variant_key]
-        variant["occurrences"] += 1
-        variant["last_seen"] = date
-        variant["reference_number"] = ref_num
-        variant["sample_description"] = description
-        variant["administration"] = administration
-        variant["bank_account"] = bank_account
-        variant["verb_company"] = verb_company
-        variant["verb_reference"] = verb_reference
-        variant["is_compound"] = is_compound
-        variant["other_account"] = other_account
 
+def _finalize_reference_patterns(
+    verb_patterns: dict, company_variants: dict
+) -> dict[str, Any]:
     # Apply majority voting to company-level patterns
     for company_key, variants in company_variants.items():
         any_variant = next(iter(variants.values()))
@@ -737,3 +585,298 @@ def analyze_reference_patterns(
             }
 
     return verb_patterns
+
+
+class PatternCounters:
+    """
+    Running debet/credit/reference pattern counters for one administration
+
+    Transactions can be added in chunks, and counters built from separate
+    chunks (e.g. in worker processes) can be merged in chunk order; the
+    finalized result equals a single pass over all transactions. Counters
+    hold only plain dicts/sets/tuples so they pickle across processes.
+    """
+
+    def __init__(
+        self,
+        administration: str,
+        include: tuple[str, ...] = ("debet", "credit", "reference"),
+    ):
+        self.administration = administration
+        self.include = tuple(include)
+        self.transactions = 0
+        self.debet_patterns: dict[str, dict] = {}
+        self.credit_patterns: dict[str, dict] = {}
+        self.verb_patterns: dict[str, dict] = {}
+        # Frequency tracker: company_key -> (debet, credit) -> variant data
+        self.company_variants: dict[str, dict[tuple, dict]] = {}
+
+    def add(
+        self,
+        transactions: list[dict],
+        is_bank_account_fn: Callable[[str, str], bool],
+    ) -> "PatternCounters":
+        """Count a chunk of transactions"""
+        administration = self.administration
+        want_debet = "debet" in self.include
+        want_credit = "credit" in self.include
+        want_reference = "reference" in self.include
+        debet_patterns = self.debet_patterns
+        credit_patterns = self.credit_patterns
+        verb_patterns = self.verb_patterns
+        company_variants = self.company_variants
+
+        for tx in transactions:
+            self.transactions += 1
+            debet = tx.get("Debet")
+            credit = tx.get("Credit")
+            description = (tx.get("TransactionDescription") or "").strip()
+            ref_num = (tx.get("ReferenceNumber") or "").strip()
+            date = tx.get("TransactionDate")
+
+            # REQ-PAT-004: Bank account lookup logic
+            debet_is_bank = is_bank_account_fn(debet, administration)
+            credit_is_bank = is_bank_account_fn(credit, administration)
+            features = description_features(description)
+
+            # Debet patterns: predict Debet when Credit is a bank account
+            # Credit patterns: predict Credit when Debet is a bank account
+            add_debet = want_debet and debet and credit_is_bank
+            add_credit = want_credit and credit and debet_is_bank
+            if add_debet or add_credit:
+                amount = tx.get("TransactionAmount", 0)
+                amount = float(amount) if amount else 0.0
+                # Create pattern key using multiple criteria (REQ-PAT-002):
+                # description and reference keywords combined
+                all_keywords = features.keywords + (
+                    _cached_keywords(ref_num) if ref_num else ()
+                )
+                keyword_part = "-".join(sorted(set(all_keywords[:3])))
+
+                if add_debet:
+                    key = f"bank_credit_{credit}_{keyword_part}"
+                    pattern = debet_patterns.get(key)
+                    if pattern is None:
+                        pattern = debet_patterns[key] = _new_side_pattern()
+                    _add_side_occurrence(pattern, description, ref_num, amount, date)
+                    pattern["predicted_debet"] = debet
+                    pattern["credit_account"] = credit
+                    pattern["is_bank_credit"] = True  # Mark that credit is bank account
+
+                if add_credit:
+                    key = f"bank_debet_{debet}_{keyword_part}"
+                    pattern = credit_patterns.get(key)
+                    if pattern is None:
+                        pattern = credit_patterns[key] = _new_side_pattern()
+                    _add_side_occurrence(pattern, description, ref_num, amount, date)
+                    pattern["predicted_credit"] = credit
+                    pattern["debet_account"] = debet
+                    pattern["is_bank_debet"] = True  # Mark that debet is bank account
+
+            if not want_reference or not ref_num or not description:
+                continue
+
+            # Identify the bank account (either debet or credit)
+            if debet_is_bank:
+                bank_account = debet
+                other_account = credit
+            elif credit_is_bank:
+                bank_account = credit
+                other_account = debet
+            else:
+                continue  # Skip if no bank account involved
+
+            # Verb from description (company/vendor name)
+            verb = features.verb
+            if not verb:
+                continue
+
+            # Parse compound verb if applicable
+            is_compound = "|" in verb
+            verb_company = None
+            verb_reference = None
+
+            if is_compound:
+                parts = verb.split("|", 1)
+                verb_company = parts[0]
+                verb_reference = parts[1] if len(parts) > 1 else None
+            else:
+                verb_company = verb
+
+            # Create pattern keys at two levels:
+            # 1. Compound key (company + reference) for multi-product vendors (e.g., ASR with 5 insurances)
+            # 2. Company-only key as fallback for single-product vendors
+            if is_compound and verb_reference:
+                compound_key = (
+                    f"{administration}_{bank_account}_{verb_company}|{verb_reference}"
+                )
+                verb_patterns[compound_key] = {
+                    "administration": administration,
+                    "bank_account": bank_account,
+                    "verb": f"{verb_company}|{verb_reference}",
+                    "verb_company": verb_company,
+                    "verb_reference": verb_reference,
+                    "is_compound": True,
+                    "reference_number": ref_num,
+                    "debet_account": debet,
+                    "credit_account": credit,
+                    "other_account": other_account,
+                    "occurrences": verb_patterns.get(compound_key, {}).get(
+                        "occurrences", 0
+                    )
+                    + 1,
+                    "confidence": 1.0,
+                    "last_seen": date,
+                    "sample_description": description,
+                }
+
+            # Company-only key (fallback for simple verbs, or aggregated for single-product vendors)
+            company_key = f"{administration}_{bank_account}_{verb_company}"
+
+            # Track all (debet, credit) combinations for this company key
+            variants = company_variants.setdefault(company_key, {})
+            variant = variants.get((debet, credit))
+            if variant is None:
+                variant = variants[(debet, credit)] = _new_variant()
+            variant["occurrences"] += 1
+            variant["last_seen"] = date
+            variant["reference_number"] = ref_num
+            variant["sample_description"] = description
+            variant["administration"] = administration
+            variant["bank_account"] = bank_account
+            variant["verb_company"] = verb_company
+            variant["verb_reference"] = verb_reference
+            variant["is_compound"] = is_compound
+            variant["other_account"] = other_account
+
+        return self
+
+    def merge(self, later: "PatternCounters") -> "PatternCounters":
+        """Fold in counters built from the chunk that follows this one"""
+        self.transactions += later.transactions
+        _merge_side_patterns(self.debet_patterns, later.debet_patterns)
+        _merge_side_patterns(self.credit_patterns, later.credit_patterns)
+
+        for key, theirs in later.verb_patterns.items():
+            mine = self.verb_patterns.get(key)
+            if mine is not None:
+                theirs["occurrences"] += mine["occurrences"]
+            self.verb_patterns[key] = theirs
+
+        for company_key, their_variants in later.company_variants.items():
+            variants = self.company_variants.setdefault(company_key, {})
+            for pair, theirs in their_variants.items():
+                mine = variants.get(pair)
+                if mine is not None:
+                    theirs["occurrences"] += mine["occurrences"]
+                variants[pair] = theirs
+        return self
+
+    def finalize(self) -> dict[str, dict[str, Any]]:
+        """Return the "debet", "credit" and/or "reference" pattern dictionaries"""
+        result = {}
+        if "debet" in self.include:
+            result["debet"] = _finalize_side_patterns(self.debet_patterns)
+        if "credit" in self.include:
+            result["credit"] = _finalize_side_patterns(self.credit_patterns)
+        if "reference" in self.include:
+            result["reference"] = _finalize_reference_patterns(
+                dict(self.verb_patterns), self.company_variants
+            )
+        return result
+
+
+def analyze_transaction_patterns(
+    transactions: list[dict],
+    administration: str,
+    is_bank_account_fn: Callable[[str, str], bool],
+    include: tuple[str, ...] = ("debet", "credit", "reference"),
+) -> dict[str, dict[str, Any]]:
+    """
+    Analyze debet, credit and reference patterns in a single pass
+
+    Each transaction is read once; description extraction is memoized via
+    description_features(), and the bank-account lookups are shared by the
+    three aggregators. Results are identical to running
+    analyze_debet_patterns, analyze_credit_patterns and
+    analyze_reference_patterns separately.
+
+    Args:
+        transactions: List of transaction dictionaries
+        administration: The administration to analyze for
+        is_bank_account_fn: Callable to check if an account is a bank account
+        include: Which pattern kinds to build
+
+    Returns:
+        Dict with "debet", "credit" and/or "reference" pattern dictionaries
+    """
+    counters = PatternCounters(administration, include)
+    counters.add(transactions, is_bank_account_fn)
+    return counters.finalize()
+
+
+def analyze_debet_patterns(
+    transactions: list[dict],
+    administration: str,
+    is_bank_account_fn: Callable[[str, str], bool],
+) -> dict[str, Any]:
+    """
+    Analyze patterns for predicting Debet account numbers
+
+    REQ-PAT-002: Use ReferenceNumber and bank account logic:
+    - If Credit is bank account → predict Debet from historical patterns
+    - Use ReferenceNumber matching in transaction descriptions
+
+    Args:
+        transactions: List of transaction dictionaries
+        administration: The administration to analyze for
+        is_bank_account_fn: Callable to check if an account is a bank account
+    """
+    return analyze_transaction_patterns(
+        transactions, administration, is_bank_account_fn, include=("debet",)
+    )["debet"]
+
+
+def analyze_credit_patterns(
+    transactions: list[dict],
+    administration: str,
+    is_bank_account_fn: Callable[[str, str], bool],
+) -> dict[str, Any]:
+    """
+    Analyze patterns for predicting Credit account numbers
+
+    REQ-PAT-002: Use ReferenceNumber and bank account logic:
+    - If Debet is bank account → predict Credit from historical patterns
+    - Use ReferenceNumber matching in transaction descriptions
+
+    Args:
+        transactions: List of transaction dictionaries
+        administration: The administration to analyze for
+        is_bank_account_fn: Callable to check if an account is a bank account
+    """
+    return analyze_transaction_patterns(
+        transactions, administration, is_bank_account_fn, include=("credit",)
+    )["credit"]
+
+
+def analyze_reference_patterns(
+    transactions: list[dict],
+    administration: str,
+    is_bank_account_fn: Callable[[str, str], bool],
+) -> dict[str, Any]:
+    """
+    Analyze patterns for predicting ReferenceNumber values using verb-based logic
+
+    Logic: Administration + BankAccount + Verb → ReferenceNumber + Debet/Credit accounts
+    Example: "ExampleTenant" + "1300" + "Picnic" → "Picnic" + debet="1003", credit="1300"
+
+    REQ-PAT-002: Use historical ReferenceNumbers to match transaction descriptions
+
+    Args:
+        transactions: List of transaction dictionaries
+        administration: The administration to analyze for
+        is_bank_account_fn: Callable to check if an account is a bank account
+    """
+    return analyze_transaction_patterns(
+        transactions, administration, is_bank_account_fn, include=("reference",)
+    )["reference"]
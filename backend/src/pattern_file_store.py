@@ -0,0 +1,218 @@
+"""Sharded per-key binary file store for the L3 pattern cache.
+
+The previous L3 layer kept every cache key in a single JSON file, so each
+read parsed the whole file and each write rewrote it - O(total cache size)
+per access, and two gunicorn workers writing at once could lose each
+other's entries. This store writes one file per cache key instead:
+
+    <root>/<sha1[:2]>/<sha1>.pcache
+
+Each file is a fixed header followed by a pickle (protocol 5) payload:
+
+    magic (4s) | version (B) | created_at (d) | expires_at (d) | key_len (I)
+    key (utf-8, key_len bytes) | payload
+
+Writes go to a temp file in the same shard directory and are moved into
+place with os.replace(), so readers in other workers see either the old or
+the new entry, never a partial one. The TTL lives in the header, so expired
+entries are rejected without unpickling them. Prefix lookups and deletes
+(per-administration invalidation) only read headers; that header scan is
+the store's index, so there is no shared index file to keep in sync.
+
+Usage:
+    from pattern_file_store import ShardedFileStore
+
+    store = ShardedFileStore("cache/patterns")
+    store.put("GoodwinSolutions", patterns, ttl_seconds=24 * 3600)
+    patterns = store.get("GoodwinSolutions")
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PCF1"
+FORMAT_VERSION = 1
+FILE_SUFFIX = ".pcache"
+
+_HEADER = struct.Struct("<4sBddI")
+
+
+class EntryHeader(NamedTuple):
+    """Header fields of a stored entry."""
+
+    key: str
+    created_at: float
+    expires_at: float
+    payload_offset: int
+
+    def is_expired(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+
+def _parse_header(buffer) -> EntryHeader:
+    magic, version, created_at, expires_at, key_len = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not a pattern cache file")
+    key_end = _HEADER.size + key_len
+    key = bytes(buffer[_HEADER.size : key_end]).decode("utf-8")
+    return EntryHeader(key, created_at, expires_at, key_end)
+
+
+class ShardedFileStore:
+    """One binary file per cache key, written atomically."""
+
+    def __init__(self, root: str | Path, use_mmap: bool = True):
+        self.root = Path(root)
+        self.use_mmap = use_mmap
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}{FILE_SUFFIX}"
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_entry(self, key: str) -> tuple[EntryHeader, Any] | None:
+        """Return (header, value) for a live entry, or None."""
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                if self.use_mmap:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return self._decode(path, key, mm)
+                return self._decode(path, key, f.read())
+        except FileNotFoundError:
+            return None
+        except (
+            OSError,
+            ValueError,
+            struct.error,
+            pickle.UnpicklingError,
+            EOFError,
+        ) as e:
+            logger.warning(f"Discarding unreadable pattern cache file {path}: {e}")
+            self._unlink(path)
+            return None
+
+    def get(self, key: str) -> Any | None:
+        """Return the stored value for a live entry, or None."""
+        entry = self.get_entry(key)
+        return entry[1] if entry else None
+
+    def _decode(self, path: Path, key: str, buffer) -> tuple[EntryHeader, Any] | None:
+        header = _parse_header(buffer)
+        if header.key != key:
+            return None  # sha1 collision; treat as a miss
+        if header.is_expired():
+            self._unlink(path)
+            return None
+        with memoryview(buffer) as view:
+            value = pickle.loads(view[header.payload_offset :])
+        return header, value
+
+    def read_header(self, path: Path) -> EntryHeader | None:
+        """Read only the header of a cache file."""
+        try:
+            with open(path, "rb") as f:
+                head = f.read(_HEADER.size)
+                key_len = _HEADER.unpack(head)[4]
+                return _parse_header(head + f.read(key_len))
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def iter_paths(self) -> Iterator[Path]:
+        return self.root.glob(f"*/*{FILE_SUFFIX}")
+
+    def keys(self, prefix: str = "") -> list[str]:
+        """Keys of live entries starting with prefix (header scan only)."""
+        now = time.time()
+        keys = []
+        for path in self.iter_paths():
+            header = self.read_header(path)
+            if header and not header.is_expired(now) and header.key.startswith(prefix):
+                keys.append(header.key)
+        return keys
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys of live entries."""
+        return iter(self.keys())
+
+    def exists(self) -> bool:
+        """True if the store holds at least one entry file."""
+        return next(iter(self.iter_paths()), None) is not None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        """Write an entry atomically; replaces any existing entry for key."""
+        path = self.path_for(key)
+        path.parent.mkdir(exist_ok=True)
+        created_at = time.time()
+        key_bytes = key.encode("utf-8")
+        header = _HEADER.pack(
+            MAGIC, FORMAT_VERSION, created_at, created_at + ttl_seconds, len(key_bytes)
+        )
+        payload = pickle.dumps(value, protocol=5)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(key_bytes)
+                f.write(payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            self._unlink(Path(tmp_name))
+            raise
+
+    def delete(self, key: str) -> bool:
+        return self._unlink(self.path_for(key))
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete all entries whose key starts with prefix; returns the count."""
+        removed = 0
+        for path in list(self.iter_paths()):
+            header = self.read_header(path)
+            if header and header.key.startswith(prefix) and self._unlink(path):
+                removed += 1
+        return removed
+
+    def purge_expired(self) -> int:
+        """Delete expired and unreadable entries; returns the count."""
+        now = time.time()
+        removed = 0
+        for path in list(self.iter_paths()):
+            header = self.read_header(path)
+            if (header is None or header.is_expired(now)) and self._unlink(path):
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for path in list(self.iter_paths()):
+            self._unlink(path)
+
+    @staticmethod
+    def _unlink(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Could not remove pattern cache file {path}: {e}")
+            return False
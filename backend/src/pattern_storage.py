@@ -53,6 +53,10 @@ def store_verb_patterns_to_database(
     REQ-PAT-006: Support incremental pattern updates
     Uses single table for ReferenceNumber, Debet, and Credit predictions
 
+    The pattern upserts and the stale-pattern cleanup run in one
+    transaction via execute_batch_queries, which sends the upserts as
+    chunked multi-row INSERT ... ON DUPLICATE KEY UPDATE statements.
+
     Args:
         db: Database manager instance
         administration: The administration to store patterns for
@@ -63,7 +67,35 @@ def store_verb_patterns_to_database(
     print(f"💾 Storing {len(verb_patterns)} verb patterns to database...")
 
     try:
+        # For full analysis: replace occurrences with freshly calculated values
+        # For incremental analysis: accumulate new occurrences on top of existing
+        occurrences_update = (
+            "occurrences = occurrences + VALUES(occurrences)"
+            if is_incremental
+            else "occurrences = VALUES(occurrences)"
+        )
+        upsert_query = f"""
+            INSERT INTO pattern_verb_patterns 
+            (administration, bank_account, verb, verb_company, verb_reference, is_compound,
+             reference_number, debet_account, credit_account, occurrences, confidence, 
+             last_seen, sample_description)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+            verb_company = VALUES(verb_company),
+            verb_reference = VALUES(verb_reference),
+            is_compound = VALUES(is_compound),
+            reference_number = VALUES(reference_number),
+            debet_account = VALUES(debet_account),
+            credit_account = VALUES(credit_account),
+            {occurrences_update},
+            confidence = VALUES(confidence),
+            last_seen = VALUES(last_seen),
+            sample_description = VALUES(sample_description),
+            updated_at = CURRENT_TIMESTAMP
+        """
+
         # Store verb patterns (unified approach for all predictions)
+        statements = []
         for pattern_key, pattern in verb_patterns.items():
             # Skip ambiguous company-level patterns — log the exclusion
             if pattern.get("_ambiguous"):
@@ -84,73 +116,53 @@ def store_verb_patterns_to_database(
                         f"marked ambiguous (confidence={pattern.get('confidence', 0.0)})"
                     )
                 continue
-            # For full analysis: replace occurrences with freshly calculated values
-            # For incremental analysis: accumulate new occurrences on top of existing
-            occurrences_update = (
-                "occurrences = occurrences + VALUES(occurrences)"
-                if is_incremental
-                else "occurrences = VALUES(occurrences)"
-            )
 
-            db.execute_query(
-                f"""
-                INSERT INTO pattern_verb_patterns 
-                (administration, bank_account, verb, verb_company, verb_reference, is_compound,
-                 reference_number, debet_account, credit_account, occurrences, confidence, 
-                 last_seen, sample_description)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                verb_company = VALUES(verb_company),
-                verb_reference = VALUES(verb_reference),
-                is_compound = VALUES(is_compound),
-                reference_number = VALUES(reference_number),
-                debet_account = VALUES(debet_account),
-                credit_account = VALUES(credit_account),
-                {occurrences_update},
-                confidence = VALUES(confidence),
-                last_seen = VALUES(last_seen),
-                sample_description = VALUES(sample_description),
-                updated_at = CURRENT_TIMESTAMP
-            """,
+            statements.append(
                 (
-                    pattern.get("administration"),
-                    pattern.get("bank_account"),
-                    pattern.get("verb"),
-                    pattern.get("verb_company"),
-                    pattern.get("verb_reference"),
-                    pattern.get("is_compound", False),
-                    pattern.get("reference_number"),
-                    pattern.get("debet_account"),
-                    pattern.get("credit_account"),
-                    pattern.get("occurrences", 1),
-                    pattern.get("confidence", 1.0),
-                    pattern.get("last_seen"),
-                    pattern.get("sample_description"),
-                ),
-                fetch=False,
-                commit=True,
+                    upsert_query,
+                    (
+                        pattern.get("administration"),
+                        pattern.get("bank_account"),
+                        pattern.get("verb"),
+                        pattern.get("verb_company"),
+                        pattern.get("verb_reference"),
+                        pattern.get("is_compound", False),
+                        pattern.get("reference_number"),
+                        pattern.get("debet_account"),
+                        pattern.get("credit_account"),
+                        pattern.get("occurrences", 1),
+                        pattern.get("confidence", 1.0),
+                        pattern.get("last_seen"),
+                        pattern.get("sample_description"),
+                    ),
+                )
             )
 
         # Only during full analysis: remove patterns not seen within the analysis window
-        if not is_incremental:
-            analysis_start = analysis_metadata.get("date_range", {}).get("from")
-            if analysis_start:
-                result = db.execute_query(
+        analysis_start = analysis_metadata.get("date_range", {}).get("from")
+        delete_stale = not is_incremental and analysis_start
+        if delete_stale:
+            statements.append(
+                (
                     """
                     DELETE FROM pattern_verb_patterns
                     WHERE administration = %s
                       AND last_seen < %s
                     """,
                     (administration, analysis_start),
-                    fetch=False,
-                    commit=True,
                 )
-                deleted_count = result if isinstance(result, int) else 0
-                if deleted_count:
-                    print(
-                        f"🧹 Removed {deleted_count} stale patterns "
-                        f"(last_seen < {analysis_start})"
-                    )
+            )
+
+        # One transaction: the upserts go out as chunked multi-row INSERTs
+        results = db.execute_batch_queries(statements) if statements else []
+
+        if delete_stale:
+            deleted_count = results[-1] if isinstance(results[-1], int) else 0
+            if deleted_count:
+                print(
+                    f"🧹 Removed {deleted_count} stale patterns "
+                    f"(last_seen < {analysis_start})"
+                )
 
         # Get current pattern count from database for accurate reporting
         pattern_count_result = db.execute_query(
@@ -4,15 +4,19 @@ API routes for pattern storage functionality
 Provides endpoints to:
 - Get pattern storage statistics
 - Trigger pattern analysis with database storage
+- Refresh patterns for all administrations on the process pool
 - Get pattern summaries from database
 """
 
 import time
 
 from flask import Blueprint, jsonify, request
+from mysql.connector import Error as MySQLError
 
 from auth.cognito_utils import cognito_required
+from db_exceptions import DatabaseError
 from pattern_analyzer import PatternAnalyzer
+from pattern_batch import PatternBatchAnalyzer
 
 # Create blueprint
 pattern_storage_bp = Blueprint("pattern_storage", __name__)
@@ -92,6 +96,37 @@ def analyze_patterns_with_storage(administration, user_email, user_roles):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@pattern_storage_bp.route("/api/patterns/analyze-all", methods=["POST"])
+@cognito_required(required_roles=["SysAdmin"])
+def analyze_all_patterns(user_email, user_roles):
+    """
+    Full pattern analysis for all administrations (or the listed ones)
+
+    Tenants are streamed in chunks and analyzed on the process pool, so the
+    refresh scales with the pool size. Returns progress and timing per tenant.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        administrations = data.get("administrations") or None
+
+        start_time = time.time()
+        reports = PatternBatchAnalyzer().run(administrations)
+        analysis_time = time.time() - start_time
+
+        failed = [a for a, r in reports.items() if r.status == "failed"]
+        return jsonify(
+            {
+                "success": not failed,
+                "analysis_time": round(analysis_time, 4),
+                "administrations": [r.to_dict() for r in reports.values()],
+                "failed": failed,
+            }
+        )
+
+    except (DatabaseError, MySQLError) as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @pattern_storage_bp.route("/api/patterns/summary/<administration>", methods=["GET"])
 @cognito_required(required_permissions=["banking_read"])
 def get_pattern_summary_from_storage(administration, user_email, user_roles):
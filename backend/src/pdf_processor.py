@@ -274,11 +274,12 @@ class PDFProcessor:
                     day, month, year = date_parts
                     transaction_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
 
-            duplicates = duplicate_checker.check_for_duplicates(
-                reference_number=reference_number,
-                transaction_date=transaction_date,
-                transaction_amount=transaction_amount,
-            )
+            # Only the main invoice line is a candidate: VAT lines routinely
+            # match earlier bookings of the same vendor
+            candidate = (reference_number, transaction_date, transaction_amount)
+            duplicates = duplicate_checker.check_for_duplicates_batch([candidate])[
+                candidate
+            ]
 
             if duplicates:
                 duplicate_info = duplicate_checker.format_duplicate_info(duplicates)
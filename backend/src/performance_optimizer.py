@@ -7,6 +7,7 @@ from datetime import datetime
 import psutil
 from flask import request
 
+import query_metrics
 from database_migrations import QueryOptimizer
 
 
@@ -328,6 +329,9 @@ def performance_middleware(app):
         # Start timing
         request.start_time = time.time()
 
+        # Count SQL statements, rows and DB time for this request
+        query_metrics.start_request()
+
         # Start memory tracking for API requests
         if request.path.startswith("/api/"):
             tracemalloc.start()
@@ -348,6 +352,10 @@ def performance_middleware(app):
             response.headers["X-Memory-Usage"] = f"{current / 1024:.2f} KB"
             response.headers["X-Memory-Peak"] = f"{peak / 1024:.2f} KB"
 
+        stats = query_metrics.end_request(_endpoint_label())
+        if stats is not None and _query_header_enabled(app):
+            response.headers["X-DB-Queries"] = stats.header_value()
+
         return response
 
     # Add profiler to app context
@@ -356,6 +364,16 @@ def performance_middleware(app):
     return profiler
 
 
+def _endpoint_label():
+    """Route pattern (not the concrete URL) so requests aggregate per endpoint"""
+    rule = request.url_rule.rule if request.url_rule else request.path
+    return f"{request.method} {rule}"
+
+
+def _query_header_enabled(app):
+    return app.debug or os.getenv("QUERY_METRICS_HEADER", "false").lower() == "true"
+
+
 # Memory management utilities
 class MemoryManager:
     """Memory management and reporting"""
@@ -407,9 +425,16 @@ def register_performance_endpoints(app):
             "success": True,
             "performance": report,
             "memory": memory_report,
+            "queries": query_metrics.registry.report(limit=5),
             "timestamp": datetime.now().isoformat(),
         }
 
+    @app.route("/api/performance/queries", methods=["GET"])
+    def query_performance():
+        """Per-endpoint SQL counts, DB time and detected N+1 statements"""
+        limit = request.args.get("limit", 20, type=int)
+        return {"success": True, "queries": query_metrics.registry.report(limit)}
+
     @app.route("/api/performance/analyze", methods=["POST"])
     def analyze_performance():
         """Analyze performance data"""
@@ -437,6 +462,7 @@ def register_performance_endpoints(app):
         # Check for N+1 queries
         query_patterns = data.get("query_patterns", [])
         n_plus_1_report = profiler.detect_n_plus_1_queries(app.db, query_patterns)
+        n_plus_1_report["observed"] = query_metrics.registry.report()["n_plus_1"]
 
         return {
             "success": True,
@@ -0,0 +1,350 @@
+"""
+Per-request SQL instrumentation with N+1 detection
+
+DatabaseManager records every statement executed during a Flask request:
+query count, rows fetched, cumulative DB time and the time spent waiting
+for a pooled connection. get_connection() returns an instrumented
+connection, so callers that open their own cursors are measured as well
+as get_cursor() and execute_query(). Statements are normalized to
+fingerprints (literals and placeholders replaced by ?, IN lists and
+multi-row VALUES collapsed), and a fingerprint that runs more than
+N_PLUS_1_THRESHOLD times in one request is flagged as a likely N+1 loop.
+
+Collection is only active between start_request() and end_request(),
+which performance_middleware calls around each request; outside a request
+(scripts, background jobs) cursors are not wrapped and nothing is
+recorded. Finished requests are summarized into a process-wide
+QueryMetricsRegistry that backs /api/performance/queries.
+
+Usage:
+    import query_metrics
+
+    query_metrics.start_request()
+    ...  # database work
+    stats = query_metrics.end_request("GET /api/reports")
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_1_THRESHOLD = int(os.getenv("N_PLUS_1_THRESHOLD", "10"))
+RECENT_REQUESTS = 200
+
+_current: ContextVar["RequestQueryStats | None"] = ContextVar(
+    "request_query_stats", default=None
+)
+
+_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*", re.DOTALL)
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\?")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_ROWS = re.compile(r"(\(\?\+\))(?:\s*,\s*\(\?\+\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """Normalize a statement so repeated executions share one fingerprint."""
+    text = _COMMENTS.sub(" ", sql)
+    text = _STRINGS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _PLACEHOLDERS.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    text = _IN_LISTS.sub("(?+)", text)
+    text = _VALUES_ROWS.sub(r"\1", text)
+    return text
+
+
+class RequestQueryStats:
+    """Query counters for one request."""
+
+    __slots__ = (
+        "connections",
+        "db_time",
+        "fingerprint_time",
+        "fingerprints",
+        "pool_wait",
+        "queries",
+        "rows",
+    )
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.connections = 0
+        self.fingerprints: Counter = Counter()
+        self.fingerprint_time: Counter = Counter()
+
+    def record_query(self, sql: str, elapsed: float) -> None:
+        key = fingerprint(sql) if isinstance(sql, str) else str(sql)
+        self.queries += 1
+        self.db_time += elapsed
+        self.fingerprints[key] += 1
+        self.fingerprint_time[key] += elapsed
+
+    def n_plus_1(self, threshold: int | None = None) -> list[dict[str, Any]]:
+        """Fingerprints repeated more than threshold times, most frequent first."""
+        limit = N_PLUS_1_THRESHOLD if threshold is None else threshold
+        return [
+            {
+                "fingerprint": key,
+                "count": count,
+                "time_ms": round(self.fingerprint_time[key] * 1000, 2),
+            }
+            for key, count in self.fingerprints.most_common()
+            if count > limit
+        ]
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "rows": self.rows,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "pool_wait_ms": round(self.pool_wait * 1000, 2),
+            "connections": self.connections,
+            "distinct_statements": len(self.fingerprints),
+            "n_plus_1": self.n_plus_1(),
+        }
+
+    def header_value(self) -> str:
+        """Compact form for the X-DB-Queries debug response header."""
+        flagged = self.n_plus_1()
+        value = (
+            f"count={self.queries}; rows={self.rows}; "
+            f"time={self.db_time * 1000:.1f}ms; pool_wait={self.pool_wait * 1000:.1f}ms"
+        )
+        if flagged:
+            value += f"; n_plus_1={len(flagged)} (max {flagged[0]['count']}x)"
+        return value
+
+
+class InstrumentedCursor:
+    """Cursor proxy that reports executes and fetched rows to the request stats."""
+
+    __slots__ = ("_cursor", "_stats")
+
+    def __init__(self, cursor, stats: RequestQueryStats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def execute(self, operation, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, *args, **kwargs)
+        finally:
+            self._stats.record_query(operation, time.perf_counter() - start)
+
+    def executemany(self, operation, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, *args, **kwargs)
+        finally:
+            self._stats.record_query(operation, time.perf_counter() - start)
+
+    def _timed_fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        self._stats.db_time += time.perf_counter() - start
+        return result
+
+    def fetchall(self):
+        rows = self._timed_fetch(self._cursor.fetchall)
+        self._stats.rows += len(rows) if rows else 0
+        return rows
+
+    def fetchmany(self, size=None):
+        args = () if size is None else (size,)
+        rows = self._timed_fetch(self._cursor.fetchmany, *args)
+        self._stats.rows += len(rows) if rows else 0
+        return rows
+
+    def fetchone(self):
+        row = self._timed_fetch(self._cursor.fetchone)
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._stats.rows += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors report to the request stats."""
+
+    __slots__ = ("_conn", "_stats")
+
+    def __init__(self, conn, stats: RequestQueryStats):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_stats", stats)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._stats)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+class QueryMetricsRegistry:
+    """Process-wide aggregate of per-request query stats."""
+
+    def __init__(self, recent: int = RECENT_REQUESTS):
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=recent)
+        self._endpoints: dict[str, dict[str, Any]] = {}
+        self._n_plus_1: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def record(self, endpoint: str, stats: RequestQueryStats) -> None:
+        summary = stats.summary()
+        with self._lock:
+            self._recent.append(
+                {
+                    "endpoint": endpoint,
+                    "timestamp": datetime.now().isoformat(),
+                    **summary,
+                }
+            )
+            totals = self._endpoints.setdefault(
+                endpoint,
+                {
+                    "requests": 0,
+                    "queries": 0,
+                    "rows": 0,
+                    "db_time_ms": 0.0,
+                    "pool_wait_ms": 0.0,
+                    "max_queries": 0,
+                },
+            )
+            totals["requests"] += 1
+            totals["queries"] += summary["queries"]
+            totals["rows"] += summary["rows"]
+            totals["db_time_ms"] += summary["db_time_ms"]
+            totals["pool_wait_ms"] += summary["pool_wait_ms"]
+            totals["max_queries"] = max(totals["max_queries"], summary["queries"])
+
+            for issue in summary["n_plus_1"]:
+                entry = self._n_plus_1.setdefault(
+                    (endpoint, issue["fingerprint"]),
+                    {
+                        "endpoint": endpoint,
+                        "fingerprint": issue["fingerprint"],
+                        "occurrences": 0,
+                        "max_count": 0,
+                        "last_seen": None,
+                    },
+                )
+                entry["occurrences"] += 1
+                entry["max_count"] = max(entry["max_count"], issue["count"])
+                entry["last_seen"] = datetime.now().isoformat()
+
+    def report(self, limit: int = 20) -> dict[str, Any]:
+        with self._lock:
+            endpoints = [
+                {
+                    "endpoint": endpoint,
+                    **totals,
+                    "avg_queries": round(totals["queries"] / totals["requests"], 2),
+                    "avg_db_time_ms": round(
+                        totals["db_time_ms"] / totals["requests"], 2
+                    ),
+                }
+                for endpoint, totals in self._endpoints.items()
+            ]
+            n_plus_1 = sorted(
+                self._n_plus_1.values(),
+                key=lambda e: (e["occurrences"], e["max_count"]),
+                reverse=True,
+            )
+            recent = list(self._recent)[-limit:]
+
+        endpoints.sort(key=lambda e: e["db_time_ms"], reverse=True)
+        return {
+            "threshold": N_PLUS_1_THRESHOLD,
+            "requests_recorded": sum(e["requests"] for e in endpoints),
+            "endpoints": endpoints[:limit],
+            "n_plus_1": [dict(e) for e in n_plus_1[:limit]],
+            "recent": recent,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._endpoints.clear()
+            self._n_plus_1.clear()
+
+
+registry = QueryMetricsRegistry()
+
+
+def start_request() -> RequestQueryStats:
+    """Begin collecting query stats for the current request."""
+    stats = RequestQueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current() -> RequestQueryStats | None:
+    return _current.get()
+
+
+def end_request(endpoint: str | None = None) -> RequestQueryStats | None:
+    """Stop collecting; records the request in the registry when endpoint is given."""
+    stats = _current.get()
+    _current.set(None)
+    if stats is None or endpoint is None:
+        return stats
+
+    registry.record(endpoint, stats)
+    flagged = stats.n_plus_1()
+    if flagged:
+        worst = flagged[0]
+        logger.warning(
+            f"⚠️ Possible N+1 in {endpoint}: {worst['count']}x "
+            f"{worst['fingerprint'][:200]} ({stats.queries} queries, "
+            f"{stats.db_time * 1000:.1f}ms DB time)"
+        )
+    return stats
+
+
+def wrap_cursor(cursor):
+    """Return an instrumented cursor while a request is being measured."""
+    stats = _current.get()
+    if stats is None or isinstance(cursor, InstrumentedCursor):
+        return cursor
+    stats.connections += 1
+    return InstrumentedCursor(cursor, stats)
+
+
+def wrap_connection(conn):
+    """Return a connection with instrumented cursors while a request is measured."""
+    stats = _current.get()
+    if stats is None or isinstance(conn, InstrumentedConnection):
+        return conn
+    stats.connections += 1
+    return InstrumentedConnection(conn, stats)
+
+
+def record_pool_wait(elapsed: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait += elapsed
@@ -25,10 +25,14 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from report_generators import ledger_totals
 from report_generators.common_formatters import escape_html, format_currency, safe_float
 
 logger = logging.getLogger(__name__)
 
+VAT_ACCOUNTS = ["2010", "2020", "2021"]
+REVENUE_ACCOUNTS = ["8001", "8002", "8003"]
+
 
 def generate_btw_report(
     cache: Any, db: Any, administration: str, year: int, quarter: int
@@ -81,11 +85,20 @@ def generate_btw_report(
         # Step 1: Calculate quarter end date
         end_date = _calculate_quarter_end_date(year, quarter)
 
+        # One pass over the cached ledger serves balance and quarter data
+        totals = ledger_totals.account_totals(
+            cache, db, administration, year, VAT_ACCOUNTS + REVENUE_ACCOUNTS
+        )
+
         # Step 2: Get balance data (BTW accounts up to end date)
-        balance_data = _get_balance_data(cache, db, administration, end_date)
+        balance_data = _get_balance_data(
+            cache, db, administration, end_date, totals=totals
+        )
 
         # Step 3: Get quarter data (BTW + revenue accounts for quarter)
-        quarter_data = _get_quarter_data(cache, db, administration, year, quarter)
+        quarter_data = _get_quarter_data(
+            cache, db, administration, year, quarter, totals=totals
+        )
 
         # Step 4: Calculate BTW amounts
         calculations = _calculate_btw_amounts(balance_data, quarter_data)
@@ -149,7 +162,11 @@ def _calculate_quarter_end_date(year: int, quarter: int) -> str:
 
 
 def _get_balance_data(
-    cache: Any, db: Any, administration: str, end_date: str
+    cache: Any,
+    db: Any,
+    administration: str,
+    end_date: str,
+    totals: Any | None = None,
 ) -> list[dict[str, Any]]:
     """
     Get balance data for BTW accounts up to end date.
@@ -165,7 +182,8 @@ def _get_balance_data(
         cache: Cache instance
         db: Database instance
         administration: Administration identifier
-        end_date: End date in YYYY-MM-DD format (e.g., '2026-03-31')
+        end_date: Quarter end date in YYYY-MM-DD format (e.g., '2026-03-31')
+        totals: Optional ledger totals for the year (ledger_totals.account_totals)
 
     Returns:
         List of dictionaries with Reknum, AccountName, and amount
@@ -174,12 +192,19 @@ def _get_balance_data(
         # Extract year from end_date
         year = int(end_date.split("-")[0])
 
+        if totals is None:
+            totals = ledger_totals.account_totals(
+                cache, db, administration, year, VAT_ACCOUNTS
+            )
+
         # Get opening balance for the year (from Opening Balance transactions)
-        opening_balance = _get_opening_balance_vat(cache, db, administration, year)
+        opening_balance = _get_opening_balance_vat(
+            cache, db, administration, year, totals=totals
+        )
 
         # Get current year transactions (excluding opening balance)
         current_year_data = _get_current_year_vat(
-            cache, db, administration, year, end_date
+            cache, db, administration, year, end_date, totals=totals
         )
 
         # Combine opening balance + current year data
@@ -210,7 +235,7 @@ def _get_balance_data(
 
 
 def _get_opening_balance_vat(
-    cache: Any, db: Any, administration: str, year: int
+    cache: Any, db: Any, administration: str, year: int, totals: Any | None = None
 ) -> dict[str, Any] | None:
     """
     Get the opening balance for VAT accounts for the specified year.
@@ -223,26 +248,21 @@ def _get_opening_balance_vat(
         db: Database instance
         administration: Administration identifier
         year: Year to get opening balance for
+        totals: Optional ledger totals for the year
 
     Returns:
         Dictionary with {'amount': net_opening_balance} or None
     """
     try:
-        df = cache.get_data(db, tenant=administration)
-
-        # Filter for opening balance transactions in the specified year
-        df_filtered = df[
-            (df["ReferenceNumber"] == "Opening Balance")
-            & (df["TransactionDate"] == f"{year}-01-01")
-            & (df["administration"] == administration)
-            & (df["Reknum"].isin(["2010", "2020", "2021"]))
-        ].copy()
-
-        if df_filtered.empty:
-            return None
+        if totals is None:
+            totals = ledger_totals.account_totals(
+                cache, db, administration, year, VAT_ACCOUNTS
+            )
 
         # Sum all opening balance amounts (should be just one with netting)
-        total = df_filtered["Amount"].sum()
+        total = ledger_totals.opening_balance(totals, VAT_ACCOUNTS)
+        if total is None:
+            return None
 
         return {"amount": total}
     except Exception as e:
@@ -251,7 +271,12 @@ def _get_opening_balance_vat(
 
 
 def _get_current_year_vat(
-    cache: Any, db: Any, administration: str, year: int, end_date: str
+    cache: Any,
+    db: Any,
+    administration: str,
+    year: int,
+    end_date: str,
+    totals: Any | None = None,
 ) -> list[dict[str, Any]]:
     """
     Get VAT transactions for the current year only (excluding opening balance).
@@ -261,42 +286,34 @@ def _get_current_year_vat(
         db: Database instance
         administration: Administration identifier
         year: Year to get transactions for
-        end_date: End date for the report (e.g., '2026-03-31')
+        end_date: Quarter end date for the report (e.g., '2026-03-31')
+        totals: Optional ledger totals for the year
 
     Returns:
         List of dictionaries with Reknum, AccountName, and amount
     """
     try:
-        df = cache.get_data(db, tenant=administration)
-
-        # Filter by date range (current year up to end_date, excluding opening balance)
-        df_filtered = df[
-            (df["TransactionDate"] >= f"{year}-01-01")
-            & (df["TransactionDate"] <= end_date)
-            & (df["ReferenceNumber"] != "Opening Balance")
-            & (df["administration"] == administration)
-            & (df["Reknum"].isin(["2010", "2020", "2021"]))
-        ].copy()
-
-        # Group by account
-        grouped = df_filtered.groupby(["Reknum", "AccountName"], as_index=False).agg(
-            {"Amount": "sum"}
-        )
-
-        # Rename Amount to amount
-        grouped = grouped.rename(columns={"Amount": "amount"})
-
-        # Convert to list of dicts
-        results = grouped.to_dict("records")
+        if totals is None:
+            totals = ledger_totals.account_totals(
+                cache, db, administration, year, VAT_ACCOUNTS
+            )
 
-        return results
+        # Current year up to the quarter of end_date, excluding opening balance
+        return ledger_totals.year_to_date_rows(
+            totals, VAT_ACCOUNTS, ledger_totals.quarter_of(end_date)
+        )
     except Exception as e:
         logger.error(f"Error getting current year VAT: {e}")
         return []
 
 
 def _get_quarter_data(
-    cache: Any, db: Any, administration: str, year: int, quarter: int
+    cache: Any,
+    db: Any,
+    administration: str,
+    year: int,
+    quarter: int,
+    totals: Any | None = None,
 ) -> list[dict[str, Any]]:
     """
     Get quarter data for BTW and revenue accounts.
@@ -310,37 +327,19 @@ def _get_quarter_data(
         administration: Administration identifier
         year: Year
         quarter: Quarter number
+        totals: Optional ledger totals for the year
 
     Returns:
         List of dictionaries with Reknum, AccountName, and amount
     """
     try:
-        # Get cache data
-        df = cache.get_data(db, tenant=administration)
-
-        # Filter by year and quarter
-        df_filtered = df[
-            (df["jaar"] == int(year)) & (df["kwartaal"] == int(quarter))
-        ].copy()
-
-        # Filter by administration (exact match for tenant isolation)
-        df_filtered = df_filtered[df_filtered["administration"] == administration]
-
-        # Filter by BTW and revenue accounts
-        df_filtered = df_filtered[
-            df_filtered["Reknum"].isin(["2010", "2020", "2021", "8001", "8002", "8003"])
-        ]
-
-        # Group by account
-        grouped = df_filtered.groupby(["Reknum", "AccountName"], as_index=False).agg(
-            {"Amount": "sum"}
-        )
-
-        # Rename Amount to amount
-        grouped = grouped.rename(columns={"Amount": "amount"})
+        accounts = VAT_ACCOUNTS + REVENUE_ACCOUNTS
+        if totals is None:
+            totals = ledger_totals.account_totals(
+                cache, db, administration, year, accounts
+            )
 
-        # Convert to list of dicts
-        results = grouped.to_dict("records")
+        results = ledger_totals.quarter_rows(totals, accounts, quarter)
 
         logger.info(f"Retrieved {len(results)} quarter records for {administration}")
         return results
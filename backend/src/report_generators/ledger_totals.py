@@ -0,0 +1,208 @@
+"""
+Ledger totals for the tax report engines (BTW and Toeristenbelasting).
+
+The reports used to mask the tenant's full cached vw_mutaties frame once
+per figure: the VAT opening balance, the year to date, the quarter and
+every account sum. account_totals() filters the frame once for the report
+year and accounts and sums Amount in one groupby; the report figures are
+then read from that small frame, so generating all four quarters of a
+year only costs one pass over the ledger each.
+
+Totals have one row per Reknum, AccountName, kwartaal and booking kind:
+- opening: ReferenceNumber is 'Opening Balance'
+- first_day: booked on 1 January of the report year
+
+When the cache cannot serve the tenant (e.g. the load failed), the same
+totals come from one grouped query on vw_mutaties.
+
+Usage:
+    from report_generators import ledger_totals
+
+    totals = ledger_totals.account_totals(cache, db, 'ExampleTenant', 2025,
+                                          ['2010', '2020', '2021'])
+    ledger_totals.quarter_rows(totals, ['2010', '2020', '2021'], 1)
+"""
+
+import logging
+from typing import Any
+
+import pandas as pd
+from mysql.connector import Error as MySQLError
+
+from db_exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+OPENING_REFERENCE = "Opening Balance"
+
+TOTALS_KEYS = ["Reknum", "AccountName", "kwartaal", "opening", "first_day"]
+
+QUARTER_ENDS = {"03-31": 1, "06-30": 2, "09-30": 3, "12-31": 4}
+
+ACCOUNT_TOTALS_QUERY = """
+    SELECT Reknum, AccountName, kwartaal,
+        ReferenceNumber = %s AS opening,
+        TransactionDate = %s AS first_day,
+        SUM(Amount) AS Amount
+    FROM vw_mutaties
+    WHERE administration = %s AND jaar = %s AND Reknum IN ({placeholders})
+    GROUP BY Reknum, AccountName, kwartaal, opening, first_day
+"""
+
+ACCOUNT_SUMS_QUERY = """
+    SELECT Reknum, SUM(Amount) AS Amount
+    FROM vw_mutaties
+    WHERE administration = %s AND jaar = %s AND Reknum IN ({placeholders})
+    GROUP BY Reknum
+"""
+
+
+def account_totals(
+    cache: Any, db: Any, administration: str, year: int, accounts: list[str]
+) -> pd.DataFrame:
+    """
+    Amount per account, quarter and booking kind for one tenant and year.
+
+    Args:
+        cache: Mutaties cache instance
+        db: Database instance (cache loading and SQL fallback)
+        administration: Administration identifier
+        year: Report year
+        accounts: Account numbers to include
+
+    Returns:
+        DataFrame with TOTALS_KEYS and Amount columns
+    """
+    year = int(year)
+    try:
+        df = cache.get_data(db, tenant=administration, requested_years=[year])
+    except (DatabaseError, MySQLError) as e:
+        logger.warning(
+            f"Mutaties cache unavailable for {administration} ({e}); "
+            "reading report totals from vw_mutaties"
+        )
+        return _query_account_totals(db, administration, year, accounts)
+
+    df = df[
+        (df["administration"] == administration)
+        & (df["jaar"] == year)
+        & (df["Reknum"].isin(accounts))
+    ]
+    keys = [
+        df["Reknum"],
+        df["AccountName"],
+        df["kwartaal"],
+        (df["ReferenceNumber"] == OPENING_REFERENCE).rename("opening"),
+        (df["TransactionDate"] == f"{year}-01-01").rename("first_day"),
+    ]
+    return df.groupby(keys, observed=True)["Amount"].sum().reset_index()
+
+
+def _query_account_totals(
+    db: Any, administration: str, year: int, accounts: list[str]
+) -> pd.DataFrame:
+    try:
+        query = ACCOUNT_TOTALS_QUERY.format(
+            placeholders=", ".join(["%s"] * len(accounts))
+        )
+        rows = db.execute_query(
+            query,
+            (OPENING_REFERENCE, f"{year}-01-01", administration, year, *accounts),
+        )
+        totals = pd.DataFrame(rows or [], columns=TOTALS_KEYS + ["Amount"])
+        totals["opening"] = totals["opening"].astype(bool)
+        totals["first_day"] = totals["first_day"].astype(bool)
+        totals["Amount"] = totals["Amount"].astype(float)
+        return totals
+    except (DatabaseError, MySQLError) as e:
+        logger.error(f"Error querying report totals for {administration}: {e}")
+        return pd.DataFrame(columns=TOTALS_KEYS + ["Amount"])
+
+
+def quarter_of(end_date: str) -> int:
+    """
+    Quarter (1-4) that ends on a YYYY-MM-DD date.
+
+    Totals are kept per quarter, so year_to_date_rows() can only stand in
+    for a "1 January up to end_date" filter when end_date is the last day
+    of a quarter. Any other date raises ValueError.
+    """
+    quarter = QUARTER_ENDS.get(end_date[5:])
+    if quarter is None:
+        raise ValueError(f"Report end date {end_date} is not the last day of a quarter")
+    return quarter
+
+
+def opening_balance(totals: pd.DataFrame, accounts: list[str]) -> float | None:
+    """Sum of the 1 January 'Opening Balance' bookings, or None if there are none."""
+    rows = totals[
+        totals["opening"] & totals["first_day"] & totals["Reknum"].isin(accounts)
+    ]
+    if rows.empty:
+        return None
+    return rows["Amount"].sum()
+
+
+def year_to_date_rows(
+    totals: pd.DataFrame, accounts: list[str], quarter: int
+) -> list[dict[str, Any]]:
+    """Per-account amounts for 1 January up to the quarter end (no opening balances)."""
+    return _account_rows(
+        totals[
+            ~totals["opening"]
+            & (totals["kwartaal"] <= int(quarter))
+            & totals["Reknum"].isin(accounts)
+        ]
+    )
+
+
+def quarter_rows(
+    totals: pd.DataFrame, accounts: list[str], quarter: int
+) -> list[dict[str, Any]]:
+    """Per-account amounts booked in the quarter."""
+    return _account_rows(
+        totals[(totals["kwartaal"] == int(quarter)) & totals["Reknum"].isin(accounts)]
+    )
+
+
+def _account_rows(totals: pd.DataFrame) -> list[dict[str, Any]]:
+    grouped = totals.groupby(
+        ["Reknum", "AccountName"], as_index=False, observed=True
+    ).agg({"Amount": "sum"})
+    return grouped.rename(columns={"Amount": "amount"}).to_dict("records")
+
+
+def account_sums(
+    cache: Any, db: Any, year: int, accounts: list[str], tenant: str | None = None
+) -> dict[str, float]:
+    """
+    Amount per account for one year, in one filtered groupby.
+
+    Args:
+        cache: Mutaties cache instance
+        db: Database instance (cache loading and SQL fallback)
+        year: Report year
+        accounts: Account numbers to include
+        tenant: Optional tenant identifier (administration)
+
+    Returns:
+        Dictionary of Reknum -> summed Amount (0.0 for accounts without bookings)
+    """
+    year = int(year)
+    try:
+        df = cache.get_data(db, tenant=tenant, requested_years=[year])
+        df = df[(df["jaar"] == year) & (df["Reknum"].isin(accounts))]
+        sums = df.groupby("Reknum", observed=True)["Amount"].sum()
+    except (DatabaseError, MySQLError) as e:
+        if tenant is None:
+            raise
+        logger.warning(
+            f"Mutaties cache unavailable for {tenant} ({e}); "
+            "reading account sums from vw_mutaties"
+        )
+        query = ACCOUNT_SUMS_QUERY.format(
+            placeholders=", ".join(["%s"] * len(accounts))
+        )
+        rows = db.execute_query(query, (tenant, year, *accounts))
+        sums = {row["Reknum"]: float(row["Amount"] or 0) for row in rows or []}
+    return {account: sums.get(account, 0.0) for account in accounts}
@@ -26,6 +26,10 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from mysql.connector import Error as MySQLError
+
+from db_exceptions import DatabaseError
+from report_generators import ledger_totals
 from report_generators.common_formatters import (
     escape_html,
     format_amount,
@@ -34,6 +38,9 @@ from report_generators.common_formatters import (
 
 logger = logging.getLogger(__name__)
 
+REVENUE_ACCOUNT = "8003"
+SERVICE_FEE_ACCOUNT = "4007"
+
 
 def generate_toeristenbelasting_report(
     cache: Any, bnb_cache: Any, db: Any, year: int, tenant: str | None = None
@@ -143,7 +150,7 @@ def generate_toeristenbelasting_report(
 
         return {"success": True, "template_data": template_data, "raw_data": raw_data}
 
-    except Exception as e:
+    except (DatabaseError, MySQLError, KeyError, TypeError, ValueError) as e:
         logger.error(f"Failed to generate Toeristenbelasting report: {e}")
         return {"success": False, "error": str(e)}
 
@@ -187,14 +194,17 @@ def _get_bnb_data(
         }
     """
     try:
-        # Get all bookings for the year
+        # Get all bookings for the year (one cache query)
         all_bookings = bnb_cache.query_by_year(db, year, tenant=tenant)
 
-        # Get cancelled bookings
-        cancelled_bookings = bnb_cache.query_cancelled_by_year(db, year, tenant=tenant)
-
-        # Get realised bookings
-        realised_bookings = bnb_cache.query_realised_by_year(db, year, tenant=tenant)
+        # Split into cancelled and realised bookings in memory
+        cancelled_bookings = []
+        realised_bookings = []
+        for booking in all_bookings:
+            if booking.get("status") == "cancelled":
+                cancelled_bookings.append(booking)
+            else:
+                realised_bookings.append(booking)
 
         logger.info(
             f"BNB data for {year}: {len(all_bookings)} total, "
@@ -207,7 +217,7 @@ def _get_bnb_data(
             "realised_bookings": realised_bookings,
         }
 
-    except Exception as e:
+    except (DatabaseError, MySQLError) as e:
         logger.error(f"Error getting BNB data: {e}")
         return {"all_bookings": [], "cancelled_bookings": [], "realised_bookings": []}
 
@@ -297,15 +307,25 @@ def _get_financial_data(
             'no_show_omzet': No-show revenue
         }
     """
+    # Sum accounts 8003 and 4007 in one pass over the cached ledger
+    sums = _get_account_sums(cache, db, year, tenant=tenant)
+
     # Get tourist tax from account 8003 using rate from TaxRateService
     saldo_toeristenbelasting = abs(
         _get_tourist_tax_from_account(
-            cache, db, year, tax_rate_service=tax_rate_service, tenant=tenant
+            cache,
+            db,
+            year,
+            tax_rate_service=tax_rate_service,
+            tenant=tenant,
+            sums=sums,
         )
     )
 
     # Get total revenue from account 8003
-    total_revenue_8003 = abs(_get_total_revenue_8003(cache, db, year, tenant=tenant))
+    total_revenue_8003 = abs(
+        _get_total_revenue_8003(cache, db, year, tenant=tenant, sums=sums)
+    )
 
     # Calculate revenue excluding VAT and tourist tax
     ontvangsten_excl_btw_excl_toeristenbelasting = (
@@ -317,7 +337,7 @@ def _get_financial_data(
 
     # Get service fees from account 4007 (make positive)
     kortingen_provisie_commissie = abs(
-        _get_service_fees(cache, db, year, tenant=tenant)
+        _get_service_fees(cache, db, year, tenant=tenant, sums=sums)
     )
 
     # Calculate no-show revenue: amountGross - amountVat for cancelled bookings
@@ -336,8 +356,38 @@ def _get_financial_data(
     }
 
 
+def _get_account_sums(
+    cache: Any, db: Any, year: int, tenant: str | None = None
+) -> dict[str, float] | None:
+    """
+    Sum the revenue (8003) and service fee (4007) accounts for the year.
+
+    Args:
+        cache: Cache instance
+        db: Database instance
+        year: Report year
+        tenant: Optional tenant filter
+
+    Returns:
+        Dictionary of Reknum -> amount, or None if the ledger is unavailable
+        (the account helpers then report 0)
+    """
+    try:
+        return ledger_totals.account_sums(
+            cache, db, year, [REVENUE_ACCOUNT, SERVICE_FEE_ACCOUNT], tenant=tenant
+        )
+    except (DatabaseError, MySQLError) as e:
+        logger.error(f"Error getting account sums: {e}")
+        return None
+
+
 def _get_tourist_tax_from_account(
-    cache: Any, db: Any, year: int, tax_rate_service=None, tenant: str | None = None
+    cache: Any,
+    db: Any,
+    year: int,
+    tax_rate_service=None,
+    tenant: str | None = None,
+    sums: dict[str, float] | None = None,
 ) -> float:
     """
     Calculate tourist tax from account 8003 using rate from TaxRateService.
@@ -348,20 +398,20 @@ def _get_tourist_tax_from_account(
         year: Report year
         tax_rate_service: Optional TaxRateService for rate lookup
         tenant: Tenant administration name
+        sums: Optional account sums from _get_account_sums
 
     Returns:
-        Tourist tax amount
+        Tourist tax amount (0 when the ledger is unavailable)
     """
+    if sums is None:
+        sums = _get_account_sums(cache, db, year, tenant=tenant)
+    if sums is None:
+        return 0
+    total_8003 = sums[REVENUE_ACCOUNT]
+
     try:
         from datetime import date as date_type
 
-        df = cache.get_data(db, tenant=tenant)
-
-        # Filter by year and account 8003
-        df_filtered = df[(df["jaar"] == int(year)) & (df["Reknum"] == "8003")].copy()
-
-        total_8003 = df_filtered["Amount"].sum()
-
         # Get tourist tax rate from service or use default
         tourist_rate = 6.02
         if tax_rate_service and tenant:
@@ -377,13 +427,17 @@ def _get_tourist_tax_from_account(
 
         return tourist_tax
 
-    except Exception as e:
+    except (DatabaseError, MySQLError, KeyError, TypeError, ValueError) as e:
         logger.error(f"Error calculating tourist tax: {e}")
         return 0
 
 
 def _get_total_revenue_8003(
-    cache: Any, db: Any, year: int, tenant: str | None = None
+    cache: Any,
+    db: Any,
+    year: int,
+    tenant: str | None = None,
+    sums: dict[str, float] | None = None,
 ) -> float:
     """
     Get total revenue from account 8003.
@@ -393,25 +447,24 @@ def _get_total_revenue_8003(
         db: Database instance
         year: Report year
         tenant: Optional tenant filter
+        sums: Optional account sums from _get_account_sums
 
     Returns:
-        Total revenue amount
+        Total revenue amount (0 when the ledger is unavailable)
     """
-    try:
-        df = cache.get_data(db, tenant=tenant)
-
-        # Filter by year and account 8003
-        df_filtered = df[(df["jaar"] == int(year)) & (df["Reknum"] == "8003")].copy()
-
-        return df_filtered["Amount"].sum()
-
-    except Exception as e:
-        logger.error(f"Error getting total revenue 8003: {e}")
+    if sums is None:
+        sums = _get_account_sums(cache, db, year, tenant=tenant)
+    if sums is None:
         return 0
+    return sums[REVENUE_ACCOUNT]
 
 
 def _get_service_fees(
-    cache: Any, db: Any, year: int, tenant: str | None = None
+    cache: Any,
+    db: Any,
+    year: int,
+    tenant: str | None = None,
+    sums: dict[str, float] | None = None,
 ) -> float:
     """
     Get service fees from account 4007 (Service Fee bookingssites).
@@ -421,21 +474,16 @@ def _get_service_fees(
         db: Database instance
         year: Report year
         tenant: Optional tenant filter
+        sums: Optional account sums from _get_account_sums
 
     Returns:
-        Service fees amount
+        Service fees amount (0 when the ledger is unavailable)
     """
-    try:
-        df = cache.get_data(db, tenant=tenant)
-
-        # Filter by year and account 4007
-        df_filtered = df[(df["jaar"] == int(year)) & (df["Reknum"] == "4007")].copy()
-
-        return df_filtered["Amount"].sum()
-
-    except Exception as e:
-        logger.error(f"Error getting service fees 4007: {e}")
+    if sums is None:
+        sums = _get_account_sums(cache, db, year, tenant=tenant)
+    if sums is None:
         return 0
+    return sums[SERVICE_FEE_ACCOUNT]
 
 
 def _calculate_taxable_revenue(financial_data: dict[str, float]) -> dict[str, float]:
@@ -16,6 +16,7 @@ from flask.typing import ResponseReturnValue
 
 from auth.cognito_utils import cognito_required
 from auth.tenant_context import tenant_required
+from banking_balance_engine import DEFAULT_GAP_PAGE_SIZE
 from db_exceptions import ClosedPeriodError
 from services.banking_service import BankingService
 
@@ -450,9 +451,11 @@ def banking_check_revolut_balance(
         account_code = request.args.get("account_code", "1022")
         start_date = request.args.get("start_date", "2025-05-01")
         expected_balance = float(request.args.get("expected_balance", "262.54"))
+        page = request.args.get("page", 1, type=int)
+        page_size = request.args.get("page_size", DEFAULT_GAP_PAGE_SIZE, type=int)
 
         result = banking_service.check_revolut_balance(
-            iban, account_code, start_date, expected_balance
+            iban, account_code, start_date, expected_balance, page, page_size
         )
         return jsonify(result)
 
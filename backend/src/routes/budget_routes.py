@@ -288,6 +288,39 @@ def budget_create_line(
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@budget_bp.route("/api/budget/versions/<int:version_id>/lines/bulk", methods=["POST"])
+@cognito_required(required_permissions=["finance_write"])
+@tenant_required()
+def budget_bulk_upsert_lines(
+    user_email, user_roles, tenant, user_tenants, version_id
+) -> ResponseReturnValue:
+    """Create or update many budget lines of a version in one request."""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"success": False, "error": "Request body is required"}), 400
+
+        lines = data.get("lines")
+        if not isinstance(lines, list) or not lines:
+            return jsonify(
+                {"success": False, "error": "lines must be a non-empty list"}
+            ), 400
+        if not all(isinstance(line, dict) for line in lines):
+            return jsonify(
+                {"success": False, "error": "each line must be an object"}
+            ), 400
+
+        result = budget_service.bulk_upsert_lines(tenant, version_id, lines)
+
+        if result["success"]:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+    except Exception as e:
+        print(f"Budget bulk upsert lines error: {e}", flush=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @budget_bp.route("/api/budget/lines/<int:line_id>", methods=["PUT"])
 @cognito_required(required_permissions=["finance_write"])
 @tenant_required()
@@ -32,6 +32,7 @@ from auth.tenant_context import (
 )
 from database import DatabaseManager
 from dialect_helpers import dialect
+from services.budget_actuals_matrix import invalidate_actuals_matrix
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -483,6 +484,8 @@ def create_account(user_email, user_roles) -> ResponseReturnValue:
             commit=True,
         )
 
+        invalidate_actuals_matrix(tenant)
+
         # Audit log (TODO: Implement proper audit logging)
         logger.info(
             f"CREATE_ACCOUNT: {user_email} created account {account} for tenant {tenant}"
@@ -668,6 +671,8 @@ def update_account(user_email, user_roles, account) -> ResponseReturnValue:
             commit=True,
         )
 
+        invalidate_actuals_matrix(tenant)
+
         # Audit log (TODO: Implement proper audit logging)
         logger.info(
             f"UPDATE_ACCOUNT: {user_email} updated account {account} for tenant {tenant}"
@@ -773,6 +778,8 @@ def delete_account(user_email, user_roles, account) -> ResponseReturnValue:
 
         db.execute_query(delete_query, (tenant, account), fetch=False, commit=True)
 
+        invalidate_actuals_matrix(tenant)
+
         # Audit log (TODO: Implement proper audit logging)
         logger.info(
             f"DELETE_ACCOUNT: {user_email} deleted account {account} for tenant {tenant}"
@@ -10,7 +10,7 @@ from flask.typing import ResponseReturnValue
 
 from auth.cognito_utils import cognito_required
 from database import DatabaseManager
-from duplicate_checker import DuplicateChecker
+from duplicate_checker import DuplicateChecker, ValidationError
 
 # Create blueprint
 duplicate_detection_bp = Blueprint("duplicate_detection", __name__)
@@ -91,6 +91,66 @@ def check_duplicate(user_email, user_roles) -> ResponseReturnValue:
         ), 200
 
 
+@duplicate_detection_bp.route("/api/check-duplicates-batch", methods=["POST"])
+@cognito_required(required_permissions=["invoices_read"])
+def check_duplicates_batch(user_email, user_roles) -> ResponseReturnValue:
+    """Check many transactions for duplicates with a single database query"""
+    try:
+        data = request.get_json() or {}
+        transactions = data.get("transactions")
+        if not isinstance(transactions, list) or not transactions:
+            return jsonify(
+                {"success": False, "error": "Missing required field: transactions"}
+            ), 400
+
+        candidates = []
+        for transaction in transactions:
+            for field in ("referenceNumber", "transactionDate", "transactionAmount"):
+                if field not in transaction:
+                    return jsonify(
+                        {"success": False, "error": f"Missing required field: {field}"}
+                    ), 400
+            candidates.append(
+                (
+                    transaction["referenceNumber"],
+                    transaction["transactionDate"],
+                    float(transaction["transactionAmount"]),
+                )
+            )
+
+        table_name = data.get("tableName", "mutaties")
+        db_manager = DatabaseManager(test_mode=flag)
+        duplicate_checker = DuplicateChecker(db_manager)
+        matches = duplicate_checker.check_for_duplicates_batch(candidates, table_name)
+
+        results = []
+        for candidate in candidates:
+            duplicate_info = duplicate_checker.format_duplicate_info(matches[candidate])
+            duplicate_info.update(
+                {
+                    "referenceNumber": candidate[0],
+                    "transactionDate": candidate[1],
+                    "transactionAmount": candidate[2],
+                }
+            )
+            results.append(duplicate_info)
+
+        return jsonify(
+            {
+                "success": True,
+                "results": results,
+                "tableName": table_name,
+                "checkTimestamp": datetime.now().isoformat(),
+            }
+        )
+
+    except (ValueError, ValidationError) as e:
+        return jsonify({"success": False, "error": f"Invalid data format: {e!s}"}), 400
+    except Exception as e:
+        print(f"Batch duplicate check error: {e}", flush=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @duplicate_detection_bp.route("/api/log-duplicate-decision", methods=["POST"])
 @cognito_required(required_permissions=["invoices_create"])
 def log_duplicate_decision(user_email, user_roles) -> ResponseReturnValue:
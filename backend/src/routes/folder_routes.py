@@ -50,6 +50,8 @@ def get_folders(user_email, user_roles) -> ResponseReturnValue:
             ), 400
 
         regex_pattern = request.args.get("regex")
+        # Catch up with folders created by other workers (e.g. after creating one)
+        refresh = request.args.get("refresh", "").lower() in ("1", "true")
         print(
             f"get_folders called for tenant={tenant}, flag={flag}, regex={regex_pattern}",
             flush=True,
@@ -68,7 +70,7 @@ def get_folders(user_email, user_roles) -> ResponseReturnValue:
 
                 if provider == "s3_shared":
                     # S3 tenant: list folders from S3 prefixes
-                    folders = list_s3_folders(tenant)
+                    folders = list_s3_folders(tenant, refresh=refresh)
                     print(
                         f"S3: found {len(folders)} folders for tenant={tenant}",
                         flush=True,
@@ -80,7 +82,7 @@ def get_folders(user_email, user_roles) -> ResponseReturnValue:
                         flush=True,
                     )
                     drive_service = GoogleDriveService(administration=tenant)
-                    drive_folders = drive_service.list_subfolders()
+                    drive_folders = drive_service.list_subfolders(refresh=refresh)
                     print(
                         f"Raw drive_folders result: {type(drive_folders)}, length: {len(drive_folders) if drive_folders else 0}",
                         flush=True,
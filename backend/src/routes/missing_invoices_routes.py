@@ -103,14 +103,10 @@ def upload_receipt(user_email, user_roles, tenant, user_tenants) -> ResponseRetu
         else:
             # Google Drive tenant: use existing Drive service
             drive_service = GoogleDriveService(administration)
-            drive_folders = drive_service.list_subfolders()
-
-            # Find folder ID for supplier
-            folder_id = None
-            for folder in drive_folders:
-                if folder["name"] == supplier_name:
-                    folder_id = folder["id"]
-                    break
+
+            # Find folder ID for supplier (folder index lookup)
+            folder = drive_service.find_subfolder(supplier_name)
+            folder_id = folder["id"] if folder else None
 
             if not folder_id:
                 # Create folder if it doesn't exist
@@ -11,6 +11,8 @@ from typing import Any
 
 import boto3
 
+from services.cognito_directory import directory_index
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
@@ -54,65 +56,28 @@ def get_user_groups(username: str) -> list[str]:
 def get_tenant_user_count(administration: str) -> int:
     """Get count of users with access to a tenant"""
     try:
-        # List all users
-        response = cognito_client.list_users(
-            UserPoolId=USER_POOL_ID,
-            Limit=60,  # Maximum allowed
-        )
-
-        count = 0
-        for user in response.get("Users", []):
-            tenants = get_user_attribute(user, "custom:tenants")
-            if tenants and administration in tenants:
-                count += 1
-
-        # Handle pagination if needed
-        while "PaginationToken" in response:
-            response = cognito_client.list_users(
-                UserPoolId=USER_POOL_ID,
-                Limit=60,
-                PaginationToken=response["PaginationToken"],
-            )
-            for user in response.get("Users", []):
-                tenants = get_user_attribute(user, "custom:tenants")
-                if tenants and administration in tenants:
-                    count += 1
-
-        return count
+        return directory_index.user_count(administration)
     except Exception as e:
         logger.error(f"Error getting tenant user count: {e}")
         return 0
 
 
+def get_tenant_user_counts(administrations: list[str]) -> dict[str, int]:
+    """Get user counts for several tenants from one directory index lookup"""
+    try:
+        return directory_index.user_counts(administrations)
+    except Exception as e:
+        logger.error(f"Error getting tenant user counts: {e}")
+        return {administration: 0 for administration in administrations}
+
+
 def get_tenant_users(administration: str) -> list[dict[str, Any]]:
     """Get all users with access to a tenant"""
     try:
-        # List all users
-        response = cognito_client.list_users(UserPoolId=USER_POOL_ID, Limit=60)
-
-        users = []
-        for user in response.get("Users", []):
-            tenants = get_user_attribute(user, "custom:tenants")
-            if tenants and administration in tenants:
-                email = get_user_attribute(user, "email")
-                groups = get_user_groups(user["Username"])
-                users.append({"email": email, "groups": groups})
-
-        # Handle pagination if needed
-        while "PaginationToken" in response:
-            response = cognito_client.list_users(
-                UserPoolId=USER_POOL_ID,
-                Limit=60,
-                PaginationToken=response["PaginationToken"],
-            )
-            for user in response.get("Users", []):
-                tenants = get_user_attribute(user, "custom:tenants")
-                if tenants and administration in tenants:
-                    email = get_user_attribute(user, "email")
-                    groups = get_user_groups(user["Username"])
-                    users.append({"email": email, "groups": groups})
-
-        return users
+        return [
+            {"email": user.email, "groups": get_user_groups(user.username)}
+            for user in directory_index.tenant_users(administration)
+        ]
     except Exception as e:
         logger.error(f"Error getting tenant users: {e}")
         return []
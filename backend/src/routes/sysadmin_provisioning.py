@@ -17,6 +17,7 @@ from flask.typing import ResponseReturnValue
 from auth.cognito_utils import cognito_required
 from database import DatabaseManager
 from dialect_helpers import dialect
+from services.cognito_directory import directory_index
 
 logger = logging.getLogger(__name__)
 
@@ -237,6 +238,8 @@ def _update_cognito_tenants(email: str, admin_name: str) -> str:
                     {"Name": "custom:tenants", "Value": json.dumps(current_tenants)}
                 ],
             )
+            if pool_id == os.getenv("COGNITO_USER_POOL_ID"):
+                directory_index.set_user_tenants(email, current_tenants, email=email)
         logger.info(
             f"Cognito updated for {email}: custom:tenants = {json.dumps(current_tenants)}"
         )
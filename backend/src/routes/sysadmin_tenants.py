@@ -13,9 +13,11 @@ from flask.typing import ResponseReturnValue
 
 from auth.cognito_utils import cognito_required
 from database import DatabaseManager
+from services.entitlement_cache import invalidate_entitlements
 
 from .sysadmin_helpers import (
     get_tenant_user_count,
+    get_tenant_user_counts,
     get_tenant_users,
     validate_administration_name,
 )
@@ -204,20 +206,26 @@ def list_tenants(user_email, user_roles) -> ResponseReturnValue:
         params.extend([per_page, offset])
         tenants = db.execute_query(query, tuple(params), fetch=True)
 
-        # Get enabled modules for each tenant
-        for tenant in tenants:
-            modules_query = """
-                SELECT module_name 
-                FROM tenant_modules 
-                WHERE administration = %s AND is_active = TRUE
+        # Get enabled modules and user counts for all listed tenants at once
+        administrations = [tenant["administration"] for tenant in tenants]
+        modules_by_tenant = {administration: [] for administration in administrations}
+        if administrations:
+            placeholders = ", ".join(["%s"] * len(administrations))
+            modules_query = f"""
+                SELECT administration, module_name
+                FROM tenant_modules
+                WHERE administration IN ({placeholders}) AND is_active = TRUE
+                ORDER BY administration, module_name
             """
-            modules = db.execute_query(
-                modules_query, (tenant["administration"],), fetch=True
-            )
-            tenant["enabled_modules"] = [m["module_name"] for m in modules]
+            for row in db.execute_query(
+                modules_query, tuple(administrations), fetch=True
+            ):
+                modules_by_tenant[row["administration"]].append(row["module_name"])
+        user_counts = get_tenant_user_counts(administrations)
 
-            # Get user count (this is expensive, consider caching)
-            tenant["user_count"] = get_tenant_user_count(tenant["administration"])
+        for tenant in tenants:
+            tenant["enabled_modules"] = modules_by_tenant[tenant["administration"]]
+            tenant["user_count"] = user_counts.get(tenant["administration"], 0)
 
             # Format dates
             if tenant.get("created_at"):
@@ -643,6 +651,7 @@ def update_tenant_modules(
                     commit=True,
                 )
 
+        invalidate_entitlements(administration)
         logger.info(f"Modules updated for tenant {administration} by {user_email}")
 
         return jsonify(
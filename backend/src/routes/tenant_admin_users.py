@@ -25,6 +25,7 @@ from flask.typing import ResponseReturnValue
 from auth.cognito_utils import cognito_required
 from auth.tenant_context import get_current_tenant, get_user_tenants
 from database import DatabaseManager
+from services.cognito_directory import directory_index
 from services.cognito_service import CognitoService
 from services.email_template_service import EmailTemplateService
 from services.invitation_service import InvitationService
@@ -330,6 +331,7 @@ def create_tenant_user(user_email, user_roles) -> ResponseReturnValue:
                     {"Name": "custom:tenants", "Value": json.dumps(updated_tenants)}
                 ],
             )
+            directory_index.set_user_tenants(username, updated_tenants, email=email)
 
             # Add user roles to DB
             test_mode_flag = os.getenv("TEST_MODE", "false").lower() == "true"
@@ -480,6 +482,7 @@ def create_tenant_user(user_email, user_roles) -> ResponseReturnValue:
                 )
 
                 username = response["User"]["Username"]
+                directory_index.set_user_tenants(username, [tenant], email=email)
 
                 # Update invitation with username
                 invitation_service.create_invitation(
@@ -17,16 +17,19 @@ Key Features:
 """
 
 import logging
+import os
 import threading
 import time
 from collections.abc import Callable
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
 from typing import Any
 
-from mysql.connector import pooling
+import mysql.connector
 
+from connection_pool import ManagedConnectionPool
 from scalability_workers import AsyncProcessingManager, ResourceMonitor
 
 # Configure logging
@@ -39,10 +42,13 @@ class ScalabilityConfig:
     """Configuration for scalability settings"""
 
     # Database Connection Pool Settings
-    db_pool_size: int = 50  # Increased from 5 to 50 (10x improvement)
+    # Max per primary pool; matches gunicorn's threads per worker
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "25"))
+    db_pool_min_size: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))  # Kept open
     db_max_overflow: int = 100  # Additional connections when needed
-    db_pool_timeout: int = 30  # Connection timeout
+    db_pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Checkout wait
     db_pool_recycle: int = 3600  # Recycle connections every hour
+    db_pool_idle_ping_seconds: int = 30  # Ping connections idle longer than this
 
     # Thread Pool Settings
     max_worker_threads: int = 100  # Increased from 4 to 100 (25x improvement)
@@ -52,6 +58,8 @@ class ScalabilityConfig:
     # Async Processing Settings
     async_queue_size: int = 1000  # Queue size for async operations
     batch_processing_size: int = 100  # Batch size for bulk operations
+    # CPU-bound work (pattern analysis); one pool per gunicorn worker
+    process_pool_size: int = int(os.getenv("PROCESS_POOL_SIZE", "2"))
 
     # Performance Monitoring
     monitoring_interval_seconds: int = 30  # Monitor every 30 seconds
@@ -64,18 +72,19 @@ class AdvancedConnectionPool:
     Advanced database connection pool with auto-scaling and monitoring
 
     Features:
-    - Dynamic pool sizing based on load
-    - Connection health monitoring
-    - Automatic failover and recovery
-    - Performance metrics collection
+    - Dynamic pool sizing between min/max bounds based on utilization
+    - Checkout queueing with timeout (PoolTimeoutError) instead of failing over
+    - Connection health checks (ping after idle, recycle by age)
+    - Checkout wait histograms and saturation alerts
     """
 
     def __init__(self, config: ScalabilityConfig, db_config: dict[str, Any]):
         self.config = config
         self.db_config = db_config
-        self.pools = {}  # Multiple pools for different purposes
+        self.pools: dict[str, ManagedConnectionPool] = {}  # One pool per purpose
         self.pool_stats = {}
         self.lock = threading.RLock()
+        self._last_timeouts: dict[str, int] = {}
 
         # Create primary connection pool
         self._create_primary_pool()
@@ -91,38 +100,47 @@ class AdvancedConnectionPool:
         self.monitoring_thread.start()
 
         logger.info(
-            f"🚀 Advanced Connection Pool initialized with {config.db_pool_size} connections"
+            f"🚀 Advanced Connection Pool initialized with "
+            f"{config.db_pool_min_size}-{config.db_pool_size} connections"
         )
 
+    def _create_pool(
+        self, name: str, min_size: int, max_size: int, options: dict[str, Any]
+    ) -> ManagedConnectionPool:
+        connect_config = self.db_config.copy()
+        connect_config.update(options)
+        pool = ManagedConnectionPool(
+            name,
+            partial(mysql.connector.connect, **connect_config),
+            min_size=min(min_size, max_size),
+            max_size=max_size,
+            checkout_timeout=self.config.db_pool_timeout,
+            idle_ping_seconds=self.config.db_pool_idle_ping_seconds,
+            recycle_seconds=self.config.db_pool_recycle,
+        )
+        self.pools[name] = pool
+        self.pool_stats[name] = {"created_at": datetime.now(), "errors": 0}
+        self._last_timeouts[name] = 0
+        return pool
+
     def _create_primary_pool(self):
         """Create primary connection pool for read/write operations"""
         try:
-            pool_config = self.db_config.copy()
-            pool_config.update(
+            self._create_pool(
+                "primary",
+                self.config.db_pool_min_size,
+                self.config.db_pool_size,
                 {
-                    "pool_name": "primary_pool",
-                    "pool_size": self.config.db_pool_size,
-                    "pool_reset_session": True,
-                    "pool_recycle": self.config.db_pool_recycle,
                     "autocommit": False,
                     "charset": "utf8mb4",
                     "collation": "utf8mb4_unicode_ci",
                     "use_unicode": True,
-                    "sql_mode": "STRICT_TRANS_TABLES,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO",
-                }
+                },
             )
 
-            self.pools["primary"] = pooling.MySQLConnectionPool(**pool_config)
-            self.pool_stats["primary"] = {
-                "created_at": datetime.now(),
-                "connections_created": 0,
-                "connections_used": 0,
-                "avg_response_time": 0.0,
-                "errors": 0,
-            }
-
             logger.info(
-                f"✅ Primary connection pool created with {self.config.db_pool_size} connections"
+                f"✅ Primary connection pool created "
+                f"({self.config.db_pool_min_size}-{self.config.db_pool_size} connections)"
             )
 
         except Exception as e:
@@ -132,30 +150,17 @@ class AdvancedConnectionPool:
     def _create_read_only_pool(self):
         """Create read-only connection pool for analytics and reporting"""
         try:
-            pool_config = self.db_config.copy()
-            pool_config.update(
+            self._create_pool(
+                "readonly",
+                max(1, self.config.db_pool_min_size // 2),
+                max(10, self.config.db_pool_size // 5),  # 20% of primary pool
                 {
-                    "pool_name": "readonly_pool",
-                    "pool_size": max(
-                        10, self.config.db_pool_size // 5
-                    ),  # 20% of primary pool
-                    "pool_reset_session": True,
-                    "pool_recycle": self.config.db_pool_recycle,
                     "autocommit": True,  # Read-only operations can auto-commit
                     "charset": "utf8mb4",
                     "collation": "utf8mb4_unicode_ci",
-                }
+                },
             )
 
-            self.pools["readonly"] = pooling.MySQLConnectionPool(**pool_config)
-            self.pool_stats["readonly"] = {
-                "created_at": datetime.now(),
-                "connections_created": 0,
-                "connections_used": 0,
-                "avg_response_time": 0.0,
-                "errors": 0,
-            }
-
             logger.info("✅ Read-only connection pool created")
 
         except Exception as e:
@@ -164,141 +169,139 @@ class AdvancedConnectionPool:
     def _create_analytics_pool(self):
         """Create dedicated pool for analytics and pattern analysis"""
         try:
-            pool_config = self.db_config.copy()
-            pool_config.update(
+            self._create_pool(
+                "analytics",
+                1,
+                max(5, self.config.db_pool_size // 10),  # 10% of primary pool
                 {
-                    "pool_name": "analytics_pool",
-                    "pool_size": max(
-                        5, self.config.db_pool_size // 10
-                    ),  # 10% of primary pool
-                    "pool_reset_session": True,
-                    "pool_recycle": self.config.db_pool_recycle,
                     "autocommit": True,
                     "charset": "utf8mb4",
                     "collation": "utf8mb4_unicode_ci",
-                }
+                },
             )
 
-            self.pools["analytics"] = pooling.MySQLConnectionPool(**pool_config)
-            self.pool_stats["analytics"] = {
-                "created_at": datetime.now(),
-                "connections_created": 0,
-                "connections_used": 0,
-                "avg_response_time": 0.0,
-                "errors": 0,
-            }
-
             logger.info("✅ Analytics connection pool created")
 
         except Exception as e:
             logger.warning(f"⚠️ Failed to create analytics pool, will use primary: {e}")
 
-    @contextmanager
-    def get_connection(self, pool_type: str = "primary"):
+    def checkout(self, pool_type: str = "primary"):
         """
-        Get connection from specified pool with automatic fallback
+        Borrow a connection from the specified pool (primary if unknown)
 
-        Args:
-            pool_type: Type of pool ('primary', 'readonly', 'analytics')
+        Waits up to db_pool_timeout seconds when the pool is saturated and
+        raises PoolTimeoutError after that. close() on the returned
+        connection gives it back to the pool.
         """
-        start_time = time.time()
-        connection = None
-
+        if pool_type not in self.pools:
+            pool_type = "primary"
         try:
-            # Try to get connection from requested pool
-            if pool_type in self.pools:
-                connection = self.pools[pool_type].get_connection()
-            else:
-                # Fallback to primary pool
-                connection = self.pools["primary"].get_connection()
-                pool_type = "primary"
-
-            # Update statistics
-            with self.lock:
-                self.pool_stats[pool_type]["connections_used"] += 1
-
-            yield connection
-
+            return self.pools[pool_type].checkout()
         except Exception as e:
-            # Update error statistics
             with self.lock:
                 self.pool_stats[pool_type]["errors"] += 1
-
             logger.error(f"❌ Connection pool error ({pool_type}): {e}")
             raise
 
+    @contextmanager
+    def get_connection(self, pool_type: str = "primary"):
+        """
+        Get connection from specified pool, returning it when the block exits
+
+        Args:
+            pool_type: Type of pool ('primary', 'readonly', 'analytics')
+        """
+        connection = self.checkout(pool_type)
+        try:
+            yield connection
         finally:
-            # Clean up connection
-            if connection:
-                try:
-                    connection.close()
-                except Exception:
-                    pass
-
-            # Update response time statistics
-            response_time = time.time() - start_time
-            with self.lock:
-                stats = self.pool_stats[pool_type]
-                # Calculate running average
-                current_avg = stats["avg_response_time"]
-                count = stats["connections_used"]
-                stats["avg_response_time"] = (
-                    current_avg * (count - 1) + response_time
-                ) / count
+            connection.close()
 
     def _monitor_pools(self):
         """Monitor connection pools and auto-scale if needed"""
         while True:
             try:
                 time.sleep(self.config.monitoring_interval_seconds)
+                self.adapt_pools()
+            except Exception as e:
+                logger.error(f"❌ Pool monitoring error: {e}")
 
-                for pool_name in self.pools:
-                    try:
-                        # Get pool statistics (if available)
-                        stats = self.pool_stats.get(pool_name, {})
-
-                        # Log pool health
-                        logger.debug(
-                            f"📊 Pool {pool_name}: "
-                            f"Used: {stats.get('connections_used', 0)}, "
-                            f"Avg Response: {stats.get('avg_response_time', 0):.3f}s, "
-                            f"Errors: {stats.get('errors', 0)}"
-                        )
-
-                        # Check for performance issues
-                        avg_response = stats.get("avg_response_time", 0)
-                        if avg_response > self.config.performance_alert_threshold:
-                            logger.warning(
-                                f"⚠️ Pool {pool_name} performance degraded: {avg_response:.3f}s"
-                            )
-
-                    except Exception as e:
-                        logger.error(f"❌ Error monitoring pool {pool_name}: {e}")
+    def adapt_pools(self):
+        """Resize every pool from recent utilization and report saturation"""
+        for pool_name, pool in list(self.pools.items()):
+            try:
+                previous_limit = pool.limit
+                limit = pool.adapt()
+                stats = pool.statistics()
+                wait = stats["checkout_wait"]
+
+                logger.debug(
+                    f"📊 Pool {pool_name}: {stats['in_use']}/{limit} in use, "
+                    f"{stats['open']} open, wait p95: {wait['p95_ms']}ms, "
+                    f"timeouts: {stats['timeouts']}"
+                )
+                if limit != previous_limit:
+                    logger.info(
+                        f"📐 Pool {pool_name} resized {previous_limit} -> {limit} "
+                        f"(bounds {pool.min_size}-{pool.max_size})"
+                    )
+
+                # Alert on saturation: timeouts, or at max size and still queueing
+                new_timeouts = stats["timeouts"] - self._last_timeouts[pool_name]
+                self._last_timeouts[pool_name] = stats["timeouts"]
+                if new_timeouts:
+                    logger.warning(
+                        f"⚠️ Pool {pool_name} saturated: {new_timeouts} checkouts "
+                        f"timed out after {pool.checkout_timeout}s"
+                    )
+                elif limit >= pool.max_size and stats["waiting"]:
+                    logger.warning(
+                        f"⚠️ Pool {pool_name} at max size ({limit}) with "
+                        f"{stats['waiting']} requests waiting"
+                    )
+
+                p95 = (wait["p95_ms"] or 0) / 1000
+                if p95 > self.config.performance_alert_threshold:
+                    logger.warning(
+                        f"⚠️ Pool {pool_name} checkout wait degraded: p95 {p95:.3f}s"
+                    )
 
             except Exception as e:
-                logger.error(f"❌ Pool monitoring error: {e}")
+                logger.error(f"❌ Error monitoring pool {pool_name}: {e}")
 
     def get_pool_statistics(self) -> dict[str, Any]:
         """Get comprehensive pool statistics"""
         with self.lock:
+            pools = {}
+            for pool_name, pool in self.pools.items():
+                stats = pool.statistics()
+                pools[pool_name] = {
+                    **self.pool_stats[pool_name],
+                    **stats,
+                    "connections_used": stats["checkouts"],
+                    # Time spent waiting for a connection, not query time
+                    "avg_response_time": stats["checkout_wait"]["avg_ms"] / 1000,
+                }
             return {
-                "pools": dict(self.pool_stats),
+                "pools": pools,
                 "total_connections_used": sum(
-                    stats.get("connections_used", 0)
-                    for stats in self.pool_stats.values()
-                ),
-                "total_errors": sum(
-                    stats.get("errors", 0) for stats in self.pool_stats.values()
+                    stats["connections_used"] for stats in pools.values()
                 ),
+                "total_errors": sum(stats["errors"] for stats in pools.values()),
+                "total_timeouts": sum(stats["timeouts"] for stats in pools.values()),
                 "avg_response_time": sum(
-                    stats.get("avg_response_time", 0)
-                    for stats in self.pool_stats.values()
+                    stats["avg_response_time"] for stats in pools.values()
                 )
-                / len(self.pool_stats),
+                / max(len(pools), 1),
                 "pool_count": len(self.pools),
                 "monitoring_active": self.monitoring_thread.is_alive(),
             }
 
+    def close(self):
+        """Close idle connections in every pool"""
+        for pool in self.pools.values():
+            pool.close_all()
+
 
 class ScalabilityManager:
     """
@@ -330,7 +333,10 @@ class ScalabilityManager:
         self.stats_lock = threading.Lock()
 
         logger.info("🚀 Scalability Manager initialized successfully")
-        logger.info(f"   📊 Database Pool: {self.config.db_pool_size} connections")
+        logger.info(
+            f"   📊 Database Pool: {self.config.db_pool_min_size}-"
+            f"{self.config.db_pool_size} connections"
+        )
         logger.info(f"   ⚡ Thread Pool: {self.config.max_worker_threads} workers")
         logger.info(
             f"   📈 Monitoring: {self.config.monitoring_interval_seconds}s intervals"
@@ -386,6 +392,7 @@ class ScalabilityManager:
                 "requests_per_second": requests_per_second,
                 "configuration": {
                     "db_pool_size": self.config.db_pool_size,
+                    "db_pool_min_size": self.config.db_pool_min_size,
                     "max_worker_threads": self.config.max_worker_threads,
                     "io_thread_pool_size": self.config.io_thread_pool_size,
                     "cpu_thread_pool_size": self.config.cpu_thread_pool_size,
@@ -437,6 +444,12 @@ class ScalabilityManager:
         if pool_stats.get("total_errors", 0) > 0:
             health_score -= 10
             issues.append(f"Database connection errors: {pool_stats['total_errors']}")
+        if pool_stats.get("total_timeouts", 0) > 0:
+            health_score -= 10
+            issues.append(
+                f"Connection pool saturated: {pool_stats['total_timeouts']} "
+                f"checkout timeouts"
+            )
 
         # Determine status
         if health_score >= 90:
@@ -484,6 +497,11 @@ class ScalabilityManager:
                 "Check database connectivity and increase connection pool size"
             )
 
+        if "Connection pool saturated" in str(issues):
+            recommendations.append(
+                "Raise DB_POOL_SIZE or reduce connection hold time in slow endpoints"
+            )
+
         if not recommendations:
             recommendations.append(
                 "System is performing well - monitor for sustained load"
@@ -497,6 +515,7 @@ class ScalabilityManager:
 
         self.async_manager.shutdown()
         self.resource_monitor.stop_monitoring()
+        self.connection_pool.close()
 
         logger.info("✅ Scalability manager shutdown complete")
 
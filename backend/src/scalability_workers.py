@@ -49,7 +49,9 @@ class AsyncProcessingManager:
 
         # Create process pool for CPU-intensive tasks
         self.process_executor = ProcessPoolExecutor(
-            max_workers=min(4, os.cpu_count() or 1)
+            max_workers=getattr(config, "process_pool_size", None)
+            or os.cpu_count()
+            or 1
         )
 
         # Task queues
@@ -14,6 +14,7 @@ from decimal import Decimal
 from typing import Any
 
 from dialect_helpers import dialect
+from log_sink import get_log_sink
 
 logger = logging.getLogger(__name__)
 
@@ -74,18 +75,15 @@ class AIUsageTracker:
             # Build feature identifier
             feature = f"template_help_{template_type}"
 
-            # Log to database
+            # Log to database (queued and batched off the request thread)
             query = """
                 INSERT INTO ai_usage_log
                 (administration, feature, tokens_used, cost_estimate)
                 VALUES (%s, %s, %s, %s)
             """
 
-            self.db.execute_query(
-                query,
-                [administration, feature, tokens_used, cost_estimate],
-                fetch=False,
-                commit=True,
+            get_log_sink().write(
+                self.db, query, [administration, feature, tokens_used, cost_estimate]
             )
 
             logger.info(
@@ -13,6 +13,7 @@ Extracted from app.py during refactoring (Phase 3.1)
 
 from typing import Any
 
+from banking_balance_engine import DEFAULT_GAP_PAGE_SIZE
 from banking_processor import BankingProcessor
 from database import DatabaseManager
 from db_exceptions import ClosedPeriodError
@@ -531,7 +532,13 @@ class BankingService:
             return {"success": False, "error": str(e)}
 
     def check_revolut_balance(
-        self, iban: str, account_code: str, start_date: str, expected_balance: float
+        self,
+        iban: str,
+        account_code: str,
+        start_date: str,
+        expected_balance: float,
+        page: int = 1,
+        page_size: int | None = DEFAULT_GAP_PAGE_SIZE,
     ) -> dict[str, Any]:
         """
         Check Revolut balance gaps by comparing calculated vs Ref3 balance
@@ -541,6 +548,8 @@ class BankingService:
             account_code (str): Account code
             start_date (str): Start date for check
             expected_balance (float): Expected final balance
+            page (int): 1-based page of gap transactions to return
+            page_size (int | None): Gap transactions per page (None = all)
 
         Returns:
             dict: Result with balance gaps and discrepancies
@@ -553,6 +562,8 @@ class BankingService:
                 account_code=account_code,
                 start_date=start_date,
                 expected_final_balance=expected_balance,
+                page=page,
+                page_size=page_size,
             )
 
             # Return only transactions with gaps (non-zero discrepancies)
@@ -568,6 +579,7 @@ class BankingService:
                     "final_discrepancy": result.get("final_discrepancy"),
                     "balance_gaps_found": result.get("balance_gaps_found"),
                     "transactions_with_gaps": result.get("transactions_with_gaps", []),
+                    "pagination": result.get("pagination"),
                     "summary": result.get("summary"),
                 }
             else:
@@ -0,0 +1,406 @@
+"""
+Monthly account matrices for the budget dashboard.
+
+The dashboard compares budget and actuals per parent, subparent or account
+for a month, quarter, YTD or full-year period. Instead of a grouped SQL
+query over vw_mutaties joined to rekeningschema (and a name lookup) per
+view, both sides are held as an account x 12 months NumPy matrix with
+parent/subparent index maps from the chart of accounts; every period and
+rollup level is then a column slice and a grouped sum.
+
+- Actuals matrices are built from the tenant's cached vw_mutaties frame
+  (mutaties_cache) per fiscal year and kept for as long as the ledger
+  cache serves the same frame: a ledger refresh, eviction or
+  invalidate_cache() yields a new frame and so a rebuild.
+- The chart of accounts is loaded once per ledger frame as well;
+  chart_of_accounts routes and the Excel import call
+  invalidate_actuals_matrix(tenant) after writing rekeningschema.
+- Budget matrices come from one plain budget_lines query per version.
+
+When the ledger cache cannot load the tenant, actuals come from one
+grouped vw_mutaties query (not cached).
+"""
+
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from mysql.connector import Error as MySQLError
+
+from db_exceptions import DatabaseError
+from mutaties_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+MONTHS = 12
+UNASSIGNED = "Unassigned"
+
+CHART_QUERY = """
+    SELECT Account, AccountName, Parent, SubParent
+    FROM rekeningschema
+    WHERE administration = %s
+"""
+
+ACTUALS_QUERY = """
+    SELECT Reknum, maand, SUM(Amount) AS Amount
+    FROM vw_mutaties
+    WHERE administration = %s AND jaar = %s{reference_filter}
+    GROUP BY Reknum, maand
+"""
+
+BUDGET_LINES_QUERY = """
+    SELECT account_code, {months}
+    FROM budget_lines
+    WHERE version_id = %s AND administration = %s
+""".format(months=", ".join(f"month_{i:02d}" for i in range(1, MONTHS + 1)))
+
+BUDGET_REFERENCE_FILTER = """
+      AND detail_dimension_type = 'ReferenceNumber'
+      AND detail_dimension_value = %s
+"""
+
+
+@dataclass(frozen=True)
+class ChartIndex:
+    """Account names and hierarchy of one tenant's chart of accounts."""
+
+    names: dict[str, str] = field(default_factory=dict)
+    parents: dict[str, str] = field(default_factory=dict)
+    subparents: dict[str, str] = field(default_factory=dict)
+
+    def __contains__(self, account: str) -> bool:
+        return account in self.parents
+
+
+@dataclass(frozen=True)
+class MonthlyMatrix:
+    """
+    Amounts per account (rows) and month (columns 0-11).
+
+    booked marks the account/month cells that have ledger rows; None means
+    every row counts in every period (budget lines).
+    """
+
+    accounts: np.ndarray
+    parents: np.ndarray
+    subparents: np.ndarray
+    values: np.ndarray
+    booked: np.ndarray | None = None
+    account_rows: dict[str, int] = field(default_factory=dict)
+    parent_rows: dict[str, np.ndarray] = field(default_factory=dict)
+    subparent_rows: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(
+        cls,
+        chart: ChartIndex,
+        accounts,
+        values: np.ndarray,
+        booked: np.ndarray | None = None,
+    ) -> "MonthlyMatrix":
+        """
+        Build a matrix from per-row account codes and 12 month columns.
+
+        Rows for the same account are summed; accounts missing from the
+        chart are dropped (as the rekeningschema join did).
+        """
+        codes = np.asarray([str(a) for a in accounts], dtype=object)
+        keep = np.fromiter((c in chart for c in codes), dtype=bool, count=len(codes))
+        codes = codes[keep]
+        values = np.asarray(values, dtype=np.float64).reshape(-1, MONTHS)[keep]
+
+        unique, inverse = np.unique(codes, return_inverse=True)
+        summed = np.zeros((len(unique), MONTHS))
+        np.add.at(summed, inverse, values)
+
+        if booked is not None:
+            booked = np.asarray(booked, dtype=bool).reshape(-1, MONTHS)[keep]
+            any_booked = np.zeros((len(unique), MONTHS), dtype=bool)
+            np.logical_or.at(any_booked, inverse, booked)
+            booked = any_booked
+
+        parents = np.array([chart.parents[c] for c in unique], dtype=object)
+        subparents = np.array([chart.subparents[c] for c in unique], dtype=object)
+        return cls(
+            accounts=unique,
+            parents=parents,
+            subparents=subparents,
+            values=summed,
+            booked=booked,
+            account_rows={code: row for row, code in enumerate(unique)},
+            parent_rows=_row_index(parents),
+            subparent_rows=_row_index(subparents),
+        )
+
+    def rollup(
+        self,
+        level: str,
+        months: list[int],
+        parent_code: str | None = None,
+        subparent_code: str | None = None,
+    ) -> dict[str, float]:
+        """
+        Period totals per code at a hierarchy level.
+
+        Args:
+            level: 'parent', 'subparent' (within parent_code) or 'account'
+                (within subparent_code).
+            months: Month numbers (1-12) to include.
+            parent_code: Parent filter for level 'subparent'.
+            subparent_code: SubParent filter for level 'account'.
+
+        Returns:
+            Dict mapping code ("Unassigned" for an empty parent/subparent)
+            to the total rounded to cents.
+        """
+        if level == "parent":
+            rows = np.arange(len(self.accounts))
+            keys = self.parents
+        elif level == "subparent":
+            rows = self.parent_rows.get(parent_code, np.empty(0, dtype=np.intp))
+            keys = self.subparents[rows]
+        else:
+            rows = self.subparent_rows.get(subparent_code, np.empty(0, dtype=np.intp))
+            keys = self.accounts[rows]
+
+        columns = [m - 1 for m in months if 1 <= m <= MONTHS]
+        totals = self.values[np.ix_(rows, columns)].sum(axis=1)
+        if self.booked is not None:
+            present = self.booked[np.ix_(rows, columns)].any(axis=1)
+            keys, totals = keys[present], totals[present]
+        if not len(keys):
+            return {}
+
+        codes, inverse = np.unique(keys, return_inverse=True)
+        sums = np.round(np.bincount(inverse, weights=totals, minlength=len(codes)), 2)
+        return {(code or UNASSIGNED): float(total) for code, total in zip(codes, sums)}
+
+
+def _row_index(keys: np.ndarray) -> dict[str, np.ndarray]:
+    if not len(keys):
+        return {}
+    codes, inverse = np.unique(keys, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(codes)))[:-1]
+    return dict(zip(codes, np.split(order, bounds)))
+
+
+# Cache structure: { tenant: (weakref to ledger frame, chart) }
+_charts: dict[str, tuple[weakref.ref, ChartIndex]] = {}
+# Cache structure: { (tenant, year): (weakref to ledger frame, matrix) }
+_matrices: dict[tuple[str, int], tuple[weakref.ref, MonthlyMatrix]] = {}
+_lock = threading.Lock()
+
+
+def load_chart(db, administration: str) -> ChartIndex:
+    """Load one tenant's chart of accounts with a single query."""
+    rows = db.execute_query(CHART_QUERY, (administration,)) or []
+    names: dict[str, str] = {}
+    parents: dict[str, str] = {}
+    subparents: dict[str, str] = {}
+    for row in rows:
+        account = str(row["Account"])
+        if account in parents:
+            continue
+        names[account] = row.get("AccountName") or ""
+        parents[account] = row.get("Parent") or ""
+        subparents[account] = row.get("SubParent") or ""
+    return ChartIndex(names=names, parents=parents, subparents=subparents)
+
+
+def get_actuals_matrix(
+    db,
+    administration: str,
+    year: int,
+    reference_number: str | None = None,
+    cache: Any = None,
+) -> tuple[ChartIndex, MonthlyMatrix]:
+    """
+    Chart of accounts and monthly actuals matrix for one tenant and year.
+
+    Args:
+        db: DatabaseManager instance (cache loading, chart and SQL fallback)
+        administration: Tenant identifier
+        year: Fiscal year
+        reference_number: Optional ReferenceNumber filter; filtered
+            matrices are built from the cached frame but not kept
+        cache: Mutaties cache instance (defaults to the global cache)
+
+    Returns:
+        (ChartIndex, MonthlyMatrix)
+    """
+    year = int(year)
+    if cache is None:
+        cache = get_cache()
+
+    try:
+        frame = cache.get_data(db, tenant=administration, requested_years=[year])
+    except (DatabaseError, MySQLError) as e:
+        logger.warning(
+            f"Mutaties cache unavailable for {administration} ({e}); "
+            "reading budget actuals from vw_mutaties"
+        )
+        chart = load_chart(db, administration)
+        return chart, _query_actuals(db, chart, administration, year, reference_number)
+
+    chart = _cached_chart(db, administration, frame)
+    if reference_number:
+        return chart, _actuals_from_frame(
+            chart, frame, administration, year, reference_number
+        )
+
+    key = (administration, year)
+    with _lock:
+        cached = _matrices.get(key)
+    if cached and cached[0]() is frame:
+        return chart, cached[1]
+
+    matrix = _actuals_from_frame(chart, frame, administration, year)
+    with _lock:
+        _matrices[key] = (weakref.ref(frame), matrix)
+        _prune()
+    return chart, matrix
+
+
+def get_budget_matrix(
+    db,
+    administration: str,
+    version_id: int,
+    chart: ChartIndex,
+    reference_number: str | None = None,
+) -> MonthlyMatrix:
+    """
+    Monthly budget matrix for one version, from a single budget_lines query.
+
+    Args:
+        db: DatabaseManager instance
+        administration: Tenant identifier
+        version_id: Budget version ID
+        chart: Chart of accounts (from get_actuals_matrix)
+        reference_number: Optional filter on ReferenceNumber detail lines
+
+    Returns:
+        MonthlyMatrix in which every budget line counts in every period
+    """
+    query = BUDGET_LINES_QUERY
+    params: tuple = (version_id, administration)
+    if reference_number:
+        query += BUDGET_REFERENCE_FILTER
+        params = (*params, reference_number)
+
+    rows = db.execute_query(query, params) or []
+    values = np.array(
+        [
+            [float(row.get(f"month_{i:02d}") or 0) for i in range(1, MONTHS + 1)]
+            for row in rows
+        ],
+        dtype=np.float64,
+    ).reshape(-1, MONTHS)
+    return MonthlyMatrix.from_rows(chart, [row["account_code"] for row in rows], values)
+
+
+def invalidate_actuals_matrix(administration: str | None = None) -> None:
+    """Drop cached charts and actuals matrices (all tenants or one tenant)."""
+    with _lock:
+        if administration is None:
+            _charts.clear()
+            _matrices.clear()
+            return
+        _charts.pop(administration, None)
+        for key in [key for key in _matrices if key[0] == administration]:
+            del _matrices[key]
+
+
+def _cached_chart(db, administration: str, frame: pd.DataFrame) -> ChartIndex:
+    with _lock:
+        cached = _charts.get(administration)
+    if cached and cached[0]() is frame:
+        return cached[1]
+
+    chart = load_chart(db, administration)
+    with _lock:
+        _charts[administration] = (weakref.ref(frame), chart)
+    return chart
+
+
+def _prune() -> None:
+    """Drop entries whose ledger frame is gone. Caller holds _lock."""
+    for key in [key for key, (ref, _m) in _matrices.items() if ref() is None]:
+        del _matrices[key]
+    for key in [key for key, (ref, _c) in _charts.items() if ref() is None]:
+        del _charts[key]
+
+
+def _actuals_from_frame(
+    chart: ChartIndex,
+    frame: pd.DataFrame,
+    administration: str,
+    year: int,
+    reference_number: str | None = None,
+) -> MonthlyMatrix:
+    if frame.empty:
+        return MonthlyMatrix.from_rows(
+            chart, [], np.empty((0, MONTHS)), np.empty((0, MONTHS))
+        )
+    mask = (frame["administration"] == administration) & (frame["jaar"] == year)
+    if reference_number:
+        mask &= frame["ReferenceNumber"] == reference_number
+    grouped = (
+        frame[mask]
+        .groupby(["Reknum", "maand"], observed=True)["Amount"]
+        .agg(["sum", "size"])
+    )
+    return _matrix_from_monthly(chart, grouped["sum"], grouped["size"] > 0)
+
+
+def _query_actuals(
+    db,
+    chart: ChartIndex,
+    administration: str,
+    year: int,
+    reference_number: str | None = None,
+) -> MonthlyMatrix:
+    params: tuple = (administration, year)
+    reference_filter = ""
+    if reference_number:
+        reference_filter = " AND ReferenceNumber = %s"
+        params = (*params, reference_number)
+    query = ACTUALS_QUERY.format(reference_filter=reference_filter)
+
+    rows = db.execute_query(query, params) or []
+    sums = pd.Series(
+        [float(row["Amount"] or 0) for row in rows],
+        index=pd.MultiIndex.from_tuples(
+            [(str(row["Reknum"]), int(row["maand"])) for row in rows],
+            names=["Reknum", "maand"],
+        )
+        if rows
+        else pd.MultiIndex.from_arrays([[], []], names=["Reknum", "maand"]),
+        dtype=np.float64,
+    )
+    return _matrix_from_monthly(chart, sums, pd.Series(True, index=sums.index))
+
+
+def _matrix_from_monthly(
+    chart: ChartIndex, sums: pd.Series, booked: pd.Series
+) -> MonthlyMatrix:
+    """Pivot (Reknum, maand) sums into account rows x 12 month columns."""
+    columns = range(1, MONTHS + 1)
+    values = sums.unstack("maand", fill_value=0.0).reindex(
+        columns=columns, fill_value=0.0
+    )
+    present = (
+        booked.unstack("maand", fill_value=False)
+        .reindex(columns=columns, fill_value=False)
+        .reindex(index=values.index, fill_value=False)
+    )
+    return MonthlyMatrix.from_rows(
+        chart,
+        values.index,
+        values.to_numpy(dtype=np.float64),
+        present.to_numpy(dtype=bool),
+    )
@@ -3,17 +3,43 @@ Budget Mutation Service
 
 Handles write operations for budget management:
 - Budget version CRUD and status transitions
-- Budget line creation, update, and deletion
+- Budget line creation, update, deletion, and bulk upsert
 - Budget copy between fiscal years
 """
 
 from datetime import datetime
-from decimal import ROUND_HALF_EVEN, Decimal
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
 from typing import Any
 
 from database import DatabaseManager
+from db_batch import executemany_chunked
 from db_exceptions import IntegrityError
 
+MONTH_COLUMNS = [f"month_{m:02d}" for m in range(1, 13)]
+
+# Keyed on the primary key: lines already in the version carry their id from
+# the snapshot, new ones pass NULL and get a new id (the unique index on the
+# dimension columns does not catch NULL dimensions)
+UPSERT_LINE_QUERY = f"""
+    INSERT INTO budget_lines
+        (id, version_id, administration, account_code, period_mode,
+         detail_dimension_type, detail_dimension_value, notes,
+         {", ".join(MONTH_COLUMNS)})
+    VALUES ({", ".join(["%s"] * 20)})
+    ON DUPLICATE KEY UPDATE
+        period_mode = VALUES(period_mode),
+        notes = COALESCE(VALUES(notes), notes),
+        {", ".join(f"{col} = VALUES({col})" for col in MONTH_COLUMNS)}
+"""
+
+COPY_LINE_QUERY = f"""
+    INSERT INTO budget_lines
+        (version_id, administration, account_code, period_mode,
+         detail_dimension_type, detail_dimension_value,
+         {", ".join(MONTH_COLUMNS)})
+    VALUES ({", ".join(["%s"] * 18)})
+"""
+
 
 class BudgetMutationService:
     """Write-only service for budget mutations (create, update, delete).
@@ -427,32 +453,13 @@ class BudgetMutationService:
             Dict with 'success' and 'data' or 'error'.
         """
         # Compute 12 monthly amounts based on period_mode
-        if period_mode == "Monthly":
-            if amounts is None or len(amounts) != 12:
-                return {
-                    "success": False,
-                    "error": "Monthly mode requires exactly 12 amounts",
-                }
-            monthly_amounts = [self.round_monetary(Decimal(str(a))) for a in amounts]
-        elif period_mode == "Annual":
-            if annual_amount is None:
-                return {
-                    "success": False,
-                    "error": "Annual mode requires an annual_amount",
-                }
-            monthly_amounts = self.divide_annual(Decimal(str(annual_amount)))
-        else:
-            return {
-                "success": False,
-                "error": "Invalid period_mode. Use 'Monthly' or 'Annual'",
-            }
-
-        # Build dimension description for error messages
-        dim_desc = (
-            f"{detail_dimension_type}={detail_dimension_value}"
-            if detail_dimension_type
-            else "none"
+        monthly_amounts, error = self._line_monthly_amounts(
+            period_mode, amounts, annual_amount
         )
+        if error:
+            return {"success": False, "error": error}
+
+        dim_desc = self._dimension_desc(detail_dimension_type, detail_dimension_value)
 
         try:
             line_id = self.db.execute_query(
@@ -604,6 +611,135 @@ class BudgetMutationService:
 
         return {"success": True, "data": {"id": line_id, "deleted": True}}
 
+    def bulk_upsert_lines(
+        self,
+        administration: str,
+        version_id: int,
+        lines: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """
+        Create or update many budget lines of a version in one transaction.
+
+        Each line takes the same fields as create_line. All account codes are
+        checked against one prefetched set from the chart of accounts, lines
+        already in the version (same account and dimension) are updated, and
+        all valid lines are written with one chunked multi-row
+        INSERT ... ON DUPLICATE KEY UPDATE. Invalid lines are reported per
+        line and do not block the others.
+
+        Args:
+            administration: Tenant identifier.
+            version_id: The budget version to write the lines to.
+            lines: Line dicts with account_code, period_mode, amounts or
+                annual_amount, and optional detail_dimension_type,
+                detail_dimension_value and notes.
+
+        Returns:
+            Dict with 'success' and 'data' containing per-line results
+            (index, account_code, status 'created'/'updated'/'error', and
+            total or error) plus created/updated/failed counts.
+        """
+        versions = self.db.execute_query(
+            "SELECT id FROM budget_versions WHERE id = %s AND administration = %s",
+            (version_id, administration),
+        )
+        if not versions:
+            return {"success": False, "error": "Budget version not found"}
+
+        known_accounts = self._existing_accounts(
+            administration, [line.get("account_code") for line in lines]
+        )
+        existing_rows = self.db.execute_query(
+            """
+            SELECT id, account_code, detail_dimension_type, detail_dimension_value
+            FROM budget_lines
+            WHERE version_id = %s AND administration = %s
+            """,
+            (version_id, administration),
+        )
+        existing_ids = {
+            (
+                row["account_code"],
+                row["detail_dimension_type"],
+                row["detail_dimension_value"],
+            ): row["id"]
+            for row in existing_rows or []
+        }
+
+        results: list[dict[str, Any]] = []
+        upserts: list[tuple] = []
+        seen: set[tuple] = set()
+
+        for index, line in enumerate(lines):
+            account_code = line.get("account_code")
+            dim_type = line.get("detail_dimension_type")
+            dim_value = line.get("detail_dimension_value")
+            key = (account_code, dim_type, dim_value)
+            result: dict[str, Any] = {"index": index, "account_code": account_code}
+            results.append(result)
+
+            monthly_amounts, error = self._line_monthly_amounts(
+                line.get("period_mode"), line.get("amounts"), line.get("annual_amount")
+            )
+            if not account_code:
+                error = "account_code is required"
+            elif not isinstance(account_code, str):
+                error = "account_code must be a string"
+            elif account_code not in known_accounts:
+                error = f"Account {account_code} not found in chart of accounts"
+            elif not all(
+                value is None or isinstance(value, str)
+                for value in (dim_type, dim_value)
+            ):
+                error = (
+                    "detail_dimension_type and detail_dimension_value must be strings"
+                )
+            elif not error and key in seen:
+                error = (
+                    f"Duplicate line for account {account_code} with dimension "
+                    f"{self._dimension_desc(dim_type, dim_value)}"
+                )
+            if error:
+                result.update({"status": "error", "error": error})
+                continue
+
+            seen.add(key)
+            line_id = existing_ids.get(key)
+            result.update(
+                {
+                    "status": "updated" if line_id else "created",
+                    "total": float(sum(monthly_amounts)),
+                }
+            )
+            upserts.append(
+                (
+                    line_id,
+                    version_id,
+                    administration,
+                    account_code,
+                    line["period_mode"],
+                    dim_type,
+                    dim_value,
+                    line.get("notes"),
+                    *monthly_amounts,
+                )
+            )
+
+        if upserts:
+            with self.db.transaction() as (cursor, _conn):
+                executemany_chunked(cursor, UPSERT_LINE_QUERY, upserts)
+
+        statuses = [result["status"] for result in results]
+        return {
+            "success": True,
+            "data": {
+                "results": results,
+                "created": statuses.count("created"),
+                "updated": statuses.count("updated"),
+                "failed": statuses.count("error"),
+            },
+        }
+
     # -------------------------------------------------------------------------
     # Copy Budget
     # -------------------------------------------------------------------------
@@ -672,21 +808,19 @@ class BudgetMutationService:
 
         source_lines = source_lines if source_lines else []
 
-        # 4. For each line, check if account_code still exists in rekeningschema
+        # 4. Keep lines whose account_code still exists in rekeningschema
+        known_accounts = self._existing_accounts(
+            administration, [line["account_code"] for line in source_lines]
+        )
         excluded_accounts: list[str] = []
         lines_to_copy: list[dict[str, Any]] = []
 
         for line in source_lines:
             account_code = line["account_code"]
-            account_exists = self.db.execute_query(
-                "SELECT Account FROM rekeningschema WHERE administration = %s AND Account = %s",
-                (administration, account_code),
-            )
-            if account_exists:
+            if account_code in known_accounts:
                 lines_to_copy.append(line)
-            else:
-                if account_code not in excluded_accounts:
-                    excluded_accounts.append(account_code)
+            elif account_code not in excluded_accounts:
+                excluded_accounts.append(account_code)
 
         # 5. Create new version and copy lines atomically
         try:
@@ -702,39 +836,23 @@ class BudgetMutationService:
                 )
                 new_version_id = cursor.lastrowid
 
-                # 6. Copy lines where account exists
-                for line in lines_to_copy:
-                    cursor.execute(
-                        """
-                        INSERT INTO budget_lines
-                            (version_id, administration, account_code, period_mode,
-                             detail_dimension_type, detail_dimension_value,
-                             month_01, month_02, month_03, month_04, month_05, month_06,
-                             month_07, month_08, month_09, month_10, month_11, month_12)
-                        VALUES (%s, %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s, %s, %s)
-                        """,
-                        (
-                            new_version_id,
-                            administration,
-                            line["account_code"],
-                            line["period_mode"],
-                            line["detail_dimension_type"],
-                            line["detail_dimension_value"],
-                            line["month_01"],
-                            line["month_02"],
-                            line["month_03"],
-                            line["month_04"],
-                            line["month_05"],
-                            line["month_06"],
-                            line["month_07"],
-                            line["month_08"],
-                            line["month_09"],
-                            line["month_10"],
-                            line["month_11"],
-                            line["month_12"],
-                        ),
+                # 6. Copy lines where account exists in one multi-row insert
+                if lines_to_copy:
+                    executemany_chunked(
+                        cursor,
+                        COPY_LINE_QUERY,
+                        [
+                            (
+                                new_version_id,
+                                administration,
+                                line["account_code"],
+                                line["period_mode"],
+                                line["detail_dimension_type"],
+                                line["detail_dimension_value"],
+                                *(line[col] for col in MONTH_COLUMNS),
+                            )
+                            for line in lines_to_copy
+                        ],
                     )
         except IntegrityError:
             return {
@@ -742,7 +860,7 @@ class BudgetMutationService:
                 "error": f"Budget version '{version_name}' already exists for fiscal year {target_fiscal_year}",
             }
 
-        # 8. Return result
+        # 7. Return result
         return {
             "success": True,
             "data": {
@@ -752,6 +870,57 @@ class BudgetMutationService:
             },
         }
 
+    # -------------------------------------------------------------------------
+    # Line Utilities
+    # -------------------------------------------------------------------------
+
+    def _line_monthly_amounts(
+        self,
+        period_mode: str | None,
+        amounts: list[float] | None,
+        annual_amount: float | None,
+    ) -> tuple[list[Decimal], str | None]:
+        """
+        Compute the 12 monthly amounts of a line from its period mode.
+
+        Returns:
+            Tuple of (monthly amounts, error message or None).
+        """
+        try:
+            if period_mode == "Monthly":
+                if amounts is None or len(amounts) != 12:
+                    return [], "Monthly mode requires exactly 12 amounts"
+                return [self.round_monetary(Decimal(str(a))) for a in amounts], None
+            if period_mode == "Annual":
+                if annual_amount is None:
+                    return [], "Annual mode requires an annual_amount"
+                return self.divide_annual(Decimal(str(annual_amount))), None
+        except (InvalidOperation, TypeError, ValueError):
+            return [], "Amounts must be numeric"
+        return [], "Invalid period_mode. Use 'Monthly' or 'Annual'"
+
+    @staticmethod
+    def _dimension_desc(dim_type: str | None, dim_value: str | None) -> str:
+        """Describe a line's dimension for error messages."""
+        return f"{dim_type}={dim_value}" if dim_type else "none"
+
+    def _existing_accounts(
+        self, administration: str, account_codes: list[str | None]
+    ) -> set[str]:
+        """Return which of the given account codes exist in rekeningschema."""
+        codes = sorted(
+            {code for code in account_codes if code and isinstance(code, str)}
+        )
+        if not codes:
+            return set()
+        placeholders = ", ".join(["%s"] * len(codes))
+        rows = self.db.execute_query(
+            f"SELECT Account FROM rekeningschema "
+            f"WHERE administration = %s AND Account IN ({placeholders})",
+            (administration, *codes),
+        )
+        return {row["Account"] for row in rows or []}
+
     # -------------------------------------------------------------------------
     # Annualization Utility
     # -------------------------------------------------------------------------
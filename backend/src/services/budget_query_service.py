@@ -13,6 +13,7 @@ from decimal import ROUND_HALF_EVEN, Decimal
 from typing import Any
 
 from database import DatabaseManager
+from services.budget_actuals_matrix import get_actuals_matrix, get_budget_matrix
 
 
 class BudgetQueryService:
@@ -430,48 +431,24 @@ class BudgetQueryService:
         vid = active_version["id"]
         version_name = active_version["name"]
 
-        # 2. Get budget rollup
-        budget_map: dict[str, float] = {}
-
-        if reference_number:
-            # When filtering by reference_number, query budget_lines filtered by
-            # detail_dimension_value where detail_dimension_type='ReferenceNumber'
-            budget_data = self._get_budget_rollup_filtered(
-                administration,
-                vid,
-                level,
-                parent_code,
-                subparent_code,
-                month_list,
-                reference_number,
-            )
-        else:
-            rollup_result = self.get_rollup(
-                administration, vid, level, parent_code, subparent_code, month_list
-            )
-            if rollup_result["success"]:
-                for row in rollup_result["data"]:
-                    budget_map[row["code"]] = row["budget"]
-            budget_data = None
-
-        if budget_data is not None:
-            budget_map = budget_data
-
-        # 3. Get actuals rollup from vw_mutaties
-        actuals_map = self._get_actuals_rollup(
-            administration,
-            resolved_year,
-            level,
-            parent_code,
-            subparent_code,
-            month_list,
-            reference_number,
+        # 2. Monthly actuals matrix (cached per tenant and fiscal year) and the
+        #    matching budget matrix; both are filtered on reference_number
+        #    (budget: detail lines with detail_dimension_type='ReferenceNumber')
+        chart, actuals = get_actuals_matrix(
+            self.db, administration, resolved_year, reference_number
+        )
+        budget = get_budget_matrix(
+            self.db, administration, vid, chart, reference_number
         )
 
-        # 4. Resolve names for all codes
+        # 3. Slice the period columns and sum per code at the requested level
+        budget_map = budget.rollup(level, month_list, parent_code, subparent_code)
+        actuals_map = actuals.rollup(level, month_list, parent_code, subparent_code)
+
+        # 4. Names come from the cached chart of accounts
         all_codes = set(budget_map.keys()) | set(actuals_map.keys())
         all_codes.discard("Unassigned")
-        name_map = self._resolve_names(administration, list(all_codes))
+        name_map = chart.names
 
         # 5. Merge budget and actuals
         rows: list[dict[str, Any]] = []
@@ -506,213 +483,3 @@ class BudgetQueryService:
                 "rows": rows,
             },
         }
-
-    # -------------------------------------------------------------------------
-    # Private Query Helpers
-    # -------------------------------------------------------------------------
-
-    def _get_budget_rollup_filtered(
-        self,
-        administration: str,
-        version_id: int,
-        level: str,
-        parent_code: str | None,
-        subparent_code: str | None,
-        months: list[int],
-        reference_number: str,
-    ) -> dict[str, float]:
-        """
-        Get budget rollup filtered by reference_number (detail_dimension_value).
-
-        Only includes budget_lines where detail_dimension_type='ReferenceNumber'
-        and detail_dimension_value matches the given reference_number.
-
-        Args:
-            administration: Tenant identifier.
-            version_id: Budget version ID.
-            level: Aggregation level.
-            parent_code: Parent filter for subparent level.
-            subparent_code: SubParent filter for account level.
-            months: List of month numbers to sum.
-            reference_number: The ReferenceNumber to filter on.
-
-        Returns:
-            Dict mapping code to budget total (float).
-        """
-        month_cols = ", ".join(
-            f"SUM(bl.month_{i:02d}) AS m{i:02d}" for i in range(1, 13)
-        )
-
-        if level == "parent":
-            query = f"""
-                SELECT r.Parent AS code,
-                       {month_cols}
-                FROM budget_lines bl
-                JOIN rekeningschema r
-                    ON r.Account = bl.account_code COLLATE utf8mb4_unicode_ci
-                    AND r.administration = bl.administration COLLATE utf8mb4_unicode_ci
-                WHERE bl.version_id = %s AND bl.administration = %s
-                  AND bl.detail_dimension_type = 'ReferenceNumber'
-                  AND bl.detail_dimension_value = %s
-                GROUP BY r.Parent
-            """
-            params: tuple = (version_id, administration, reference_number)
-
-        elif level == "subparent":
-            query = f"""
-                SELECT r.SubParent AS code,
-                       {month_cols}
-                FROM budget_lines bl
-                JOIN rekeningschema r
-                    ON r.Account = bl.account_code COLLATE utf8mb4_unicode_ci
-                    AND r.administration = bl.administration COLLATE utf8mb4_unicode_ci
-                WHERE bl.version_id = %s AND bl.administration = %s AND r.Parent = %s
-                  AND bl.detail_dimension_type = 'ReferenceNumber'
-                  AND bl.detail_dimension_value = %s
-                GROUP BY r.SubParent
-            """
-            params = (version_id, administration, parent_code, reference_number)
-
-        else:  # account
-            month_cols_individual = ", ".join(
-                f"bl.month_{i:02d} AS m{i:02d}" for i in range(1, 13)
-            )
-            query = f"""
-                SELECT bl.account_code AS code,
-                       {month_cols_individual}
-                FROM budget_lines bl
-                JOIN rekeningschema r
-                    ON r.Account = bl.account_code COLLATE utf8mb4_unicode_ci
-                    AND r.administration = bl.administration COLLATE utf8mb4_unicode_ci
-                WHERE bl.version_id = %s AND bl.administration = %s AND r.SubParent = %s
-                  AND bl.detail_dimension_type = 'ReferenceNumber'
-                  AND bl.detail_dimension_value = %s
-            """
-            params = (version_id, administration, subparent_code, reference_number)
-
-        rows = self.db.execute_query(query, params)
-        rows = rows if rows else []
-
-        budget_map: dict[str, float] = {}
-        for row in rows:
-            code = row.get("code") or "Unassigned"
-            total = self._sum_months(row, months)
-            budget_map[code] = float(self.round_monetary(total))
-
-        return budget_map
-
-    def _get_actuals_rollup(
-        self,
-        administration: str,
-        year: int,
-        level: str,
-        parent_code: str | None,
-        subparent_code: str | None,
-        months: list[int],
-        reference_number: str | None = None,
-    ) -> dict[str, float]:
-        """
-        Get actuals rollup from vw_mutaties grouped by hierarchy level.
-
-        Args:
-            administration: Tenant identifier.
-            year: Fiscal year.
-            level: Aggregation level — 'parent', 'subparent', or 'account'.
-            parent_code: Parent filter for subparent level.
-            subparent_code: SubParent filter for account level.
-            months: List of month numbers to include.
-            reference_number: Optional ReferenceNumber filter.
-
-        Returns:
-            Dict mapping code to actual total (float).
-        """
-        placeholders = ", ".join(["%s"] * len(months))
-
-        if level == "parent":
-            query = f"""
-                SELECT r.Parent AS code, SUM(vm.Amount) AS actual
-                FROM vw_mutaties vm
-                JOIN rekeningschema r
-                    ON r.Account = vm.Reknum COLLATE utf8mb4_unicode_ci
-                    AND r.administration = vm.administration COLLATE utf8mb4_unicode_ci
-                WHERE vm.administration = %s AND vm.jaar = %s
-                  AND vm.maand IN ({placeholders})
-            """
-            params_list: list = [administration, year, *months]
-
-        elif level == "subparent":
-            query = f"""
-                SELECT r.SubParent AS code, SUM(vm.Amount) AS actual
-                FROM vw_mutaties vm
-                JOIN rekeningschema r
-                    ON r.Account = vm.Reknum COLLATE utf8mb4_unicode_ci
-                    AND r.administration = vm.administration COLLATE utf8mb4_unicode_ci
-                WHERE vm.administration = %s AND vm.jaar = %s
-                  AND vm.maand IN ({placeholders})
-                  AND r.Parent = %s
-            """
-            params_list = [administration, year, *months, parent_code]
-
-        else:  # account
-            query = f"""
-                SELECT vm.Reknum AS code, SUM(vm.Amount) AS actual
-                FROM vw_mutaties vm
-                JOIN rekeningschema r
-                    ON r.Account = vm.Reknum COLLATE utf8mb4_unicode_ci
-                    AND r.administration = vm.administration COLLATE utf8mb4_unicode_ci
-                WHERE vm.administration = %s AND vm.jaar = %s
-                  AND vm.maand IN ({placeholders})
-                  AND r.SubParent = %s
-            """
-            params_list = [administration, year, *months, subparent_code]
-
-        if reference_number:
-            query += "  AND vm.ReferenceNumber = %s"
-            params_list.append(reference_number)
-
-        if level == "parent":
-            query += "\n                GROUP BY r.Parent"
-        elif level == "subparent":
-            query += "\n                GROUP BY r.SubParent"
-        else:
-            query += "\n                GROUP BY vm.Reknum"
-
-        rows = self.db.execute_query(query, tuple(params_list))
-        rows = rows if rows else []
-
-        actuals_map: dict[str, float] = {}
-        for row in rows:
-            code = row.get("code") or "Unassigned"
-            actual = Decimal(str(row.get("actual", 0) or 0))
-            actuals_map[code] = float(self.round_monetary(actual))
-
-        return actuals_map
-
-    def _resolve_names(self, administration: str, codes: list[str]) -> dict[str, str]:
-        """
-        Resolve account/parent/subparent codes to names via rekeningschema.
-
-        Args:
-            administration: Tenant identifier.
-            codes: List of codes to resolve.
-
-        Returns:
-            Dict mapping code to AccountName.
-        """
-        if not codes:
-            return {}
-
-        placeholders = ", ".join(["%s"] * len(codes))
-        name_query = f"""
-            SELECT DISTINCT Account, AccountName
-            FROM rekeningschema
-            WHERE administration = %s AND Account IN ({placeholders})
-        """
-        name_rows = self.db.execute_query(name_query, (administration, *codes))
-
-        name_map: dict[str, str] = {}
-        if name_rows:
-            for nr in name_rows:
-                name_map[nr["Account"]] = nr.get("AccountName", "")
-
-        return name_map
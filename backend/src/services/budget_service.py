@@ -207,6 +207,12 @@ class BudgetService:
         """Delete a budget line."""
         return self._mutation.delete_line(administration, line_id)
 
+    def bulk_upsert_lines(
+        self, administration: str, version_id: int, lines: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Create or update many budget lines of a version in one transaction."""
+        return self._mutation.bulk_upsert_lines(administration, version_id, lines)
+
     def copy_budget(
         self,
         administration: str,
@@ -12,7 +12,9 @@ from io import BytesIO
 from typing import Any
 
 from database import DatabaseManager
+from db_batch import executemany_chunked
 from dialect_helpers import dialect
+from services.budget_actuals_matrix import invalidate_actuals_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,23 @@ EXCEL_HEADERS = [
     "Pattern",
 ]
 
+# Keyed on the primary key: existing accounts carry their AccountID from the
+# snapshot, new ones pass NULL and get a new id
+UPSERT_ACCOUNT_QUERY = """
+    INSERT INTO rekeningschema
+    (AccountID, Account, AccountName, AccountLookup, SubParent, Parent, VW,
+     Belastingaangifte, administration, parameters)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        AccountName = VALUES(AccountName),
+        AccountLookup = VALUES(AccountLookup),
+        SubParent = VALUES(SubParent),
+        Parent = VALUES(Parent),
+        VW = VALUES(VW),
+        Belastingaangifte = VALUES(Belastingaangifte),
+        parameters = VALUES(parameters)
+"""
+
 
 class ChartOfAccountsIOService:
     """Service for importing and exporting chart of accounts data."""
@@ -96,18 +115,24 @@ class ChartOfAccountsIOService:
         """
         Import accounts from an Excel file stream (upsert logic).
 
+        The workbook is streamed (read-only), every row is validated before
+        anything is written, and rows are compared with one snapshot of the
+        tenant's accounts: only new and changed accounts are written, with a
+        chunked INSERT ... ON DUPLICATE KEY UPDATE in a single transaction.
+
         Args:
             tenant: Tenant identifier.
             file_stream: File-like object containing the Excel data.
 
         Returns:
-            Dict with 'success', 'imported', 'updated', 'total' or 'errors'.
+            Dict with 'success', 'imported', 'updated', 'unchanged', 'total'
+            and 'changes' (inserted accounts, updated accounts with the
+            changed fields), or 'errors'.
         """
         import openpyxl
 
         try:
-            wb = openpyxl.load_workbook(file_stream)
-            ws = wb.active
+            wb = openpyxl.load_workbook(file_stream, read_only=True, data_only=True)
         except Exception as e:
             return {
                 "success": False,
@@ -115,26 +140,102 @@ class ChartOfAccountsIOService:
                 "details": str(e),
             }
 
-        # Validate headers
-        headers = [cell.value for cell in ws[1]]
-        if headers != EXCEL_HEADERS:
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            headers = list(next(rows, ()))
+            # Validate headers
+            if headers != EXCEL_HEADERS:
+                return {
+                    "success": False,
+                    "error": "Invalid Excel format",
+                    "expected_headers": EXCEL_HEADERS,
+                    "found_headers": headers,
+                }
+            accounts_to_import, errors = self._parse_rows(rows)
+        finally:
+            wb.close()
+
+        if errors:
             return {
                 "success": False,
-                "error": "Invalid Excel format",
-                "expected_headers": EXCEL_HEADERS,
-                "found_headers": headers,
+                "errors": errors,
+                "parsed": len(accounts_to_import),
+            }
+
+        existing = self._load_account_snapshot(tenant)
+        upserts: list[tuple] = []
+        inserted: list[str] = []
+        updated: list[dict[str, Any]] = []
+        unchanged = 0
+
+        for account, acc in accounts_to_import.items():
+            current = existing.get(account)
+            parameters = self._merge_parameters(current, acc)
+            values = {
+                "AccountName": acc["name"],
+                "AccountLookup": acc["lookup"],
+                "SubParent": acc["sub_parent"],
+                "Parent": acc["parent"],
+                "VW": acc["vw"],
+                "Belastingaangifte": acc["tax"],
+                "parameters": parameters,
             }
 
-        # Parse rows
-        accounts_to_import: list[dict[str, Any]] = []
+            if current is None:
+                inserted.append(account)
+            else:
+                changed = [
+                    field
+                    for field, value in values.items()
+                    if self._normalize(field, current.get(field))
+                    != self._normalize(field, value)
+                ]
+                if not changed:
+                    unchanged += 1
+                    continue
+                updated.append({"account": account, "fields": changed})
+
+            upserts.append(
+                (
+                    current["AccountID"] if current else None,
+                    account,
+                    acc["name"],
+                    acc["lookup"],
+                    acc["sub_parent"],
+                    acc["parent"],
+                    acc["vw"],
+                    acc["tax"],
+                    tenant,
+                    json.dumps(parameters) if parameters else None,
+                )
+            )
+
+        if upserts:
+            with self.db.transaction() as (cursor, _conn):
+                executemany_chunked(cursor, UPSERT_ACCOUNT_QUERY, upserts)
+            invalidate_actuals_matrix(tenant)
+
+        return {
+            "success": True,
+            "imported": len(inserted),
+            "updated": len(updated),
+            "unchanged": unchanged,
+            "total": len(accounts_to_import),
+            "changes": {"inserted": inserted, "updated": updated},
+        }
+
+    @staticmethod
+    def _parse_rows(rows) -> tuple[dict[str, dict[str, Any]], list[str]]:
+        """Validate data rows; returns accounts keyed by number (last row wins)."""
+        accounts: dict[str, dict[str, Any]] = {}
         errors: list[str] = []
+        width = len(EXCEL_HEADERS)
 
-        for row_num, row in enumerate(
-            ws.iter_rows(min_row=2, values_only=True), start=2
-        ):
-            if not any(row):  # Skip empty rows
+        for row_num, row in enumerate(rows, start=2):
+            if not row or not any(row):  # Skip empty rows
                 continue
-
+            # Streamed rows can be shorter than the header when trailing cells are empty
+            row = tuple(row[:width]) + (None,) * (width - len(row))
             account, name, lookup, sub_parent, parent, vw, tax, pattern = row
 
             if not account:
@@ -144,95 +245,67 @@ class ChartOfAccountsIOService:
                 errors.append(f"Row {row_num}: Account name required")
                 continue
 
-            accounts_to_import.append(
-                {
-                    "account": str(account).strip(),
-                    "name": str(name).strip(),
-                    "lookup": str(lookup).strip() if lookup else "",
-                    "sub_parent": str(sub_parent).strip() if sub_parent else "",
-                    "parent": str(parent).strip() if parent else "",
-                    "vw": str(vw).strip() if vw else "",
-                    "tax": str(tax).strip() if tax else "",
-                    "bank_account": bool(pattern),
-                    "iban": str(lookup).strip() if lookup and pattern else None,
-                }
-            )
-
-        if errors:
-            return {
-                "success": False,
-                "errors": errors,
-                "parsed": len(accounts_to_import),
+            account = str(account).strip()
+            accounts.pop(account, None)  # Keep file order for a repeated account
+            accounts[account] = {
+                "name": str(name).strip(),
+                "lookup": str(lookup).strip() if lookup else "",
+                "sub_parent": str(sub_parent).strip() if sub_parent else "",
+                "parent": str(parent).strip() if parent else "",
+                "vw": str(vw).strip() if vw else "",
+                "tax": str(tax).strip() if tax else "",
+                "bank_account": bool(pattern),
+                "iban": str(lookup).strip() if lookup and pattern else None,
             }
+        return accounts, errors
+
+    def _load_account_snapshot(self, tenant: str) -> dict[str, dict[str, Any]]:
+        """All accounts of the tenant keyed by account number (one query)."""
+        rows = self.db.execute_query(
+            """
+            SELECT AccountID, Account, AccountName, AccountLookup, SubParent,
+                   Parent, VW, Belastingaangifte, parameters
+            FROM rekeningschema
+            WHERE administration = %s
+            """,
+            (tenant,),
+        )
+        return {str(row["Account"]): row for row in rows or []}
 
-        # Upsert accounts
-        imported = 0
-        updated = 0
-
-        for acc in accounts_to_import:
-            params_dict: dict[str, Any] = {}
-            if acc["bank_account"]:
-                params_dict["bank_account"] = True
-            if acc["iban"]:
-                params_dict["iban"] = acc["iban"]
-            parameters_json = json.dumps(params_dict) if params_dict else None
-
-            exists = self.db.execute_query(
-                "SELECT 1 FROM rekeningschema WHERE administration = %s AND Account = %s",
-                (tenant, acc["account"]),
-            )
-
-            if exists:
-                self.db.execute_query(
-                    """
-                    UPDATE rekeningschema
-                    SET AccountName = %s, AccountLookup = %s, SubParent = %s,
-                        Parent = %s, VW = %s, Belastingaangifte = %s,
-                        parameters = %s
-                    WHERE administration = %s AND Account = %s
-                    """,
-                    (
-                        acc["name"],
-                        acc["lookup"],
-                        acc["sub_parent"],
-                        acc["parent"],
-                        acc["vw"],
-                        acc["tax"],
-                        parameters_json,
-                        tenant,
-                        acc["account"],
-                    ),
-                    fetch=False,
-                    commit=True,
-                )
-                updated += 1
-            else:
-                self.db.execute_query(
-                    """
-                    INSERT INTO rekeningschema
-                    (Account, AccountName, AccountLookup, SubParent, Parent, VW,
-                     Belastingaangifte, administration, parameters)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        acc["account"],
-                        acc["name"],
-                        acc["lookup"],
-                        acc["sub_parent"],
-                        acc["parent"],
-                        acc["vw"],
-                        acc["tax"],
-                        tenant,
-                        parameters_json,
-                    ),
-                    fetch=False,
-                    commit=True,
-                )
-                imported += 1
+    @staticmethod
+    def _merge_parameters(
+        current: dict[str, Any] | None, acc: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Apply the file's bank_account/iban to the account's parameters.
 
-        return {
-            "success": True,
-            "imported": imported,
-            "updated": updated,
-            "total": imported + updated,
-        }
+        Other keys (VAT netting, year-end purposes, ...) are not part of the
+        Excel format and are kept as they are.
+        """
+        parameters = ChartOfAccountsIOService._parse_parameters(
+            current.get("parameters") if current else None
+        )
+        parameters.pop("bank_account", None)
+        parameters.pop("iban", None)
+        if acc["bank_account"]:
+            parameters["bank_account"] = True
+        if acc["iban"]:
+            parameters["iban"] = acc["iban"]
+        return parameters
+
+    @staticmethod
+    def _parse_parameters(raw: Any) -> dict[str, Any]:
+        if isinstance(raw, dict):
+            return dict(raw)
+        if not raw:
+            return {}
+        try:
+            parsed = json.loads(raw)
+        except (TypeError, ValueError):
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+
+    @classmethod
+    def _normalize(cls, field: str, value: Any) -> Any:
+        if field == "parameters":
+            return cls._parse_parameters(value)
+        return "" if value is None else str(value).strip()
@@ -0,0 +1,242 @@
+"""
+CognitoDirectoryIndex: In-memory tenant -> users index over the Cognito
+user pool.
+
+Cognito cannot filter list_users on custom attributes, so answering "which
+users belong to tenant X" means paginating the whole pool. The index does
+that scan once, parses custom:tenants per user, and answers per-tenant
+counts and listings from memory until CACHE_TTL_SECONDS expires.
+
+Routes and services that change a user's tenants (invites, tenant
+removal, user deletion, provisioning) update the index incrementally via
+set_user_tenants() / remove_user(), so changes show up without a rescan.
+The TTL bounds drift from changes made outside this process.
+
+Usage:
+    from services.cognito_directory import directory_index
+
+    counts = directory_index.user_counts(["TenantA", "TenantB"])
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = 300  # 5 minutes
+PAGE_LIMIT = 60  # Maximum allowed by list_users
+
+
+@dataclass(frozen=True)
+class DirectoryUser:
+    """A Cognito user as seen by the directory index."""
+
+    username: str
+    email: str | None
+    tenants: frozenset[str]
+
+
+def parse_tenants(value: str | None) -> list[str]:
+    """Parse a custom:tenants attribute value (JSON array) into a list."""
+    if not value:
+        return []
+    # Handle escaped quotes in Cognito response
+    if "\\" in value:
+        value = value.replace("\\", "")
+    try:
+        tenants = json.loads(value)
+    except ValueError:
+        return [value]
+    if isinstance(tenants, list):
+        return [str(t) for t in tenants]
+    return [str(tenants)]
+
+
+def _user_from_cognito(user: dict) -> DirectoryUser:
+    attributes = {a["Name"]: a["Value"] for a in user.get("Attributes", [])}
+    return DirectoryUser(
+        username=user["Username"],
+        email=attributes.get("email"),
+        tenants=frozenset(parse_tenants(attributes.get("custom:tenants"))),
+    )
+
+
+def _key(identifier: str) -> str:
+    return identifier.strip().lower()
+
+
+def _default_client():
+    import boto3
+
+    return boto3.client("cognito-idp", region_name=os.getenv("AWS_REGION", "eu-west-1"))
+
+
+class CognitoDirectoryIndex:
+    """Tenant -> users map built from one paginated list_users scan."""
+
+    def __init__(
+        self,
+        client_provider: Callable | None = None,
+        user_pool_id: str | None = None,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+    ):
+        self._client_provider = client_provider or _default_client
+        self._client = None
+        self._user_pool_id = user_pool_id
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # Users are keyed by lowercased email (Username if no email), so
+        # routes that address users by email or by Username both resolve.
+        self._users: dict[str, DirectoryUser] = {}
+        self._aliases: dict[str, str] = {}
+        self._by_tenant: dict[str, set[str]] = {}
+        self._loaded_at: float | None = None
+        self._version = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = self._client_provider()
+        return self._client
+
+    def _scan(self) -> list[DirectoryUser]:
+        client = self._get_client()
+        pool_id = self._user_pool_id or os.getenv("COGNITO_USER_POOL_ID")
+        params = {"UserPoolId": pool_id, "Limit": PAGE_LIMIT}
+        users = []
+        while True:
+            response = client.list_users(**params)
+            users.extend(_user_from_cognito(u) for u in response.get("Users", []))
+            token = response.get("PaginationToken")
+            if not token:
+                return users
+            params["PaginationToken"] = token
+
+    def refresh(self) -> None:
+        """Rebuild the index from a full scan of the user pool."""
+        with self._lock:
+            version = self._version
+        users = self._scan()
+
+        by_key = {}
+        aliases = {}
+        by_tenant: dict[str, set[str]] = {}
+        for user in users:
+            key = _key(user.email or user.username)
+            by_key[key] = user
+            aliases[_key(user.username)] = key
+            for tenant in user.tenants:
+                by_tenant.setdefault(tenant, set()).add(key)
+
+        with self._lock:
+            self._users = by_key
+            self._aliases = aliases
+            self._by_tenant = by_tenant
+            # An incremental update during the scan may be missing from it;
+            # keep the result but rescan on the next read.
+            self._loaded_at = time.time() if self._version == version else 0.0
+        logger.info(
+            f"Cognito directory index loaded: {len(by_key)} users, "
+            f"{len(by_tenant)} tenants"
+        )
+
+    def _ensure_fresh(self) -> None:
+        with self._lock:
+            loaded_at = self._loaded_at
+        if loaded_at is None or time.time() - loaded_at >= self.ttl_seconds:
+            self.refresh()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def user_count(self, tenant: str) -> int:
+        """Number of users with access to the tenant."""
+        self._ensure_fresh()
+        with self._lock:
+            return len(self._by_tenant.get(tenant, ()))
+
+    def user_counts(self, tenants: Iterable[str]) -> dict[str, int]:
+        """User counts for several tenants from a single index lookup."""
+        self._ensure_fresh()
+        with self._lock:
+            return {t: len(self._by_tenant.get(t, ())) for t in tenants}
+
+    def tenant_users(self, tenant: str) -> list[DirectoryUser]:
+        """Users with access to the tenant, sorted by email."""
+        self._ensure_fresh()
+        with self._lock:
+            users = [self._users[k] for k in self._by_tenant.get(tenant, ())]
+        return sorted(users, key=lambda u: (u.email or u.username).lower())
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _resolve(self, identifier: str) -> str:
+        key = _key(identifier)
+        return key if key in self._users else self._aliases.get(key, key)
+
+    def _drop(self, key: str) -> DirectoryUser | None:
+        user = self._users.pop(key, None)
+        if user:
+            for tenant in user.tenants:
+                members = self._by_tenant.get(tenant)
+                if members:
+                    members.discard(key)
+                    if not members:
+                        del self._by_tenant[tenant]
+        return user
+
+    def set_user_tenants(
+        self, username: str, tenants: Iterable[str], email: str | None = None
+    ) -> None:
+        """Record a user's new tenant list after a Cognito update."""
+        with self._lock:
+            self._version += 1
+            if self._loaded_at is None:
+                return  # Nothing cached yet; the first scan will see it
+            key = self._resolve(email or username)
+            previous = self._drop(key)
+            user = DirectoryUser(
+                username=previous.username if previous else username,
+                email=email or (previous.email if previous else None),
+                tenants=frozenset(tenants),
+            )
+            self._users[key] = user
+            self._aliases[_key(user.username)] = key
+            for tenant in user.tenants:
+                self._by_tenant.setdefault(tenant, set()).add(key)
+
+    def remove_user(self, username: str) -> None:
+        """Forget a user after it was deleted from Cognito."""
+        with self._lock:
+            self._version += 1
+            if self._loaded_at is None:
+                return
+            key = self._resolve(username)
+            user = self._drop(key)
+            if user:
+                self._aliases.pop(_key(user.username), None)
+
+    def invalidate(self) -> None:
+        """Drop the index; the next query rescans the user pool."""
+        with self._lock:
+            self._version += 1
+            self._users = {}
+            self._aliases = {}
+            self._by_tenant = {}
+            self._loaded_at = None
+
+
+# Process-wide index shared by the sysadmin routes and user-admin writers
+directory_index = CognitoDirectoryIndex()
@@ -12,6 +12,8 @@ import os
 import boto3
 from botocore.exceptions import ClientError
 
+from services.cognito_directory import directory_index
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
@@ -85,6 +87,9 @@ class CognitoService:
             )
 
             logger.info(f"User {email} created successfully")
+            directory_index.set_user_tenants(
+                email, [tenant] if tenant else [], email=email
+            )
             return response["User"]
 
         except ClientError as e:
@@ -216,6 +221,7 @@ class CognitoService:
                 UserPoolId=self.user_pool_id, Username=username
             )
             logger.info(f"User {username} deleted successfully")
+            directory_index.remove_user(username)
             return True
         except ClientError as e:
             logger.error(f"Failed to delete user {username}: {e}")
@@ -448,6 +454,7 @@ class CognitoService:
                     ],
                 )
                 logger.info(f"Tenant {tenant} added to user {username}")
+                directory_index.set_user_tenants(username, current_tenants)
 
             return True
 
@@ -525,6 +532,7 @@ class CognitoService:
                 f"Tenant {tenant} removed from user {username}. "
                 f"Remaining tenants: {current_tenants}"
             )
+            directory_index.set_user_tenants(username, current_tenants)
 
             return True, False
 
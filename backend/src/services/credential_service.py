@@ -5,12 +5,23 @@ Handles encryption, decryption, and storage of tenant-specific credentials in My
 This service provides secure credential management for multi-tenant applications,
 storing encrypted credentials in the database using AES-256 encryption with
 per-tenant key derivation via PBKDF2-SHA256.
+
+Key derivation (100k PBKDF2 iterations) dominates the cost of a credential
+lookup, and CredentialService is created per request, so derived Fernet
+ciphers are cached process-wide per (master key fingerprint, tenant).
+Decrypted credentials are cached for CREDENTIAL_CACHE_TTL seconds (0
+disables); store/delete invalidate the entry in this process, other worker
+processes pick up changes when their entry expires.
 """
 
 import base64
+import copy
+import hashlib
 import json
 import logging
 import os
+import threading
+import time
 from typing import Any
 
 from cryptography.fernet import Fernet, InvalidToken
@@ -20,6 +31,41 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 logger = logging.getLogger(__name__)
 
+CREDENTIAL_CACHE_TTL = float(os.getenv("CREDENTIAL_CACHE_TTL", "60"))
+
+# (master key fingerprint, tenant or None for the master cipher) -> Fernet
+_cipher_cache: dict[tuple[str, str | None], Fernet] = {}
+# (master key fingerprint, database, administration, credential_type)
+#   -> (expires_at, decrypted value)
+_credential_cache: dict[tuple[str, str | None, str, str], tuple[float, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def _key_fingerprint(key: str) -> str:
+    """Stable identifier of a master key that does not reveal the key."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def invalidate_credential_cache(
+    administration: str | None = None, credential_type: str | None = None
+) -> None:
+    """Drop cached decrypted credentials (all, one tenant, or one credential)."""
+    with _cache_lock:
+        for cache_key in list(_credential_cache):
+            _fingerprint, _database, admin, ctype = cache_key
+            if administration is not None and admin != administration:
+                continue
+            if credential_type is not None and ctype != credential_type:
+                continue
+            del _credential_cache[cache_key]
+
+
+def clear_cipher_cache() -> None:
+    """Drop all derived ciphers and decrypted credentials (e.g. after key rotation)."""
+    with _cache_lock:
+        _cipher_cache.clear()
+        _credential_cache.clear()
+
 
 class CredentialDecryptionError(Exception):
     """
@@ -68,11 +114,37 @@ class CredentialService:
                 "or provide encryption_key parameter."
             )
 
+        self._key_fingerprint = _key_fingerprint(self.encryption_key)
+        self.cache_ttl = CREDENTIAL_CACHE_TTL
+
         # Master Fernet cipher (used for backward compatibility / fallback)
-        self._fernet = self._create_fernet_cipher(self.encryption_key)
+        self._fernet = self._cached_cipher(
+            None, lambda: self._create_fernet_cipher(self.encryption_key)
+        )
 
         logger.info("CredentialService initialized successfully")
 
+    def _cached_cipher(self, tenant: str | None, derive) -> Fernet:
+        """Return the process-wide cipher for this master key and tenant."""
+        cache_key = (self._key_fingerprint, tenant)
+        cipher = _cipher_cache.get(cache_key)
+        if cipher is None:
+            # Derived outside the lock; a concurrent miss derives the same key
+            cipher = derive()
+            with _cache_lock:
+                cipher = _cipher_cache.setdefault(cache_key, cipher)
+        return cipher
+
+    def _tenant_cipher(self, tenant: str) -> Fernet:
+        return self._cached_cipher(
+            tenant, lambda: self._derive_tenant_key(self.encryption_key, tenant)
+        )
+
+    def _credential_cache_key(self, administration: str, credential_type: str):
+        database = getattr(self.db, "config", None)
+        database = database.get("database") if isinstance(database, dict) else None
+        return (self._key_fingerprint, database, administration, credential_type)
+
     def _create_fernet_cipher(self, key: str) -> Fernet:
         """
         Create a Fernet cipher from the encryption key using a static salt.
@@ -148,7 +220,7 @@ class CredentialService:
 
             # Select the appropriate cipher
             if tenant:
-                cipher = self._derive_tenant_key(self.encryption_key, tenant)
+                cipher = self._tenant_cipher(tenant)
             else:
                 cipher = self._fernet
 
@@ -190,7 +262,7 @@ class CredentialService:
 
             if tenant:
                 # Try tenant-derived key first
-                tenant_cipher = self._derive_tenant_key(self.encryption_key, tenant)
+                tenant_cipher = self._tenant_cipher(tenant)
                 try:
                     decrypted_bytes = tenant_cipher.decrypt(encrypted_bytes)
                 except InvalidToken:
@@ -258,6 +330,7 @@ class CredentialService:
                 fetch=False,
                 commit=True,
             )
+            invalidate_credential_cache(administration, credential_type)
 
             logger.info(
                 f"Stored credential for administration '{administration}', type '{credential_type}'"
@@ -281,12 +354,21 @@ class CredentialService:
             administration: The tenant/administration identifier
             credential_type: Type of credential to retrieve
 
+        Decrypted values are served from a short-lived process cache
+        (CREDENTIAL_CACHE_TTL) when present.
+
         Returns:
             Decrypted credential value, or None if not found
 
         Raises:
             CredentialDecryptionError: If decryption fails with both keys
         """
+        cache_key = self._credential_cache_key(administration, credential_type)
+        if self.cache_ttl > 0:
+            cached = _credential_cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                return copy.deepcopy(cached[1])
+
         try:
             query = """
                 SELECT encrypted_value 
@@ -308,7 +390,7 @@ class CredentialService:
             encrypted_bytes = base64.b64decode(encrypted_value.encode("utf-8"))
 
             # Try tenant-derived key first
-            tenant_cipher = self._derive_tenant_key(self.encryption_key, administration)
+            tenant_cipher = self._tenant_cipher(administration)
             try:
                 decrypted_bytes = tenant_cipher.decrypt(encrypted_bytes)
                 plaintext = decrypted_bytes.decode("utf-8")
@@ -334,6 +416,12 @@ class CredentialService:
             logger.info(
                 f"Retrieved credential for administration '{administration}', type '{credential_type}'"
             )
+            if self.cache_ttl > 0:
+                with _cache_lock:
+                    _credential_cache[cache_key] = (
+                        time.monotonic() + self.cache_ttl,
+                        copy.deepcopy(result),
+                    )
             return result
 
         except CredentialDecryptionError:
@@ -410,6 +498,7 @@ class CredentialService:
             rows_affected = self.db.execute_query(
                 query, (administration, credential_type), fetch=False, commit=True
             )
+            invalidate_credential_cache(administration, credential_type)
 
             if rows_affected > 0:
                 logger.info(
@@ -8,6 +8,7 @@ Provides query interface for SysAdmin (all tenants) and Tenant Admin (own tenant
 import logging
 
 from database import DatabaseManager
+from log_sink import get_log_sink
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +28,13 @@ class EmailLogService:
         subject: str | None = None,
         sent_by: str | None = None,
     ) -> int | None:
-        """Log an email that was successfully handed to SES."""
+        """Log an email that was successfully handed to SES.
+
+        Returns the new row id, or None when the row was queued (log_sink).
+        """
         try:
-            return self.db.execute_query(
+            return get_log_sink().write(
+                self.db,
                 """INSERT INTO email_log
                    (recipient, email_type, administration, status,
                     ses_message_id, subject, sent_by)
@@ -42,8 +47,6 @@ class EmailLogService:
                     subject,
                     sent_by,
                 ),
-                fetch=False,
-                commit=True,
             )
         except Exception as e:
             logger.error(f"Failed to log email send: {e}")
@@ -57,16 +60,15 @@ class EmailLogService:
         error_message: str,
         sent_by: str | None = None,
     ) -> int | None:
-        """Log an email that failed to send."""
+        """Log an email that failed to send (row id, or None when queued)."""
         try:
-            return self.db.execute_query(
+            return get_log_sink().write(
+                self.db,
                 """INSERT INTO email_log
                    (recipient, email_type, administration, status,
                     error_message, sent_by)
                    VALUES (%s, %s, %s, 'failed', %s, %s)""",
                 (recipient, email_type, administration, error_message, sent_by),
-                fetch=False,
-                commit=True,
             )
         except Exception as e:
             logger.error(f"Failed to log email failure: {e}")
@@ -78,15 +80,18 @@ class EmailLogService:
         status: str,
         error_message: str | None = None,
     ) -> bool:
-        """Update delivery status from SNS notification (delivered/bounced/complained)."""
+        """Update delivery status from SNS notification (delivered/bounced/complained).
+
+        Goes through the log sink too, so it is applied after a still-queued
+        log_sent() row for the same message.
+        """
         try:
-            self.db.execute_query(
+            get_log_sink().write(
+                self.db,
                 """UPDATE email_log
                    SET status = %s, error_message = %s
                    WHERE ses_message_id = %s""",
                 (status, error_message, ses_message_id),
-                fetch=False,
-                commit=True,
             )
             return True
         except Exception as e:
@@ -0,0 +1,196 @@
+"""
+EntitlementCache: In-memory per-tenant snapshot of active modules and
+function toggles, used by the function_guard and module_required
+decorators.
+
+A snapshot is loaded with a single query over tenant_modules and
+tenant_functions and kept for CACHE_TTL_SECONDS. Endpoints that change
+modules or function toggles call invalidate_entitlements(tenant), which
+bumps the tenant's version in this process so a load that was already in
+flight cannot store a stale snapshot.
+
+Other worker processes learn about a change through the tables themselves:
+at most every VERSION_CHECK_SECONDS a cached snapshot is checked against a
+signature of the tenant's rows (row count, active count and latest
+updated_at), one aggregate query, and reloaded when it differs.
+
+Requirements: 3.1, 3.2, 3.3, 4.5
+Reference: .kiro/specs/tenant-optional-functions/design.md
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+from mysql.connector import Error as MySQLError
+
+from db_exceptions import DatabaseError
+from services.function_registry import FUNCTION_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = 300  # 5 minutes
+VERSION_CHECK_SECONDS = 2  # Staleness bound across worker processes
+
+ENTITLEMENT_QUERY = """
+    SELECT 'module' AS kind, module_name AS name, is_active, updated_at
+    FROM tenant_modules
+    WHERE administration = %s
+    UNION ALL
+    SELECT 'function' AS kind, function_name AS name, is_active, updated_at
+    FROM tenant_functions
+    WHERE administration = %s
+"""
+
+SIGNATURE_QUERY = """
+    SELECT COUNT(*) AS row_count, SUM(is_active) AS active_count,
+           MAX(updated_at) AS updated_at
+    FROM (
+        SELECT is_active, updated_at FROM tenant_modules
+        WHERE administration = %s
+        UNION ALL
+        SELECT is_active, updated_at FROM tenant_functions
+        WHERE administration = %s
+    ) AS entitlements
+"""
+
+
+@dataclass(frozen=True)
+class EntitlementSnapshot:
+    """Active modules and function toggle overrides for one tenant."""
+
+    tenant: str
+    version: tuple[int, int]
+    active_modules: frozenset[str] = frozenset()
+    function_overrides: dict[str, bool] = field(default_factory=dict)
+
+    def has_module(self, module_name: str) -> bool:
+        """True if the module is active for the tenant."""
+        return module_name in self.active_modules
+
+    def function_enabled(self, function_name: str) -> bool:
+        """Toggle state: tenant override, else the FUNCTION_REGISTRY default."""
+        registry_entry = FUNCTION_REGISTRY.get(function_name)
+        if not registry_entry:
+            return False
+        return self.function_overrides.get(
+            function_name, registry_entry["default_enabled"]
+        )
+
+
+# Cache structure: { tenant: (snapshot, loaded_at, signature, checked_at) }
+_snapshots: dict[str, tuple[EntitlementSnapshot, float, tuple, float]] = {}
+_versions: dict[str, int] = {}
+_generation = 0  # bumped when all tenants are invalidated
+_lock = threading.Lock()
+
+
+def _default_db():
+    from database import DatabaseManager
+
+    test_mode = os.getenv("TEST_MODE", "false").lower() == "true"
+    return DatabaseManager(test_mode=test_mode)
+
+
+def _signature(row_count, active_count, updated_at) -> tuple:
+    return (int(row_count or 0), int(active_count or 0), updated_at)
+
+
+def _load_signature(db, tenant: str) -> tuple:
+    rows = db.execute_query(SIGNATURE_QUERY, (tenant, tenant)) or [{}]
+    row = rows[0]
+    return _signature(
+        row.get("row_count"), row.get("active_count"), row.get("updated_at")
+    )
+
+
+def _load_snapshot(
+    db, tenant: str, version: tuple[int, int]
+) -> tuple[EntitlementSnapshot, tuple]:
+    rows = db.execute_query(ENTITLEMENT_QUERY, (tenant, tenant)) or []
+    signature = _signature(
+        len(rows),
+        sum(1 for row in rows if row["is_active"]),
+        max((row["updated_at"] for row in rows if row.get("updated_at")), default=None),
+    )
+    modules = set()
+    overrides = {}
+    for row in rows:
+        if row["kind"] == "module":
+            if row["is_active"]:
+                modules.add(row["name"])
+        else:
+            overrides[row["name"]] = bool(row["is_active"])
+    snapshot = EntitlementSnapshot(
+        tenant=tenant,
+        version=version,
+        active_modules=frozenset(modules),
+        function_overrides=overrides,
+    )
+    return snapshot, signature
+
+
+def get_entitlements(tenant: str, db=None) -> EntitlementSnapshot:
+    """
+    Get the entitlement snapshot for a tenant, using the cache when fresh.
+
+    Args:
+        tenant: Tenant administration name
+        db: Optional DatabaseManager; only created on a cache miss
+
+    Returns:
+        EntitlementSnapshot. On DB failure an uncached snapshot without
+        modules is returned, so guarded routes are denied (as has_module()
+        does on error).
+    """
+    now = time.time()
+    with _lock:
+        cached = _snapshots.get(tenant)
+        version = (_generation, _versions.get(tenant, 0))
+    if cached and cached[0].version == version and now - cached[1] < CACHE_TTL_SECONDS:
+        snapshot, loaded_at, signature, checked_at = cached
+        if now - checked_at < VERSION_CHECK_SECONDS:
+            return snapshot
+        # Another worker may have changed the tenant's modules or functions
+        db = db or _default_db()
+        try:
+            current = _load_signature(db, tenant)
+        except (DatabaseError, MySQLError) as e:
+            logger.error(f"Error checking entitlements for tenant {tenant}: {e}")
+            current = None
+        if current == signature:
+            with _lock:
+                if _snapshots.get(tenant) is cached:
+                    _snapshots[tenant] = (snapshot, loaded_at, signature, now)
+            return snapshot
+
+    try:
+        snapshot, signature = _load_snapshot(db or _default_db(), tenant, version)
+    except (DatabaseError, MySQLError) as e:
+        logger.error(f"Error loading entitlements for tenant {tenant}: {e}")
+        return EntitlementSnapshot(tenant=tenant, version=version)
+
+    with _lock:
+        # Skip storing if the tenant was invalidated while we were loading
+        if (_generation, _versions.get(tenant, 0)) == version:
+            _snapshots[tenant] = (snapshot, now, signature, now)
+    return snapshot
+
+
+def invalidate_entitlements(tenant: str | None = None):
+    """
+    Drop cached entitlements after a module or function change.
+
+    Args:
+        tenant: Tenant administration name, or None to clear all tenants
+    """
+    global _generation
+    with _lock:
+        if tenant:
+            _versions[tenant] = _versions.get(tenant, 0) + 1
+            _snapshots.pop(tenant, None)
+        else:
+            _generation += 1
+            _snapshots.clear()
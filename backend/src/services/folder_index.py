@@ -0,0 +1,253 @@
+"""
+FolderIndex: Per-tenant index of invoice (supplier) folders.
+
+Uploads and the invoice folder picker only need to find one folder by
+name, but used to list every subfolder of the tenant's Facturen folder
+(Google Drive, 1,000 per page) or invoices/ prefix (S3) on each request.
+A FolderIndex keeps name -> folder in memory per (provider, tenant,
+parent) so lookups are O(1):
+
+- The first use loads the last persisted snapshot (storage_folder_index)
+  or does one full listing.
+- After FOLDER_INDEX_REFRESH_SECONDS the index catches up from its
+  source: Google Drive through the changes feed since the stored page
+  token (one request when nothing changed), S3 with a new listing.
+- A lookup that misses catches up at once before reporting the folder as
+  missing, so a folder created by another worker is not created twice.
+  Full listings (folders(), names()) do not: they may miss a folder
+  another worker created until the next refresh, unless the caller passes
+  refresh=True (e.g. the folder picker after creating a folder).
+- add() puts folders created by this process in the index immediately.
+
+Sources implement list_folders() -> (folders, cursor) and
+list_changes(cursor) -> (changed, removed_ids, cursor), or return None
+from list_changes() when they have no changes feed. Folders are dicts
+with at least 'id' and 'name'.
+
+Persisting is best effort: without the table (migration not applied)
+or database the index still works per process.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from mysql.connector import Error as MySQLError
+
+from db_exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+FOLDER_INDEX_REFRESH_SECONDS = int(os.getenv("FOLDER_INDEX_REFRESH_SECONDS", "60"))
+
+LOAD_SNAPSHOT_QUERY = """
+    SELECT page_token, folders, synced_at FROM storage_folder_index
+    WHERE administration = %s AND provider = %s AND parent_id = %s
+"""
+
+SAVE_SNAPSHOT_QUERY = """
+    INSERT INTO storage_folder_index
+        (administration, provider, parent_id, page_token, folders, synced_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        page_token = VALUES(page_token),
+        folders = VALUES(folders),
+        synced_at = VALUES(synced_at)
+"""
+
+
+class CursorExpired(Exception):
+    """The source no longer accepts the stored cursor; relist everything."""
+
+
+class FolderIndex:
+    """name -> folder for one tenant's folder parent, kept in sync with its source."""
+
+    def __init__(self, provider: str, tenant: str, parent_id: str, db=None):
+        self.provider = provider
+        self.tenant = tenant
+        self.parent_id = parent_id
+        self.db = db
+        self._lock = threading.RLock()
+        self._folders: dict[str, dict] = {}
+        self._by_name: dict[str, list[str]] = {}
+        self._cursor: str | None = None
+        self._synced_at: float | None = None
+        self._loaded = False
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def folders(self, source, refresh: bool = False) -> list[dict]:
+        """All folders sorted by name (case-insensitive); refresh catches up first."""
+        with self._lock:
+            self._sync(source, force=refresh)
+            folders = [dict(folder) for folder in self._folders.values()]
+        return sorted(folders, key=lambda folder: folder["name"].lower())
+
+    def names(self, source, refresh: bool = False) -> list[str]:
+        return [folder["name"] for folder in self.folders(source, refresh)]
+
+    def find(self, name: str, source, ignore_case: bool = False) -> dict | None:
+        """Folder with this name, or None if the source has none."""
+        with self._lock:
+            synced = self._sync(source)
+            folder = self._lookup(name, ignore_case)
+            if folder is None and not synced:
+                self._sync(source, force=True)
+                folder = self._lookup(name, ignore_case)
+            return dict(folder) if folder else None
+
+    def add(self, folder: dict) -> None:
+        """Record a folder this process just created."""
+        with self._lock:
+            if self._synced_at is None:
+                return  # Not built yet; the first sync will list it
+            self._upsert(folder)
+            self._save()
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _sync(self, source, force: bool = False) -> bool:
+        """Bring the index up to date if stale (or forced). True if it synced."""
+        if not self._loaded:
+            self._loaded = True
+            self._load()
+        if not force and self._fresh():
+            return False
+        try:
+            if self._cursor is not None:
+                try:
+                    changes = source.list_changes(self._cursor)
+                except CursorExpired:
+                    changes = None
+                if changes is not None:
+                    changed, removed, self._cursor = changes
+                    for folder_id in removed:
+                        self._remove(folder_id)
+                    for folder in changed:
+                        self._upsert(folder)
+                    self._synced_at = time.time()
+                    if changed or removed:
+                        self._save()
+                    return True
+            folders, cursor = source.list_folders()
+        except Exception:
+            if self._synced_at is None:
+                raise
+            logger.warning(
+                f"Folder index refresh failed for {self.provider}/{self.tenant}; "
+                "serving cached folders",
+                exc_info=True,
+            )
+            return True
+        self._folders = {}
+        self._by_name = {}
+        for folder in folders:
+            self._upsert(folder)
+        self._cursor = cursor
+        self._synced_at = time.time()
+        self._save()
+        return True
+
+    def _fresh(self) -> bool:
+        return (
+            self._synced_at is not None
+            and time.time() - self._synced_at < FOLDER_INDEX_REFRESH_SECONDS
+        )
+
+    def _lookup(self, name: str, ignore_case: bool = False) -> dict | None:
+        ids = self._by_name.get(name)
+        if ids:
+            return self._folders[ids[0]]
+        if ignore_case:
+            folded = name.casefold()
+            for other, ids in self._by_name.items():
+                if other.casefold() == folded:
+                    return self._folders[ids[0]]
+        return None
+
+    def _upsert(self, folder: dict) -> None:
+        self._remove(folder["id"])
+        self._folders[folder["id"]] = folder
+        self._by_name.setdefault(folder["name"], []).append(folder["id"])
+
+    def _remove(self, folder_id: str) -> None:
+        folder = self._folders.pop(folder_id, None)
+        if folder is None:
+            return
+        ids = self._by_name[folder["name"]]
+        ids.remove(folder_id)
+        if not ids:
+            del self._by_name[folder["name"]]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if self.db is None:
+            return
+        try:
+            rows = self.db.execute_query(
+                LOAD_SNAPSHOT_QUERY, (self.tenant, self.provider, self.parent_id)
+            )
+            if not rows:
+                return
+            row = rows[0]
+            for folder in json.loads(row["folders"]):
+                self._upsert(folder)
+            self._cursor = row["page_token"]
+            self._synced_at = float(row["synced_at"])
+        except (DatabaseError, MySQLError, KeyError, TypeError, ValueError) as e:
+            logger.debug(f"No persisted folder index for {self.tenant}: {e}")
+
+    def _save(self) -> None:
+        if self.db is None:
+            return
+        try:
+            self.db.execute_query(
+                SAVE_SNAPSHOT_QUERY,
+                (
+                    self.tenant,
+                    self.provider,
+                    self.parent_id,
+                    self._cursor,
+                    json.dumps(list(self._folders.values())),
+                    self._synced_at,
+                ),
+                fetch=False,
+                commit=True,
+            )
+        except (DatabaseError, MySQLError, TypeError, ValueError) as e:
+            logger.debug(f"Could not persist folder index for {self.tenant}: {e}")
+
+
+# Cache structure: { (provider, tenant, parent_id): FolderIndex }
+_indexes: dict[tuple[str, str, str], FolderIndex] = {}
+_lock = threading.Lock()
+
+
+def get_folder_index(provider: str, tenant: str, parent_id: str, db=None):
+    """Process-wide FolderIndex for a tenant's folder parent."""
+    key = (provider, tenant, parent_id)
+    with _lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = FolderIndex(provider, tenant, parent_id, db)
+        elif index.db is None:
+            index.db = db
+        return index
+
+
+def invalidate_folder_index(tenant: str | None = None) -> None:
+    """Drop in-memory folder indexes for one tenant, or for all tenants."""
+    with _lock:
+        for key in list(_indexes):
+            if tenant is None or key[1] == tenant:
+                del _indexes[key]
@@ -3,8 +3,12 @@ Function Guard: Route decorator that enforces function-level access control.
 
 Checks (in order):
 1. Tenant context is available (from @tenant_required())
-2. Parent module is active for the tenant (via has_module())
-3. Function toggle is enabled for the tenant (via TenantFunctionService)
+2. Parent module is active for the tenant
+3. Function toggle is enabled for the tenant
+
+Module and toggle state come from the tenant's cached entitlement snapshot
+(services.entitlement_cache), so a warm request issues at most a cheap
+version check every few seconds.
 
 Returns HTTP 403 with appropriate JSON error messages for each failure case.
 
@@ -15,7 +19,6 @@ Reference: .kiro/specs/tenant-optional-functions/design.md
 """
 
 import functools
-import os
 
 from flask import jsonify
 
@@ -51,16 +54,12 @@ def function_guard(function_name: str, module_name: str):
                     {"success": False, "error": "Tenant context required"}
                 ), 403
 
-            # Create DatabaseManager instance
-            from database import DatabaseManager
+            from services.entitlement_cache import get_entitlements
 
-            test_mode = os.getenv("TEST_MODE", "false").lower() == "true"
-            db = DatabaseManager(test_mode=test_mode)
+            entitlements = get_entitlements(tenant)
 
             # Step 2: Check parent module is active
-            from services.module_registry import has_module
-
-            if not has_module(db, tenant, module_name):
+            if not entitlements.has_module(module_name):
                 return jsonify(
                     {
                         "success": False,
@@ -69,10 +68,7 @@ def function_guard(function_name: str, module_name: str):
                 ), 403
 
             # Step 3: Check function toggle is enabled
-            from services.tenant_function_service import TenantFunctionService
-
-            service = TenantFunctionService(db)
-            if not service.get_function_state(tenant, function_name):
+            if not entitlements.function_enabled(function_name):
                 return jsonify(
                     {
                         "success": False,
@@ -224,17 +224,11 @@ class InvoiceService:
                     flush=True,
                 )
                 drive_service = GoogleDriveService(administration=tenant)
-                drive_folders = drive_service.list_subfolders()
-
                 # Find the folder ID for the selected folder
-                folder_id = None
-                for folder in drive_folders:
-                    if folder["name"] == folder_name:
-                        folder_id = folder["id"]
-                        print(
-                            f"Found folder: {folder_name} (ID: {folder_id})", flush=True
-                        )
-                        break
+                folder = drive_service.find_subfolder(folder_name)
+                folder_id = folder["id"] if folder else None
+                if folder_id:
+                    print(f"Found folder: {folder_name} (ID: {folder_id})", flush=True)
 
                 if folder_id:
                     # Check if file already exists
@@ -262,7 +256,7 @@ class InvoiceService:
                     return drive_result
                 else:
                     print(
-                        f"Folder '{folder_name}' not found in Google Drive folders: {[f['name'] for f in drive_folders]}",
+                        f"Folder '{folder_name}' not found in Google Drive",
                         flush=True,
                     )
                     print("Using local storage as fallback", flush=True)
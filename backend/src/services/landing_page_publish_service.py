@@ -17,12 +17,27 @@ from datetime import datetime, timezone
 import boto3
 from botocore.exceptions import ClientError
 
-from services.landing_page_renderers import LandingPageRenderers
+from services.landing_page_renderers import LandingPageRenderers, content_hash
 from services.landing_page_styles import LandingPageStyles
 from services.media_asset_service import MediaAssetService
 
 logger = logging.getLogger(__name__)
 
+# S3 object metadata key holding the content hash of a published artifact
+CONTENT_HASH_METADATA = "content-hash"
+
+# Published artifacts per slug: filename -> (content type, error on failed write)
+PUBLISHED_ARTIFACTS = {
+    "landing.json": (
+        "application/json",
+        "Failed to publish landing page data to S3.",
+    ),
+    "index.html": (
+        "text/html; charset=utf-8",
+        "Failed to publish index.html to S3.",
+    ),
+}
+
 
 class LandingPagePublishService:
     """
@@ -66,6 +81,8 @@ class LandingPagePublishService:
 
         Resolves slug → draft → branding → footer/SEO, writes landing.json
         and index.html to S3, saves version snapshot, invalidates CloudFront.
+        Artifacts whose content hash matches the published object are not
+        rewritten, and only the paths of changed artifacts are invalidated.
         """
         slug = self.slug_svc.get_slug(tenant)
         if not slug:
@@ -119,162 +136,75 @@ class LandingPagePublishService:
 
         self._enrich_sections_with_module_data(published_data["sections"], tenant)
 
-        # Write landing.json to S3
-        json_body = json.dumps(published_data, ensure_ascii=False)
-        json_bytes = json_body.encode("utf-8")
+        json_bytes = json.dumps(published_data, ensure_ascii=False).encode("utf-8")
+        try:
+            index_html = self.generate_index_html(published_data, slug)
+        except ValueError as e:
+            logger.error("index.html generation failed for slug=%s: %s", slug, e)
+            return {"success": False, "error": "Failed to publish index.html to S3."}
+        html_bytes = (
+            index_html.encode("utf-8") if isinstance(index_html, str) else index_html
+        )
+
+        # landing.json is hashed without published_at so an unchanged draft
+        # keeps its published objects
+        artifacts = {
+            "landing.json": (
+                json_bytes,
+                content_hash(
+                    {k: v for k, v in published_data.items() if k != "published_at"}
+                ),
+            ),
+            "index.html": (html_bytes, content_hash(html_bytes)),
+        }
+
+        s3_client = boto3.client(
+            "s3", region_name=os.environ.get("AWS_DEFAULT_REGION", "eu-west-1")
+        )
+        changed = [
+            filename
+            for filename, (_body, digest) in artifacts.items()
+            if self._published_hash(s3_client, slug, filename) != digest
+        ]
 
         if self.asset_svc:
             # Use MediaAssetService for tracked asset storage
-            try:
-                json_result = self.asset_svc.store_and_register(
-                    tenant=tenant,
-                    file_data=json_bytes,
-                    filename="landing.json",
-                    category="landing-pages",
-                    entity_type="landing_page",
-                    entity_id=slug,
-                )
-                if not json_result.get("success"):
-                    logger.error(
-                        "store_and_register landing.json failed for slug=%s: %s",
-                        slug,
-                        json_result.get("error"),
-                    )
-                    return {
-                        "success": False,
-                        "error": "Failed to publish landing page data to S3.",
-                    }
-                logger.info("Published landing.json via asset_svc for slug=%s", slug)
-            except (ClientError, ValueError) as e:
-                logger.error(
-                    "store_and_register landing.json failed for slug=%s: %s", slug, e
-                )
-                return {
-                    "success": False,
-                    "error": "Failed to publish landing page data to S3.",
-                }
-
-            # Generate and write index.html via asset_svc
-            try:
-                index_html = self.generate_index_html(published_data, slug)
-                html_bytes = (
-                    index_html.encode("utf-8")
-                    if isinstance(index_html, str)
-                    else index_html
-                )
-                html_result = self.asset_svc.store_and_register(
-                    tenant=tenant,
-                    file_data=html_bytes,
-                    filename="index.html",
-                    category="landing-pages",
-                    entity_type="landing_page",
-                    entity_id=slug,
-                )
-                if not html_result.get("success"):
-                    logger.error(
-                        "store_and_register index.html failed for slug=%s: %s",
-                        slug,
-                        html_result.get("error"),
-                    )
-                    return {
-                        "success": False,
-                        "error": "Failed to publish index.html to S3.",
-                    }
-                logger.info("Published index.html via asset_svc for slug=%s", slug)
-            except (ClientError, ValueError) as e:
-                logger.error(
-                    "store_and_register index.html failed for slug=%s: %s", slug, e
-                )
-                return {
-                    "success": False,
-                    "error": "Failed to publish index.html to S3.",
-                }
-
-            # Write slug-based files for CloudFront serving ({slug}/index.html)
-            # The asset_svc writes are for tracking (tenant/category/asset_id_file),
-            # but CloudFront resolves subdomains to {slug}/index.html in S3.
-            try:
-                s3_client = boto3.client(
-                    "s3", region_name=os.environ.get("AWS_DEFAULT_REGION", "eu-west-1")
-                )
-                s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=f"{slug}/landing.json",
-                    Body=json_bytes,
-                    ContentType="application/json",
-                    CacheControl="public, max-age=300",
-                )
-                s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=f"{slug}/index.html",
-                    Body=html_bytes,
-                    ContentType="text/html; charset=utf-8",
-                    CacheControl="public, max-age=300",
+            for filename in changed:
+                error = self._register_artifact(
+                    tenant, slug, filename, artifacts[filename][0]
                 )
-                logger.info(
-                    "Published CDN-serving files to s3://%s/%s/",
-                    self.bucket_name,
-                    slug,
-                )
-            except (ClientError, ValueError) as e:
-                logger.error("S3 CDN-serving write failed for slug=%s: %s", slug, e)
-                return {
-                    "success": False,
-                    "error": "Failed to publish landing page for CDN serving.",
-                }
-        else:
-            # Fallback: direct S3 writes (no db_manager / no asset tracking)
+                if error:
+                    return {"success": False, "error": error}
+
+        # Write slug-based files for CloudFront serving ({slug}/index.html)
+        # The asset_svc writes are for tracking (tenant/category/asset_id_file),
+        # but CloudFront resolves subdomains to {slug}/index.html in S3.
+        for filename in changed:
+            body, digest = artifacts[filename]
+            content_type, error = PUBLISHED_ARTIFACTS[filename]
             try:
-                s3_client = boto3.client(
-                    "s3", region_name=os.environ.get("AWS_DEFAULT_REGION", "eu-west-1")
-                )
                 s3_client.put_object(
                     Bucket=self.bucket_name,
-                    Key=f"{slug}/landing.json",
-                    Body=json_bytes,
-                    ContentType="application/json",
+                    Key=f"{slug}/{filename}",
+                    Body=body,
+                    ContentType=content_type,
                     CacheControl="public, max-age=300",
+                    Metadata={CONTENT_HASH_METADATA: digest},
                 )
                 logger.info(
-                    "Published landing.json to s3://%s/%s/landing.json",
+                    "Published %s to s3://%s/%s/%s",
+                    filename,
                     self.bucket_name,
                     slug,
+                    filename,
                 )
             except (ClientError, ValueError) as e:
                 logger.error(
-                    "S3 put_object landing.json failed for slug=%s: %s", slug, e
-                )
-                return {
-                    "success": False,
-                    "error": "Failed to publish landing page data to S3.",
-                }
-
-            # Generate and write index.html to S3
-            try:
-                index_html = self.generate_index_html(published_data, slug)
-                s3_client = boto3.client(
-                    "s3", region_name=os.environ.get("AWS_DEFAULT_REGION", "eu-west-1")
-                )
-                s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=f"{slug}/index.html",
-                    Body=index_html.encode("utf-8")
-                    if isinstance(index_html, str)
-                    else index_html,
-                    ContentType="text/html; charset=utf-8",
-                    CacheControl="public, max-age=300",
-                )
-                logger.info(
-                    "Published index.html to s3://%s/%s/index.html",
-                    self.bucket_name,
-                    slug,
+                    "S3 put_object %s failed for slug=%s: %s", filename, slug, e
                 )
-            except (ClientError, ValueError) as e:
-                logger.error("S3 put_object index.html failed for slug=%s: %s", slug, e)
-                return {
-                    "success": False,
-                    "error": "Failed to publish index.html to S3.",
-                }
+                if self.asset_svc:
+                    error = "Failed to publish landing page for CDN serving."
+                return {"success": False, "error": error}
 
         # Save version snapshot
         version_result = self.landing_page_svc.save_version(
@@ -290,13 +220,17 @@ class LandingPagePublishService:
         else:
             self.landing_page_svc.prune_old_versions(slug)
 
-        self._invalidate_cache(slug)
+        if changed:
+            self._invalidate_cache(slug, self._artifact_paths(slug, changed))
+        else:
+            logger.info("Landing page unchanged for slug=%s, nothing written", slug)
 
         return {
             "success": True,
             "version": version,
             "published_at": now,
             "public_url": f"/p/{slug}",
+            "changed": changed,
         }
 
     # ========================================================================
@@ -380,18 +314,70 @@ class LandingPagePublishService:
             )
             return []
 
-    def _invalidate_cache(self, slug: str) -> None:
-        """Invalidate CloudFront cache for a tenant's landing page files."""
+    def _published_hash(self, s3_client, slug: str, filename: str) -> str | None:
+        """Content hash stored on the published {slug}/{filename}, or None."""
+        try:
+            response = s3_client.head_object(
+                Bucket=self.bucket_name, Key=f"{slug}/{filename}"
+            )
+        except ClientError:
+            return None
+        return (response.get("Metadata") or {}).get(CONTENT_HASH_METADATA)
+
+    def _register_artifact(
+        self, tenant: str, slug: str, filename: str, body: bytes
+    ) -> str | None:
+        """Store a changed artifact via asset_svc; returns an error message on failure."""
+        error = PUBLISHED_ARTIFACTS[filename][1]
+        try:
+            result = self.asset_svc.store_and_register(
+                tenant=tenant,
+                file_data=body,
+                filename=filename,
+                category="landing-pages",
+                entity_type="landing_page",
+                entity_id=slug,
+            )
+        except (ClientError, ValueError) as e:
+            logger.error(
+                "store_and_register %s failed for slug=%s: %s", filename, slug, e
+            )
+            return error
+        if not result.get("success"):
+            logger.error(
+                "store_and_register %s failed for slug=%s: %s",
+                filename,
+                slug,
+                result.get("error"),
+            )
+            return error
+        logger.info("Published %s via asset_svc for slug=%s", filename, slug)
+        return None
+
+    @staticmethod
+    def _artifact_paths(slug: str, filenames: list) -> list:
+        """CloudFront paths serving the given artifacts of a slug."""
+        paths = [f"/{slug}/{filename}" for filename in filenames]
+        if "index.html" in filenames:
+            paths += [f"/{slug}", f"/{slug}/"]
+        return paths
+
+    def _invalidate_cache(self, slug: str, paths: list | None = None) -> None:
+        """Invalidate CloudFront cache for a tenant's landing page files.
+
+        Without ``paths`` everything under the slug is invalidated.
+        """
         if not self.cloudfront_distribution_id:
             logger.warning(
                 "CLOUDFRONT_PUBLIC_PAGES_DISTRIBUTION_ID not set — skipping cache invalidation"
             )
             return
+        paths = paths or [f"/{slug}/*", f"/{slug}"]
         try:
             self._cloudfront.create_invalidation(
                 DistributionId=self.cloudfront_distribution_id,
                 InvalidationBatch={
-                    "Paths": {"Quantity": 2, "Items": [f"/{slug}/*", f"/{slug}"]},
+                    "Paths": {"Quantity": len(paths), "Items": paths},
                     "CallerReference": f"{slug}-{datetime.now(timezone.utc).isoformat()}",
                 },
             )
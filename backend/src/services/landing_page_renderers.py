@@ -8,14 +8,39 @@ Each render method converts a section's properties and layout into
 standalone static HTML served directly from S3/CloudFront.
 """
 
+import hashlib
 import html
+import json
 import os
 import re
+import threading
+from collections import OrderedDict
 
 import markdown
 
 from services.landing_page_styles import LandingPageStyles
 
+# Rendered section HTML keyed by (section hash, branding hash, layout), shared
+# across publishes so unchanged sections are not re-rendered
+SECTION_CACHE_SIZE = 512
+_section_cache: OrderedDict = OrderedDict()
+_section_cache_lock = threading.Lock()
+
+
+def content_hash(value) -> str:
+    """SHA-256 hex digest of bytes, a string or a JSON-serialisable value."""
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    elif not isinstance(value, (bytes, bytearray)):
+        value = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+def clear_section_cache() -> None:
+    """Drop all cached section HTML."""
+    with _section_cache_lock:
+        _section_cache.clear()
+
 
 class LandingPageRenderers:
     """Section HTML renderers for the landing page publish pipeline."""
@@ -24,6 +49,7 @@ class LandingPageRenderers:
         self.img_base = img_base
         self.color_accent = color_accent
         self.color_primary = color_primary
+        self.branding_hash = content_hash([img_base, color_accent, color_primary])
 
     # ========================================================================
     # Section Dispatch
@@ -37,57 +63,89 @@ class LandingPageRenderers:
         ``LandingPageStyles.build_section_style``.  When settings are absent or
         empty, the section renders exactly as before (no style attribute, default
         container class) preserving backwards compatibility.
+
+        Rendered sections are cached by :meth:`section_key`, so a republish
+        only renders the sections whose content changed.
         """
         parts = []
         for section in sections:
-            section_type = section.get("type", "")
-            props = section.get("properties", {})
-            layout = section.get("layout", "")
-            settings = section.get("settings", {})
-
-            # Generate section wrapper with settings-based inline style
-            wrapper_style = LandingPageStyles.build_section_style(
-                settings, self.img_base
-            )
-
-            content_html = self.render_section(section_type, props, layout, slug)
-            if content_html:
-                if wrapper_style:
-                    # Settings present — apply styled wrapper
-                    max_width = settings.get("max_width", "contained")
-                    container_class = "container" if max_width == "contained" else ""
-                    style_attr = f' style="{wrapper_style}"'
-
-                    # Separate any trailing <script> blocks from section HTML
-                    section_part, script_part = self._split_script(content_html)
-
-                    # Extract original CSS classes from the section wrapper
-                    orig_classes = self._extract_section_classes(section_part)
-
-                    # Merge classes: always include 'section', preserve originals
-                    all_classes = {"section"}
-                    all_classes.update(orig_classes)
-                    class_str = " ".join(sorted(all_classes))
-
-                    # Extract original id attribute if present
-                    orig_id = self._extract_section_id(section_part)
-                    id_attr = f' id="{orig_id}"' if orig_id else ""
-
-                    # Strip the existing wrapper to get inner content
-                    inner = self._strip_section_wrapper(section_part)
-
-                    parts.append(
-                        f'<section{id_attr} class="{class_str}"{style_attr}>'
-                        f'<div class="{container_class}">{inner}</div>'
-                        f"</section>"
-                    )
-                    if script_part:
-                        parts.append(script_part)
-                else:
-                    # No settings — render as-is
-                    parts.append(content_html)
+            key = self.section_key(section, slug)
+            with _section_cache_lock:
+                section_parts = _section_cache.get(key)
+                if section_parts is not None:
+                    _section_cache.move_to_end(key)
+            if section_parts is None:
+                section_parts = self._render_section_parts(section, slug)
+                with _section_cache_lock:
+                    _section_cache[key] = section_parts
+                    while len(_section_cache) > SECTION_CACHE_SIZE:
+                        _section_cache.popitem(last=False)
+            parts.extend(section_parts)
         return "\n".join(parts)
 
+    def section_key(self, section: dict, slug: str) -> tuple:
+        """Cache key of a section: (section hash, branding hash, layout)."""
+        section_hash = content_hash(
+            {
+                "type": section.get("type", ""),
+                "properties": section.get("properties", {}),
+                "settings": section.get("settings", {}),
+                "slug": slug,
+            }
+        )
+        return (section_hash, self.branding_hash, section.get("layout", ""))
+
+    def _render_section_parts(self, section: dict, slug: str) -> list:
+        """Render one section (and any trailing script) to HTML parts."""
+        section_type = section.get("type", "")
+        props = section.get("properties", {})
+        layout = section.get("layout", "")
+        settings = section.get("settings", {})
+
+        # Generate section wrapper with settings-based inline style
+        wrapper_style = LandingPageStyles.build_section_style(settings, self.img_base)
+
+        content_html = self.render_section(section_type, props, layout, slug)
+        if not content_html:
+            return []
+        if not wrapper_style:
+            # No settings — render as-is
+            return [content_html]
+
+        # Settings present — apply styled wrapper
+        max_width = settings.get("max_width", "contained")
+        container_class = "container" if max_width == "contained" else ""
+        style_attr = f' style="{wrapper_style}"'
+
+        # Separate any trailing <script> blocks from section HTML
+        section_part, script_part = self._split_script(content_html)
+
+        # Extract original CSS classes from the section wrapper
+        orig_classes = self._extract_section_classes(section_part)
+
+        # Merge classes: always include 'section', preserve originals
+        all_classes = {"section"}
+        all_classes.update(orig_classes)
+        class_str = " ".join(sorted(all_classes))
+
+        # Extract original id attribute if present
+        orig_id = self._extract_section_id(section_part)
+        id_attr = f' id="{orig_id}"' if orig_id else ""
+
+        # Strip the existing wrapper to get inner content
+        inner = self._strip_section_wrapper(section_part)
+
+        parts = [
+            (
+                f'<section{id_attr} class="{class_str}"{style_attr}>'
+                f'<div class="{container_class}">{inner}</div>'
+                f"</section>"
+            )
+        ]
+        if script_part:
+            parts.append(script_part)
+        return parts
+
     @staticmethod
     def _strip_section_wrapper(html_str: str) -> str:
         """Strip outer <section ...>...</section> wrapper if present.
@@ -367,9 +425,7 @@ class LandingPageRenderers:
 
         # Render markdown content to HTML (supports headings, bold, lists, etc.)
         if content.strip():
-            text_html = markdown.markdown(
-                content, extensions=["nl2br", "smarty"]
-            )
+            text_html = markdown.markdown(content, extensions=["nl2br", "smarty"])
         else:
             text_html = ""
         title_html = f"<h2>{title}</h2>" if title else ""
@@ -5,7 +5,9 @@ Resolves a tenant's company logo as a base64 data URI based on the configured
 storage provider. Supports Google Drive (legacy) and S3 shared/tenant buckets.
 
 Used by both the STR invoice generator and the ZZP PDF generator to avoid
-duplicating logo fetch logic across multiple modules.
+duplicating logo fetch logic across multiple modules. Encoded logos are kept
+in the shared PDF render cache keyed by the logo asset, so a logo is
+downloaded once per cache TTL instead of once per document.
 
 Reference: .kiro/specs/s3-shared-bucket-infrastructure/design.md §Provider-Aware Logo Resolution
 """
@@ -18,6 +20,8 @@ import boto3
 import requests
 from botocore.exceptions import ClientError
 
+from services.pdf_render_cache import get_logo
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,6 +79,14 @@ def _resolve_google_drive_logo(
     if not logo_file_id:
         return None
 
+    return get_logo(
+        ("google_drive", logo_file_id),
+        lambda: _download_google_drive_logo(tenant, logo_file_id),
+    )
+
+
+def _download_google_drive_logo(tenant: str, logo_file_id: str) -> str | None:
+    """Download a Google Drive logo and encode it as a data URI."""
     logo_url = f"https://lh3.googleusercontent.com/d/{logo_file_id}=w600"
     try:
         resp = requests.get(logo_url, timeout=10)
@@ -112,6 +124,13 @@ def _resolve_s3_logo(
         )
         return None
 
+    return get_logo(
+        ("s3", bucket, s3_key), lambda: _download_s3_logo(tenant, bucket, s3_key)
+    )
+
+
+def _download_s3_logo(tenant: str, bucket: str, s3_key: str) -> str | None:
+    """Download an S3 logo and encode it as a data URI."""
     try:
         s3_client = boto3.client("s3")
         obj = s3_client.get_object(Bucket=bucket, Key=s3_key)
@@ -21,9 +21,18 @@ from ulid import ULID
 from database import DatabaseManager
 from db_exceptions import DatabaseError, IntegrityError
 from services.parameter_service import ParameterService
+from storage.client_registry import S3_CLIENT_CONFIG, get_client_registry
 
 logger = logging.getLogger(__name__)
 
+
+def _s3_client():
+    """S3 client for the managed buckets, shared process-wide."""
+    return get_client_registry().shared(
+        ("s3", None), None, lambda: boto3.client("s3", config=S3_CLIENT_CONFIG)
+    )
+
+
 # entity_type → (table, id_column, existence_query) or None for ephemeral types
 # Special: 'dynamodb' as table name indicates DynamoDB-backed entity (no MySQL query)
 ENTITY_TYPE_REGISTRY = {
@@ -1379,7 +1388,7 @@ class MediaAssetService:
         """
         keys = []
         try:
-            s3_client = boto3.client("s3")
+            s3_client = _s3_client()
             paginator = s3_client.get_paginator("list_objects_v2")
             page_iterator = paginator.paginate(Bucket=bucket, Prefix=prefix)
 
@@ -1522,12 +1531,11 @@ class MediaAssetService:
         """
         import os
 
-        import boto3
         from botocore.exceptions import ClientError
 
         s3_objects = {}  # {s3_key: {bucket, size, last_modified}}
 
-        s3_client = boto3.client("s3")
+        s3_client = _s3_client()
 
         def list_with_metadata(bucket, prefix):
             """List S3 objects with full metadata."""
@@ -1609,7 +1617,6 @@ class MediaAssetService:
         """
         import os
 
-        import boto3
         from botocore.exceptions import ClientError
 
         # Safety check: verify keys are not registered
@@ -1629,7 +1636,7 @@ class MediaAssetService:
         shared_bucket = os.environ.get("S3_SHARED_BUCKET")
         pages_bucket = os.environ.get("LANDING_PAGES_BUCKET")
 
-        s3_client = boto3.client("s3")
+        s3_client = _s3_client()
         deleted = 0
         skipped = 0
 
@@ -2504,7 +2511,7 @@ class MediaAssetService:
         """
         objects = []
         try:
-            s3_client = boto3.client("s3")
+            s3_client = _s3_client()
             paginator = s3_client.get_paginator("list_objects_v2")
             page_iterator = paginator.paginate(Bucket=bucket, Prefix=prefix)
 
@@ -2808,7 +2815,7 @@ class MediaAssetService:
             True if upload succeeded, False otherwise.
         """
         try:
-            s3_client = boto3.client("s3")
+            s3_client = _s3_client()
             s3_client.put_object(
                 Bucket=bucket,
                 Key=key,
@@ -2841,7 +2848,7 @@ class MediaAssetService:
             True if deletion succeeded, False otherwise.
         """
         try:
-            s3_client = boto3.client("s3")
+            s3_client = _s3_client()
             s3_client.delete_object(Bucket=bucket, Key=key)
             return True
         except ClientError as e:
@@ -2931,7 +2938,7 @@ class MediaAssetService:
                 return url
 
         # Generate new presigned URL
-        s3_client = boto3.client("s3")
+        s3_client = _s3_client()
         url = s3_client.generate_presigned_url(
             "get_object",
             Params={"Bucket": asset["bucket"], "Key": asset["s3_key"]},
@@ -11,7 +11,6 @@ Reference: .kiro/specs/parameter-driven-config/design.md
 
 import functools
 import logging
-import os
 
 from flask import jsonify
 
@@ -217,12 +216,10 @@ def module_required(module_name: str):
             if not tenant:
                 return jsonify({"error": "Tenant context required"}), 403
 
-            from database import DatabaseManager
+            # Imported here: entitlement_cache -> function_registry -> this module
+            from services.entitlement_cache import get_entitlements
 
-            test_mode = os.getenv("TEST_MODE", "false").lower() == "true"
-            db = DatabaseManager(test_mode=test_mode)
-
-            if not has_module(db, tenant, module_name):
+            if not get_entitlements(tenant).has_module(module_name):
                 return jsonify(
                     {"error": f"{module_name} module not enabled for this tenant"}
                 ), 403
@@ -278,6 +275,10 @@ def activate_module(
             "Module %s activated for tenant %s by %s", module_name, tenant, activated_by
         )
 
+        from services.entitlement_cache import invalidate_entitlements
+
+        invalidate_entitlements(tenant)
+
         # Seed required parameters for the newly activated module
         from services.parameter_service import ParameterService
 
@@ -3,12 +3,14 @@ PDFGeneratorService: HTML-to-PDF conversion for invoices using weasyprint.
 
 Renders an HTML template with invoice data, injects tenant logo,
 and converts to PDF. Falls back to a default template if no
-tenant-specific template is configured.
+tenant-specific template is configured. Compiled templates, logos and
+parsed stylesheets come from the shared pdf_render_cache.
 
 Reference: .kiro/specs/zzp-module/design.md §5.6
 """
 
 import logging
+import os
 from datetime import date
 from io import BytesIO
 
@@ -16,6 +18,12 @@ from babel.dates import format_date as babel_format_date
 from babel.numbers import format_currency, format_decimal
 
 from services.logo_resolver import resolve_tenant_logo
+from services.pdf_render_cache import (
+    CompiledTemplate,
+    get_compiled_template,
+    get_template_path,
+    write_pdf,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +52,10 @@ COUNTRY_LOCALE_MAP = {
 }
 DEFAULT_LOCALE = "nl_NL"
 
+DEFAULT_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "templates", "zzp_invoice_default.html"
+)
+
 
 class PDFGeneratorService:
     """Generate invoice PDFs from HTML templates via weasyprint."""
@@ -82,7 +94,7 @@ class PDFGeneratorService:
         is_preview: bool = False,
     ) -> str:
         """Render the invoice HTML from template + data."""
-        template_html = self._load_template(tenant)
+        template = self._load_template(tenant)
         logo_url = self._get_tenant_logo(tenant)
         branding = self._get_branding(tenant)
 
@@ -180,11 +192,7 @@ class PDFGeneratorService:
             "{{grand_total}}": fmt_amount(invoice.get("grand_total", 0)),
         }
 
-        html = template_html
-        for key, value in replacements.items():
-            html = html.replace(key, value)
-
-        return html
+        return template.render(replacements)
 
     def _get_branding(self, tenant: str) -> dict:
         """Load tenant branding from zzp_branding namespace."""
@@ -298,38 +306,32 @@ class PDFGeneratorService:
 
     def _html_to_pdf(self, html: str) -> BytesIO:
         """Convert HTML string to PDF bytes via weasyprint."""
-        try:
-            import weasyprint
-        except ImportError:
-            logger.error("weasyprint not installed — cannot generate PDF")
-            raise RuntimeError(
-                "PDF generation requires weasyprint. "
-                "Install with: pip install weasyprint>=60.0"
-            )
-
-        pdf_bytes = weasyprint.HTML(string=html).write_pdf()
-        output = BytesIO(pdf_bytes)
+        output = BytesIO(write_pdf(html))
         output.seek(0)
         return output
 
-    def _load_template(self, tenant: str) -> str:
+    def _load_template(self, tenant: str) -> CompiledTemplate:
         """Load HTML template: tenant-specific via TemplateService, or default."""
+        path = get_template_path(
+            tenant, "zzp_invoice", lambda: self._resolve_template_path(tenant)
+        )
+        return get_compiled_template(tenant, path, _INLINE_DEFAULT_TEMPLATE)
+
+    def _resolve_template_path(self, tenant: str) -> str:
+        """Path of the tenant's template file, or of the built-in default."""
         if self.template_service:
             try:
                 meta = self.template_service.get_template_metadata(
                     tenant, "zzp_invoice"
                 )
                 if meta and meta.get("local_path"):
-                    import os
-
                     path = meta["local_path"]
                     if os.path.exists(path):
-                        with open(path, "r", encoding="utf-8") as f:
-                            return f.read()
+                        return path
             except Exception as e:
                 logger.warning("Failed to load tenant template, using default: %s", e)
 
-        return self._default_template()
+        return DEFAULT_TEMPLATE_PATH
 
     def _get_tenant_logo(self, tenant: str) -> str | None:
         """Get logo as base64 data URI from tenant's branding config.
@@ -343,21 +345,6 @@ class PDFGeneratorService:
 
         return resolve_tenant_logo(tenant, "zzp_branding", self.parameter_service)
 
-    @staticmethod
-    def _default_template() -> str:
-        """Return the built-in default invoice HTML template."""
-        import os
-
-        template_path = os.path.join(
-            os.path.dirname(__file__), "..", "templates", "zzp_invoice_default.html"
-        )
-        if os.path.exists(template_path):
-            with open(template_path, "r", encoding="utf-8") as f:
-                return f.read()
-
-        # Inline fallback if file doesn't exist yet
-        return _INLINE_DEFAULT_TEMPLATE
-
 
 _INLINE_DEFAULT_TEMPLATE = """<!DOCTYPE html>
 <html><head><meta charset="utf-8"/>
@@ -0,0 +1,210 @@
+"""
+PDF Render Cache
+
+Process-wide caches shared by the invoice rendering pipelines (ZZP invoice
+PDFs, STR invoices and template previews), so rendering a document only
+costs the layout work:
+
+- Compiled invoice templates keyed by (tenant, template version), where the
+  version is the template file's path, mtime and size
+- Logo data URIs keyed by the logo asset (storage provider + file id/S3 key)
+- Parsed WeasyPrint stylesheets and font configuration, kept per thread
+  because a FontConfiguration is not safe to share between threads
+
+Template lookups and logos expire after their TTL so changes made by another
+worker process are picked up. Call invalidate_render_cache(tenant) after
+changing a tenant's template or branding to drop them right away.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_TTL_SECONDS = 300  # 5 minutes
+LOGO_TTL_SECONDS = 3600  # 1 hour
+MAX_LOGOS = 256
+MAX_STYLESHEETS = 32
+
+PLACEHOLDER_RE = re.compile(r"\{\{\w+\}\}")
+STYLE_RE = re.compile(r"<style[^>]*>(.*?)</style>", re.DOTALL | re.IGNORECASE)
+
+
+class CompiledTemplate:
+    """HTML template split once into literal text and {{placeholder}} slots.
+
+    Rendering fills every slot in a single pass; placeholders without a value
+    are kept as-is and placeholders inside substituted values are not expanded.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._literals = PLACEHOLDER_RE.split(source)
+        self._slots = PLACEHOLDER_RE.findall(source)
+
+    def render(self, values: dict[str, str]) -> str:
+        """Render with values keyed by the full placeholder, e.g. '{{logo}}'."""
+        parts = [self._literals[0]]
+        for slot, literal in zip(self._slots, self._literals[1:]):
+            parts.append(values.get(slot, slot))
+            parts.append(literal)
+        return "".join(parts)
+
+
+# Cache structure: { (tenant, template_type): (path, resolved_at) }
+_template_paths: dict[tuple[str, str], tuple[str | None, float]] = {}
+# Cache structure: { (tenant, path, mtime_ns, size): CompiledTemplate }
+_templates: dict[tuple, CompiledTemplate] = {}
+# Cache structure: { asset_key: (data_uri, fetched_at) }, least recently used first
+_logos: OrderedDict[tuple, tuple[str, float]] = OrderedDict()
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_template_path(
+    tenant: str, template_type: str, resolve: Callable[[], str | None]
+) -> str | None:
+    """Tenant template path from resolve(), remembered for TEMPLATE_TTL_SECONDS."""
+    key = (tenant, template_type)
+    now = time.monotonic()
+    with _lock:
+        cached = _template_paths.get(key)
+    if cached and now - cached[1] < TEMPLATE_TTL_SECONDS:
+        return cached[0]
+
+    path = resolve()
+    with _lock:
+        _template_paths[key] = (path, now)
+    return path
+
+
+def get_compiled_template(
+    tenant: str, path: str | None, fallback: str
+) -> CompiledTemplate:
+    """Compiled template for a file, recompiled when the file changes.
+
+    Uses ``fallback`` (an inline template source) when the path is unset or
+    the file does not exist or cannot be read.
+    """
+    try:
+        stat = os.stat(path) if path else None
+    except OSError:
+        stat = None
+    if stat is None:
+        key = (tenant, None, 0, hashlib.sha256(fallback.encode("utf-8")).hexdigest())
+    else:
+        key = (tenant, path, stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        template = _templates.get(key)
+    if template is not None:
+        return template
+
+    if stat is None:
+        source = fallback
+    else:
+        try:
+            with open(path, encoding="utf-8") as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning("Cannot read template %s, using fallback: %s", path, e)
+            source = fallback
+    template = CompiledTemplate(source)
+    with _lock:
+        # Drop older versions of this tenant's template
+        for stale in [k for k in _templates if k[:2] == key[:2]]:
+            del _templates[stale]
+        _templates[key] = template
+    return template
+
+
+def get_logo(asset_key: tuple, fetch: Callable[[], str | None]) -> str | None:
+    """Logo data URI for an asset, fetched at most once per LOGO_TTL_SECONDS.
+
+    Failed fetches (None) are not cached, so the next document retries.
+    """
+    now = time.monotonic()
+    with _lock:
+        cached = _logos.get(asset_key)
+        if cached and now - cached[1] < LOGO_TTL_SECONDS:
+            _logos.move_to_end(asset_key)
+            return cached[0]
+
+    data_uri = fetch()
+    if data_uri:
+        with _lock:
+            _logos[asset_key] = (data_uri, now)
+            _logos.move_to_end(asset_key)
+            while len(_logos) > MAX_LOGOS:
+                _logos.popitem(last=False)
+    return data_uri
+
+
+def invalidate_render_cache(tenant: str | None = None) -> None:
+    """Drop cached templates and logos for one tenant, or everything.
+
+    Logos are keyed by asset rather than tenant, so they are dropped for all
+    tenants either way. Clearing everything also drops the calling thread's
+    parsed stylesheets and font configuration.
+    """
+    with _lock:
+        if tenant is None:
+            _template_paths.clear()
+            _templates.clear()
+            _local.__dict__.clear()
+        else:
+            for key in [k for k in _template_paths if k[0] == tenant]:
+                del _template_paths[key]
+            for key in [k for k in _templates if k[0] == tenant]:
+                del _templates[key]
+        _logos.clear()
+
+
+def write_pdf(html: str) -> bytes:
+    """Convert HTML to PDF bytes, reusing parsed stylesheets and fonts.
+
+    The document's <style> blocks are parsed once per thread and passed to
+    WeasyPrint as stylesheets together with a shared FontConfiguration.
+
+    Raises:
+        RuntimeError: If weasyprint is not installed.
+    """
+    try:
+        import weasyprint
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        logger.error("weasyprint not installed — cannot generate PDF")
+        raise RuntimeError(
+            "PDF generation requires weasyprint. "
+            "Install with: pip install weasyprint>=60.0"
+        )
+
+    css_text = "\n".join(STYLE_RE.findall(html))
+    if not css_text.strip():
+        return weasyprint.HTML(string=html).write_pdf()
+
+    font_config = getattr(_local, "font_config", None)
+    if font_config is None:
+        font_config = _local.font_config = FontConfiguration()
+        _local.stylesheets = OrderedDict()
+
+    stylesheets = _local.stylesheets
+    css_key = hashlib.sha256(css_text.encode("utf-8")).hexdigest()
+    stylesheet = stylesheets.get(css_key)
+    if stylesheet is None:
+        stylesheet = weasyprint.CSS(string=css_text, font_config=font_config)
+        stylesheets[css_key] = stylesheet
+        while len(stylesheets) > MAX_STYLESHEETS:
+            stylesheets.popitem(last=False)
+    else:
+        stylesheets.move_to_end(css_key)
+
+    return weasyprint.HTML(string=STYLE_RE.sub("", html)).write_pdf(
+        stylesheets=[stylesheet], font_config=font_config
+    )
@@ -11,6 +11,8 @@ Reference: .kiro/specs/provider-aware-folder-routes/design.md
 
 import logging
 
+from services.folder_index import get_folder_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,40 +95,32 @@ def get_s3_storage(tenant: str, parameter_service=None):
     return S3SharedStorage(tenant, parameter_service)
 
 
-def list_s3_folders(
-    tenant: str, parameter_service=None, category: str = "invoices"
-) -> list[str]:
-    """List folder names under {tenant}/{category}/ in S3.
+class S3FolderSource:
+    """Folder source for FolderIndex: reference folders under one S3 prefix.
 
-    Uses list_objects_v2 with Delimiter='/' to extract unique reference
-    (folder) names from CommonPrefixes. Also checks for .folder marker
-    objects in Contents to include empty folders that have no other files.
+    S3 has no changes feed, so every refresh is a full (delimited) listing.
+    """
 
-    Args:
-        tenant: The tenant/administration identifier.
-        parameter_service: Optional ParameterService instance.
-        category: Storage category prefix (default: 'invoices').
+    def __init__(self, storage, prefix: str):
+        self.storage = storage
+        self.prefix = prefix
 
-    Returns:
-        Sorted list of folder name strings. Returns empty list on error.
-    """
-    try:
-        storage = get_s3_storage(tenant, parameter_service)
-        prefix = f"{tenant}/{category}/"
+    def list_folders(self):
+        prefix = self.prefix
         folder_names: set = set()
 
         # Paginate through all results
         continuation_token = None
         while True:
             kwargs = {
-                "Bucket": storage.bucket,
+                "Bucket": self.storage.bucket,
                 "Prefix": prefix,
                 "Delimiter": "/",
             }
             if continuation_token:
                 kwargs["ContinuationToken"] = continuation_token
 
-            response = storage._client.list_objects_v2(**kwargs)
+            response = self.storage._client.list_objects_v2(**kwargs)
 
             # Extract folder names from CommonPrefixes
             for cp in response.get("CommonPrefixes", []):
@@ -156,7 +150,51 @@ def list_s3_folders(
             else:
                 break
 
-        return sorted(folder_names)
+        return [s3_folder_entry(prefix, name) for name in folder_names], None
+
+    def list_changes(self, cursor):
+        return None
+
+
+def s3_folder_entry(prefix: str, folder_name: str) -> dict:
+    """FolderIndex entry for an S3 reference folder."""
+    return {"id": f"{prefix}{folder_name}/", "name": folder_name}
+
+
+def _s3_folder_index(tenant: str, storage, prefix: str):
+    db = getattr(storage.parameter_service, "db", None)
+    return get_folder_index("s3_shared", tenant, f"{storage.bucket}/{prefix}", db=db)
+
+
+def list_s3_folders(
+    tenant: str,
+    parameter_service=None,
+    category: str = "invoices",
+    refresh: bool = False,
+) -> list[str]:
+    """List folder names under {tenant}/{category}/ in S3.
+
+    Names come from the tenant's FolderIndex for this prefix, so repeated
+    calls are served from memory. The index relists through S3FolderSource
+    (list_objects_v2 with Delimiter='/' plus .folder markers for empty
+    folders) at most every FOLDER_INDEX_REFRESH_SECONDS, so a folder that
+    another worker just created may be missing until then unless refresh
+    is set.
+
+    Args:
+        tenant: The tenant/administration identifier.
+        parameter_service: Optional ParameterService instance.
+        category: Storage category prefix (default: 'invoices').
+        refresh: Relist first (user-triggered refresh of the folder picker).
+
+    Returns:
+        Sorted list of folder name strings. Returns empty list on error.
+    """
+    try:
+        storage = get_s3_storage(tenant, parameter_service)
+        prefix = f"{tenant}/{category}/"
+        index = _s3_folder_index(tenant, storage, prefix)
+        return sorted(index.names(S3FolderSource(storage, prefix), refresh))
 
     except Exception as e:
         logger.warning(
@@ -195,6 +233,10 @@ def create_s3_folder(tenant: str, folder_name: str, parameter_service=None) -> d
         )
 
         logger.info("Created S3 folder marker: s3://%s/%s", storage.bucket, key)
+        prefix = f"{tenant}/invoices/"
+        _s3_folder_index(tenant, storage, prefix).add(
+            s3_folder_entry(prefix, folder_name)
+        )
         return {"id": key, "name": folder_name, "url": key}
 
     except Exception as e:
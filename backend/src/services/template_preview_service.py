@@ -16,6 +16,7 @@ import os
 from datetime import datetime
 from typing import Any
 
+from services.pdf_render_cache import invalidate_render_cache
 from services.template_html_processor import TemplateHtmlProcessor
 from services.template_pdf_renderer import TemplatePdfRenderer
 
@@ -375,6 +376,9 @@ class TemplatePreviewService:
                 version,
             )
 
+            # Render the new version on the next invoice rather than after the TTL
+            invalidate_render_cache(self.administration)
+
             # 5. Log approval
             self._log_template_approval(template_type, user_email, notes, validation)
 
@@ -13,6 +13,7 @@ import logging
 from typing import Any
 
 from database import DatabaseManager
+from services.entitlement_cache import invalidate_entitlements
 from services.function_registry import FUNCTION_REGISTRY
 from services.module_registry import has_module
 
@@ -173,6 +174,7 @@ class TenantFunctionService:
                 fetch=False,
                 commit=True,
             )
+            invalidate_entitlements(tenant)
 
             return {
                 "success": True,
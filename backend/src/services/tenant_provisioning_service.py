@@ -22,6 +22,7 @@ import os
 from pathlib import Path
 from typing import Any
 
+from services.entitlement_cache import invalidate_entitlements
 from services.parameter_service import ParameterService
 
 logger = logging.getLogger(__name__)
@@ -665,6 +666,7 @@ class TenantProvisioningService:
                 )
                 logger.info(f"Module '{module}' inserted for '{administration}'")
                 results.append({"name": module, "status": "created"})
+        invalidate_entitlements(administration)
         return results
 
     def _load_chart_of_accounts(
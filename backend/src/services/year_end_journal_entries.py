@@ -6,13 +6,33 @@ Handles the creation and deletion of journal entries for year-end closure:
 - Opening balance transactions for the new year
 - VAT netting logic for balance sheet carry-forward
 
+Entries are built in memory and written with multi-row INSERTs: ending
+balances come from one grouped query and the VAT netting flags of all
+accounts from one rekeningschema query, so closing a year costs a fixed
+number of statements however many accounts carry a balance.
+
 Extracted from year_end_service.py for clarity and maintainability.
 """
 
 from typing import Any
 
+from db_batch import chunk_params
 from services.year_end_config import YearEndConfigService
 
+INSERT_ENTRIES_PREFIX = """
+    INSERT INTO mutaties (
+        TransactionNumber,
+        TransactionDate,
+        TransactionDescription,
+        TransactionAmount,
+        Debet,
+        Credit,
+        ReferenceNumber,
+        administration
+    ) VALUES
+"""
+ENTRY_VALUES = "(%s, %s, %s, %s, %s, %s, %s, %s)"
+
 
 class YearEndJournalEntryHelper:
     """Helper for creating and managing year-end journal entries."""
@@ -26,6 +46,40 @@ class YearEndJournalEntryHelper:
         """
         self.config_service = config_service
 
+    def create_year_end_entries(
+        self,
+        administration: str,
+        year: int,
+        net_result: float,
+        cursor,
+    ) -> tuple[str | None, str | None]:
+        """
+        Create the closure transaction for a year and the opening balances
+        for the next year in one multi-row INSERT.
+
+        The closure transaction only touches the P&L closing account
+        (VW='Y') and the equity account, which the opening balances leave
+        out, so the ending balances can be read before it is written.
+
+        Args:
+            administration: Tenant identifier
+            year: Year being closed
+            net_result: Pre-calculated net P&L result
+            cursor: Database cursor (for transaction control)
+
+        Returns:
+            tuple: (closure TransactionNumber, opening TransactionNumber);
+                each None when no entries were needed
+        """
+        closure_entries = self.closure_entries(administration, year, net_result)
+        opening_entries = self.opening_balance_entries(administration, year + 1, cursor)
+        self.insert_entries(closure_entries + opening_entries, cursor)
+
+        return (
+            closure_entries[0][0] if closure_entries else None,
+            opening_entries[0][0] if opening_entries else None,
+        )
+
     def create_closure_transaction(
         self,
         administration: str,
@@ -36,6 +90,50 @@ class YearEndJournalEntryHelper:
         """
         Create year-end closure transaction (P&L to equity).
 
+        See closure_entries() for the booking rules.
+
+        Args:
+            administration: Tenant identifier
+            year: Year being closed
+            net_result: Pre-calculated net P&L result
+            cursor: Database cursor (for transaction control)
+
+        Returns:
+            str: TransactionNumber of created transaction, or None if net result is zero
+        """
+        entries = self.closure_entries(administration, year, net_result)
+        self.insert_entries(entries, cursor)
+        return entries[0][0] if entries else None
+
+    def create_opening_balances(
+        self,
+        administration: str,
+        year: int,
+        cursor,
+    ) -> str | None:
+        """
+        Create opening balance transactions for the new year.
+
+        See opening_balance_entries() for the booking rules.
+
+        Args:
+            administration: Tenant identifier
+            year: Year for opening balances (e.g., 2025 for balances from 2024)
+            cursor: Database cursor (for transaction control)
+
+        Returns:
+            str: TransactionNumber of created transactions, or None if no balances
+        """
+        entries = self.opening_balance_entries(administration, year, cursor)
+        self.insert_entries(entries, cursor)
+        return entries[0][0] if entries else None
+
+    def closure_entries(
+        self, administration: str, year: int, net_result: float
+    ) -> list[list]:
+        """
+        Build the year-end closure entry (P&L to equity).
+
         This transaction closes all P&L accounts by recording the net result
         in the equity account. The P&L closing account is used as the
         offsetting account.
@@ -55,10 +153,9 @@ class YearEndJournalEntryHelper:
             administration: Tenant identifier
             year: Year being closed
             net_result: Pre-calculated net P&L result
-            cursor: Database cursor (for transaction control)
 
         Returns:
-            str: TransactionNumber of created transaction, or None if net result is zero
+            list: INSERT parameter rows (empty if net result is zero)
         """
         # Get required accounts from configuration
         equity_account_info = self.config_service.get_account_by_purpose(
@@ -77,7 +174,7 @@ class YearEndJournalEntryHelper:
 
         # No transaction needed if result is zero
         if net_result == 0:
-            return None
+            return []
 
         # Determine debit and credit based on profit/loss
         # TransactionAmount is always positive
@@ -93,49 +190,27 @@ class YearEndJournalEntryHelper:
             credit = pl_closing_account
             amount = net_result
 
-        # Create transaction
-        transaction_number = f"YearClose {year}"
-        transaction_date = f"{year}-12-31"
-        description = f"Year-end closure {year} - {administration}"
-        reference_number = "Year Closure"
-
-        insert_query = """
-            INSERT INTO mutaties (
-                TransactionNumber,
-                TransactionDate,
-                TransactionDescription,
-                TransactionAmount,
-                Debet,
-                Credit,
-                ReferenceNumber,
-                administration
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        cursor.execute(
-            insert_query,
+        return [
             [
-                transaction_number,
-                transaction_date,
-                description,
+                f"YearClose {year}",
+                f"{year}-12-31",
+                f"Year-end closure {year} - {administration}",
                 amount,
                 debet,
                 credit,
-                reference_number,
+                "Year Closure",
                 administration,
-            ],
-        )
-
-        return transaction_number
+            ]
+        ]
 
-    def create_opening_balances(
+    def opening_balance_entries(
         self,
         administration: str,
         year: int,
         cursor,
-    ) -> str | None:
+    ) -> list[list]:
         """
-        Create opening balance transactions for the new year.
+        Build opening balance entries for the new year.
 
         CORRECTED APPROACH:
         - Use equity account as offset for ALL balance sheet accounts
@@ -159,10 +234,10 @@ class YearEndJournalEntryHelper:
         Args:
             administration: Tenant identifier
             year: Year for opening balances (e.g., 2025 for balances from 2024)
-            cursor: Database cursor (for transaction control)
+            cursor: Database cursor
 
         Returns:
-            str: TransactionNumber of created transactions, or None if no balances
+            list: INSERT parameter rows (empty if there is nothing to carry forward)
         """
         # Get equity account from configuration
         equity_account_info = self.config_service.get_account_by_purpose(
@@ -178,7 +253,7 @@ class YearEndJournalEntryHelper:
         ending_balances = self._get_ending_balances(administration, year - 1, cursor)
 
         if not ending_balances:
-            return None  # No balances to carry forward
+            return []  # No balances to carry forward
 
         # Filter out equity account - it will be calculated as the balancing account
         non_equity_balances = [
@@ -186,17 +261,17 @@ class YearEndJournalEntryHelper:
         ]
 
         if not non_equity_balances:
-            return None  # No non-equity balances to carry forward
+            return []  # No non-equity balances to carry forward
 
         # Separate VAT accounts from regular accounts
+        vat_netting_accounts, vat_primary_account = self._get_vat_netting_accounts(
+            administration, cursor
+        )
         vat_accounts = []
         regular_accounts = []
 
         for balance_info in non_equity_balances:
-            account = balance_info["account"]
-
-            # Check if account has VAT netting flag
-            if self._is_vat_netting_account(administration, account, cursor):
+            if balance_info["account"] in vat_netting_accounts:
                 vat_accounts.append(balance_info)
             else:
                 regular_accounts.append(balance_info)
@@ -206,59 +281,40 @@ class YearEndJournalEntryHelper:
         transaction_date = f"{year}-01-01"
         reference_number = "Opening Balance"
 
-        insert_query = """
-            INSERT INTO mutaties (
-                TransactionNumber,
-                TransactionDate,
-                TransactionDescription,
-                TransactionAmount,
-                Debet,
-                Credit,
-                ReferenceNumber,
-                administration
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        records_created = 0
+        entries = []
 
         # Handle VAT accounts with netting
-        if vat_accounts:
-            vat_primary_account = self._get_vat_primary_account(administration, cursor)
-
-            if vat_primary_account:
-                # Calculate net VAT balance
-                net_vat_balance = sum(b["balance"] for b in vat_accounts)
-
-                # Create single entry for netted VAT if non-zero
-                if abs(net_vat_balance) > 0.01:
-                    description = f"Opening balance {year} for BTW (netted)"
-
-                    if net_vat_balance > 0:
-                        # Net debit (more paid than received - VAT receivable)
-                        debet = vat_primary_account
-                        credit = equity_account
-                        amount = net_vat_balance
-                    else:
-                        # Net credit (more received than paid - VAT payable)
-                        debet = equity_account
-                        credit = vat_primary_account
-                        amount = abs(net_vat_balance)
-
-                    cursor.execute(
-                        insert_query,
-                        [
-                            transaction_number,
-                            transaction_date,
-                            description,
-                            amount,
-                            debet,
-                            credit,
-                            reference_number,
-                            administration,
-                        ],
-                    )
-
-                    records_created += 1
+        if vat_accounts and vat_primary_account:
+            # Calculate net VAT balance
+            net_vat_balance = sum(b["balance"] for b in vat_accounts)
+
+            # Create single entry for netted VAT if non-zero
+            if abs(net_vat_balance) > 0.01:
+                description = f"Opening balance {year} for BTW (netted)"
+
+                if net_vat_balance > 0:
+                    # Net debit (more paid than received - VAT receivable)
+                    debet = vat_primary_account
+                    credit = equity_account
+                    amount = net_vat_balance
+                else:
+                    # Net credit (more received than paid - VAT payable)
+                    debet = equity_account
+                    credit = vat_primary_account
+                    amount = abs(net_vat_balance)
+
+                entries.append(
+                    [
+                        transaction_number,
+                        transaction_date,
+                        description,
+                        amount,
+                        debet,
+                        credit,
+                        reference_number,
+                        administration,
+                    ]
+                )
 
         # Create opening balance entries for regular (non-VAT) accounts
         # Equity account is used as the offsetting account for all entries
@@ -287,8 +343,7 @@ class YearEndJournalEntryHelper:
                 credit = account
                 amount = abs(balance)
 
-            cursor.execute(
-                insert_query,
+            entries.append(
                 [
                     transaction_number,
                     transaction_date,
@@ -298,12 +353,31 @@ class YearEndJournalEntryHelper:
                     credit,
                     reference_number,
                     administration,
-                ],
+                ]
             )
 
-            records_created += 1
+        return entries
+
+    @staticmethod
+    def insert_entries(entries: list[list], cursor) -> None:
+        """
+        Write journal entries with multi-row INSERTs.
+
+        Entries are split only where one statement would exceed the packet
+        limit (see db_batch.chunk_params).
 
-        return transaction_number if records_created > 0 else None
+        Args:
+            entries: INSERT parameter rows from closure_entries() and
+                opening_balance_entries()
+            cursor: Database cursor (for transaction control)
+        """
+        for chunk in chunk_params(
+            INSERT_ENTRIES_PREFIX, entries, max_rows=max(len(entries), 1)
+        ):
+            cursor.execute(
+                INSERT_ENTRIES_PREFIX + ", ".join([ENTRY_VALUES] * len(chunk)),
+                [value for entry in chunk for value in entry],
+            )
 
     def _get_ending_balances(
         self, administration: str, year: int, cursor
@@ -401,94 +475,68 @@ class YearEndJournalEntryHelper:
 
         return balances
 
-    def _is_vat_netting_account(
-        self, administration: str, account: str, cursor
-    ) -> bool:
-        """
-        Check if account has VAT netting flag in parameters.
-
-        Args:
-            administration: Tenant identifier
-            account: Account code to check
-            cursor: Database cursor
-
-        Returns:
-            bool: True if account has vat_netting=true parameter
-        """
-        query = """
-            SELECT JSON_EXTRACT(parameters, '$.vat_netting') as vat_netting
-            FROM rekeningschema
-            WHERE administration = %s
-            AND Account = %s
-        """
-
-        cursor.execute(query, [administration, account])
-        result = cursor.fetchone()
-
-        if result:
-            # Handle both dict and tuple cursor results
-            vat_netting = (
-                result["vat_netting"] if isinstance(result, dict) else result[0]
-            )
-
-            # Handle both boolean true and string "true"
-            if vat_netting is not None:
-                if isinstance(vat_netting, bool):
-                    return vat_netting
-                elif isinstance(vat_netting, (int, float)):
-                    return bool(vat_netting)
-                else:
-                    # String value
-                    return str(vat_netting).strip('"').lower() == "true"
-
-        return False
-
-    def _get_vat_primary_account(self, administration: str, cursor) -> str | None:
+    def _get_vat_netting_accounts(
+        self, administration: str, cursor
+    ) -> tuple[set[str], str | None]:
         """
-        Get the primary VAT account that receives the net balance.
+        Get all accounts with the VAT netting flag and the account that
+        receives their net balance, with one query.
 
-        Looks for an account with vat_netting=true that has a vat_primary parameter.
+        The primary account is the vat_primary parameter of the first
+        netting account, or that account itself when it has none.
 
         Args:
             administration: Tenant identifier
             cursor: Database cursor
 
         Returns:
-            str: Account code of primary VAT account, or None if not found
+            tuple: (set of netting account codes, primary VAT account or None)
         """
         query = """
             SELECT
                 Account,
+                JSON_EXTRACT(parameters, '$.vat_netting') as vat_netting,
                 JSON_EXTRACT(parameters, '$.vat_primary') as vat_primary
             FROM rekeningschema
             WHERE administration = %s
-            AND (
-                JSON_EXTRACT(parameters, '$.vat_netting') = true
-                OR JSON_EXTRACT(parameters, '$.vat_netting') = 'true'
-            )
-            LIMIT 1
+            AND JSON_EXTRACT(parameters, '$.vat_netting') IS NOT NULL
         """
 
         cursor.execute(query, [administration])
-        result = cursor.fetchone()
 
-        if result:
+        netting_accounts = set()
+        primary_account = None
+        for row in cursor.fetchall():
             # Handle both dict and tuple cursor results
-            if isinstance(result, dict):
-                vat_primary = result.get("vat_primary")
-                account = result.get("Account")
+            if isinstance(row, dict):
+                account = row.get("Account")
+                vat_netting = row.get("vat_netting")
+                vat_primary = row.get("vat_primary")
             else:
-                account = result[0]
-                vat_primary = result[1]
+                account, vat_netting, vat_primary = row[0], row[1], row[2]
 
-            # If vat_primary is specified, use it; otherwise use the account itself
-            if vat_primary:
-                vat_primary_str = str(vat_primary).strip('"')
-                return vat_primary_str if vat_primary_str else account
-            else:
-                return account
+            if not self._is_flag_set(vat_netting):
+                continue
+            netting_accounts.add(account)
 
-        return None
+            # If vat_primary is specified, use it; otherwise use the account itself
+            if primary_account is None:
+                vat_primary_str = str(vat_primary).strip('"') if vat_primary else ""
+                primary_account = vat_primary_str or account
+
+        return netting_accounts, primary_account
+
+    @staticmethod
+    def _is_flag_set(value) -> bool:
+        """Interpret a JSON boolean parameter (true, 1 or the string "true")."""
+        if value is None:
+            return False
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return bool(value)
+        # String value
+        return str(value).strip('"').lower() == "true"
 
     def delete_transactions(
         self, administration: str, transaction_number: str, cursor
@@ -293,6 +293,10 @@ class YearEndClosureService:
         3. Creates opening balance transactions for next year
         4. Records closure status in database
 
+        Steps 2 and 3 are written with one multi-row INSERT, using the net
+        result computed during validation. Only this tenant's ledger cache
+        is invalidated afterwards.
+
         All operations are performed within a database transaction,
         so if any step fails, all changes are rolled back.
 
@@ -319,17 +323,16 @@ class YearEndClosureService:
         cursor = conn.cursor()
 
         try:
-            # Step 2: Create year-end closure transaction
-            net_result = self._calculate_net_pl_result(administration, year)
-            closure_transaction_number = self.journal_helper.create_closure_transaction(
+            # Steps 2 + 3: Closure transaction (P&L to equity) and opening
+            # balances for next year, written with one multi-row INSERT
+            net_result = validation["info"]["net_result"]
+            (
+                closure_transaction_number,
+                opening_transaction_number,
+            ) = self.journal_helper.create_year_end_entries(
                 administration, year, net_result, cursor
             )
 
-            # Step 3: Create opening balance transactions for next year
-            opening_transaction_number = self.journal_helper.create_opening_balances(
-                administration, year + 1, cursor
-            )
-
             # Step 4: Record closure status
             self._record_closure_status(
                 administration,
@@ -344,10 +347,10 @@ class YearEndClosureService:
             # Commit all changes
             conn.commit()
 
-            # Invalidate cache so reports pick up new transactions
+            # Invalidate this tenant's cache so reports pick up new transactions
             from mutaties_cache import invalidate_cache
 
-            invalidate_cache()
+            invalidate_cache(administration)
 
             # Return success result
             return {
@@ -495,10 +498,10 @@ class YearEndClosureService:
             # Commit all changes
             conn.commit()
 
-            # Invalidate cache so reports pick up changes
+            # Invalidate this tenant's cache so reports pick up changes
             from mutaties_cache import invalidate_cache
 
-            invalidate_cache()
+            invalidate_cache(administration)
 
             # Return success result
             return {
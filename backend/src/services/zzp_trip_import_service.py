@@ -14,14 +14,27 @@ Business rules:
 - Preview mode: validate without committing
 - Commit mode: bulk insert validated rows with audit logging
 
+Large imports (multi-year rittenregistratie exports run to thousands of
+trips) are handled in bulk:
+- Files are read in chunks of IMPORT_PARSE_CHUNK_ROWS rows, reporting
+  progress after each chunk.
+- Validation only reads existing trips in the import's date range and
+  odometer window, plus the vehicle's latest trip, through the
+  (administration, vehicle_id, trip_date) index.
+- Commit inserts up to IMPORT_INSERT_CHUNK_ROWS trips per multi-row
+  INSERT and writes their audit rows with one INSERT ... SELECT per chunk.
+
 Reference: .kiro/specs/ZZP/rittenregistratie/design.md §4.4
 """
 
 import io
 import logging
+import os
+from collections.abc import Callable, Iterator
 
 import pandas as pd
 
+from db_batch import chunk_params
 from db_exceptions import DatabaseError
 
 logger = logging.getLogger(__name__)
@@ -50,6 +63,37 @@ REQUIRED_IMPORT_FIELDS = [
     "trip_purpose",
 ]
 
+# Rows read per pandas chunk while parsing an import file
+IMPORT_PARSE_CHUNK_ROWS = int(os.getenv("ZZP_IMPORT_PARSE_CHUNK_ROWS", "1000"))
+
+# Maximum trips per multi-row INSERT (also capped by packet size)
+IMPORT_INSERT_CHUNK_ROWS = int(os.getenv("ZZP_IMPORT_INSERT_CHUNK_ROWS", "500"))
+
+TRIP_INSERT_PREFIX = """
+    INSERT INTO zzp_trips (
+        administration, vehicle_id, trip_date, start_time, end_time,
+        start_address, end_address, start_odometer, end_odometer,
+        trip_category, trip_purpose, contact_id, project_name, notes,
+        is_billable, is_gap_fill, is_cancelled, version, created_by
+    ) VALUES
+"""
+TRIP_VALUES = "(" + ", ".join(["%s"] * 19) + ")"
+
+# Audit rows for the trips of one chunk, re-selected by vehicle and natural
+# key from the INSERT's first generated ID on; followed by the key tuples
+AUDIT_INSERT_SELECT_PREFIX = """
+    INSERT INTO zzp_trip_audit (
+        administration, trip_id, version, action, changed_fields,
+        correction_reason, changed_by
+    )
+    SELECT t.administration, t.id, t.version, 'created', NULL, NULL, %s
+    FROM zzp_trips t
+    WHERE t.administration = %s AND t.vehicle_id = %s AND t.id >= %s
+      AND NOT EXISTS (SELECT 1 FROM zzp_trip_audit a WHERE a.trip_id = t.id)
+      AND (t.trip_date, t.start_odometer, t.end_odometer) IN
+"""
+AUDIT_KEY_VALUES = "(%s, %s, %s)"
+
 # Template CSV columns (Dutch headers for downloadable template)
 TEMPLATE_COLUMNS = [
     "Datum",
@@ -78,13 +122,18 @@ class TripImportService:
         self.parameter_service = parameter_service
 
     def parse_file(
-        self, file_stream, filename: str, column_mapping: dict | None = None
+        self,
+        file_stream,
+        filename: str,
+        column_mapping: dict | None = None,
+        progress_callback: Callable[[int], None] | None = None,
     ) -> dict:
         """Parse a CSV or Excel file and apply column mapping.
 
-        Detects file type by extension, reads via pandas, applies the
-        column mapping to normalize headers to internal field names,
-        and returns raw rows for subsequent validation.
+        Detects file type by extension, reads via pandas in chunks of
+        IMPORT_PARSE_CHUNK_ROWS rows, applies the column mapping to
+        normalize headers to internal field names, and returns raw rows
+        for subsequent validation.
 
         Args:
             file_stream: File-like object (BytesIO or similar) with the uploaded data.
@@ -93,6 +142,8 @@ class TripImportService:
                 Keys are the header names in the file, values are internal field names.
                 Example: {"Datum": "trip_date", "Van": "start_address", ...}
                 If None, uses DEFAULT_COLUMN_MAPPING.
+            progress_callback: Optional callable receiving the number of rows
+                parsed so far after each chunk.
 
         Returns:
             Dict with keys:
@@ -119,8 +170,29 @@ class TripImportService:
                 "error": f"Unsupported file type: '{ext}'. Use .csv, .xlsx, or .xls.",
             }
 
+        columns_found = None
+        rename_map = {}
+        rows = []
         try:
-            df = self._read_dataframe(file_stream, ext)
+            for chunk in self._read_dataframe(file_stream, ext):
+                if columns_found is None:
+                    # Strip whitespace from column headers
+                    columns_found = [str(col).strip() for col in chunk.columns]
+
+                    # Apply column mapping: rename file headers → internal field names
+                    # The mapping is {file_header: internal_name}
+                    rename_map = {
+                        file_col: internal_name
+                        for file_col, internal_name in mapping.items()
+                        if file_col in columns_found
+                    }
+
+                rows.extend(self._chunk_rows(chunk, columns_found, rename_map))
+                logger.debug(
+                    "Parsed %d rows from import file '%s'", len(rows), filename
+                )
+                if progress_callback:
+                    progress_callback(len(rows))
         except Exception as e:
             logger.warning("Failed to parse import file '%s': %s", filename, e)
             return {
@@ -133,47 +205,25 @@ class TripImportService:
                 "error": f"Could not read file: {e!s}",
             }
 
-        if df.empty:
+        columns_found = columns_found or []
+        if not rows:
             return {
                 "success": True,
                 "rows": [],
                 "total_rows": 0,
-                "columns_found": list(df.columns),
+                "columns_found": columns_found,
                 "columns_mapped": [],
-                "unmapped_columns": list(df.columns),
+                "unmapped_columns": columns_found,
                 "error": None,
             }
 
-        # Strip whitespace from column headers
-        df.columns = [str(col).strip() for col in df.columns]
-        columns_found = list(df.columns)
-
-        # Apply column mapping: rename file headers → internal field names
-        # The mapping is {file_header: internal_name}
-        rename_map = {}
-        for file_col, internal_name in mapping.items():
-            if file_col in df.columns:
-                rename_map[file_col] = internal_name
-
-        mapped_columns = list(rename_map.values())
-        unmapped_columns = [col for col in columns_found if col not in rename_map]
-
-        df = df.rename(columns=rename_map)
-
-        # Convert DataFrame to list of dicts, replacing NaN with None
-        df = df.where(pd.notna(df), None)
-        rows = df.to_dict(orient="records")
-
-        # Clean up row values: strip strings, convert odometer to int
-        rows = [self._clean_row(row) for row in rows]
-
         return {
             "success": True,
             "rows": rows,
             "total_rows": len(rows),
             "columns_found": columns_found,
-            "columns_mapped": mapped_columns,
-            "unmapped_columns": unmapped_columns,
+            "columns_mapped": list(rename_map.values()),
+            "unmapped_columns": [col for col in columns_found if col not in rename_map],
             "error": None,
         }
 
@@ -214,29 +264,6 @@ class TripImportService:
                 "preview": [],
             }
 
-        # Fetch existing trips for continuity + duplicate checks
-        existing_trips = self._get_existing_trips(tenant, vehicle_id)
-
-        # Build a set of existing (date, start_odometer, end_odometer) for duplicate detection
-        existing_set = set()
-        for trip in existing_trips:
-            trip_date = trip.get("trip_date")
-            # Normalize date to string if it's a date object
-            if hasattr(trip_date, "strftime"):
-                trip_date = trip_date.strftime("%Y-%m-%d")
-            existing_set.add(
-                (
-                    str(trip_date),
-                    int(trip.get("start_odometer", 0)),
-                    int(trip.get("end_odometer", 0)),
-                )
-            )
-
-        # Get the last odometer reading from existing trips
-        last_existing_odometer = None
-        if existing_trips:
-            last_existing_odometer = int(existing_trips[-1].get("end_odometer", 0))
-
         # Get valid categories and purposes (if parameter_service available)
         valid_categories = self._get_trip_categories(tenant)
         valid_purposes = self._get_trip_purposes(tenant)
@@ -257,6 +284,33 @@ class TripImportService:
             self._validate_odometer_values(row)
             self._validate_category_purpose(row, valid_categories, valid_purposes)
 
+        # Fetch only the existing trips the import can collide with: same
+        # dates and start odometers within the import's range
+        existing_set = set()
+        keys = [key for key in map(self._duplicate_key, annotated_rows) if key]
+        if keys:
+            existing_trips = self._get_existing_trips(
+                tenant,
+                vehicle_id,
+                date_range=(min(k[0] for k in keys), max(k[0] for k in keys)),
+                odometer_range=(min(k[1] for k in keys), max(k[1] for k in keys)),
+            )
+            for trip in existing_trips:
+                trip_date = trip.get("trip_date")
+                # Normalize date to string if it's a date object
+                if hasattr(trip_date, "strftime"):
+                    trip_date = trip_date.strftime("%Y-%m-%d")
+                existing_set.add(
+                    (
+                        str(trip_date),
+                        int(trip.get("start_odometer", 0)),
+                        int(trip.get("end_odometer", 0)),
+                    )
+                )
+
+        # Get the last odometer reading from existing trips
+        last_existing_odometer = self._get_last_existing_odometer(tenant, vehicle_id)
+
         # Sort rows by normalized date for continuity checks
         annotated_rows.sort(key=lambda r: r.get("_normalized_date", "9999-99-99"))
 
@@ -294,7 +348,9 @@ class TripImportService:
         """Bulk insert validated rows as trip records.
 
         Inserts all rows (or only valid rows if skip_error_rows was applied
-        during validation). Creates audit log entries for each imported trip.
+        during validation) with multi-row INSERTs of up to
+        IMPORT_INSERT_CHUNK_ROWS trips, in one transaction. Creates audit log
+        entries for each imported trip, one INSERT ... SELECT per chunk.
 
         Args:
             tenant: Administration/tenant identifier.
@@ -328,57 +384,44 @@ class TripImportService:
                 "errors": [],
             }
 
-        insert_query = """
-            INSERT INTO zzp_trips (
-                administration, vehicle_id, trip_date, start_time, end_time,
-                start_address, end_address, start_odometer, end_odometer,
-                trip_category, trip_purpose, contact_id, project_name, notes,
-                is_billable, is_gap_fill, is_cancelled, version, created_by
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        audit_query = """
-            INSERT INTO zzp_trip_audit (
-                administration, trip_id, version, action, changed_fields,
-                correction_reason, changed_by
-            ) VALUES (%s, %s, %s, 'created', NULL, NULL, %s)
-        """
-
         imported = 0
         errors = []
 
+        trip_params = [
+            (
+                tenant,
+                vehicle_id,
+                row.get("trip_date"),
+                row.get("start_time"),
+                row.get("end_time"),
+                row.get("start_address"),
+                row.get("end_address"),
+                row.get("start_odometer"),
+                row.get("end_odometer"),
+                row.get("trip_category"),
+                row.get("trip_purpose"),
+                row.get("contact_id"),
+                row.get("project_name"),
+                row.get("notes"),
+                False,  # is_billable
+                False,  # is_gap_fill
+                False,  # is_cancelled
+                1,  # version
+                created_by,
+            )
+            for row in valid_rows
+        ]
+
         try:
             with self.db.transaction() as (cursor, _conn):
-                for row in valid_rows:
-                    params = (
-                        tenant,
-                        vehicle_id,
-                        row.get("trip_date"),
-                        row.get("start_time"),
-                        row.get("end_time"),
-                        row.get("start_address"),
-                        row.get("end_address"),
-                        row.get("start_odometer"),
-                        row.get("end_odometer"),
-                        row.get("trip_category"),
-                        row.get("trip_purpose"),
-                        row.get("contact_id"),
-                        row.get("project_name"),
-                        row.get("notes"),
-                        False,  # is_billable
-                        False,  # is_gap_fill
-                        False,  # is_cancelled
-                        1,  # version
-                        created_by,
+                for chunk in chunk_params(
+                    TRIP_INSERT_PREFIX, trip_params, max_rows=IMPORT_INSERT_CHUNK_ROWS
+                ):
+                    first_id = self._insert_trips(cursor, chunk)
+                    self._insert_audit_rows(
+                        cursor, tenant, vehicle_id, first_id, chunk, created_by
                     )
-                    cursor.execute(insert_query, params)
-                    trip_id = cursor.lastrowid
-
-                    # Write audit log entry
-                    audit_params = (tenant, trip_id, 1, created_by)
-                    cursor.execute(audit_query, audit_params)
-
-                    imported += 1
+                    imported += len(chunk)
 
             logger.info(
                 "Import committed for tenant=%s vehicle_id=%d: imported=%d, skipped=%d",
@@ -460,37 +503,62 @@ class TripImportService:
         return filename[dot_idx:].lower()
 
     @staticmethod
-    def _read_dataframe(file_stream, ext: str) -> pd.DataFrame:
-        """Read file stream into a pandas DataFrame based on extension.
+    def _read_dataframe(
+        file_stream, ext: str, chunksize: int | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Read file stream into pandas DataFrames of at most `chunksize` rows.
+
+        A file without data rows yields a single empty DataFrame that still
+        carries the header columns.
 
         Args:
             file_stream: File-like object with the data.
             ext: File extension (e.g., ".csv", ".xlsx").
+            chunksize: Maximum number of rows per DataFrame
+                (default: IMPORT_PARSE_CHUNK_ROWS).
 
-        Returns:
-            pandas DataFrame with the file contents.
+        Yields:
+            pandas DataFrames with consecutive slices of the file contents.
 
         Raises:
             ValueError: If extension is unsupported.
             Exception: Propagates pandas read errors.
         """
+        chunksize = chunksize or IMPORT_PARSE_CHUNK_ROWS
         if ext == ".csv":
             # Try semicolon first (Dutch standard), fall back to comma
+            sep = ";"
             try:
-                df = pd.read_csv(file_stream, sep=";", dtype=str)
+                head = pd.read_csv(file_stream, sep=";", dtype=str, nrows=1)
                 # If only 1 column found, it's probably comma-separated
-                if len(df.columns) <= 1:
-                    file_stream.seek(0)
-                    df = pd.read_csv(file_stream, sep=",", dtype=str)
+                if len(head.columns) <= 1:
+                    sep = ","
             except Exception:
-                file_stream.seek(0)
-                df = pd.read_csv(file_stream, sep=",", dtype=str)
-            return df
+                sep = ","
+            file_stream.seek(0)
+            yield from pd.read_csv(file_stream, sep=sep, dtype=str, chunksize=chunksize)
         elif ext in (".xlsx", ".xls"):
-            return pd.read_excel(file_stream, dtype=str)
+            # Excel workbooks cannot be read incrementally by pandas
+            df = pd.read_excel(file_stream, dtype=str)
+            if df.empty:
+                yield df
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start : start + chunksize]
         else:
             raise ValueError(f"Unsupported file extension: {ext}")
 
+    def _chunk_rows(
+        self, chunk: pd.DataFrame, columns: list[str], rename_map: dict
+    ) -> list[dict]:
+        """Convert one parsed chunk into cleaned row dicts with internal field names."""
+        chunk = chunk.set_axis(columns, axis=1).rename(columns=rename_map)
+
+        # Convert DataFrame to list of dicts, replacing NaN with None
+        chunk = chunk.where(pd.notna(chunk), None)
+
+        # Clean up row values: strip strings, convert odometer to int
+        return [self._clean_row(row) for row in chunk.to_dict(orient="records")]
+
     @staticmethod
     def _clean_row(row: dict) -> dict:
         """Clean a parsed row: strip strings, attempt numeric conversion for odometers.
@@ -524,21 +592,112 @@ class TripImportService:
     # Validate_import helper methods
     # -------------------------------------------------------------------------
 
-    def _get_existing_trips(self, tenant: str, vehicle_id: int) -> list:
-        """Fetch existing trips for the vehicle from DB for continuity/duplicate checks."""
+    def _get_existing_trips(
+        self,
+        tenant: str,
+        vehicle_id: int,
+        date_range: tuple[str, str],
+        odometer_range: tuple[int, int],
+    ) -> list:
+        """Fetch the vehicle's trips within the import's date and start-odometer window.
+
+        Used for duplicate checks; the date range is served by the
+        (administration, vehicle_id, trip_date) index.
+        """
         try:
             query = """
                 SELECT trip_date, start_odometer, end_odometer
                 FROM zzp_trips
                 WHERE administration = %s AND vehicle_id = %s AND is_cancelled = 0
+                  AND trip_date BETWEEN %s AND %s
+                  AND start_odometer BETWEEN %s AND %s
                 ORDER BY trip_date, start_odometer
             """
-            result = self.db.execute_query(query, (tenant, vehicle_id), fetch=True)
+            result = self.db.execute_query(
+                query, (tenant, vehicle_id, *date_range, *odometer_range), fetch=True
+            )
             return result if result else []
         except DatabaseError as e:
             logger.warning("Failed to fetch existing trips for validation: %s", e)
             return []
 
+    def _get_last_existing_odometer(self, tenant: str, vehicle_id: int) -> int | None:
+        """End odometer of the vehicle's latest trip, or None if it has none."""
+        try:
+            query = """
+                SELECT trip_date, start_odometer, end_odometer
+                FROM zzp_trips
+                WHERE administration = %s AND vehicle_id = %s AND is_cancelled = 0
+                ORDER BY trip_date DESC, start_odometer DESC
+                LIMIT 1
+            """
+            result = self.db.execute_query(query, (tenant, vehicle_id), fetch=True)
+        except DatabaseError as e:
+            logger.warning("Failed to fetch last odometer for validation: %s", e)
+            return None
+        if not result:
+            return None
+        return int(result[-1].get("end_odometer", 0))
+
+    @staticmethod
+    def _insert_trips(cursor, trip_params: list[tuple]) -> int:
+        """Insert trips with one multi-row INSERT and return the first generated ID."""
+        cursor.execute(
+            TRIP_INSERT_PREFIX + ", ".join([TRIP_VALUES] * len(trip_params)),
+            [value for params in trip_params for value in params],
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _insert_audit_rows(
+        cursor,
+        tenant: str,
+        vehicle_id: int,
+        first_id: int,
+        trip_params: list[tuple],
+        created_by: str,
+    ) -> None:
+        """Write a 'created' audit row for every trip of a chunk.
+
+        The trips are re-selected by vehicle and (date, start, end odometer)
+        among IDs from first_id on, so nothing is assumed about how the
+        other IDs of the multi-row INSERT were assigned. If the re-select
+        does not match exactly the inserted trips, DatabaseError rolls the
+        import back.
+        """
+        # trip_date, start_odometer, end_odometer of each TRIP_VALUES tuple
+        keys = [
+            value
+            for params in trip_params
+            for value in (params[2], params[7], params[8])
+        ]
+        cursor.execute(
+            AUDIT_INSERT_SELECT_PREFIX
+            + "("
+            + ", ".join([AUDIT_KEY_VALUES] * len(trip_params))
+            + ")",
+            [created_by, tenant, vehicle_id, first_id, *keys],
+        )
+        if cursor.rowcount != len(trip_params):
+            raise DatabaseError(
+                f"Expected {len(trip_params)} imported trips for the audit log, "
+                f"found {cursor.rowcount}"
+            )
+
+    @staticmethod
+    def _duplicate_key(row: dict) -> tuple[str, int] | None:
+        """(date, start odometer) of a row that can match an existing trip."""
+        date = row.get("_normalized_date")
+        start = row.get("start_odometer")
+        if (
+            not date
+            or date == "9999-99-99"
+            or not isinstance(start, (int, float))
+            or not isinstance(row.get("end_odometer"), (int, float))
+        ):
+            return None
+        return date, int(start)
+
     def _get_trip_categories(self, tenant: str) -> list[str] | None:
         """Get configured trip categories from parameter_service."""
         if self.parameter_service:
@@ -0,0 +1,189 @@
+"""
+StorageClientRegistry: process-wide cache of authenticated storage clients.
+
+get_storage_provider(), GoogleDriveService and MediaAssetService used to
+build a new client for every request: boto3.client("s3") loads botocore's
+service model and opens a fresh connection pool, and Google Drive rebuilt
+its OAuth credentials (often refreshing the token) and the discovery-based
+service. The registry keeps those objects per tenant and credential
+version, so a request only pays for the API call itself:
+
+- shared(): one client per key for all threads. Used for boto3 clients,
+  which are thread-safe; S3_CLIENT_CONFIG sizes their connection pool for
+  the worker's request threads.
+- credentials() / store_credentials() / refresh_lock(): OAuth credentials
+  per tenant and version. The caller refreshes them under refresh_lock()
+  when expires_within(TOKEN_REFRESH_MARGIN_SECONDS) says they are about to
+  expire, so concurrent requests do not each refresh the token and none of
+  them starts with a token that is about to expire.
+- per_thread(): one client per key and thread. googleapiclient services
+  sit on httplib2, which is not thread-safe, so each request thread keeps
+  its own Drive service (and HTTP connection) and reuses it for later
+  requests.
+
+A credential version is credential_version() over the fields that
+identify a credential (access key, OAuth client, refresh token). Storing
+other credentials yields a new version and replaces the cached entry on
+its next use, in every worker process. invalidate_storage_clients()
+drops entries explicitly.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from botocore.config import Config
+
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+TOKEN_REFRESH_MARGIN_SECONDS = int(
+    os.getenv("GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS", "300")
+)
+
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+    retries={"mode": "standard"},
+)
+
+
+def credential_version(*parts) -> str:
+    """Short, non-reversible fingerprint of the given credential fields."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def expires_within(creds, seconds: float) -> bool:
+    """True if OAuth credentials are invalid or expire within `seconds`."""
+    if not creds.valid:
+        return True
+    expiry = getattr(creds, "expiry", None)
+    if not isinstance(expiry, datetime):
+        return False
+    # google-auth keeps expiry as a naive UTC datetime
+    now = datetime.now(UTC).replace(tzinfo=None)
+    return expiry - timedelta(seconds=seconds) <= now
+
+
+class StorageClientRegistry:
+    """Clients and credentials keyed by (kind, tenant, ...) and a version."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shared: dict[tuple, tuple[str | None, Any]] = {}
+        self._credentials: dict[tuple, tuple[str | None, Any]] = {}
+        self._refresh_locks: dict[tuple, threading.Lock] = {}
+        self._local = threading.local()
+        # Bumped by invalidate(); per-thread entries from older generations
+        # are rebuilt on their thread's next lookup
+        self._generation = 0
+        self._tenant_generations: dict[Any, int] = {}
+        self._stats = {"hits": 0, "misses": 0}
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+
+    def shared(self, key: tuple, version: str | None, factory: Callable[[], Any]):
+        """Client shared by all threads; built with factory() on first use."""
+        entry = self._shared.get(key)
+        if entry is not None and entry[0] == version:
+            self._count("hits")
+            return entry[1]
+        with self._lock:
+            entry = self._shared.get(key)
+            if entry is None or entry[0] != version:
+                # Built under the lock: boto3's default session is not
+                # safe to create clients from concurrently
+                entry = (version, factory())
+                self._shared[key] = entry
+                self._stats["misses"] += 1
+        return entry[1]
+
+    def per_thread(self, key: tuple, version: str | None, factory: Callable[[], Any]):
+        """Client owned by the calling thread; built with factory() on first use."""
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = {}
+        generation = self._key_generation(key)
+        entry = clients.get(key)
+        if entry is not None and entry[0] == version and entry[1] == generation:
+            self._count("hits")
+            return entry[2]
+        client = factory()
+        clients[key] = (version, generation, client)
+        self._count("misses")
+        return client
+
+    # ------------------------------------------------------------------
+    # OAuth credentials
+    # ------------------------------------------------------------------
+
+    def credentials(self, key: tuple, version: str | None):
+        """Cached credentials for key at this version, or None."""
+        entry = self._credentials.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+
+    def store_credentials(self, key: tuple, version: str | None, creds) -> None:
+        with self._lock:
+            self._credentials[key] = (version, creds)
+
+    def refresh_lock(self, key: tuple) -> threading.Lock:
+        """Lock that serialises token refreshes for one credential key."""
+        with self._lock:
+            return self._refresh_locks.setdefault(key, threading.Lock())
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def invalidate(self, tenant: str | None = None) -> None:
+        """Drop cached clients and credentials for one tenant, or for all."""
+        with self._lock:
+            if tenant is None:
+                self._shared.clear()
+                self._credentials.clear()
+                self._tenant_generations.clear()
+                self._generation += 1
+                return
+            for cache in (self._shared, self._credentials):
+                for key in [key for key in cache if _tenant_of(key) == tenant]:
+                    del cache[key]
+            self._tenant_generations[tenant] = (
+                self._tenant_generations.get(tenant, 0) + 1
+            )
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "shared_clients": len(self._shared),
+                "credentials": len(self._credentials),
+            }
+
+    def _key_generation(self, key: tuple) -> tuple[int, int]:
+        return self._generation, self._tenant_generations.get(_tenant_of(key), 0)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+
+def _tenant_of(key: tuple):
+    return key[1] if len(key) > 1 else None
+
+
+_registry = StorageClientRegistry()
+
+
+def get_client_registry() -> StorageClientRegistry:
+    return _registry
+
+
+def invalidate_storage_clients(tenant: str | None = None) -> None:
+    """Drop cached storage clients for a tenant (or all tenants)."""
+    _registry.invalidate(tenant)
@@ -18,6 +18,7 @@ import os
 import boto3
 from botocore.exceptions import ClientError
 
+from storage.client_registry import S3_CLIENT_CONFIG, get_client_registry
 from storage.storage_provider import StorageProvider
 
 logger = logging.getLogger(__name__)
@@ -37,7 +38,10 @@ class S3SharedStorage(StorageProvider):
         self.bucket = bucket or os.getenv("S3_SHARED_BUCKET", "")
         if not self.bucket:
             raise ValueError("S3 shared bucket not configured")
-        self._client = boto3.client("s3")
+        # Default credential chain: one client (and pool) for every tenant
+        self._client = get_client_registry().shared(
+            ("s3", None), None, lambda: boto3.client("s3", config=S3_CLIENT_CONFIG)
+        )
 
     def _upload_raw(self, file_data: bytes, key: str, content_type: str) -> bool:
         """Raw S3 put_object. No key building, no registry."""
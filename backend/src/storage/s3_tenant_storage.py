@@ -13,6 +13,11 @@ import os
 import boto3
 from botocore.exceptions import ClientError
 
+from storage.client_registry import (
+    S3_CLIENT_CONFIG,
+    credential_version,
+    get_client_registry,
+)
 from storage.storage_provider import StorageProvider
 
 logger = logging.getLogger(__name__)
@@ -36,7 +41,7 @@ class S3TenantStorage(StorageProvider):
 
     @staticmethod
     def _create_client(tenant, parameter_service):
-        """Create S3 client with tenant's cross-account credentials."""
+        """S3 client with tenant's cross-account credentials (cached per version)."""
         if not parameter_service or not parameter_service.credential_service:
             raise RuntimeError(
                 f"CredentialService required for S3 tenant storage ({tenant})"
@@ -48,11 +53,20 @@ class S3TenantStorage(StorageProvider):
                 f"S3 credentials not found for tenant {tenant}. "
                 "Store them via tenant_credentials with type 's3_credentials'."
             )
-        return boto3.client(
-            "s3",
-            aws_access_key_id=creds.get("aws_access_key_id"),
-            aws_secret_access_key=creds.get("aws_secret_access_key"),
-            region_name=creds.get("region", "eu-west-1"),
+        access_key = creds.get("aws_access_key_id")
+        secret_key = creds.get("aws_secret_access_key")
+        region = creds.get("region", "eu-west-1")
+        # Reused until the tenant stores other keys (new version)
+        return get_client_registry().shared(
+            ("s3", tenant),
+            credential_version(access_key, secret_key, region),
+            lambda: boto3.client(
+                "s3",
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                region_name=region,
+                config=S3_CLIENT_CONFIG,
+            ),
         )
 
     def _upload_raw(self, file_data: bytes, key: str, content_type: str) -> bool:
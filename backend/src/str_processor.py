@@ -460,7 +460,7 @@ class STRProcessor:
             return []
         df = pd.DataFrame(planned_bookings)
         summary = (
-            df.groupby(["channel", "listing"])
+            df.groupby(["channel", "listing"], observed=True)
             .agg({"amountGross": "sum", "reservationCode": "count"})
             .reset_index()
         )
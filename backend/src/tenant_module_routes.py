@@ -268,6 +268,10 @@ def update_tenant_module(user_email, user_roles):
                 )
                 conn.commit()
 
+            from services.entitlement_cache import invalidate_entitlements
+
+            invalidate_entitlements(tenant)
+
         logger.info(
             f"Tenant module updated: {tenant}.{module_name} = {is_active} by {user_email}"
         )
@@ -1,6 +1,10 @@
 """WSGI entry point for production deployment."""
 
 from app import app
+from log_sink import start_log_sink
+
+# Audit / AI-usage / email log rows are written in batches by a background thread
+start_log_sink()
 
 # Expose app at module level for WSGI servers (both names for compatibility)
 application = app
@@ -111,7 +111,7 @@ class TestAuthEnforcement:
 class TestListContacts:
     """Tests for GET /api/contacts."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_list_contacts_success(self, mock_get_service, mock_module,
                                    client, zzp_auth):
@@ -129,7 +129,7 @@ class TestListContacts:
         assert data['success'] is True
         assert len(data['data']) == 1
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_list_contacts_with_type_filter(self, mock_get_service, mock_module,
                                             client, zzp_auth):
@@ -146,7 +146,7 @@ class TestListContacts:
             'test-tenant', contact_type='supplier', include_inactive=False
         )
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_list_contacts_server_error(self, mock_get_service, mock_module,
                                         client, zzp_auth):
@@ -171,7 +171,7 @@ class TestListContacts:
 class TestGetContact:
     """Tests for GET /api/contacts/<id>."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_get_contact_success(self, mock_get_service, mock_module,
                                  client, zzp_auth):
@@ -189,7 +189,7 @@ class TestGetContact:
         assert data['success'] is True
         assert data['data']['client_id'] == 'ACME'
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_get_contact_not_found(self, mock_get_service, mock_module,
                                    client, zzp_auth):
@@ -204,7 +204,7 @@ class TestGetContact:
         data = json.loads(response.data)
         assert 'error' in data
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_get_contact_server_error(self, mock_get_service, mock_module,
                                       client, zzp_auth):
@@ -227,7 +227,7 @@ class TestGetContact:
 class TestCreateContact:
     """Tests for POST /api/contacts."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_create_contact_success(self, mock_get_service, mock_module,
                                     client, zzp_auth):
@@ -248,7 +248,7 @@ class TestCreateContact:
         data = json.loads(response.data)
         assert data['success'] is True
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_create_contact_no_body(self, mock_get_service, mock_module,
                                     client, zzp_auth):
@@ -263,7 +263,7 @@ class TestCreateContact:
         data = json.loads(response.data)
         assert data['success'] is False
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_create_contact_value_error(self, mock_get_service, mock_module,
                                         client, zzp_auth):
@@ -284,7 +284,7 @@ class TestCreateContact:
         data = json.loads(response.data)
         assert 'already exists' in data['error']
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_create_contact_server_error(self, mock_get_service, mock_module,
                                          client, zzp_auth):
@@ -311,7 +311,7 @@ class TestCreateContact:
 class TestUpdateContact:
     """Tests for PUT /api/contacts/<id>."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_update_contact_success(self, mock_get_service, mock_module,
                                     client, zzp_auth):
@@ -332,7 +332,7 @@ class TestUpdateContact:
         data = json.loads(response.data)
         assert data['success'] is True
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_update_contact_no_body(self, mock_get_service, mock_module,
                                     client, zzp_auth):
@@ -347,7 +347,7 @@ class TestUpdateContact:
         data = json.loads(response.data)
         assert data['success'] is False
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_update_contact_value_error(self, mock_get_service, mock_module,
                                         client, zzp_auth):
@@ -364,7 +364,7 @@ class TestUpdateContact:
 
         assert response.status_code == 400
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_update_contact_server_error(self, mock_get_service, mock_module,
                                          client, zzp_auth):
@@ -391,7 +391,7 @@ class TestUpdateContact:
 class TestDeleteContact:
     """Tests for DELETE /api/contacts/<id>."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_delete_contact_success(self, mock_get_service, mock_module,
                                     client, zzp_auth):
@@ -406,7 +406,7 @@ class TestDeleteContact:
         data = json.loads(response.data)
         assert data['success'] is True
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_delete_contact_in_use(self, mock_get_service, mock_module,
                                    client, zzp_auth):
@@ -423,7 +423,7 @@ class TestDeleteContact:
         data = json.loads(response.data)
         assert 'referenced' in data['error']
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_delete_contact_server_error(self, mock_get_service, mock_module,
                                          client, zzp_auth):
@@ -446,7 +446,7 @@ class TestDeleteContact:
 class TestGetContactTypes:
     """Tests for GET /api/contacts/types."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_get_types_success(self, mock_get_service, mock_module,
                                client, zzp_auth):
@@ -464,7 +464,7 @@ class TestGetContactTypes:
         assert data['success'] is True
         assert 'client' in data['data']
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.contact_routes._get_service')
     def test_get_types_server_error(self, mock_get_service, mock_module,
                                     client, zzp_auth):
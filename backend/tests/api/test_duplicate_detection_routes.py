@@ -138,6 +138,48 @@ class TestCheckDuplicate:
         assert data['success'] is False
 
 
+class TestCheckDuplicatesBatch:
+    """Tests for POST /api/check-duplicates-batch."""
+
+    @patch('routes.duplicate_detection_routes.DuplicateChecker')
+    @patch('routes.duplicate_detection_routes.DatabaseManager')
+    def test_batch_check_returns_result_per_transaction(
+        self, mock_db_class, mock_checker_class, client, finance_auth
+    ):
+        """All transactions are checked with one batch call."""
+        from duplicate_checker import DuplicateChecker
+        mock_checker = MagicMock()
+        mock_checker_class.return_value = mock_checker
+        mock_checker.check_for_duplicates_batch.return_value = {
+            ('REF001', '2024-01-01', 100.0): [{'ID': 1, 'TransactionAmount': 100.0}],
+            ('REF001', '2024-01-01', 21.0): [],
+        }
+        mock_checker.format_duplicate_info.side_effect = (
+            lambda rows: DuplicateChecker.format_duplicate_info(None, rows)
+        )
+
+        response = client.post(
+            '/api/check-duplicates-batch',
+            headers=finance_auth,
+            json={'transactions': [
+                {'referenceNumber': 'REF001', 'transactionDate': '2024-01-01', 'transactionAmount': 100.0},
+                {'referenceNumber': 'REF001', 'transactionDate': '2024-01-01', 'transactionAmount': 21.0},
+            ]}
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        mock_checker.check_for_duplicates_batch.assert_called_once()
+        assert [r['has_duplicates'] for r in data['results']] == [True, False]
+
+    def test_batch_check_without_transactions_returns_400(self, client, finance_auth):
+        """An empty batch is rejected."""
+        response = client.post(
+            '/api/check-duplicates-batch', headers=finance_auth, json={'transactions': []}
+        )
+        assert response.status_code == 400
+
+
 # ============================================================================
 # Log Decision Tests
 # ============================================================================
@@ -89,7 +89,7 @@ class TestAuthEnforcement:
 class TestListProducts:
     """Tests for GET /api/products."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_list_products_success(self, mock_get_service,
                                    mock_has_module, client, zzp_auth):
@@ -107,7 +107,7 @@ class TestListProducts:
         assert data['success'] is True
         assert len(data['data']) == 1
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_list_products_with_inactive(self, mock_get_service,
                                          mock_has_module, client, zzp_auth):
@@ -125,7 +125,7 @@ class TestListProducts:
             'test-tenant', include_inactive=True
         )
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_list_products_server_error(self, mock_get_service,
                                         mock_has_module, client, zzp_auth):
@@ -150,7 +150,7 @@ class TestListProducts:
 class TestGetProduct:
     """Tests for GET /api/products/<id>."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_get_product_success(self, mock_get_service,
                                   mock_has_module, client, zzp_auth):
@@ -168,7 +168,7 @@ class TestGetProduct:
         assert data['success'] is True
         assert data['data']['id'] == 1
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_get_product_not_found(self, mock_get_service,
                                     mock_has_module, client, zzp_auth):
@@ -184,7 +184,7 @@ class TestGetProduct:
         assert data['success'] is False
         assert 'not found' in data['error'].lower()
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_get_product_server_error(self, mock_get_service,
                                        mock_has_module, client, zzp_auth):
@@ -209,7 +209,7 @@ class TestGetProduct:
 class TestCreateProduct:
     """Tests for POST /api/products."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_create_product_success(self, mock_get_service,
                                      mock_has_module, client, zzp_auth):
@@ -230,7 +230,7 @@ class TestCreateProduct:
         data = json.loads(response.data)
         assert data['success'] is True
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_create_product_missing_body(self, mock_get_service,
                                           mock_has_module, client, zzp_auth):
@@ -245,7 +245,7 @@ class TestCreateProduct:
         data = json.loads(response.data)
         assert data['success'] is False
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_create_product_value_error(self, mock_get_service,
                                          mock_has_module, client, zzp_auth):
@@ -265,7 +265,7 @@ class TestCreateProduct:
         assert data['success'] is False
         assert 'Name is required' in data['error']
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_create_product_server_error(self, mock_get_service,
                                           mock_has_module, client, zzp_auth):
@@ -294,7 +294,7 @@ class TestCreateProduct:
 class TestUpdateProduct:
     """Tests for PUT /api/products/<id>."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_update_product_success(self, mock_get_service,
                                      mock_has_module, client, zzp_auth):
@@ -315,7 +315,7 @@ class TestUpdateProduct:
         data = json.loads(response.data)
         assert data['success'] is True
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_update_product_missing_body(self, mock_get_service,
                                           mock_has_module, client, zzp_auth):
@@ -329,7 +329,7 @@ class TestUpdateProduct:
         data = json.loads(response.data)
         assert data['success'] is False
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_update_product_value_error(self, mock_get_service,
                                          mock_has_module, client, zzp_auth):
@@ -348,7 +348,7 @@ class TestUpdateProduct:
         data = json.loads(response.data)
         assert 'Invalid price' in data['error']
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_update_product_server_error(self, mock_get_service,
                                           mock_has_module, client, zzp_auth):
@@ -375,7 +375,7 @@ class TestUpdateProduct:
 class TestDeleteProduct:
     """Tests for DELETE /api/products/<id>."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_delete_product_success(self, mock_get_service,
                                      mock_has_module, client, zzp_auth):
@@ -391,7 +391,7 @@ class TestDeleteProduct:
         assert data['success'] is True
         assert 'deactivated' in data['message'].lower()
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_delete_product_value_error(self, mock_get_service,
                                          mock_has_module, client, zzp_auth):
@@ -408,7 +408,7 @@ class TestDeleteProduct:
         data = json.loads(response.data)
         assert data['success'] is False
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_delete_product_server_error(self, mock_get_service,
                                           mock_has_module, client, zzp_auth):
@@ -431,7 +431,7 @@ class TestDeleteProduct:
 class TestGetProductTypes:
     """Tests for GET /api/products/types."""
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_get_product_types_success(self, mock_get_service,
                                         mock_has_module, client, zzp_auth):
@@ -450,7 +450,7 @@ class TestGetProductTypes:
         assert data['success'] is True
         assert len(data['data']) == 2
 
-    @patch('services.module_registry.has_module', return_value=True)
+    @patch('services.entitlement_cache.get_entitlements', return_value=MagicMock())
     @patch('routes.product_routes._get_service')
     def test_get_product_types_server_error(self, mock_get_service,
                                              mock_has_module, client, zzp_auth):
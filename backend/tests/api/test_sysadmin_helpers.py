@@ -165,10 +165,12 @@ class TestGetUserGroups:
 class TestGetTenantUserCount:
     """Tests for get_tenant_user_count with mocked Cognito client."""
 
-    @patch('routes.sysadmin_helpers.cognito_client')
-    def test_get_tenant_user_count_counts_matching_users(self, mock_cognito):
+    def test_get_tenant_user_count_counts_matching_users(self):
         """Should count users that have the specified tenant in custom:tenants."""
         from routes.sysadmin_helpers import get_tenant_user_count
+        from services.cognito_directory import CognitoDirectoryIndex
+
+        mock_cognito = MagicMock()
 
         mock_cognito.list_users.return_value = {
             'Users': [
@@ -193,5 +195,7 @@ class TestGetTenantUserCount:
             ]
         }
 
-        result = get_tenant_user_count('tenant-a')
+        index = CognitoDirectoryIndex(lambda: mock_cognito, 'pool')
+        with patch('routes.sysadmin_helpers.directory_index', index):
+            result = get_tenant_user_count('tenant-a')
         assert result == 2
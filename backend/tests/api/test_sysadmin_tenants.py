@@ -255,7 +255,7 @@ class TestCreateTenant:
 class TestListTenants:
     """Tests for GET /api/sysadmin/tenants."""
 
-    @patch('routes.sysadmin_tenants.get_tenant_user_count', return_value=2)
+    @patch('routes.sysadmin_tenants.get_tenant_user_counts', return_value={'TestCorp': 2})
     @patch('routes.sysadmin_tenants.DatabaseManager')
     def test_list_tenants_success(self, mock_db_class, mock_user_count, client):
         """Successful tenant listing returns paginated results."""
@@ -277,7 +277,10 @@ class TestListTenants:
                 'created_at': datetime(2026, 1, 15, 10, 0),
                 'updated_at': datetime(2026, 2, 1, 12, 0),
             }],
-            [{'module_name': 'FIN'}, {'module_name': 'STR'}],  # Modules for TestCorp
+            [  # Modules for all listed tenants (one IN query)
+                {'administration': 'TestCorp', 'module_name': 'FIN'},
+                {'administration': 'TestCorp', 'module_name': 'STR'},
+            ],
         ]
 
         response = client.get('/api/sysadmin/tenants')
@@ -289,10 +292,12 @@ class TestListTenants:
         assert len(data['tenants']) == 1
         assert data['tenants'][0]['administration'] == 'TestCorp'
         assert data['tenants'][0]['enabled_modules'] == ['FIN', 'STR']
+        assert data['tenants'][0]['user_count'] == 2
+        mock_user_count.assert_called_once_with(['TestCorp'])
         assert data['page'] == 1
         assert data['per_page'] == 50
 
-    @patch('routes.sysadmin_tenants.get_tenant_user_count', return_value=0)
+    @patch('routes.sysadmin_tenants.get_tenant_user_counts', return_value={})
     @patch('routes.sysadmin_tenants.DatabaseManager')
     def test_list_tenants_with_status_filter(self, mock_db_class, mock_user_count, client):
         """Status filter is applied to query."""
@@ -312,7 +317,7 @@ class TestListTenants:
         assert data['total'] == 0
         assert data['tenants'] == []
 
-    @patch('routes.sysadmin_tenants.get_tenant_user_count', return_value=0)
+    @patch('routes.sysadmin_tenants.get_tenant_user_counts', return_value={})
     @patch('routes.sysadmin_tenants.DatabaseManager')
     def test_list_tenants_with_search(self, mock_db_class, mock_user_count, client):
         """Search parameter filters tenants."""
@@ -330,7 +335,7 @@ class TestListTenants:
         data = json.loads(response.data)
         assert data['success'] is True
 
-    @patch('routes.sysadmin_tenants.get_tenant_user_count', return_value=0)
+    @patch('routes.sysadmin_tenants.get_tenant_user_counts', return_value={})
     @patch('routes.sysadmin_tenants.DatabaseManager')
     def test_list_tenants_pagination(self, mock_db_class, mock_user_count, client):
         """Pagination parameters are respected."""
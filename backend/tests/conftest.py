@@ -28,6 +28,42 @@ hypothesis_settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "default"))
 
 # Test fixtures for pytest framework
 
+@pytest.fixture
+def reset_entitlement_cache():
+    """Start a test with an empty tenant entitlement cache."""
+    from services.entitlement_cache import invalidate_entitlements
+    invalidate_entitlements()
+    yield
+    invalidate_entitlements()
+
+
+@pytest.fixture
+def reset_storage_clients():
+    """Start a test without cached S3 clients or Drive services."""
+    from storage.client_registry import invalidate_storage_clients
+    invalidate_storage_clients()
+    yield
+    invalidate_storage_clients()
+
+
+@pytest.fixture
+def reset_folder_index():
+    """Start a test with empty Drive/S3 folder indexes."""
+    from services.folder_index import invalidate_folder_index
+    invalidate_folder_index()
+    yield
+    invalidate_folder_index()
+
+
+@pytest.fixture
+def reset_render_cache():
+    """Start a test without cached invoice templates, logos or stylesheets."""
+    from services.pdf_render_cache import invalidate_render_cache
+    invalidate_render_cache()
+    yield
+    invalidate_render_cache()
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files"""
@@ -17,6 +17,8 @@ from flask import Flask
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
+pytestmark = pytest.mark.usefixtures("reset_storage_clients")
+
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -18,6 +18,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from pattern_analyzer import PatternAnalyzer
 from pattern_cache import PersistentPatternCache, get_pattern_cache
+from pattern_file_store import ShardedFileStore
 from database import DatabaseManager
 
 
@@ -47,8 +48,7 @@ def test_persistent_cache_functionality():
         
         # Override cache directory for testing
         analyzer1.persistent_cache.cache_dir = Path(temp_cache_dir)
-        analyzer1.persistent_cache.patterns_file = Path(temp_cache_dir) / "patterns_cache.json"
-        analyzer1.persistent_cache.metadata_file = Path(temp_cache_dir) / "cache_metadata.json"
+        analyzer1.persistent_cache.file_store = ShardedFileStore(Path(temp_cache_dir) / "patterns")
         
         # Clear any existing cache
         analyzer1.persistent_cache.clear_all_cache()
@@ -102,8 +102,7 @@ def test_persistent_cache_functionality():
         
         # Use same cache directory
         analyzer2.persistent_cache.cache_dir = Path(temp_cache_dir)
-        analyzer2.persistent_cache.patterns_file = Path(temp_cache_dir) / "patterns_cache.json"
-        analyzer2.persistent_cache.metadata_file = Path(temp_cache_dir) / "cache_metadata.json"
+        analyzer2.persistent_cache.file_store = ShardedFileStore(Path(temp_cache_dir) / "patterns")
         
         # Re-initialize cache (should load from persistent storage)
         analyzer2.persistent_cache._initialize_cache()
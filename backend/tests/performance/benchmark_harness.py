@@ -0,0 +1,306 @@
+"""
+Timing, JSON results and regression thresholds for the benchmark suite.
+
+BenchmarkRecorder.run() times a callable over warmup + measured rounds
+(with an optional untimed setup per round) and compares the median with
+baseline.json next to this file. A benchmark regresses when
+
+    median > baseline_median * speed_factor * (1 + tolerance) + ABSOLUTE_SLACK_MS
+
+where tolerance is per benchmark (default DEFAULT_TOLERANCE, overridable
+with BENCHMARK_TOLERANCE). Baselines recorded at a different
+BENCHMARK_SCALE are ignored.
+
+speed_factor makes the limits relative to the machine: every session
+times a fixed calibration workload (Python aggregation plus SQLite, like
+the benchmarks) and stores it as environment.calibration_ms. The factor
+is this session's calibration time divided by the baseline's, so a
+machine that is 30% slower gets 30% higher limits instead of failing.
+Load can change during a session (for example when the unit suite runs
+in parallel), so the workload is timed again just before and after each
+benchmark that has a baseline; the factor used for its limit is the
+larger of the session factor and that local one.
+
+Every session writes results/<timestamp>.json and results/latest.json;
+with BENCHMARK_UPDATE_BASELINE=1 it rewrites baseline.json instead of
+failing on regressions.
+"""
+
+import gc
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+HERE = Path(__file__).parent
+BASELINE_PATH = HERE / "baseline.json"
+RESULTS_DIR = HERE / "results"
+
+DEFAULT_TOLERANCE = 0.25
+ABSOLUTE_SLACK_MS = 5.0  # Ignore regressions within timer noise
+CALIBRATION_ROUNDS = 5
+
+
+def update_baseline_requested() -> bool:
+    return os.getenv("BENCHMARK_UPDATE_BASELINE", "").lower() in ("1", "true", "yes")
+
+
+def _calibration_workload() -> int:
+    rows = [(i % 97, i % 13, (i * 7919) % 10007) for i in range(100_000)]
+    totals: dict[tuple[int, int], int] = {}
+    for account, month, amount in rows:
+        totals[account, month] = totals.get((account, month), 0) + amount
+
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE TABLE t (account INTEGER, month INTEGER, amount INTEGER)")
+        conn.executemany("INSERT INTO t VALUES (?, ?, ?)", rows)
+        grouped = conn.execute(
+            "SELECT account, month, SUM(amount) FROM t GROUP BY account, month"
+        ).fetchall()
+    finally:
+        conn.close()
+    labels = sorted(f"{key}:{value}" for key, value in totals.items())
+    return len(labels) + len(grouped)
+
+
+def calibrate(rounds: int = CALIBRATION_ROUNDS, warmup: int = 1) -> float:
+    """Fastest time (ms) of the fixed calibration workload on this machine."""
+    for _ in range(warmup):
+        _calibration_workload()
+    times = []
+    gc.collect()
+    gc.disable()  # Keep the size of the session's heap out of the measurement
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            _calibration_workload()
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return round(min(times) * 1000, 3)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    times: list[float]
+    tolerance: float
+    baseline_ms: float | None = None
+    speed_factor: float = 1.0  # Calibration time relative to the baseline's
+    calibration_ms: float | None = None  # Timed around this benchmark
+    info: dict[str, Any] = field(default_factory=dict)
+    value: Any = None  # Return value of the last round (not serialized)
+
+    def _ms(self, seconds: float) -> float:
+        return round(seconds * 1000, 3)
+
+    @property
+    def median_ms(self) -> float:
+        return self._ms(statistics.median(self.times))
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.times)
+        return self._ms(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))])
+
+    @property
+    def limit_ms(self) -> float | None:
+        if self.baseline_ms is None:
+            return None
+        return round(
+            self.baseline_ms * self.speed_factor * (1 + self.tolerance)
+            + ABSOLUTE_SLACK_MS,
+            3,
+        )
+
+    @property
+    def regressed(self) -> bool:
+        return self.limit_ms is not None and self.median_ms > self.limit_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rounds": len(self.times),
+            "median_ms": self.median_ms,
+            "p95_ms": self.p95_ms,
+            "min_ms": self._ms(min(self.times)),
+            "max_ms": self._ms(max(self.times)),
+            "mean_ms": self._ms(statistics.fmean(self.times)),
+            "baseline_ms": self.baseline_ms,
+            "tolerance": self.tolerance,
+            "speed_factor": self.speed_factor,
+            "calibration_ms": self.calibration_ms,
+            "limit_ms": self.limit_ms,
+            "change": (
+                round(self.median_ms / self.baseline_ms - 1, 3)
+                if self.baseline_ms
+                else None
+            ),
+            "regressed": self.regressed,
+            **({"info": self.info} if self.info else {}),
+        }
+
+
+class BenchmarkRecorder:
+    """Runs benchmarks for one session and writes their results."""
+
+    def __init__(
+        self,
+        environment: dict[str, Any] | None = None,
+        baseline_path: Path = BASELINE_PATH,
+        default_tolerance: float | None = None,
+        calibration_ms: float | None = None,
+    ):
+        self.environment = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "calibration_ms": calibration_ms or calibrate(),
+            **(environment or {}),
+        }
+        self.baseline_path = baseline_path
+        env_tolerance = os.getenv("BENCHMARK_TOLERANCE")
+        self.tolerance_override = float(env_tolerance) if env_tolerance else None
+        self.default_tolerance = (
+            DEFAULT_TOLERANCE if default_tolerance is None else default_tolerance
+        )
+        self.speed_factor = 1.0
+        self.baseline_calibration_ms: float | None = None
+        self.baseline = self._load_baseline()
+        self.results: dict[str, BenchmarkResult] = {}
+
+    def _load_baseline(self) -> dict[str, Any]:
+        if not self.baseline_path.exists():
+            return {}
+        data = json.loads(self.baseline_path.read_text())
+        environment = data.get("environment", {})
+        if environment.get("scale") != self.environment.get("scale"):
+            return {}
+        if environment.get("calibration_ms"):
+            self.baseline_calibration_ms = environment["calibration_ms"]
+            self.speed_factor = round(
+                self.environment["calibration_ms"] / self.baseline_calibration_ms, 3
+            )
+        return data.get("benchmarks", {})
+
+    def run(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        setup: Callable[[], Any] | None = None,
+        rounds: int = 5,
+        warmup: int = 1,
+        tolerance: float | None = None,
+        info: dict[str, Any] | None = None,
+    ) -> BenchmarkResult:
+        """Time func over rounds; func receives setup()'s return value if given."""
+
+        def call():
+            if setup is None:
+                start = time.perf_counter()
+                value = func()
+            else:
+                state = setup()
+                start = time.perf_counter()
+                value = func(state)
+            return time.perf_counter() - start, value
+
+        baseline = self.baseline.get(name)
+        calibrated = baseline is not None and self.baseline_calibration_ms is not None
+
+        for _ in range(warmup):
+            call()
+        # Machine load right before and after the rounds; the busier one counts
+        before = calibrate(rounds=1, warmup=0) if calibrated else None
+        times, value = [], None
+        for _ in range(rounds):
+            elapsed, value = call()
+            times.append(elapsed)
+        calibration_ms = (
+            max(before, calibrate(rounds=1, warmup=0)) if calibrated else None
+        )
+
+        speed_factor = self.speed_factor
+        if calibration_ms is not None:
+            speed_factor = max(
+                speed_factor, round(calibration_ms / self.baseline_calibration_ms, 3)
+            )
+        result = BenchmarkResult(
+            name=name,
+            times=times,
+            tolerance=(
+                self.tolerance_override
+                if self.tolerance_override is not None
+                else tolerance if tolerance is not None else self.default_tolerance
+            ),
+            baseline_ms=baseline["median_ms"] if baseline else None,
+            speed_factor=speed_factor,
+            calibration_ms=calibration_ms,
+            info=info or {},
+            value=value,
+        )
+        self.results[name] = result
+        return result
+
+    def assert_no_regression(self, result: BenchmarkResult) -> None:
+        if result.regressed and not update_baseline_requested():
+            raise AssertionError(
+                f"Benchmark '{result.name}' regressed: "
+                f"median {result.median_ms:.1f}ms > limit {result.limit_ms:.1f}ms "
+                f"(baseline {result.baseline_ms:.1f}ms, "
+                f"speed factor {result.speed_factor:.2f}, "
+                f"tolerance {result.tolerance:.0%})"
+            )
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "environment": self.environment,
+            "benchmarks": {
+                name: result.to_dict() for name, result in sorted(self.results.items())
+            },
+        }
+
+    def write(self, results_dir: Path = RESULTS_DIR) -> Path | None:
+        """Write the session report; also rewrites the baseline when requested."""
+        if not self.results:
+            return None
+        report = self.report()
+        text = json.dumps(report, indent=2)
+        results_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = results_dir / f"benchmarks_{stamp}.json"
+        path.write_text(text)
+        (results_dir / "latest.json").write_text(text)
+
+        if update_baseline_requested():
+            self.write_baseline(report)
+        return path
+
+    def write_baseline(self, report: dict[str, Any]) -> None:
+        benchmarks = {}
+        if self.baseline_path.exists():
+            existing = json.loads(self.baseline_path.read_text())
+            if existing.get("environment", {}).get("scale") == self.environment.get(
+                "scale"
+            ):
+                benchmarks = existing.get("benchmarks", {})
+        for name, entry in report["benchmarks"].items():
+            benchmarks[name] = {
+                "median_ms": entry["median_ms"],
+                "p95_ms": entry["p95_ms"],
+                "rounds": entry["rounds"],
+            }
+        baseline = {
+            "created_at": report["created_at"],
+            "environment": report["environment"],
+            "benchmarks": dict(sorted(benchmarks.items())),
+        }
+        self.baseline_path.write_text(json.dumps(baseline, indent=2) + "\n")
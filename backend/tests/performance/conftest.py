@@ -0,0 +1,72 @@
+"""
+Fixtures for the benchmark suite (tests/performance).
+
+A session-wide SQLiteStore is loaded once with the synthetic benchmark
+tenant plus a small second tenant (so tenant filters have rows to skip)
+and snapshotted; every test gets the store restored afterwards, so
+benchmarks that write (bank import, STR import) start from the same data.
+
+Run:
+    pytest tests/performance -m performance
+    BENCHMARK_UPDATE_BASELINE=1 pytest tests/performance   # new baseline
+"""
+
+import pytest
+
+from benchmark_harness import BenchmarkRecorder
+from database import DatabaseManager
+from sqlite_standin import SQLiteDatabase, SQLiteStore
+from synthetic_tenant import OTHER_ADMINISTRATION, SyntheticTenant, benchmark_scale
+
+SEED = 38
+
+
+@pytest.fixture(scope="session")
+def tenant():
+    return SyntheticTenant(seed=SEED, scale=benchmark_scale())
+
+
+@pytest.fixture(scope="session")
+def store(tenant):
+    store = SQLiteStore()
+    tenant.load(store)
+    SyntheticTenant(
+        seed=SEED + 1,
+        scale=tenant.scale / 10,
+        administration=OTHER_ADMINISTRATION,
+    ).load(store)
+    store.snapshot()
+    return store
+
+
+@pytest.fixture(autouse=True)
+def restore_store(store, monkeypatch):
+    # get_cursor() prefers the class-wide scalability manager over get_connection()
+    monkeypatch.setattr(DatabaseManager, "_scalability_manager", None)
+    yield
+    store.restore()
+
+
+@pytest.fixture(scope="session")
+def database_class(store):
+    return SQLiteDatabase.bind(store)
+
+
+@pytest.fixture
+def db(database_class):
+    return database_class()
+
+
+@pytest.fixture(scope="session")
+def recorder(tenant):
+    recorder = BenchmarkRecorder(
+        environment={
+            "scale": tenant.scale,
+            "seed": tenant.seed,
+            "tenant": tenant.summary(),
+        }
+    )
+    yield recorder
+    path = recorder.write()
+    if path:
+        print(f"\nBenchmark results written to {path}")
@@ -0,0 +1,556 @@
+"""
+In-memory SQLite stand-in for MySQL used by the benchmark suite.
+
+The hot paths under benchmark talk to MySQL through DatabaseManager and
+raw mysql-connector connections. SQLiteStore holds the tables they read
+and write (mutaties, rekeningschema, vw_mutaties, year_closure_status,
+bnb*, s3_assets) and hands out connections that behave like
+mysql-connector's where this code relies on it:
+
+- %s / %(name)s placeholders, INSERT IGNORE and DESCRIBE <table>
+- cursor(dictionary=True, buffered=False), fetchone/fetchmany/fetchall
+- dictionary rows accept column names in any case (MySQL returns the
+  name as written in the query, sqlite the declared one)
+- cursor.description with mysql FieldType codes (db_stream reads these)
+- YEAR/MONTH/QUARTER/WEEK/CONCAT/NOW/CURDATE/JSON_UNQUOTE functions
+- sqlite errors surface as db_exceptions types
+
+Absolute timings are not comparable with production MySQL; relative
+changes between runs are what the suite tracks.
+
+SQLiteDatabase.bind(store) returns a DatabaseManager subclass (or a
+subclass of another DatabaseManager subclass such as STRDatabase) whose
+connections come from the store, so tests can patch it in where the
+production code constructs its own DatabaseManager.
+"""
+
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+from mysql.connector.constants import FieldType
+
+from database import DatabaseManager
+from db_exceptions import DatabaseError, IntegrityError, OperationalError
+
+
+def _converter(parse):
+    def convert(raw: bytes):
+        text = raw.decode()
+        try:
+            return parse(text)
+        except ValueError:
+            return text  # e.g. '' where MySQL would hold a zero date
+
+    return convert
+
+
+sqlite3.register_converter("DATE", _converter(date.fromisoformat))
+sqlite3.register_converter("DATETIME", _converter(datetime.fromisoformat))
+
+SCHEMA = """
+CREATE TABLE rekeningschema (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Account VARCHAR(10) NOT NULL,
+    AccountName VARCHAR(100),
+    AccountLookup VARCHAR(50),
+    Parent VARCHAR(10),
+    VW CHAR(1),
+    Belastingaangifte VARCHAR(100),
+    parameters JSON,
+    administration VARCHAR(50) NOT NULL,
+    UNIQUE (administration, Account)
+);
+
+CREATE TABLE mutaties (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    TransactionNumber VARCHAR(50),
+    TransactionDate DATE,
+    TransactionDescription VARCHAR(255),
+    TransactionAmount DOUBLE,
+    Debet VARCHAR(10),
+    Credit VARCHAR(10),
+    ReferenceNumber VARCHAR(100),
+    Ref1 VARCHAR(100),
+    Ref2 VARCHAR(100),
+    Ref3 VARCHAR(255),
+    Ref4 VARCHAR(255),
+    administration VARCHAR(50)
+);
+CREATE INDEX idx_mutaties_admin_date ON mutaties (administration, TransactionDate);
+CREATE INDEX idx_mutaties_ref2 ON mutaties (Ref2);
+CREATE INDEX idx_mutaties_debet ON mutaties (administration, Debet);
+CREATE INDEX idx_mutaties_credit ON mutaties (administration, Credit);
+
+CREATE TABLE year_closure_status (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    administration VARCHAR(50) NOT NULL,
+    year INT NOT NULL,
+    closed_date DATETIME NOT NULL,
+    closed_by VARCHAR(255) NOT NULL,
+    closure_transaction_id INT,
+    opening_balance_transaction_id INT,
+    notes TEXT,
+    UNIQUE (administration, year)
+);
+
+CREATE TABLE bnb (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sourceFile VARCHAR(255),
+    channel VARCHAR(50),
+    listing VARCHAR(100),
+    checkinDate DATE,
+    checkoutDate DATE,
+    nights INT,
+    guests INT,
+    amountGross DOUBLE,
+    amountNett DOUBLE,
+    amountChannelFee DOUBLE,
+    amountTouristTax DOUBLE,
+    amountVat DOUBLE,
+    guestName VARCHAR(100),
+    phone VARCHAR(50),
+    reservationCode VARCHAR(50),
+    reservationDate DATE,
+    status VARCHAR(20),
+    pricePerNight DOUBLE,
+    daysBeforeReservation INT,
+    addInfo TEXT,
+    year INT,
+    q INT,
+    m INT,
+    country VARCHAR(50),
+    administration VARCHAR(50)
+);
+CREATE INDEX idx_bnb_channel ON bnb (channel, administration);
+
+CREATE TABLE bnbplanned AS SELECT * FROM bnb WHERE 0;
+
+CREATE TABLE bnbfuture (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE,
+    channel VARCHAR(50),
+    listing VARCHAR(100),
+    amount DOUBLE,
+    items INT
+);
+
+CREATE TABLE s3_assets (
+    id INTEGER PRIMARY KEY,
+    administration VARCHAR(50) NOT NULL,
+    bucket VARCHAR(100),
+    s3_key VARCHAR(500),
+    mime_type VARCHAR(100),
+    file_size INT,
+    category VARCHAR(50),
+    media_type VARCHAR(20),
+    original_filename VARCHAR(255),
+    content_hash CHAR(64),
+    status VARCHAR(20),
+    created_at DATETIME
+);
+
+CREATE TABLE s3_asset_references (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    administration VARCHAR(50) NOT NULL,
+    asset_id INT NOT NULL,
+    entity_type VARCHAR(50),
+    entity_id VARCHAR(100),
+    created_at DATETIME
+);
+
+CREATE VIEW vw_mutaties AS
+SELECT r.Belastingaangifte AS Aangifte, m.TransactionNumber, m.TransactionDate,
+       m.TransactionDescription, m.TransactionAmount AS Amount, m.Debet AS Reknum,
+       r.AccountName, r.Parent, r.VW,
+       CAST(strftime('%Y', m.TransactionDate) AS INTEGER) AS jaar,
+       (CAST(strftime('%m', m.TransactionDate) AS INTEGER) + 2) / 3 AS kwartaal,
+       CAST(strftime('%m', m.TransactionDate) AS INTEGER) AS maand,
+       CAST(strftime('%W', m.TransactionDate) AS INTEGER) AS week,
+       m.ReferenceNumber, m.administration, m.Ref3, m.Ref4
+FROM mutaties m
+JOIN rekeningschema r ON m.Debet = r.Account AND m.administration = r.administration
+UNION ALL
+SELECT r.Belastingaangifte, m.TransactionNumber, m.TransactionDate,
+       m.TransactionDescription, -m.TransactionAmount, m.Credit,
+       r.AccountName, r.Parent, r.VW,
+       CAST(strftime('%Y', m.TransactionDate) AS INTEGER),
+       (CAST(strftime('%m', m.TransactionDate) AS INTEGER) + 2) / 3,
+       CAST(strftime('%m', m.TransactionDate) AS INTEGER),
+       CAST(strftime('%W', m.TransactionDate) AS INTEGER),
+       m.ReferenceNumber, m.administration, m.Ref3, m.Ref4
+FROM mutaties m
+JOIN rekeningschema r ON m.Credit = r.Account AND m.administration = r.administration;
+
+CREATE VIEW vw_bnb_total AS
+SELECT channel, listing, checkinDate, checkoutDate, nights, guests, amountGross,
+       amountNett, amountChannelFee, amountTouristTax, amountVat, guestName,
+       reservationCode, reservationDate, status, pricePerNight,
+       daysBeforeReservation, year, q, m, country, administration
+FROM bnb
+UNION ALL
+SELECT channel, listing, checkinDate, checkoutDate, nights, guests, amountGross,
+       amountNett, amountChannelFee, amountTouristTax, amountVat, guestName,
+       reservationCode, reservationDate, status, pricePerNight,
+       daysBeforeReservation, year, q, m, country, administration
+FROM bnbplanned;
+"""
+
+# DESCRIBE types for computed view columns (SQLite reports none)
+VIEW_COLUMN_TYPES = {
+    "vw_mutaties": {
+        "Amount": "decimal(20,2)",
+        "jaar": "int(4)",
+        "kwartaal": "int(1)",
+        "maand": "int(2)",
+        "week": "int(2)",
+    },
+}
+
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s|%s|%%")
+_DESCRIBE = re.compile(
+    r"^\s*(?:DESCRIBE|DESC|SHOW\s+COLUMNS\s+FROM)\s+`?(\w+)`?\s*;?\s*$", re.I
+)
+_INSERT_IGNORE = re.compile(r"^\s*INSERT\s+IGNORE\b", re.I)
+
+_PEEK_ROWS = 256
+
+
+@lru_cache(maxsize=1024)
+def translate(sql: str) -> str:
+    """Rewrite mysql-connector SQL into SQLite SQL."""
+
+    def placeholder(match):
+        if match.group(0) == "%%":
+            return "%"
+        return f":{match.group(1)}" if match.group(1) else "?"
+
+    sql = _PLACEHOLDER.sub(placeholder, sql)
+    return _INSERT_IGNORE.sub("INSERT OR IGNORE", sql)
+
+
+def _bind_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    return value
+
+
+def _bind(params):
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return {key: _bind_value(value) for key, value in params.items()}
+    return tuple(_bind_value(value) for value in params)
+
+
+def _type_code(value):
+    if isinstance(value, bool | int):
+        return FieldType.LONGLONG
+    if isinstance(value, float):
+        return FieldType.DOUBLE
+    if isinstance(value, datetime):
+        return FieldType.DATETIME
+    if isinstance(value, date):
+        return FieldType.DATE
+    if isinstance(value, bytes):
+        return FieldType.BLOB
+    return FieldType.VAR_STRING
+
+
+def _wrap_error(error: sqlite3.Error) -> DatabaseError:
+    if isinstance(error, sqlite3.IntegrityError):
+        return IntegrityError(str(error), original_error=error)
+    if isinstance(error, sqlite3.OperationalError):
+        return OperationalError(str(error), original_error=error)
+    return DatabaseError(str(error), original_error=error)
+
+
+def _mysql_week(value):
+    return None if value is None else int(date.fromisoformat(value[:10]).strftime("%U"))
+
+
+def _month(value):
+    return None if value is None else int(value[5:7])
+
+
+class SQLiteStore:
+    """One in-memory database shared by all stand-in connections."""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(
+            ":memory:",
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+        )
+        self.conn.create_function(
+            "YEAR", 1, lambda v: None if v is None else int(v[:4]), deterministic=True
+        )
+        self.conn.create_function("MONTH", 1, _month, deterministic=True)
+        self.conn.create_function(
+            "QUARTER",
+            1,
+            lambda v: None if v is None else (_month(v) + 2) // 3,
+            deterministic=True,
+        )
+        self.conn.create_function("WEEK", 1, _mysql_week, deterministic=True)
+        self.conn.create_function(
+            "CONCAT", -1, lambda *a: None if None in a else "".join(map(str, a))
+        )
+        self.conn.create_function("NOW", 0, lambda: datetime.now().isoformat(sep=" "))
+        self.conn.create_function("CURDATE", 0, lambda: date.today().isoformat())
+        self.conn.create_function("JSON_UNQUOTE", 1, lambda v: v, deterministic=True)
+        self.conn.executescript(SCHEMA)
+        self._snapshot = None
+
+    def connect(self) -> "StandInConnection":
+        return StandInConnection(self)
+
+    def insert_rows(self, table: str, rows: list[dict]) -> None:
+        if not rows:
+            return
+        columns = list(rows[0])
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
+        self.conn.executemany(
+            sql, [tuple(_bind_value(row.get(c)) for c in columns) for row in rows]
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def count(self, table: str, where: str = "", params=()) -> int:
+        sql = f"SELECT COUNT(*) FROM {table}" + (f" WHERE {where}" if where else "")
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def describe(self, table: str) -> list[tuple]:
+        overrides = VIEW_COLUMN_TYPES.get(table, {})
+        rows = self.conn.execute(f"PRAGMA table_info({table})").fetchall()
+        if not rows:
+            raise OperationalError(f"Table '{table}' doesn't exist")
+        return [
+            (
+                name,
+                overrides.get(name) or (declared or "varchar(255)").lower(),
+                "NO" if notnull else "YES",
+                "PRI" if pk else "",
+                default,
+                "",
+            )
+            for _cid, name, declared, notnull, default, pk in rows
+        ]
+
+    def snapshot(self) -> None:
+        """Remember the current contents; restore() rolls back to them."""
+        self.conn.commit()
+        self._snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn.backup(self._snapshot)
+
+    def restore(self) -> None:
+        self.conn.rollback()
+        self._snapshot.backup(self.conn)
+
+
+class _Row(dict):
+    """Dictionary row with MySQL's case-insensitive column lookup."""
+
+    def __missing__(self, key):
+        if isinstance(key, str):
+            folded = key.lower()
+            for name, value in self.items():
+                if name.lower() == folded:
+                    return value
+        raise KeyError(key)
+
+
+class StandInCursor:
+    """mysql-connector-like cursor over the store's sqlite connection."""
+
+    DESCRIBE_COLUMNS = ("Field", "Type", "Null", "Key", "Default", "Extra")
+
+    def __init__(self, store: SQLiteStore, dictionary: bool = False):
+        self._store = store
+        self._dictionary = dictionary
+        self._cursor = None
+        self._rows = None  # Rows produced without sqlite (DESCRIBE)
+        self._buffer = []
+        self._columns = ()
+        self._description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def execute(self, operation, params=None, multi=False):
+        self._buffer = []
+        self._rows = None
+        self._description = None
+        match = _DESCRIBE.match(operation)
+        if match:
+            self._rows = self._store.describe(match.group(1))
+            self._columns = self.DESCRIBE_COLUMNS
+            self._description = [
+                (name, FieldType.VAR_STRING, None, None, None, None, 1)
+                for name in self._columns
+            ]
+            self.rowcount = len(self._rows)
+            return None
+
+        try:
+            self._cursor = self._store.conn.execute(translate(operation), _bind(params))
+        except sqlite3.Error as e:
+            raise _wrap_error(e) from e
+        self._columns = tuple(c[0] for c in self._cursor.description or ())
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid or None
+        return None
+
+    def executemany(self, operation, seq_params):
+        try:
+            self._cursor = self._store.conn.executemany(
+                translate(operation), [_bind(p) for p in seq_params]
+            )
+        except sqlite3.Error as e:
+            raise _wrap_error(e) from e
+        self._columns = ()
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid or None
+
+    @property
+    def description(self):
+        if self._description is None and self._columns:
+            self._buffer.extend(self._fetch_raw(_PEEK_ROWS))
+            codes = []
+            for index, name in enumerate(self._columns):
+                value = next(
+                    (row[index] for row in self._buffer if row[index] is not None),
+                    None,
+                )
+                code = FieldType.NULL if value is None else _type_code(value)
+                codes.append((name, code, None, None, None, None, 1))
+            self._description = codes
+        return self._description
+
+    @property
+    def column_names(self):
+        return self._columns
+
+    @property
+    def with_rows(self):
+        return bool(self._columns)
+
+    def _fetch_raw(self, size=None):
+        if self._rows is not None:
+            if size is None:
+                rows, self._rows = self._rows, []
+            else:
+                rows, self._rows = self._rows[:size], self._rows[size:]
+            return rows
+        if self._cursor is None or not self._columns:
+            return []
+        try:
+            if size is None:
+                return self._cursor.fetchall()
+            return self._cursor.fetchmany(size)
+        except sqlite3.Error as e:
+            raise _wrap_error(e) from e
+
+    def _take(self, size=None):
+        rows = self._buffer
+        if size is None:
+            self._buffer = []
+            rows = rows + self._fetch_raw()
+        elif len(rows) >= size:
+            rows, self._buffer = rows[:size], rows[size:]
+        else:
+            self._buffer = []
+            rows = rows + self._fetch_raw(size - len(rows))
+        if self._dictionary:
+            columns = self._columns
+            return [_Row(zip(columns, row)) for row in rows]
+        return [tuple(row) for row in rows]
+
+    def fetchone(self):
+        rows = self._take(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=1):
+        return self._take(size)
+
+    def fetchall(self):
+        return self._take()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cursor = None
+        self._rows = None
+        self._buffer = []
+
+
+class StandInConnection:
+    """mysql-connector-like connection; all connections share one database."""
+
+    def __init__(self, store: SQLiteStore):
+        self._store = store
+        self.autocommit = False
+
+    def cursor(self, dictionary=False, buffered=None, **kwargs):
+        return StandInCursor(self._store, dictionary=dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._store.conn.in_transaction
+
+    def start_transaction(self, **kwargs):
+        pass
+
+    def commit(self):
+        self._store.conn.commit()
+
+    def rollback(self):
+        self._store.conn.rollback()
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        # Closing must not discard the shared in-memory database
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteDatabase(DatabaseManager):
+    """DatabaseManager whose connections come from a bound SQLiteStore."""
+
+    store: SQLiteStore
+
+    def __init__(self, test_mode=False):
+        self.test_mode = test_mode
+        self.config = {"database": ":memory:"}
+
+    def get_connection(self, pool_type="primary"):
+        return self.store.connect()
+
+    @classmethod
+    def bind(cls, store: SQLiteStore, base: type | None = None) -> type:
+        """Subclass of cls (placed under base, e.g. STRDatabase) bound to store."""
+        bases = (base, cls) if base else (cls,)
+        name = f"SQLite{base.__name__ if base else 'DatabaseManager'}"
+        return type(name, bases, {"store": store})
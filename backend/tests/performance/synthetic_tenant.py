@@ -0,0 +1,554 @@
+"""
+Deterministic synthetic tenant for the benchmark suite.
+
+SyntheticTenant builds a complete administration from one seeded
+random.Random: chart of accounts, several years of mutaties (with the
+Opening Balance entries year-end closure writes), year_closure_status,
+bank statement batches, STR bookings and media assets. The same seed and
+scale always produce identical rows, so timings from different runs (and
+from before/after an optimization) measure the same work.
+
+Scale multiplies the row counts; set BENCHMARK_SCALE to run the suite
+against a larger tenant.
+
+Usage:
+    tenant = SyntheticTenant(seed=38, scale=1.0)
+    store = SQLiteStore()
+    tenant.load(store)
+    batch = tenant.bank_statement(500)
+"""
+
+import hashlib
+import json
+import os
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+ADMINISTRATION = "BenchTenant"
+OTHER_ADMINISTRATION = "OtherTenant"
+
+FIRST_YEAR = 2021
+LAST_YEAR = 2025
+CLOSED_YEARS = (2021, 2022, 2023)
+
+EQUITY_ACCOUNT = "3080"
+VAT_PRIMARY_ACCOUNT = "2010"
+
+BANK_ACCOUNTS = {
+    "1002": "NL91ABNA0417164300",
+    "1011": "NL20INGB0001234567",
+}
+
+# Account, AccountName, Parent, VW, Belastingaangifte
+ACCOUNTS = [
+    ("0100", "Inventaris", "0000", "N", "Materiele vaste activa"),
+    ("1002", "Bank ABN AMRO", "1000", "N", "Liquide middelen"),
+    ("1011", "Bank ING", "1000", "N", "Liquide middelen"),
+    ("1300", "Debiteuren", "1000", "N", "Vorderingen"),
+    ("1600", "Crediteuren", "1000", "N", "Kortlopende schulden"),
+    ("2010", "BTW af te dragen", "2000", "N", "Kortlopende schulden"),
+    ("2020", "BTW te vorderen hoog", "2000", "N", "Vorderingen"),
+    ("2021", "BTW te vorderen laag", "2000", "N", "Vorderingen"),
+    ("3080", "Resultaat boekjaar", "3000", "N", "Eigen vermogen"),
+    ("4000", "Huisvestingskosten", "4000", "Y", "Huisvestingskosten"),
+    ("4010", "Energie", "4000", "Y", "Huisvestingskosten"),
+    ("4020", "Telefoon en internet", "4000", "Y", "Kantoorkosten"),
+    ("4100", "Kantoorkosten", "4000", "Y", "Kantoorkosten"),
+    ("4200", "Autokosten", "4000", "Y", "Vervoerskosten"),
+    ("4300", "Verzekeringen", "4000", "Y", "Algemene kosten"),
+    ("4400", "Bankkosten", "4000", "Y", "Algemene kosten"),
+    ("4500", "Reiskosten", "4000", "Y", "Vervoerskosten"),
+    ("4600", "Schoonmaakkosten", "4000", "Y", "Algemene kosten"),
+    ("4700", "Kosten verhuur", "4000", "Y", "Overige kosten"),
+    ("8001", "Omzet hoog tarief", "8000", "Y", "Netto omzet"),
+    ("8002", "Omzet laag tarief", "8000", "Y", "Netto omzet"),
+    ("8003", "Omzet verhuur", "8000", "Y", "Netto omzet"),
+]
+
+# Counterparty, description template, expense account, VAT account, amount range
+EXPENSES = [
+    ("Picnic", "PICNIC betaling {n}", "4100", "2021", (12, 160)),
+    ("ANWB", "ANWB Energie {n}", "4010", "2020", (80, 260)),
+    ("KPN", "KPN abonnement {n}", "4020", "2020", (35, 90)),
+    ("Shell", "SHELL tankstation {n}", "4200", "2020", (40, 120)),
+    ("Centraal Beheer", "Centraal Beheer polis {n}", "4300", None, (30, 220)),
+    ("ABN AMRO", "Kosten betaalrekening {n}", "4400", None, (5, 25)),
+    ("NS", "NS reizen {n}", "4500", "2021", (4, 60)),
+    ("Vastgoed BV", "Huur bedrijfsruimte {n}", "4000", "2020", (600, 900)),
+    ("Schoon & Co", "Schoonmaak appartement {n}", "4600", "2020", (45, 140)),
+    ("Booking.com", "Booking.com commissie {n}", "4700", "2020", (20, 300)),
+]
+
+# Counterparty, description template, revenue account, VAT rate
+REVENUES = [
+    ("Airbnb", "AIRBNB PAYMENTS {n}", "8003", 0.09),
+    ("Booking.com", "Booking.com uitbetaling {n}", "8003", 0.09),
+    ("Klant Jansen", "Factuur {n} Jansen", "8001", 0.21),
+    ("Klant De Vries", "Factuur {n} De Vries", "8001", 0.21),
+    ("Boekhandel", "Verkoop boeken {n}", "8002", 0.09),
+]
+
+STR_CHANNELS = ("airbnb", "booking", "dfDirect")
+STR_LISTINGS = ("Green Studio", "Red Studio", "Child Friendly")
+COUNTRIES = ("NL", "DE", "BE", "FR", "GB", "US", "ES")
+GUEST_NAMES = ("Jansen", "Muller", "Dubois", "Smith", "Garcia", "Peeters", "Rossi")
+
+MEDIA_CATEGORIES = ("logo", "product", "invoice", "receipt", "banner")
+
+
+def benchmark_scale(default: float = 1.0) -> float:
+    """Scale factor from BENCHMARK_SCALE (row counts are multiplied by it)."""
+    return float(os.getenv("BENCHMARK_SCALE", default))
+
+
+def _money(value: float) -> float:
+    return round(value, 2)
+
+
+def _random_date(rng: random.Random, year: int, month: int | None = None) -> date:
+    month = month or rng.randint(1, 12)
+    return date(year, month, rng.randint(1, 28))
+
+
+class SyntheticTenant:
+    """Seeded generator for one benchmark administration."""
+
+    def __init__(
+        self,
+        seed: int = 38,
+        scale: float = 1.0,
+        administration: str = ADMINISTRATION,
+        years: tuple[int, int] = (FIRST_YEAR, LAST_YEAR),
+        closed_years: tuple[int, ...] = CLOSED_YEARS,
+    ):
+        self.seed = seed
+        self.scale = scale
+        self.administration = administration
+        self.first_year, self.last_year = years
+        self.closed_years = closed_years
+
+        self.transactions_per_year = max(50, int(3000 * scale))
+        self.bookings_per_year = max(20, int(400 * scale))
+        self.media_assets = max(10, int(300 * scale))
+
+        self.accounts = self._build_accounts()
+        self.mutaties = self._build_mutaties()
+        self.bookings = self._build_bookings()
+        self.assets, self.asset_references = self._build_media_assets()
+
+    def _rng(self, purpose: str) -> random.Random:
+        # One stream per purpose: adding rows to one table never shifts another
+        digest = hashlib.sha256(f"{self.seed}:{purpose}".encode()).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    # ------------------------------------------------------------------
+    # Chart of accounts
+    # ------------------------------------------------------------------
+
+    def _build_accounts(self) -> list[dict]:
+        rows = []
+        for account, name, parent, vw, aangifte in ACCOUNTS:
+            parameters = {}
+            if account in BANK_ACCOUNTS:
+                parameters = {"bank_account": True, "iban": BANK_ACCOUNTS[account]}
+            elif account == VAT_PRIMARY_ACCOUNT:
+                parameters = {"vat_netting": True, "vat_primary": True}
+            elif account in ("2020", "2021"):
+                parameters = {"vat_netting": True}
+            elif account == EQUITY_ACCOUNT:
+                parameters = {"purpose": "equity_result"}
+            rows.append(
+                {
+                    "Account": account,
+                    "AccountName": name,
+                    "AccountLookup": BANK_ACCOUNTS.get(account),
+                    "Parent": parent,
+                    "VW": vw,
+                    "Belastingaangifte": aangifte,
+                    "parameters": json.dumps(parameters) if parameters else None,
+                    "administration": self.administration,
+                }
+            )
+        return rows
+
+    # ------------------------------------------------------------------
+    # Mutaties
+    # ------------------------------------------------------------------
+
+    def _build_mutaties(self) -> list[dict]:
+        rng = self._rng("mutaties")
+        rows = []
+        balances: dict[str, float] = defaultdict(float)
+        sequences = {account: 1000 for account in BANK_ACCOUNTS}
+        balance_accounts = {a[0] for a in ACCOUNTS if a[3] == "N"}
+
+        for year in range(self.first_year, self.last_year + 1):
+            if year - 1 in self.closed_years:
+                opening = self._opening_balances(year, balances)
+                rows.extend(opening)
+                # Closure resets the P&L; the balance sheet carries over unchanged
+            year_rows = []
+            for n in range(self.transactions_per_year):
+                year_rows.extend(self._transaction(rng, year, n, sequences))
+            year_rows.sort(key=lambda r: r["TransactionDate"])
+            rows.extend(year_rows)
+
+            for row in year_rows:
+                amount = row["TransactionAmount"]
+                if row["Debet"] in balance_accounts:
+                    balances[row["Debet"]] += amount
+                if row["Credit"] in balance_accounts:
+                    balances[row["Credit"]] -= amount
+        return rows
+
+    def _transaction(self, rng, year, n, sequences) -> list[dict]:
+        bank = "1002" if rng.random() < 0.8 else "1011"
+        day = _random_date(rng, year)
+        sequences[bank] += 1
+        base = {
+            "TransactionNumber": f"{bank}-{year}-{n:05d}",
+            "TransactionDate": day,
+            "Ref1": BANK_ACCOUNTS[bank],
+            "Ref2": f"{BANK_ACCOUNTS[bank][-6:]}{sequences[bank]:07d}",
+            "Ref3": "",
+            "Ref4": "",
+            "administration": self.administration,
+        }
+
+        if rng.random() < 0.3:
+            counterparty, template, revenue_account, rate = rng.choice(REVENUES)
+            gross = _money(rng.uniform(80, 1500))
+            vat = _money(gross * rate / (1 + rate))
+            description = template.format(n=rng.randint(10000, 99999))
+            rows = [
+                {
+                    **base,
+                    "TransactionDescription": description,
+                    "TransactionAmount": _money(gross - vat),
+                    "Debet": bank,
+                    "Credit": revenue_account,
+                    "ReferenceNumber": counterparty,
+                },
+                {
+                    **base,
+                    "TransactionDescription": f"BTW {description}",
+                    "TransactionAmount": vat,
+                    "Debet": bank,
+                    "Credit": VAT_PRIMARY_ACCOUNT,
+                    "ReferenceNumber": counterparty,
+                },
+            ]
+        else:
+            counterparty, template, account, vat_account, (low, high) = rng.choice(
+                EXPENSES
+            )
+            gross = _money(rng.uniform(low, high))
+            description = template.format(n=rng.randint(1000000, 9999999))
+            document = f"{counterparty.replace(' ', '')}_{day:%Y%m%d}_{n}.pdf"
+            base["Ref3"] = f"https://drive.example.com/file/{self.seed}-{year}-{n}"
+            base["Ref4"] = document
+            if vat_account is None:
+                return [
+                    {
+                        **base,
+                        "TransactionDescription": description,
+                        "TransactionAmount": gross,
+                        "Debet": account,
+                        "Credit": bank,
+                        "ReferenceNumber": counterparty,
+                    }
+                ]
+            rate = 0.21 if vat_account == "2020" else 0.09
+            vat = _money(gross * rate / (1 + rate))
+            rows = [
+                {
+                    **base,
+                    "TransactionDescription": description,
+                    "TransactionAmount": _money(gross - vat),
+                    "Debet": account,
+                    "Credit": bank,
+                    "ReferenceNumber": counterparty,
+                },
+                {
+                    **base,
+                    "TransactionDescription": f"BTW {description}",
+                    "TransactionAmount": vat,
+                    "Debet": vat_account,
+                    "Credit": bank,
+                    "ReferenceNumber": counterparty,
+                },
+            ]
+        return rows
+
+    def _opening_balances(self, year, balances) -> list[dict]:
+        """Opening Balance entries as year-end closure writes them (VAT netted)."""
+        rows = []
+        entries = {}
+        vat_total = 0.0
+        for account, balance in sorted(balances.items()):
+            if account == EQUITY_ACCOUNT:
+                continue
+            if account in ("2010", "2020", "2021"):
+                vat_total += balance
+            else:
+                entries[account] = balance
+        entries[VAT_PRIMARY_ACCOUNT] = vat_total
+
+        for account, balance in entries.items():
+            if abs(balance) <= 0.01:
+                continue
+            debet, credit = (
+                (account, EQUITY_ACCOUNT) if balance > 0 else (EQUITY_ACCOUNT, account)
+            )
+            rows.append(
+                {
+                    "TransactionNumber": f"OpeningBalance {year}",
+                    "TransactionDate": date(year, 1, 1),
+                    "TransactionDescription": f"Opening balance {year} for {account}",
+                    "TransactionAmount": _money(abs(balance)),
+                    "Debet": debet,
+                    "Credit": credit,
+                    "ReferenceNumber": "Opening Balance",
+                    "Ref1": "",
+                    "Ref2": "",
+                    "Ref3": "",
+                    "Ref4": "",
+                    "administration": self.administration,
+                }
+            )
+        return rows
+
+    def year_closures(self) -> list[dict]:
+        return [
+            {
+                "administration": self.administration,
+                "year": year,
+                "closed_date": datetime(year + 1, 2, 15, 10, 0),
+                "closed_by": "benchmark@example.com",
+            }
+            for year in self.closed_years
+        ]
+
+    # ------------------------------------------------------------------
+    # Bank statements
+    # ------------------------------------------------------------------
+
+    def bank_statement(
+        self, count: int, duplicate_ratio: float = 0.2, with_accounts: bool = True
+    ) -> list[dict]:
+        """A statement batch for the last year, as the bank import review grid sends it.
+
+        duplicate_ratio of the rows repeat transactions already in mutaties
+        (same Ref2) so the duplicate checks hit. Without with_accounts the
+        counter-account and ReferenceNumber are left empty, which is what
+        pattern apply receives.
+        """
+        rng = self._rng(f"statement:{count}:{duplicate_ratio}:{with_accounts}")
+        existing = [
+            row
+            for row in self.mutaties
+            if row["Ref2"] and row["TransactionDate"].year == self.last_year
+        ]
+        rows = []
+        sequence = 9_000_000
+        for n in range(count):
+            if existing and rng.random() < duplicate_ratio:
+                source = rng.choice(existing)
+                row = {
+                    key: source[key]
+                    for key in (
+                        "TransactionNumber",
+                        "TransactionDescription",
+                        "TransactionAmount",
+                        "Debet",
+                        "Credit",
+                        "ReferenceNumber",
+                        "Ref1",
+                        "Ref2",
+                        "Ref3",
+                        "Ref4",
+                    )
+                }
+                row["TransactionDate"] = source["TransactionDate"].isoformat()
+            else:
+                sequence += 1
+                bank = "1002" if rng.random() < 0.8 else "1011"
+                counterparty, template, account, _vat, (low, high) = rng.choice(
+                    EXPENSES
+                )
+                row = {
+                    "TransactionNumber": f"{bank}-import-{n:05d}",
+                    "TransactionDate": (
+                        _random_date(rng, self.last_year, 12).isoformat()
+                    ),
+                    "TransactionDescription": template.format(
+                        n=rng.randint(1000000, 9999999)
+                    ),
+                    "TransactionAmount": _money(rng.uniform(low, high)),
+                    "Debet": account,
+                    "Credit": bank,
+                    "ReferenceNumber": counterparty,
+                    "Ref1": BANK_ACCOUNTS[bank],
+                    "Ref2": f"{BANK_ACCOUNTS[bank][-6:]}{sequence:07d}",
+                    "Ref3": "",
+                    "Ref4": "",
+                }
+            if not with_accounts:
+                bank_side = row["Credit"] if row["Credit"] in BANK_ACCOUNTS else None
+                row["Debet"] = "" if bank_side else row["Debet"]
+                row["Credit"] = bank_side or ""
+                row["ReferenceNumber"] = ""
+            row["administration"] = self.administration
+            row["Administration"] = self.administration
+            rows.append(row)
+        return rows
+
+    # ------------------------------------------------------------------
+    # STR bookings
+    # ------------------------------------------------------------------
+
+    def _booking(self, rng, code, checkin: date, status: str) -> dict:
+        channel = rng.choice(STR_CHANNELS)
+        nights = rng.randint(1, 10)
+        guests = rng.randint(1, 4)
+        price = _money(rng.uniform(70, 180))
+        gross = _money(price * nights)
+        channel_fee = _money(gross * (0.15 if channel != "dfDirect" else 0.0))
+        tourist_tax = _money(nights * guests * 2.5)
+        vat = _money((gross - tourist_tax) * 0.09 / 1.09)
+        reserved = checkin - timedelta(days=rng.randint(1, 120))
+        return {
+            "sourceFile": f"{channel}_{checkin.year}.csv",
+            "channel": channel,
+            "listing": rng.choice(STR_LISTINGS),
+            "checkinDate": checkin.isoformat(),
+            "checkoutDate": (checkin + timedelta(days=nights)).isoformat(),
+            "nights": nights,
+            "guests": guests,
+            "amountGross": gross,
+            "amountNett": _money(gross - channel_fee - tourist_tax - vat),
+            "amountChannelFee": channel_fee,
+            "amountTouristTax": tourist_tax,
+            "amountVat": vat,
+            "guestName": rng.choice(GUEST_NAMES),
+            "phone": f"+31 6 {rng.randint(10000000, 99999999)}",
+            "reservationCode": code,
+            "reservationDate": reserved.isoformat(),
+            "status": status,
+            "pricePerNight": price,
+            "daysBeforeReservation": (checkin - reserved).days,
+            "addInfo": "",
+            "year": checkin.year,
+            "q": (checkin.month - 1) // 3 + 1,
+            "m": checkin.month,
+            "country": rng.choice(COUNTRIES),
+            "administration": self.administration,
+        }
+
+    def _build_bookings(self) -> list[dict]:
+        rng = self._rng("bookings")
+        rows = []
+        for year in range(self.first_year, self.last_year + 1):
+            for n in range(self.bookings_per_year):
+                status = "cancelled" if rng.random() < 0.05 else "realised"
+                rows.append(
+                    self._booking(
+                        rng, f"HM{year}{n:05d}", _random_date(rng, year), status
+                    )
+                )
+        return rows
+
+    def str_import(self, count: int, already_loaded_ratio: float = 0.3) -> list[dict]:
+        """A parsed STR download: realised, planned and already loaded bookings."""
+        rng = self._rng(f"str_import:{count}:{already_loaded_ratio}")
+        recent = [b for b in self.bookings if b["year"] == self.last_year]
+        rows = []
+        for n in range(count):
+            if recent and rng.random() < already_loaded_ratio:
+                rows.append(dict(rng.choice(recent)))
+                continue
+            status = "planned" if rng.random() < 0.4 else "realised"
+            year = self.last_year + 1 if status == "planned" else self.last_year
+            rows.append(
+                self._booking(rng, f"NEW{n:06d}", _random_date(rng, year), status)
+            )
+        return rows
+
+    # ------------------------------------------------------------------
+    # Media assets
+    # ------------------------------------------------------------------
+
+    def _build_media_assets(self) -> tuple[list[dict], list[dict]]:
+        rng = self._rng("media")
+        assets, references = [], []
+        first_id = self.seed * 100_000  # Tenants loaded side by side keep distinct ids
+        for n in range(1, self.media_assets + 1):
+            asset_id = first_id + n
+            category = rng.choice(MEDIA_CATEGORIES)
+            content_hash = hashlib.sha256(
+                f"{self.seed}:asset:{n}".encode()
+            ).hexdigest()
+            extension, mime = rng.choice(
+                (
+                    ("png", "image/png"),
+                    ("jpg", "image/jpeg"),
+                    ("pdf", "application/pdf"),
+                )
+            )
+            assets.append(
+                {
+                    "id": asset_id,
+                    "administration": self.administration,
+                    "bucket": "benchmark-assets",
+                    "s3_key": (
+                        f"{self.administration}/{category}/"
+                        f"{content_hash[:16]}.{extension}"
+                    ),
+                    "mime_type": mime,
+                    "file_size": rng.randint(5_000, 4_000_000),
+                    "category": category,
+                    "media_type": "document" if extension == "pdf" else "image",
+                    "original_filename": f"{category}_{n}.{extension}",
+                    "content_hash": content_hash,
+                    "status": "active",
+                    "created_at": datetime(self.last_year, 1, 1) + timedelta(hours=n),
+                }
+            )
+            for _ in range(rng.randint(0, 3)):
+                references.append(
+                    {
+                        "administration": self.administration,
+                        "asset_id": asset_id,
+                        "entity_type": rng.choice(("product", "invoice", "page")),
+                        "entity_id": str(rng.randint(1, 500)),
+                        "created_at": datetime(self.last_year, 6, 1),
+                    }
+                )
+        return assets, references
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self, store) -> None:
+        """Insert every table into a SQLiteStore (or anything with insert_rows)."""
+        store.insert_rows("rekeningschema", self.accounts)
+        store.insert_rows("mutaties", self.mutaties)
+        store.insert_rows("year_closure_status", self.year_closures())
+        store.insert_rows("bnb", self.bookings)
+        store.insert_rows("s3_assets", self.assets)
+        store.insert_rows("s3_asset_references", self.asset_references)
+        store.commit()
+
+    def summary(self) -> dict:
+        return {
+            "seed": self.seed,
+            "scale": self.scale,
+            "administration": self.administration,
+            "years": [self.first_year, self.last_year],
+            "accounts": len(self.accounts),
+            "mutaties": len(self.mutaties),
+            "bookings": len(self.bookings),
+            "media_assets": len(self.assets),
+        }
@@ -0,0 +1,338 @@
+"""
+Benchmarks for the backend hot paths on the synthetic tenant.
+
+Each test runs one production code path against the SQLite stand-in,
+checks the result is plausible for the generated data and fails when its
+median time regressed past the baseline threshold (benchmark_harness).
+
+Covered: mutaties cache load, Aangifte IB, actuals balance endpoint,
+pivot query, bank import save, pattern apply, STR import, XLSX export
+and BTW report.
+"""
+
+import base64
+import itertools
+import json
+import os
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from actuals_routes import actuals_bp
+from banking_processor import BankingProcessor
+from btw_processor import BTWProcessor
+from mutaties_cache import MutatiesCache
+from pattern_analyzer import PatternAnalyzer
+from pattern_detection import analyze_transaction_patterns
+from services import pivot_service
+from services.pivot_service import PivotService, build_registry_from_db
+from sqlite_standin import SQLiteDatabase
+from str_database import STRDatabase
+from str_processor import STRProcessor
+from synthetic_tenant import ADMINISTRATION, CLOSED_YEARS, LAST_YEAR
+from xlsx_export import XLSXExportProcessor
+
+# Patch target for tenant role resolution (imported locally in cognito_utils)
+ROLE_PATCH = "auth.role_cache.get_tenant_roles"
+
+START_YEAR = max(CLOSED_YEARS) + 1
+YEARS = range(START_YEAR - 1, LAST_YEAR + 1)  # Cache keeps the last closed year
+BANK_BATCH = 400
+PATTERN_BATCH = 500
+STR_BATCH = 300
+
+PIVOT_REGISTRIES = (
+    "SYSTEM_ALLOWED_COLUMNS",
+    "COLUMN_TYPE_MAP",
+    "DATA_SOURCE_LABELS",
+    "DATA_SOURCE_MODULES",
+)
+
+
+class _PivotParameters:
+    """ParameterService holding the ui.pivot settings a tenant would configure."""
+
+    VALUES = {"force_groupable.vw_mutaties": ["jaar", "kwartaal", "maand"]}
+
+    def get_param(self, namespace=None, key=None, tenant=None, **kwargs):
+        return self.VALUES.get(key)
+
+
+class _NoTemplates:
+    """TemplateService without tenant templates (default template is used)."""
+
+    def get_template_metadata(self, *args, **kwargs):
+        return None
+
+
+class _StaticPatternCache:
+    """Persistent pattern cache that always hits with one analysis result."""
+
+    def __init__(self, patterns):
+        self.patterns = patterns
+
+    def get_patterns(self, *args, **kwargs):
+        return self.patterns
+
+    def store_patterns(self, *args, **kwargs):
+        pass
+
+    def invalidate_cache(self, *args, **kwargs):
+        pass
+
+
+def _auth_headers():
+    payload = {
+        "email": "benchmark@example.com",
+        "custom:tenants": [ADMINISTRATION],
+        "cognito:groups": ["Finance_CRUD"],
+    }
+    header = base64.urlsafe_b64encode(json.dumps({"alg": "HS256"}).encode())
+    body = base64.urlsafe_b64encode(json.dumps(payload).encode())
+    token = ".".join(
+        [header.decode().rstrip("="), body.decode().rstrip("="), "mock_signature"]
+    )
+    return {"Authorization": f"Bearer {token}", "X-Tenant": ADMINISTRATION}
+
+
+@pytest.fixture
+def warm_cache(db):
+    cache = MutatiesCache()
+    cache.get_data(db, tenant=ADMINISTRATION)
+    return cache
+
+
+@pytest.fixture
+def pivot_registry(db):
+    saved = {name: dict(getattr(pivot_service, name)) for name in PIVOT_REGISTRIES}
+    saved_initialised = pivot_service._registry_initialised
+    build_registry_from_db(db, _PivotParameters())
+    yield
+    for name, values in saved.items():
+        registry = getattr(pivot_service, name)
+        registry.clear()
+        registry.update(values)
+    pivot_service._registry_initialised = saved_initialised
+
+
+class TestReportingBenchmarks:
+
+    def test_cache_load(self, recorder, db, store):
+        result = recorder.run(
+            "cache_load",
+            lambda cache: cache.get_data(db, tenant=ADMINISTRATION),
+            setup=MutatiesCache,
+        )
+
+        frame = result.value
+        expected = store.count(
+            "vw_mutaties",
+            "administration = ? AND jaar >= ?",
+            (ADMINISTRATION, START_YEAR - 1),
+        )
+        assert len(frame) == expected
+        assert set(frame["jaar"].unique()) == set(YEARS)
+        recorder.assert_no_regression(result)
+
+    def test_aangifte_ib(self, recorder, db, warm_cache):
+        result = recorder.run(
+            "aangifte_ib",
+            lambda: warm_cache.query_aangifte_ib(
+                LAST_YEAR,
+                ADMINISTRATION,
+                db_manager=db,
+                tenant=ADMINISTRATION,
+                user_tenants=[ADMINISTRATION],
+                start_year=START_YEAR,
+            ),
+            rounds=20,
+        )
+
+        parents = {row["Parent"] for row in result.value}
+        assert {"1000", "4000", "8000"} <= parents
+        recorder.assert_no_regression(result)
+
+    def test_actuals_balance(self, recorder, database_class, warm_cache, monkeypatch):
+        monkeypatch.setattr("actuals_routes.DatabaseManager", database_class)
+        monkeypatch.setattr("actuals_routes.get_cache", lambda: warm_cache)
+        monkeypatch.setattr(ROLE_PATCH, lambda *args, **kwargs: ["Finance_CRUD"])
+        app = Flask(__name__)
+        app.config["TESTING"] = True
+        app.register_blueprint(actuals_bp, url_prefix="/api/reports")
+        client = app.test_client()
+        years = ",".join(str(year) for year in YEARS)
+        url = f"/api/reports/actuals-balance?years={years}&per_year=true"
+        headers = _auth_headers()
+
+        result = recorder.run(
+            "actuals_balance", lambda: client.get(url, headers=headers), rounds=10
+        )
+
+        response = result.value
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["closedYears"] == list(CLOSED_YEARS)
+        assert {row["jaar"] for row in body["data"]} == set(YEARS)
+        recorder.assert_no_regression(result)
+
+    def test_pivot(self, recorder, db, pivot_registry):
+        service = PivotService(db, _PivotParameters())
+        config = {
+            "data_source": "vw_mutaties",
+            "group_columns": ["Parent", "Reknum", "AccountName"],
+            "aggregate_measures": [
+                {"function": "SUM", "column": "Amount"},
+                {"function": "COUNT", "column": "*"},
+            ],
+            "column_pivot": "jaar",
+            "filters": {"VW": "Y"},
+        }
+
+        result = recorder.run(
+            "pivot",
+            lambda: service.execute_pivot(ADMINISTRATION, [ADMINISTRATION], config),
+        )
+
+        pivot = result.value
+        assert pivot["success"]
+        assert pivot["row_count"] == len({row["Reknum"] for row in pivot["data"]})
+        assert pivot["row_count"] >= 10
+        recorder.assert_no_regression(result)
+
+    def test_xlsx_export(self, recorder, db, store, tmp_path):
+        processor = XLSXExportProcessor.__new__(XLSXExportProcessor)
+        processor.test_mode = False
+        processor.db = db
+        processor.template_service = _NoTemplates()
+        processor.default_template_path = os.path.join(
+            os.path.dirname(__file__), "..", "..", "templates", "xlsx", "template.xlsx"
+        )
+        processor.default_output_base_path = str(tmp_path)
+        processor.folder_search_log = []
+        counter = itertools.count()
+
+        def export(filename):
+            data = processor.make_ledgers(LAST_YEAR, ADMINISTRATION)
+            processor.write_workbook(data, filename, "data", ADMINISTRATION)
+            return data
+
+        result = recorder.run(
+            "xlsx_export",
+            export,
+            setup=lambda: str(tmp_path / f"export_{next(counter)}.xlsx"),
+            rounds=3,
+            warmup=0,
+        )
+
+        data = result.value
+        transactions = store.count(
+            "vw_mutaties",
+            "administration = ? AND jaar = ?",
+            (ADMINISTRATION, LAST_YEAR),
+        )
+        opening_number = f"Beginbalans {LAST_YEAR}"
+        opening = [row for row in data if row["TransactionNumber"] == opening_number]
+        assert opening
+        assert len(data) == transactions + len(opening)
+        recorder.assert_no_regression(result)
+
+    def test_btw_report(self, recorder, database_class, warm_cache, monkeypatch):
+        monkeypatch.setattr("btw_processor.DatabaseManager", database_class)
+        monkeypatch.setattr("btw_processor.get_cache", lambda: warm_cache)
+        processor = BTWProcessor()
+
+        result = recorder.run(
+            "btw_report",
+            lambda: processor.generate_btw_report(ADMINISTRATION, LAST_YEAR, 4),
+            rounds=10,
+        )
+
+        report = result.value
+        assert report["success"], report.get("error")
+        assert report["calculations"]["total_balance"] != 0
+        recorder.assert_no_regression(result)
+
+
+class TestImportBenchmarks:
+
+    def test_bank_import_save(self, recorder, db, tenant, store):
+        processor = BankingProcessor.__new__(BankingProcessor)
+        processor.db = db
+        statement = tenant.bank_statement(BANK_BATCH)
+        existing_ref2 = {
+            row[0] for row in store.conn.execute("SELECT Ref2 FROM mutaties").fetchall()
+        }
+
+        def setup():
+            store.restore()
+            return [dict(row) for row in statement]
+
+        result = recorder.run(
+            "bank_import_save",
+            processor.save_approved_transactions,
+            setup=setup,
+            rounds=3,
+            warmup=0,
+        )
+
+        expected = sum(1 for row in statement if row["Ref2"] not in existing_ref2)
+        assert 0 < expected < len(statement)
+        assert result.value == expected
+        recorder.assert_no_regression(result)
+
+    def test_pattern_apply(self, recorder, db, tenant):
+        analyzer = PatternAnalyzer.__new__(PatternAnalyzer)
+        analyzer.test_mode = False
+        analyzer.db = db
+        analyzer.patterns_cache = {}
+        analyzer.bank_accounts_cache = None
+        since = datetime(LAST_YEAR, 1, 1)
+        history = db.execute_query(*analyzer.build_history_query(ADMINISTRATION, since))
+        patterns = analyze_transaction_patterns(
+            history, ADMINISTRATION, analyzer.is_bank_account
+        )
+        analyzer.persistent_cache = _StaticPatternCache(
+            analyzer.build_analysis_result(len(history), patterns, {}, since)
+        )
+        statement = tenant.bank_statement(
+            PATTERN_BATCH, duplicate_ratio=0.0, with_accounts=False
+        )
+
+        result = recorder.run(
+            "pattern_apply",
+            lambda: analyzer.apply_patterns_to_transactions(statement, ADMINISTRATION),
+        )
+
+        updated, stats = result.value
+        assert len(updated) == PATTERN_BATCH
+        assert stats["predictions_made"]["reference"] > PATTERN_BATCH // 2
+        assert stats["predictions_made"]["debet"] > PATTERN_BATCH // 2
+        recorder.assert_no_regression(result)
+
+    def test_str_import(self, recorder, tenant, store, monkeypatch):
+        database_class = SQLiteDatabase.bind(store, STRDatabase)
+        monkeypatch.setattr("str_database.STRDatabase", database_class)
+        processor = STRProcessor(tenant=ADMINISTRATION)
+        bookings = tenant.str_import(STR_BATCH)
+
+        def import_bookings(_restored):
+            # Same sequence as the STR import route for non-direct platforms
+            separated = processor.separate_by_status(bookings)
+            str_db = database_class()
+            realised = str_db.insert_realised_bookings(separated["realised"])
+            planned = str_db.insert_planned_bookings(separated["planned"])
+            str_db.insert_future_summary(
+                processor.generate_future_summary(separated["planned"])
+            )
+            return separated, realised, planned
+
+        result = recorder.run(
+            "str_import", import_bookings, setup=store.restore, rounds=3
+        )
+
+        separated, realised, planned = result.value
+        assert separated["already_loaded"]
+        assert realised == len(separated["realised"]) > 0
+        assert planned == len(separated["planned"]) > 0
+        recorder.assert_no_regression(result)
@@ -0,0 +1,103 @@
+"""
+Sanity checks for the synthetic benchmark tenant.
+
+Benchmarks are only comparable between runs when the generated data is,
+so these pin determinism and the bookkeeping invariants the hot paths
+rely on (double entry, opening balances after closed years).
+"""
+
+from collections import defaultdict
+
+from synthetic_tenant import (
+    CLOSED_YEARS,
+    EQUITY_ACCOUNT,
+    FIRST_YEAR,
+    LAST_YEAR,
+    SyntheticTenant,
+)
+
+SCALE = 0.05
+
+
+def _small(seed=38):
+    return SyntheticTenant(seed=seed, scale=SCALE)
+
+
+class TestSyntheticTenant:
+
+    def test_same_seed_generates_same_data(self):
+        first, second = _small(), _small()
+
+        assert first.mutaties == second.mutaties
+        assert first.bookings == second.bookings
+        assert first.assets == second.assets
+        assert first.bank_statement(50) == second.bank_statement(50)
+
+    def test_other_seed_generates_other_data(self):
+        assert _small(38).mutaties != _small(39).mutaties
+
+    def test_rows_are_double_entry_on_known_accounts(self):
+        tenant = _small()
+        accounts = {row["Account"] for row in tenant.accounts}
+
+        for row in tenant.mutaties:
+            assert row["Debet"] in accounts
+            assert row["Credit"] in accounts
+            assert row["Debet"] != row["Credit"]
+            assert row["TransactionAmount"] > 0
+
+    def test_opening_balances_follow_each_closed_year(self):
+        tenant = _small()
+        opening_years = {
+            row["TransactionDate"].year
+            for row in tenant.mutaties
+            if row["ReferenceNumber"] == "Opening Balance"
+        }
+
+        assert opening_years == {year + 1 for year in CLOSED_YEARS}
+        assert {row["year"] for row in tenant.year_closures()} == set(CLOSED_YEARS)
+
+    def test_opening_balances_carry_balance_sheet(self):
+        tenant = _small()
+        year = max(CLOSED_YEARS) + 1
+        balance_accounts = {
+            row["Account"] for row in tenant.accounts if row["VW"] == "N"
+        }
+        carried = defaultdict(float)
+        opening = defaultdict(float)
+        for row in tenant.mutaties:
+            amount = row["TransactionAmount"]
+            if row["ReferenceNumber"] == "Opening Balance":
+                if row["TransactionDate"].year == year:
+                    opening[row["Debet"]] += amount
+                    opening[row["Credit"]] -= amount
+            elif FIRST_YEAR <= row["TransactionDate"].year < year:
+                if row["Debet"] in balance_accounts:
+                    carried[row["Debet"]] += amount
+                if row["Credit"] in balance_accounts:
+                    carried[row["Credit"]] -= amount
+
+        # Bank accounts carry over one-to-one (VAT accounts are netted)
+        for account in ("1002", "1011"):
+            assert round(opening[account], 2) == round(carried[account], 2)
+        assert round(sum(opening.values()), 2) == 0
+        assert EQUITY_ACCOUNT in opening
+
+    def test_bank_statement_repeats_existing_transactions(self):
+        tenant = _small()
+        existing = {row["Ref2"] for row in tenant.mutaties if row["Ref2"]}
+
+        statement = tenant.bank_statement(200, duplicate_ratio=0.5)
+
+        duplicates = [row for row in statement if row["Ref2"] in existing]
+        assert 0 < len(duplicates) < len(statement)
+        assert all(
+            row["TransactionDate"].startswith(str(LAST_YEAR)) for row in statement
+        )
+
+    def test_bank_statement_without_accounts_keeps_bank_side(self):
+        statement = _small().bank_statement(50, with_accounts=False)
+
+        for row in statement:
+            assert row["ReferenceNumber"] == ""
+            assert row["Credit"] in ("1002", "1011", "")
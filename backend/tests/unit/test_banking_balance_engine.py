@@ -0,0 +1,148 @@
+"""Unit tests for banking_balance_engine.py.
+
+Tests cover:
+- Revolut Ref2 parsing
+- Numeric Ref2 sequence gap detection
+- Saldo progression and running balance checks
+- Pagination of gap results
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from banking_balance_engine import (
+    balance_gaps,
+    compute_running_balance,
+    find_saldo_progression_issues,
+    find_sequence_gaps,
+    is_numeric_sequence,
+    page_bounds,
+    split_revolut_ref2,
+    transaction_details,
+)
+import pandas as pd
+
+
+def _revolut_tx(tx_id, amount, debet, credit, saldo, ref3=None, when='2025-05-01 10:00:00'):
+    return {
+        'ID': tx_id,
+        'TransactionDate': date(2025, 5, 1),
+        'TransactionDescription': f'tx {tx_id}',
+        'TransactionAmount': Decimal(str(amount)),
+        'Debet': debet,
+        'Credit': credit,
+        'Ref2': f'Card payment_{saldo}_{when}',
+        'Ref3': ref3 if ref3 is not None else str(saldo),
+    }
+
+
+class TestSplitRevolutRef2:
+
+    def test_parses_saldo_and_completion(self):
+        parsed = split_revolut_ref2(pd.Series(['Top-up_150.25_2025-05-01 10:00:00']))
+        assert bool(parsed['has_parts'].iat[0]) is True
+        assert parsed['saldo'].iat[0] == 150.25
+        assert parsed['completion'].iat[0] == '2025-05-01 10:00:00'
+        assert parsed['datetime_str'].iat[0] == '2025-05-01 10:00:00'
+
+    def test_short_or_missing_ref2(self):
+        parsed = split_revolut_ref2(pd.Series(['no-parts', None, 'a_b']))
+        assert not parsed['has_parts'].any()
+        assert parsed['saldo'].isna().all()
+        assert list(parsed['completion']) == ['', '', '']
+
+
+class TestSequenceGaps:
+
+    def test_detects_gap_and_invalid_reference(self):
+        rows = [
+            {'Ref2': '1', 'TransactionDate': date(2026, 1, 1), 'TransactionDescription': 'a', 'TransactionAmount': 1.0},
+            {'Ref2': '2', 'TransactionDate': date(2026, 1, 2), 'TransactionDescription': 'b', 'TransactionAmount': 2.0},
+            {'Ref2': 'X9', 'TransactionDate': date(2026, 1, 3), 'TransactionDescription': 'c', 'TransactionAmount': 3.0},
+            {'Ref2': '5', 'TransactionDate': date(2026, 1, 4), 'TransactionDescription': 'd', 'TransactionAmount': 4.0},
+        ]
+        result = find_sequence_gaps(rows)
+        assert result['first_sequence'] == 1
+        assert result['last_sequence'] == 5
+        assert result['issues'][0]['error'] == 'Invalid sequence number: X9'
+        gap = result['issues'][1]
+        assert (gap['expected'], gap['found'], gap['gap']) == (3, 5, 2)
+        assert isinstance(gap['found'], int)
+
+    def test_is_numeric_sequence(self):
+        assert is_numeric_sequence([{'Ref2': '12'}]) is True
+        assert is_numeric_sequence([{'Ref2': 'Top-up_1.00_2025-01-01'}]) is False
+
+
+class TestSaldoProgression:
+
+    def test_consistent_progression_has_no_issues(self):
+        rows = [
+            _revolut_tx(1, 10, '1022', '4000', '110.00', when='2025-05-01 10:00:00'),
+            _revolut_tx(2, 20, '4000', '1022', '90.00', when='2025-05-01 11:00:00'),
+        ]
+        assert find_saldo_progression_issues(rows) == []
+
+    def test_orders_by_completion_and_reports_mismatch(self):
+        rows = [
+            _revolut_tx(2, 20, '4000', '1022', '80.00', when='2025-05-01 11:00:00'),
+            _revolut_tx(1, 10, '1022', '4000', '110.00', when='2025-05-01 10:00:00'),
+        ]
+        issues = find_saldo_progression_issues(rows)
+        assert len(issues) == 1
+        assert issues[0]['expected'] == 90.0
+        assert issues[0]['found'] == 80.0
+        assert issues[0]['gap'] == -10.0
+
+
+class TestRunningBalance:
+
+    def test_first_ref3_seeds_balance_and_gaps_are_flagged(self):
+        rows = [
+            _revolut_tx(3, 5, '4000', '1022', '105.00', ref3='99.00'),
+            _revolut_tx(1, 10, '1022', '4000', '100.00'),
+            _revolut_tx(2, 10, '1022', '4000', '110.00'),
+        ]
+        frame = compute_running_balance(rows, '1022')
+        assert list(frame['id']) == [1, 2, 3]
+        assert list(frame['calculated_balance']) == [100.0, 110.0, 105.0]
+        assert frame.attrs['starting_balance_info']['first_ref3'] == 100.0
+        assert frame.attrs['final_balance'] == pytest.approx(105.0)
+
+        gaps = balance_gaps(frame[frame['has_gap']])
+        assert gaps == [{
+            'transaction_id': 3,
+            'transaction_date': '2025-05-01',
+            'ref2_datetime': '2025-05-01 10:00:00',
+            'description': 'tx 3',
+            'calculated_balance': 105.0,
+            'ref3_balance': 99.0,
+            'discrepancy': -6.0,
+            'ref2': 'Card payment_105.00_2025-05-01 10:00:00',
+        }]
+
+    def test_missing_ref3_yields_none_discrepancy(self):
+        rows = [
+            _revolut_tx(1, 10, '1022', '4000', '100.00'),
+            _revolut_tx(2, 10, '9999', '4000', '100.00', ref3=''),
+        ]
+        details = transaction_details(compute_running_balance(rows, '1022'))
+        assert details[1]['direction'] == 'SKIP'
+        assert details[1]['ref3_balance'] is None
+        assert details[1]['discrepancy'] is None
+
+
+class TestPageBounds:
+
+    def test_pages_and_clamps(self):
+        assert page_bounds(25, page=2, page_size=10) == (
+            10, 20, {'page': 2, 'page_size': 10, 'total': 25, 'total_pages': 3}
+        )
+        start, stop, meta = page_bounds(25, page=5, page_size=10)
+        assert start == stop
+        assert meta['page'] == 5
+
+    def test_no_page_size_returns_everything(self):
+        start, stop, meta = page_bounds(7, page=3, page_size=None)
+        assert (start, stop, meta['page'], meta['total_pages']) == (0, 7, 1, 1)
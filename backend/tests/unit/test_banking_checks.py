@@ -6,9 +6,10 @@ Tests cover:
 - BankingChecks.check_sequence_numbers (basic paths)
 """
 
-import pytest
-from unittest.mock import MagicMock, patch
 from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from banking_checks import BankingChecks, _get_opening_balance_date
 
@@ -167,3 +168,46 @@ class TestCheckSequenceNumbers:
         )
         assert result['success'] is True
         assert result.get('gaps', []) == []
+
+
+# ---------------------------------------------------------------------------
+# check_revolut_balance_gaps
+# ---------------------------------------------------------------------------
+
+class TestCheckRevolutBalanceGaps:
+    """Tests for BankingChecks.check_revolut_balance_gaps."""
+
+    @staticmethod
+    def _cursor_rows(mock_db, rows):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_db.get_connection.return_value = mock_conn
+        mock_cursor.fetchall.return_value = rows
+        return mock_conn, mock_cursor
+
+    def test_no_transactions_closes_connection(self, checks, mock_db):
+        mock_conn, mock_cursor = self._cursor_rows(mock_db, [])
+        result = checks.check_revolut_balance_gaps('NL08REVO', '1022')
+        assert result['success'] is False
+        mock_cursor.close.assert_called_once()
+        mock_conn.close.assert_called_once()
+
+    def test_gaps_are_paged(self, checks, mock_db):
+        rows = [
+            {'ID': i, 'TransactionDate': date(2025, 5, 1), 'TransactionDescription': f'tx {i}',
+             'TransactionAmount': 10.0, 'Debet': '1022', 'Credit': '4000',
+             'Ref1': 'NL08REVO', 'Ref2': f'Top-up_{i}_2025-05-01 10:00:00',
+             'Ref3': '0.00', 'Administration': 'TenantA'}
+            for i in range(1, 6)
+        ]
+        self._cursor_rows(mock_db, rows)
+        result = checks.check_revolut_balance_gaps(
+            'NL08REVO', '1022', expected_final_balance=40.0, page=2, page_size=3
+        )
+        assert result['success'] is True
+        assert result['calculated_final_balance'] == 40.0
+        assert result['balance_gaps_found'] == 4
+        assert result['pagination'] == {'page': 2, 'page_size': 3, 'total': 4, 'total_pages': 2}
+        assert [g['transaction_id'] for g in result['balance_gaps']] == [5]
+        assert len(result['first_10_transactions']) == 5
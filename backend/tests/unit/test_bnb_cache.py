@@ -99,7 +99,7 @@ class TestGetData:
         cache.data = pd.DataFrame({'col': [1]})
         cache.last_refresh = datetime.now() - timedelta(minutes=31)
 
-        # Mock the DB cursor to return a DataFrame via pd.read_sql
+        # Mock the DB cursor to return a DataFrame via read_frame
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_db.get_cursor.return_value.__enter__ = MagicMock(
@@ -128,7 +128,7 @@ class TestGetData:
             'month': [1],
         })
 
-        with patch('bnb_cache.pd.read_sql', return_value=sample_data):
+        with patch('bnb_cache.read_frame', return_value=sample_data):
             result = cache.get_data(mock_db)
 
         assert cache.last_refresh is not None
@@ -166,7 +166,7 @@ class TestGetData:
             'month': [6],
         })
 
-        with patch('bnb_cache.pd.read_sql', return_value=sample_data):
+        with patch('bnb_cache.read_frame', return_value=sample_data):
             result = cache.get_data(mock_db)
 
         assert cache.data is not None
@@ -208,7 +208,7 @@ class TestRefresh:
             'month': [1, 2],
         })
 
-        with patch('bnb_cache.pd.read_sql', return_value=sample_data):
+        with patch('bnb_cache.read_frame', return_value=sample_data):
             cache.refresh(mock_db)
 
         assert cache.data is not None
@@ -247,7 +247,7 @@ class TestRefresh:
             'month': [3],
         })
 
-        with patch('bnb_cache.pd.read_sql', return_value=sample_data):
+        with patch('bnb_cache.read_frame', return_value=sample_data):
             cache.refresh(mock_db)
 
         assert pd.api.types.is_datetime64_any_dtype(cache.data['checkinDate'])
@@ -285,7 +285,7 @@ class TestRefresh:
             'month': [1],
         })
 
-        with patch('bnb_cache.pd.read_sql', return_value=sample_data):
+        with patch('bnb_cache.read_frame', return_value=sample_data):
             cache.refresh(mock_db)
 
         # NaN/invalid values should be filled with 0
@@ -326,7 +326,7 @@ class TestRefresh:
             'month': [1],
         })
 
-        with patch('bnb_cache.pd.read_sql', return_value=sample_data):
+        with patch('bnb_cache.read_frame', return_value=sample_data):
             cache.refresh(mock_db)
 
         assert cache.data['channel'].iloc[0] == ''
@@ -347,7 +347,7 @@ class TestRefresh:
         )
         mock_db.get_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
-        with patch('bnb_cache.pd.read_sql', side_effect=Exception("DB connection failed")):
+        with patch('bnb_cache.read_frame', side_effect=Exception("DB connection failed")):
             with pytest.raises(Exception, match="DB connection failed"):
                 cache.refresh(mock_db)
 
@@ -633,7 +633,7 @@ class TestCacheExpiredThenRefresh:
         )
         mock_db.get_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
-        with patch('bnb_cache.pd.read_sql', return_value=fresh_data):
+        with patch('bnb_cache.read_frame', return_value=fresh_data):
             result = cache.get_data(mock_db)
 
         # Should have fresh data, not stale
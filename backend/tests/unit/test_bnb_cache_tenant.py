@@ -97,7 +97,7 @@ class TestPerTenantIsolation:
         )
         mock_db.get_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
-        with patch("bnb_cache.pd.read_sql", return_value=fresh_data):
+        with patch("bnb_cache.read_frame", return_value=fresh_data):
             result = cache.get_data(mock_db, tenant="NewTenant")
 
         assert len(result) == 2
@@ -449,7 +449,7 @@ class TestRefreshWithTenant:
         )
         mock_db.get_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
-        with patch("bnb_cache.pd.read_sql", return_value=data):
+        with patch("bnb_cache.read_frame", return_value=data):
             cache.refresh(mock_db, tenant="TenantX")
 
         assert "TenantX" in cache._tenant_data
@@ -472,7 +472,7 @@ class TestRefreshWithTenant:
         )
         mock_db.get_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
-        with patch("bnb_cache.pd.read_sql", return_value=combined):
+        with patch("bnb_cache.read_frame", return_value=combined):
             cache.refresh(mock_db)
 
         assert "T1" in cache._tenant_data
@@ -522,7 +522,7 @@ class TestTTLAndAccess:
         )
         mock_db.get_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
-        with patch("bnb_cache.pd.read_sql", return_value=fresh_data):
+        with patch("bnb_cache.read_frame", return_value=fresh_data):
             result = cache.get_data(mock_db, tenant="T1")
 
         assert len(result) == 5
@@ -218,6 +218,8 @@ class TestGetBalanceData:
         # Create sample dataframe
         df = pd.DataFrame({
             'TransactionDate': ['2025-01-15', '2025-02-20', '2025-04-10'],
+            'jaar': [2025, 2025, 2025],
+            'kwartaal': [1, 1, 2],
             'administration': ['GoodwinSolutions', 'GoodwinSolutions', 'GoodwinSolutions'],
             'Reknum': ['2010', '2020', '2010'],
             'AccountName': ['BTW te betalen', 'BTW ontvangen', 'BTW te betalen'],
@@ -273,12 +275,14 @@ class TestGetQuarterData:
         mock_db = Mock()
         
         df = pd.DataFrame({
+            'TransactionDate': ['2025-01-15', '2025-02-20', '2025-04-10', '2024-01-15'],
             'jaar': [2025, 2025, 2025, 2024],
             'kwartaal': [1, 1, 2, 1],
             'administration': ['GoodwinSolutions', 'GoodwinSolutions', 'GoodwinSolutions', 'GoodwinSolutions'],
             'Reknum': ['2010', '2020', '2010', '2010'],
             'AccountName': ['BTW te betalen', 'BTW ontvangen', 'BTW te betalen', 'BTW te betalen'],
-            'Amount': [1000.0, 500.0, 200.0, 300.0]
+            'Amount': [1000.0, 500.0, 200.0, 300.0],
+            'ReferenceNumber': ['INV-001', 'INV-002', 'INV-003', 'INV-004']
         })
         
         mock_cache.get_data.return_value = df
@@ -312,7 +316,8 @@ class TestGenerateBTWReport:
             'administration': ['GoodwinSolutions', 'GoodwinSolutions'],
             'Reknum': ['2010', '2020'],
             'AccountName': ['BTW te betalen', 'BTW ontvangen'],
-            'Amount': [1000.0, 500.0]
+            'Amount': [1000.0, 500.0],
+            'ReferenceNumber': ['INV-001', 'INV-002']
         })
         
         mock_cache.get_data.return_value = df
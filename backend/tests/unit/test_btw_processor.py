@@ -13,6 +13,7 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime
 
 from btw_processor import BTWProcessor
+from db_exceptions import DatabaseError
 
 
 class TestGetVatAccounts:
@@ -380,6 +381,8 @@ class TestGetQuarterData:
         mock_get_cache.return_value = mock_cache
 
         data = pd.DataFrame({
+            'ReferenceNumber': ['INV001', 'INV002', 'INV003', 'INV004'],
+            'TransactionDate': ['2024-02-15', '2024-02-15', '2024-02-15', '2024-02-15'],
             'jaar': [2024, 2024, 2024, 2024],
             'kwartaal': [1, 1, 2, 1],
             'administration': ['TestAdmin', 'TestAdmin', 'TestAdmin', 'TestAdmin'],
@@ -407,6 +410,8 @@ class TestGetQuarterData:
         mock_get_cache.return_value = mock_cache
 
         data = pd.DataFrame({
+            'ReferenceNumber': ['INV001', 'INV002', 'INV003'],
+            'TransactionDate': ['2024-02-15', '2024-02-15', '2024-02-15'],
             'jaar': [2024, 2024, 2024],
             'kwartaal': [1, 1, 1],
             'administration': ['TestAdmin', 'TestAdmin', 'TestAdmin'],
@@ -429,6 +434,8 @@ class TestGetQuarterData:
         mock_get_cache.return_value = mock_cache
 
         data = pd.DataFrame({
+            'ReferenceNumber': ['INV001', 'INV002', 'INV003'],
+            'TransactionDate': ['2024-02-15', '2024-02-15', '2024-02-15'],
             'jaar': [2024, 2024, 2024],
             'kwartaal': [1, 1, 1],
             'administration': ['TestAdmin', 'TestAdmin', 'TestAdmin'],
@@ -463,6 +470,8 @@ class TestGetQuarterData:
         mock_get_cache.return_value = mock_cache
 
         data = pd.DataFrame({
+            'ReferenceNumber': ['INV001', 'INV002'],
+            'TransactionDate': ['2024-02-15', '2024-02-15'],
             'jaar': [2024, 2024],
             'kwartaal': [1, 1],
             'administration': ['TestAdmin', 'OtherAdmin'],
@@ -571,7 +580,7 @@ class TestGenerateBtwReport:
         """Test that cache errors in sub-methods produce report with empty data."""
         mock_cache = MagicMock()
         mock_get_cache.return_value = mock_cache
-        mock_cache.get_data.side_effect = Exception("Database unavailable")
+        mock_cache.get_data.side_effect = DatabaseError("Database unavailable")
 
         with patch.object(processor, '_get_last_btw_transaction', return_value=None):
             result = processor.generate_btw_report('TestAdmin', 2024, 1)
@@ -582,8 +591,17 @@ class TestGenerateBtwReport:
         assert result['calculations']['total_balance'] == 0.0
         assert result['calculations']['received_btw'] == 0.0
 
-    def test_generate_btw_report_unhandled_error_returns_failure(self, processor):
+    @patch('btw_processor.get_cache')
+    def test_generate_btw_report_unhandled_error_returns_failure(self, mock_get_cache, processor):
         """Test that unhandled exceptions in generate_btw_report return failure."""
+        mock_cache = MagicMock()
+        mock_get_cache.return_value = mock_cache
+        mock_cache.get_data.return_value = pd.DataFrame({
+            'ReferenceNumber': [], 'TransactionDate': [],
+            'administration': [], 'Reknum': [], 'AccountName': [],
+            'Amount': [], 'jaar': [], 'kwartaal': [],
+        })
+
         # Patch _get_balance_data to raise outside its own try/except
         with patch.object(processor, '_get_balance_data', side_effect=TypeError("unexpected")):
             result = processor.generate_btw_report('TestAdmin', 2024, 1)
@@ -875,14 +893,15 @@ class TestUploadReportToDrive:
         """Test that production mode uploads to Google Drive."""
         mock_drive = MagicMock()
         mock_drive_class.return_value = mock_drive
-        mock_drive.list_subfolders.return_value = [
-            {'name': 'btw', 'id': 'btw_folder_123'}
-        ]
+        mock_drive.find_subfolder.return_value = {'name': 'BTW', 'id': 'btw_folder_123'}
         mock_drive.upload_file.return_value = {'url': 'https://drive.google.com/file/123'}
 
         html_content = '<html><body>Report</body></html>'
         result = prod_processor.upload_report_to_drive(html_content, 'report.html', 'TestAdmin')
 
+        mock_drive.find_subfolder.assert_called_once_with('btw', ignore_case=True)
+        mock_drive.list_subfolders.assert_not_called()
+        assert mock_drive.upload_file.call_args[0][2] == 'btw_folder_123'
         assert result['success'] is True
         assert result['location'] == 'google_drive'
         assert 'drive.google.com' in result['url']
@@ -892,9 +911,7 @@ class TestUploadReportToDrive:
         """Test error when BTW folder not found in Google Drive."""
         mock_drive = MagicMock()
         mock_drive_class.return_value = mock_drive
-        mock_drive.list_subfolders.return_value = [
-            {'name': 'invoices', 'id': 'inv_folder_123'}
-        ]
+        mock_drive.find_subfolder.return_value = None
 
         html_content = '<html><body>Report</body></html>'
         result = prod_processor.upload_report_to_drive(html_content, 'report.html', 'TestAdmin')
@@ -0,0 +1,156 @@
+"""Unit tests for the budget dashboard monthly matrices.
+
+Tests cover:
+- Period slicing and rollup per parent, subparent and account
+- Reuse of the actuals matrix while the ledger cache serves the same frame
+- Rebuild after a ledger refresh and after invalidate_actuals_matrix
+"""
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+
+from db_exceptions import DatabaseError
+
+from services import budget_actuals_matrix
+from services.budget_actuals_matrix import (
+    get_actuals_matrix,
+    get_budget_matrix,
+    invalidate_actuals_matrix,
+)
+
+
+CHART = [
+    {'Account': '4000', 'AccountName': 'Omzet', 'Parent': '4', 'SubParent': '40'},
+    {'Account': '4010', 'AccountName': 'Omzet BNB', 'Parent': '4', 'SubParent': '41'},
+    {'Account': '7000', 'AccountName': 'Diversen', 'Parent': None, 'SubParent': None},
+]
+
+
+def _ledger(rows):
+    return pd.DataFrame({
+        'administration': ['tenant_a'] * len(rows),
+        'jaar': [2025] * len(rows),
+        'maand': [r[1] for r in rows],
+        'Reknum': pd.Categorical([r[0] for r in rows]),
+        'Amount': [r[2] for r in rows],
+        'ReferenceNumber': ['INV'] * len(rows),
+    })
+
+
+@pytest.fixture(autouse=True)
+def clear_matrices():
+    invalidate_actuals_matrix()
+    yield
+    invalidate_actuals_matrix()
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    db.execute_query.side_effect = (
+        lambda query, params=None: CHART if 'rekeningschema' in query else []
+    )
+    return db
+
+
+@pytest.fixture
+def mock_cache():
+    cache = MagicMock()
+    cache.get_data.return_value = _ledger([
+        ('4000', 1, 100.0),
+        ('4000', 4, 40.0),
+        ('4010', 2, 25.5),
+        ('7000', 3, 10.0),
+        ('9999', 1, 1000.0),  # not in the chart of accounts
+    ])
+    return cache
+
+
+class TestRollup:
+    """Tests for MonthlyMatrix.rollup period slicing."""
+
+    def test_parent_level_quarter(self, mock_db, mock_cache):
+        _chart, actuals = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+
+        assert actuals.rollup('parent', [1, 2, 3]) == {'4': 125.5, 'Unassigned': 10.0}
+
+    def test_subparent_level_within_parent(self, mock_db, mock_cache):
+        _chart, actuals = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+
+        assert actuals.rollup('subparent', list(range(1, 13)), parent_code='4') == {
+            '40': 140.0,
+            '41': 25.5,
+        }
+
+    def test_account_level_only_accounts_booked_in_period(self, mock_db, mock_cache):
+        _chart, actuals = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+
+        assert actuals.rollup('account', [4], subparent_code='40') == {'4000': 40.0}
+        assert actuals.rollup('account', [5], subparent_code='40') == {}
+
+    def test_budget_lines_count_in_every_period(self, mock_db):
+        chart = budget_actuals_matrix.load_chart(mock_db, 'tenant_a')
+        mock_db.execute_query.side_effect = lambda query, params=None: [
+            {'account_code': '4000', **{f'month_{i:02d}': 10 for i in range(1, 13)}},
+            {'account_code': '4000', **{f'month_{i:02d}': 0 for i in range(1, 13)}},
+        ]
+
+        budget = get_budget_matrix(mock_db, 'tenant_a', 1, chart)
+
+        assert budget.rollup('parent', [1, 2]) == {'4': 20.0}
+        assert budget.rollup('account', [12], subparent_code='40') == {'4000': 10.0}
+
+
+class TestActualsCache:
+    """Tests for reuse and invalidation of cached actuals matrices."""
+
+    def test_reused_while_ledger_frame_is_unchanged(self, mock_db, mock_cache):
+        first = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+        second = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+
+        assert second[1] is first[1]
+        chart_queries = [
+            c for c in mock_db.execute_query.call_args_list if 'rekeningschema' in c[0][0]
+        ]
+        assert len(chart_queries) == 1
+
+    def test_rebuilt_after_ledger_refresh(self, mock_db, mock_cache):
+        _chart, first = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+        mock_cache.get_data.return_value = _ledger([('4000', 1, 1.0)])
+
+        _chart, second = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+
+        assert second is not first
+        assert second.rollup('parent', [1]) == {'4': 1.0}
+
+    def test_rebuilt_after_invalidate(self, mock_db, mock_cache):
+        _chart, first = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+
+        invalidate_actuals_matrix('tenant_a')
+        _chart, second = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+
+        assert second is not first
+
+    def test_reference_number_matrix_is_not_cached(self, mock_db, mock_cache):
+        _chart, full = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+        _chart, filtered = get_actuals_matrix(
+            mock_db, 'tenant_a', 2025, reference_number='OTHER', cache=mock_cache
+        )
+
+        assert filtered.rollup('parent', list(range(1, 13))) == {}
+        assert get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)[1] is full
+
+    def test_cache_error_falls_back_to_grouped_query(self, mock_db, mock_cache):
+        mock_cache.get_data.side_effect = DatabaseError('load failed')
+        mock_db.execute_query.side_effect = lambda query, params=None: (
+            CHART if 'rekeningschema' in query
+            else [{'Reknum': '4010', 'maand': 6, 'Amount': 12}]
+        )
+
+        _chart, actuals = get_actuals_matrix(mock_db, 'tenant_a', 2025, cache=mock_cache)
+
+        assert actuals.rollup('parent', [6]) == {'4': 12.0}
+        query, params = mock_db.execute_query.call_args[0]
+        assert 'GROUP BY Reknum, maand' in query
+        assert params == ('tenant_a', 2025)
@@ -664,7 +664,7 @@ class TestBudgetCopyPreservesLineData:
                     return source_lines
                 elif 'SELECT' in query and 'rekeningschema' in query:
                     # All accounts exist
-                    return [{'Account': params[1]}]
+                    return [{'Account': code} for code in params[1:]]
                 return None
 
             mock_db.execute_query.side_effect = mock_execute
@@ -674,11 +674,13 @@ class TestBudgetCopyPreservesLineData:
                 cursor = MagicMock()
                 cursor.lastrowid = 99
 
-                def capture_execute(query, params):
+                cursor.rowcount = 0
+
+                def capture_executemany(query, rows):
                     if 'INSERT INTO budget_lines' in query:
-                        inserted_lines.append(params)
+                        inserted_lines.extend(rows)
 
-                cursor.execute = capture_execute
+                cursor.executemany = capture_executemany
                 conn = MagicMock()
                 yield cursor, conn
 
@@ -750,7 +752,7 @@ class TestBudgetCopyPreservesLineData:
                 elif 'SELECT' in query and 'budget_lines' in query:
                     return source_lines
                 elif 'SELECT' in query and 'rekeningschema' in query:
-                    return [{'Account': params[1]}]
+                    return [{'Account': code} for code in params[1:]]
                 return None
 
             mock_db.execute_query.side_effect = mock_execute
@@ -760,11 +762,13 @@ class TestBudgetCopyPreservesLineData:
                 cursor = MagicMock()
                 cursor.lastrowid = 99
 
-                def capture_execute(query, params):
+                cursor.rowcount = 0
+
+                def capture_executemany(query, rows):
                     if 'INSERT INTO budget_lines' in query:
-                        inserted_lines.append(params)
+                        inserted_lines.extend(rows)
 
-                cursor.execute = capture_execute
+                cursor.executemany = capture_executemany
                 conn = MagicMock()
                 yield cursor, conn
 
@@ -323,6 +323,23 @@ class TestBudgetLineCreate:
         assert 'annual_amount is required' in resp.get_json()['error']
 
 
+class TestBudgetLineBulkUpsert:
+
+    def test_bulk_upsert_success(self, client, mock_budget_service):
+        """POST /api/budget/versions/<id>/lines/bulk passes all lines to the service."""
+        mock_budget_service.bulk_upsert_lines.return_value = {'success': True, 'data': {}}
+        lines = [{'account_code': '8000', 'period_mode': 'Annual', 'annual_amount': 1200}]
+        resp = client.post('/api/budget/versions/1/lines/bulk', json={'lines': lines})
+        assert resp.status_code == 200
+        mock_budget_service.bulk_upsert_lines.assert_called_once_with('TestTenant', 1, lines)
+
+    def test_bulk_upsert_requires_lines(self, client):
+        """POST /api/budget/versions/<id>/lines/bulk without lines returns 400."""
+        resp = client.post('/api/budget/versions/1/lines/bulk', json={'lines': []})
+        assert resp.status_code == 400
+        assert 'lines must be a non-empty list' in resp.get_json()['error']
+
+
 class TestBudgetLineUpdate:
 
     def test_update_line_success(self, client, mock_budget_service):
@@ -8,8 +8,11 @@ Requirements: 2.3, 3.2, 3.5
 """
 
 import pytest
+import pandas as pd
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+from db_exceptions import DatabaseError
 
 # Mock DatabaseManager before importing BudgetService
 with patch('database.DatabaseManager'):
@@ -879,6 +882,147 @@ class TestDeleteLine:
         assert 'tenant_x' in delete_call[0][1]
 
 
+# -------------------------------------------------------------------------
+# Bulk Line Upsert Tests
+# -------------------------------------------------------------------------
+
+
+class TestBulkUpsertLines:
+    """Tests for BudgetService.bulk_upsert_lines()."""
+
+    def setup_method(self):
+        """Create a BudgetService with a mocked database."""
+        from contextlib import contextmanager
+        from unittest.mock import MagicMock
+
+        with patch('database.DatabaseManager') as MockDB:
+            self.mock_db = MockDB.return_value
+            self.service = BudgetService(test_mode=True)
+            self.service.db = self.mock_db
+
+        self.mock_cursor = MagicMock()
+        self.mock_cursor.rowcount = 0
+
+        @contextmanager
+        def transaction():
+            yield self.mock_cursor, MagicMock()
+
+        self.mock_db.transaction = transaction
+
+    def _route_queries(self, accounts, existing=None):
+        def execute(query, params=None, **kwargs):
+            if 'budget_versions' in query:
+                return [{'id': 5}]
+            if 'rekeningschema' in query:
+                return [{'Account': a} for a in accounts if a in params]
+            if 'budget_lines' in query:
+                return existing or []
+            return None
+
+        self.mock_db.execute_query.side_effect = execute
+
+    def test_creates_and_updates_in_one_executemany(self):
+        """New lines pass a NULL id, lines already in the version keep theirs."""
+        self._route_queries(
+            ['4000', '4100'],
+            existing=[{'id': 12, 'account_code': '4100',
+                       'detail_dimension_type': None, 'detail_dimension_value': None}],
+        )
+
+        result = self.service.bulk_upsert_lines('tenant_a', 5, [
+            {'account_code': '4000', 'period_mode': 'Monthly', 'amounts': [100] * 12},
+            {'account_code': '4100', 'period_mode': 'Annual', 'annual_amount': 1200,
+             'notes': 'rent'},
+        ])
+
+        assert result['success'] is True
+        assert result['data']['created'] == 1
+        assert result['data']['updated'] == 1
+        assert [r['status'] for r in result['data']['results']] == ['created', 'updated']
+        assert result['data']['results'][1]['total'] == 1200.0
+
+        self.mock_cursor.executemany.assert_called_once()
+        query, rows = self.mock_cursor.executemany.call_args[0]
+        assert 'ON DUPLICATE KEY UPDATE' in query
+        assert rows[0][0] is None
+        assert rows[1][0] == 12
+        assert rows[1][7] == 'rent'
+        assert rows[1][8:] == tuple([Decimal('100.00')] * 12)
+
+    def test_validates_accounts_with_one_query(self):
+        """Unknown accounts are reported per line from a single prefetch."""
+        self._route_queries(['4000'])
+
+        result = self.service.bulk_upsert_lines('tenant_a', 5, [
+            {'account_code': '4000', 'period_mode': 'Monthly', 'amounts': [1] * 12},
+            {'account_code': '9999', 'period_mode': 'Monthly', 'amounts': [1] * 12},
+            {'account_code': '4000', 'period_mode': 'Monthly', 'amounts': [1] * 3},
+        ])
+
+        results = result['data']['results']
+        assert results[0]['status'] == 'created'
+        assert results[1]['error'] == 'Account 9999 not found in chart of accounts'
+        assert results[2]['error'] == 'Monthly mode requires exactly 12 amounts'
+        assert result['data']['failed'] == 2
+
+        account_queries = [
+            c for c in self.mock_db.execute_query.call_args_list if 'rekeningschema' in c[0][0]
+        ]
+        assert len(account_queries) == 1
+        assert account_queries[0][0][1] == ('tenant_a', '4000', '9999')
+        assert len(self.mock_cursor.executemany.call_args[0][1]) == 1
+
+    def test_duplicate_line_in_request_is_rejected(self):
+        """The same account and dimension twice in one request is reported once as an error."""
+        self._route_queries(['4000'])
+        line = {'account_code': '4000', 'period_mode': 'Annual', 'annual_amount': 12,
+                'detail_dimension_type': 'platform', 'detail_dimension_value': 'Airbnb'}
+
+        result = self.service.bulk_upsert_lines('tenant_a', 5, [line, dict(line)])
+
+        assert result['data']['results'][1]['error'] == (
+            'Duplicate line for account 4000 with dimension platform=Airbnb'
+        )
+        assert len(self.mock_cursor.executemany.call_args[0][1]) == 1
+
+    def test_malformed_lines_are_reported_per_line(self):
+        """Non-numeric amounts and non-string codes fail their own line, not the request."""
+        self._route_queries(['4000'])
+
+        result = self.service.bulk_upsert_lines('tenant_a', 5, [
+            {'account_code': '4000', 'period_mode': 'Annual', 'annual_amount': 'abc'},
+            {'account_code': ['4000'], 'period_mode': 'Annual', 'annual_amount': 12},
+            {'account_code': '4000', 'period_mode': 'Annual', 'annual_amount': 12,
+             'detail_dimension_type': 'platform', 'detail_dimension_value': ['Airbnb']},
+            {'account_code': '4000', 'period_mode': 'Annual', 'annual_amount': 12},
+        ])
+
+        results = result['data']['results']
+        assert results[0]['error'] == 'Amounts must be numeric'
+        assert results[1]['error'] == 'account_code must be a string'
+        assert results[2]['error'] == (
+            'detail_dimension_type and detail_dimension_value must be strings'
+        )
+        assert results[3]['status'] == 'created'
+        assert result['data']['failed'] == 3
+
+        account_query = next(
+            c for c in self.mock_db.execute_query.call_args_list if 'rekeningschema' in c[0][0]
+        )
+        assert account_query[0][1] == ('tenant_a', '4000')
+
+    def test_version_not_found(self):
+        """Returns error without writing when the version belongs to another tenant."""
+        self.mock_db.execute_query.return_value = []
+
+        result = self.service.bulk_upsert_lines('tenant_a', 5, [
+            {'account_code': '4000', 'period_mode': 'Annual', 'annual_amount': 12},
+        ])
+
+        assert result == {'success': False, 'error': 'Budget version not found'}
+        self.mock_cursor.executemany.assert_not_called()
+
+
 # -------------------------------------------------------------------------
 # Budget Copy Tests (Task 6.2)
 # -------------------------------------------------------------------------
@@ -901,6 +1045,7 @@ class TestCopyBudget:
 
         mock_cursor = MagicMock()
         mock_cursor.lastrowid = 99
+        mock_cursor.rowcount = 0
         mock_conn = MagicMock()
 
         @contextmanager
@@ -914,8 +1059,7 @@ class TestCopyBudget:
         """Copies all lines from source to new Draft version for target year."""
         # 1. Fetch source version
         # 2. Fetch source lines
-        # 3. Account validation for line 1
-        # 4. Account validation for line 2
+        # 3. One account validation query for all lines
         self.mock_db.execute_query.side_effect = [
             [{'id': 1, 'name': 'Budget 2024', 'fiscal_year': 2024, 'status': 'Approved'}],
             [
@@ -936,8 +1080,7 @@ class TestCopyBudget:
                  'month_09': Decimal('500.00'), 'month_10': Decimal('500.00'),
                  'month_11': Decimal('500.00'), 'month_12': Decimal('500.00')},
             ],
-            [{'Account': '4000'}],  # account 4000 exists
-            [{'Account': '4100'}],  # account 4100 exists
+            [{'Account': '4000'}, {'Account': '4100'}],  # both accounts exist
         ]
 
         mock_cursor = self._mock_transaction()
@@ -949,6 +1092,12 @@ class TestCopyBudget:
         assert result['data']['lines_copied'] == 2
         assert result['data']['excluded_accounts'] == []
 
+        account_query, account_params = self.mock_db.execute_query.call_args_list[2][0]
+        assert 'Account IN (%s, %s)' in account_query
+        assert account_params == ('tenant_a', '4000', '4100')
+        mock_cursor.executemany.assert_called_once()
+        assert len(mock_cursor.executemany.call_args[0][1]) == 2
+
     def test_source_version_not_found(self):
         """Returns error when source version doesn't exist or belongs to another tenant."""
         self.mock_db.execute_query.return_value = []
@@ -1002,8 +1151,7 @@ class TestCopyBudget:
                  'month_09': Decimal('50.00'), 'month_10': Decimal('50.00'),
                  'month_11': Decimal('50.00'), 'month_12': Decimal('50.00')},
             ],
-            [{'Account': '4000'}],  # account 4000 exists
-            [],                      # account 9999 does NOT exist
+            [{'Account': '4000'}],  # account 9999 does NOT exist
         ]
 
         mock_cursor = self._mock_transaction()
@@ -1036,8 +1184,7 @@ class TestCopyBudget:
                  'month_09': Decimal('30.00'), 'month_10': Decimal('30.00'),
                  'month_11': Decimal('30.00'), 'month_12': Decimal('30.00')},
             ],
-            [],  # account 9999 not found (first line)
-            [],  # account 9999 not found (second line)
+            [],  # account 9999 not found
         ]
 
         mock_cursor = self._mock_transaction()
@@ -1072,9 +1219,8 @@ class TestCopyBudget:
         result = self.service.copy_budget('tenant_a', 1, 2025, 'Copy 2025')
 
         assert result['success'] is True
-        # The second cursor.execute call should be the line INSERT
-        line_insert_call = mock_cursor.execute.call_args_list[1]
-        params = line_insert_call[0][1]
+        # The lines are written with one executemany after the version INSERT
+        params = mock_cursor.executemany.call_args[0][1][0]
         # params: (new_version_id, admin, account_code, period_mode, dim_type, dim_value, m01..m12)
         assert params[2] == '4100'       # account_code
         assert params[3] == 'Annual'     # period_mode preserved
@@ -1105,9 +1251,8 @@ class TestCopyBudget:
         result = self.service.copy_budget('tenant_a', 1, 2025, 'Copy 2025')
 
         assert result['success'] is True
-        # Verify the INSERT line call has all 12 months preserved
-        line_insert_call = mock_cursor.execute.call_args_list[1]
-        params = line_insert_call[0][1]
+        # Verify the INSERT line row has all 12 months preserved
+        params = mock_cursor.executemany.call_args[0][1][0]
         # Months are params[6] through params[17]
         for i in range(12):
             assert params[6 + i] == monthly[i]
@@ -1515,12 +1660,58 @@ class TestParsePeriod:
 class TestGetDashboard:
     """Tests for BudgetService.get_dashboard() — Requirements 6.1–6.9."""
 
+    CHART = [
+        {'Account': '4000', 'AccountName': 'Omzet', 'Parent': '4000', 'SubParent': '40'},
+        {'Account': '5000', 'AccountName': 'Kosten', 'Parent': '5000', 'SubParent': '50'},
+        {'Account': '6000', 'AccountName': 'Diversen', 'Parent': '6000', 'SubParent': '60'},
+    ]
+
     def setup_method(self):
-        """Create a BudgetService with a mocked database."""
+        """Create a BudgetService with a mocked database and ledger cache."""
         with patch('database.DatabaseManager') as MockDB:
             self.mock_db = MockDB.return_value
             self.service = BudgetService(test_mode=True)
             self.service.db = self.mock_db
+        self.mock_cache = MagicMock()
+        self.mock_cache.get_data.return_value = self._ledger([])
+        self.cache_patcher = patch(
+            'services.budget_actuals_matrix.get_cache', return_value=self.mock_cache
+        )
+        self.cache_patcher.start()
+
+    def teardown_method(self):
+        self.cache_patcher.stop()
+
+    @staticmethod
+    def _ledger(rows):
+        """vw_mutaties frame from (Reknum, maand, Amount[, ReferenceNumber]) tuples."""
+        return pd.DataFrame({
+            'administration': ['tenant_a'] * len(rows),
+            'jaar': [2025] * len(rows),
+            'maand': [r[1] for r in rows],
+            'Reknum': [r[0] for r in rows],
+            'Amount': [r[2] for r in rows],
+            'ReferenceNumber': [r[3] if len(r) > 3 else 'INV' for r in rows],
+        })
+
+    @staticmethod
+    def _budget_line(account, **months):
+        line = {f'month_{i:02d}': Decimal('0.00') for i in range(1, 13)}
+        line.update(months)
+        line['account_code'] = account
+        return line
+
+    def _mock_queries(self, version, budget_lines):
+        """Route execute_query by table: version lookup, chart, budget lines."""
+        def execute_query(query, params=None, *args, **kwargs):
+            if 'budget_versions' in query:
+                return version
+            if 'rekeningschema' in query:
+                return self.CHART
+            if 'budget_lines' in query:
+                return budget_lines
+            return []
+        self.mock_db.execute_query.side_effect = execute_query
 
     def test_no_active_version_returns_notification(self):
         """When no active version exists, returns empty rows with notification."""
@@ -1535,30 +1726,19 @@ class TestGetDashboard:
 
     def test_returns_budget_actual_variance(self):
         """Dashboard merges budget and actuals with variance = actual - budget."""
-        # Mock: active version found
-        # Mock: get_rollup budget data (called internally via get_rollup)
-        # Mock: actuals query
-        # Mock: name resolution
-
-        # Setup budget rollup response data
-        budget_row = {f'm{i:02d}': Decimal('0.00') for i in range(1, 13)}
-        budget_row['m01'] = Decimal('1000.00')
-        budget_row['m02'] = Decimal('1500.00')
-        budget_row['m03'] = Decimal('2000.00')
-        budget_row['code'] = '4000'
-
-        self.mock_db.execute_query.side_effect = [
-            # 1. Find active version
+        self._mock_queries(
             [{'id': 3, 'name': 'Budget 2025 Approved'}],
-            # 2. get_rollup query (budget lines joined to rekeningschema)
-            [budget_row],
-            # 3. get_rollup name resolution
-            [{'Account': '4000', 'AccountName': 'Omzet'}],
-            # 4. actuals query from vw_mutaties
-            [{'code': '4000', 'actual': Decimal('4200.50')}],
-            # 5. _resolve_names
-            [{'Account': '4000', 'AccountName': 'Omzet'}],
-        ]
+            [self._budget_line(
+                '4000',
+                month_01=Decimal('1000.00'),
+                month_02=Decimal('1500.00'),
+                month_03=Decimal('2000.00'),
+                month_04=Decimal('9999.00'),
+            )],
+        )
+        self.mock_cache.get_data.return_value = self._ledger(
+            [('4000', 1, 4000.0), ('4000', 3, 200.50), ('4000', 4, 777.0)]
+        )
 
         result = self.service.get_dashboard('tenant_a', 'parent', 'q1', year=2025)
 
@@ -1587,17 +1767,11 @@ class TestGetDashboard:
 
     def test_variance_positive_means_over_budget(self):
         """Positive variance means actual > budget (over-budget)."""
-        budget_row = {f'm{i:02d}': Decimal('0.00') for i in range(1, 13)}
-        budget_row['m01'] = Decimal('100.00')
-        budget_row['code'] = '5000'
-
-        self.mock_db.execute_query.side_effect = [
-            [{'id': 1, 'name': 'V1'}],  # active version
-            [budget_row],  # rollup
-            [{'Account': '5000', 'AccountName': 'Kosten'}],  # name resolution in rollup
-            [{'code': '5000', 'actual': Decimal('150.00')}],  # actuals
-            [{'Account': '5000', 'AccountName': 'Kosten'}],  # name resolution
-        ]
+        self._mock_queries(
+            [{'id': 1, 'name': 'V1'}],
+            [self._budget_line('5000', month_01=Decimal('100.00'))],
+        )
+        self.mock_cache.get_data.return_value = self._ledger([('5000', 1, 150.0)])
 
         result = self.service.get_dashboard('tenant_a', 'parent', 'month-1', year=2025)
 
@@ -1606,17 +1780,11 @@ class TestGetDashboard:
 
     def test_variance_negative_means_under_budget(self):
         """Negative variance means actual < budget (under-budget)."""
-        budget_row = {f'm{i:02d}': Decimal('0.00') for i in range(1, 13)}
-        budget_row['m01'] = Decimal('200.00')
-        budget_row['code'] = '5000'
-
-        self.mock_db.execute_query.side_effect = [
-            [{'id': 1, 'name': 'V1'}],  # active version
-            [budget_row],  # rollup
-            [{'Account': '5000', 'AccountName': 'Kosten'}],  # name resolution in rollup
-            [{'code': '5000', 'actual': Decimal('120.00')}],  # actuals
-            [{'Account': '5000', 'AccountName': 'Kosten'}],  # name resolution
-        ]
+        self._mock_queries(
+            [{'id': 1, 'name': 'V1'}],
+            [self._budget_line('5000', month_01=Decimal('200.00'))],
+        )
+        self.mock_cache.get_data.return_value = self._ledger([('5000', 1, 120.0)])
 
         result = self.service.get_dashboard('tenant_a', 'parent', 'month-1', year=2025)
 
@@ -1625,36 +1793,25 @@ class TestGetDashboard:
 
     def test_code_in_actuals_only_shows_zero_budget(self):
         """Codes only in actuals show budget=0 with variance=actual."""
-        self.mock_db.execute_query.side_effect = [
-            [{'id': 1, 'name': 'V1'}],  # active version
-            [],  # rollup returns no budget rows
-            # (name resolution for rollup skipped because no data)
-            [{'code': '6000', 'actual': Decimal('500.00')}],  # actuals
-            [{'Account': '6000', 'AccountName': 'Diversen'}],  # name resolution
-        ]
+        self._mock_queries([{'id': 1, 'name': 'V1'}], [])
+        self.mock_cache.get_data.return_value = self._ledger([('6000', 7, 500.0)])
 
         result = self.service.get_dashboard('tenant_a', 'parent', 'full', year=2025)
 
         rows = result['data']['rows']
         assert len(rows) == 1
         assert rows[0]['code'] == '6000'
+        assert rows[0]['name'] == 'Diversen'
         assert rows[0]['budget'] == 0.0
         assert rows[0]['actual'] == 500.0
         assert rows[0]['variance'] == 500.0
 
     def test_code_in_budget_only_shows_zero_actual(self):
         """Codes only in budget show actual=0 with negative variance."""
-        budget_row = {f'm{i:02d}': Decimal('0.00') for i in range(1, 13)}
-        budget_row['m01'] = Decimal('300.00')
-        budget_row['code'] = '4000'
-
-        self.mock_db.execute_query.side_effect = [
-            [{'id': 1, 'name': 'V1'}],  # active version
-            [budget_row],  # rollup
-            [{'Account': '4000', 'AccountName': 'Omzet'}],  # name resolution in rollup
-            [],  # actuals empty
-            [{'Account': '4000', 'AccountName': 'Omzet'}],  # name resolution
-        ]
+        self._mock_queries(
+            [{'id': 1, 'name': 'V1'}],
+            [self._budget_line('4000', month_01=Decimal('300.00'))],
+        )
 
         result = self.service.get_dashboard('tenant_a', 'parent', 'month-1', year=2025)
 
@@ -1665,22 +1822,47 @@ class TestGetDashboard:
         assert rows[0]['actual'] == 0.0
         assert rows[0]['variance'] == -300.0
 
+    def test_actuals_outside_period_are_not_listed(self):
+        """Accounts without ledger rows in the period do not appear."""
+        self._mock_queries([{'id': 1, 'name': 'V1'}], [])
+        self.mock_cache.get_data.return_value = self._ledger([('6000', 7, 500.0)])
+
+        result = self.service.get_dashboard('tenant_a', 'parent', 'q1', year=2025)
+
+        assert result['data']['rows'] == []
+
+    def test_drill_down_to_account_level(self):
+        """Account level sums the accounts within the requested subparent."""
+        self._mock_queries(
+            [{'id': 1, 'name': 'V1'}],
+            [
+                self._budget_line('4000', month_02=Decimal('100.00')),
+                self._budget_line('4000', month_02=Decimal('50.00')),
+                self._budget_line('5000', month_02=Decimal('70.00')),
+            ],
+        )
+        self.mock_cache.get_data.return_value = self._ledger(
+            [('4000', 2, 120.0), ('5000', 2, 80.0)]
+        )
+
+        result = self.service.get_dashboard(
+            'tenant_a', 'account', 'month-2', year=2025, subparent_code='40'
+        )
+
+        rows = result['data']['rows']
+        assert [r['code'] for r in rows] == ['4000']
+        assert rows[0]['budget'] == 150.0
+        assert rows[0]['actual'] == 120.0
+
     def test_reference_number_filter_applied(self):
         """When reference_number is provided, both budget and actuals are filtered."""
-        budget_row = {f'm{i:02d}': Decimal('0.00') for i in range(1, 13)}
-        budget_row['m01'] = Decimal('500.00')
-        budget_row['code'] = '4000'
-
-        self.mock_db.execute_query.side_effect = [
-            # active version
+        self._mock_queries(
             [{'id': 1, 'name': 'V1'}],
-            # _get_budget_rollup_filtered query
-            [budget_row],
-            # actuals query (with ReferenceNumber filter)
-            [{'code': '4000', 'actual': Decimal('450.00')}],
-            # _resolve_names
-            [{'Account': '4000', 'AccountName': 'Omzet'}],
-        ]
+            [self._budget_line('4000', month_01=Decimal('500.00'))],
+        )
+        self.mock_cache.get_data.return_value = self._ledger(
+            [('4000', 1, 450.0, 'REF001'), ('4000', 1, 999.0, 'REF002')]
+        )
 
         result = self.service.get_dashboard(
             'tenant_a', 'parent', 'month-1', year=2025, reference_number='REF001'
@@ -1693,24 +1875,42 @@ class TestGetDashboard:
         assert rows[0]['actual'] == 450.0
         assert rows[0]['variance'] == -50.0
 
-        # Verify the actuals query included ReferenceNumber filter
-        actuals_call = self.mock_db.execute_query.call_args_list[2]
-        query = actuals_call[0][0]
-        assert 'ReferenceNumber' in query
+        # Verify the budget lines query filtered on the ReferenceNumber dimension
+        budget_call = next(
+            c for c in self.mock_db.execute_query.call_args_list
+            if 'budget_lines' in c[0][0]
+        )
+        assert 'detail_dimension_value' in budget_call[0][0]
+        assert 'REF001' in budget_call[0][1]
+
+    def test_cache_error_falls_back_to_actuals_query(self):
+        """When the ledger cache fails, actuals come from a grouped vw_mutaties query."""
+        self._mock_queries(
+            [{'id': 1, 'name': 'V1'}],
+            [self._budget_line('4000', month_01=Decimal('100.00'))],
+        )
+        fallback = self.mock_db.execute_query.side_effect
+
+        def execute_query(query, params=None, *args, **kwargs):
+            if 'vw_mutaties' in query:
+                return [{'Reknum': '4000', 'maand': 1, 'Amount': Decimal('90.00')}]
+            return fallback(query, params)
+        self.mock_db.execute_query.side_effect = execute_query
+        self.mock_cache.get_data.side_effect = DatabaseError('Database unavailable')
+
+        result = self.service.get_dashboard('tenant_a', 'parent', 'month-1', year=2025)
+
+        rows = result['data']['rows']
+        assert rows[0]['actual'] == 90.0
+        assert rows[0]['variance'] == -10.0
 
     def test_response_structure_matches_design(self):
         """Response matches the structure defined in design.md."""
-        budget_row = {f'm{i:02d}': Decimal('0.00') for i in range(1, 13)}
-        budget_row['m01'] = Decimal('100.00')
-        budget_row['code'] = '4000'
-
-        self.mock_db.execute_query.side_effect = [
+        self._mock_queries(
             [{'id': 3, 'name': 'Budget 2025 Approved'}],
-            [budget_row],
-            [{'Account': '4000', 'AccountName': 'Omzet'}],
-            [{'code': '4000', 'actual': Decimal('90.00')}],
-            [{'Account': '4000', 'AccountName': 'Omzet'}],
-        ]
+            [self._budget_line('4000', month_01=Decimal('100.00'))],
+        )
+        self.mock_cache.get_data.return_value = self._ledger([('4000', 1, 90.0)])
 
         result = self.service.get_dashboard('tenant_a', 'parent', 'month-1', year=2025)
 
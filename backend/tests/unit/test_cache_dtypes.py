@@ -0,0 +1,106 @@
+"""Unit tests for cache_dtypes.py.
+
+Tests cover:
+- compact_frame dtype normalization for mutaties and BNB frames
+- Sorted categories after concatenation
+- LRU eviction to the memory budget
+- MutatiesCache memory accounting
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from cache_dtypes import (
+    BNB_SCHEMA,
+    MUTATIES_SCHEMA,
+    compact_frame,
+    evict_to_budget,
+)
+from mutaties_cache import MutatiesCache
+from mutaties_cache_models import TenantCacheEntry
+
+
+def _mutaties_frame():
+    return pd.DataFrame({
+        'Reknum': ['4000', '1000', '4000'],
+        'AccountName': ['Kosten', 'Bank', 'Kosten'],
+        'Parent': ['4000', '1000', '4000'],
+        'VW': ['Y', 'N', 'Y'],
+        'administration': ['TenantA'] * 3,
+        'TransactionDescription': ['Huur', 'Huur', 'Rente'],
+        'Amount': [10.0, -5.5, 1.25],
+        'jaar': [2025, 2025, 2024],
+        'maand': [1, 2, 12],
+    })
+
+
+class TestCompactFrame:
+
+    def test_mutaties_layout(self):
+        df = compact_frame(_mutaties_frame(), MUTATIES_SCHEMA)
+        assert isinstance(df['Reknum'].dtype, pd.CategoricalDtype)
+        assert list(df['Reknum'].cat.categories) == ['1000', '4000']
+        assert df['jaar'].dtype == np.int16
+        assert df['maand'].dtype == np.int8
+        assert df['Amount'].dtype == np.float64
+        assert df['TransactionDescription'].dtype == object
+        assert df['TransactionDescription'].iat[0] is df['TransactionDescription'].iat[1]
+
+    def test_nullable_period_column_stays_float(self):
+        df = pd.DataFrame({'year': [2025, None], 'amountGross': ['10.5', None]})
+        compact_frame(df, BNB_SCHEMA)
+        assert df['year'].dtype == np.float64
+        assert df['amountGross'].tolist()[0] == 10.5
+
+    def test_concat_is_recategorized_sorted(self):
+        first = compact_frame(_mutaties_frame(), MUTATIES_SCHEMA)
+        second = compact_frame(
+            pd.DataFrame({'Reknum': ['0500'], 'jaar': [2023]}), MUTATIES_SCHEMA
+        )
+        merged = compact_frame(pd.concat([first, second], ignore_index=True), MUTATIES_SCHEMA)
+        assert list(merged['Reknum'].cat.categories) == ['0500', '1000', '4000']
+
+    def test_observed_groupby_matches_object_groupby(self):
+        raw = _mutaties_frame()
+        compact = compact_frame(raw.copy(), MUTATIES_SCHEMA)
+        expected = raw.groupby(['Reknum', 'AccountName'], as_index=False)['Amount'].sum()
+        actual = compact.groupby(
+            ['Reknum', 'AccountName'], as_index=False, observed=True
+        )['Amount'].sum()
+        assert actual.to_dict('records') == expected.to_dict('records')
+
+
+class TestEvictToBudget:
+
+    def test_evicts_least_recently_used_first(self):
+        now = datetime.now()
+        data = {
+            'old': SimpleNamespace(memory_bytes=40, last_accessed=now - timedelta(hours=2)),
+            'mid': SimpleNamespace(memory_bytes=40, last_accessed=now - timedelta(hours=1)),
+            'new': SimpleNamespace(memory_bytes=40, last_accessed=now),
+        }
+        assert evict_to_budget(data, budget_bytes=80, keep='new') == ['old']
+        assert set(data) == {'mid', 'new'}
+
+    def test_never_evicts_kept_tenant(self):
+        data = {'big': SimpleNamespace(memory_bytes=500, last_accessed=datetime.now())}
+        assert evict_to_budget(data, budget_bytes=10, keep='big') == []
+        assert 'big' in data
+
+
+class TestMutatiesCacheMemoryBudget:
+
+    def test_account_memory_evicts_other_tenants(self):
+        cache = MutatiesCache(memory_budget_mb=0)
+        now = datetime.now()
+        for tenant in ('A', 'B'):
+            cache._tenant_data[tenant] = TenantCacheEntry(
+                data=_mutaties_frame(), last_accessed=now, last_loaded=now
+            )
+            cache._account_memory(tenant)
+
+        assert list(cache._tenant_data) == ['B']
+        assert cache._tenant_data['B'].memory_bytes > 0
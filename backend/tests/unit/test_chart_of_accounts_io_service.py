@@ -0,0 +1,225 @@
+"""
+Unit tests for the chart of accounts Excel import (ChartOfAccountsIOService).
+
+Tests cover:
+- Header and row validation before anything is written
+- Diff against the tenant snapshot: inserted / updated / unchanged
+- One chunked INSERT ... ON DUPLICATE KEY UPDATE in a single transaction
+- Parameters: bank_account/iban from the file, other keys preserved
+"""
+
+import json
+from contextlib import contextmanager
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import openpyxl
+import pytest
+
+from services.chart_of_accounts_io_service import (
+    EXCEL_HEADERS,
+    UPSERT_ACCOUNT_QUERY,
+    ChartOfAccountsIOService,
+)
+
+TENANT = "TestTenant"
+
+
+def _workbook(rows, headers=EXCEL_HEADERS):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+    stream = BytesIO()
+    wb.save(stream)
+    stream.seek(0)
+    return stream
+
+
+def _existing(account_id, account, name, parent="1000", parameters=None, **extra):
+    return {
+        "AccountID": account_id,
+        "Account": account,
+        "AccountName": name,
+        "AccountLookup": extra.get("lookup"),
+        "SubParent": extra.get("sub_parent", ""),
+        "Parent": parent,
+        "VW": extra.get("vw", "N"),
+        "Belastingaangifte": extra.get("tax", ""),
+        "parameters": json.dumps(parameters) if parameters else None,
+    }
+
+
+@pytest.fixture
+def db():
+    db = MagicMock()
+    db.execute_query.return_value = []
+    db.cursor = MagicMock()
+    db.cursor.rowcount = 0
+
+    @contextmanager
+    def transaction():
+        yield db.cursor, MagicMock()
+
+    db.transaction.side_effect = transaction
+    return db
+
+
+def _upserted_rows(db):
+    rows = []
+    for call in db.cursor.executemany.call_args_list:
+        assert call.args[0] == UPSERT_ACCOUNT_QUERY
+        rows.extend(call.args[1])
+    return rows
+
+
+class TestValidation:
+
+    def test_invalid_headers_rejected(self, db):
+        stream = _workbook([], headers=["Account", "Name"])
+
+        result = ChartOfAccountsIOService(db).import_from_excel(TENANT, stream)
+
+        assert result["success"] is False
+        assert result["error"] == "Invalid Excel format"
+        db.transaction.assert_not_called()
+
+    def test_row_errors_reported_and_nothing_written(self, db):
+        stream = _workbook(
+            [
+                ["1000", "Kas", "", "", "1000", "N", "", 0],
+                [None, "No number", "", "", "1000", "N", "", 0],
+                ["2000", None, "", "", "2000", "N", "", 0],
+            ]
+        )
+
+        result = ChartOfAccountsIOService(db).import_from_excel(TENANT, stream)
+
+        assert result["success"] is False
+        assert result["errors"] == [
+            "Row 3: Account number required",
+            "Row 4: Account name required",
+        ]
+        assert result["parsed"] == 1
+        db.transaction.assert_not_called()
+
+    def test_unparseable_file(self, db):
+        result = ChartOfAccountsIOService(db).import_from_excel(
+            TENANT, BytesIO(b"not excel")
+        )
+
+        assert result["success"] is False
+        assert result["error"] == "Failed to parse Excel file"
+
+
+class TestDiffImport:
+
+    def test_new_changed_and_unchanged_accounts(self, db):
+        db.execute_query.return_value = [
+            _existing(1, "1000", "Kas"),
+            _existing(2, "1300", "Debiteuren"),
+        ]
+        stream = _workbook(
+            [
+                ["1000", "Kas", "", "", "1000", "N", "", 0],  # unchanged
+                ["1300", "Debiteuren NL", "", "", "1000", "N", "", 0],  # renamed
+                ["8000", "Omzet", "", "", "8000", "Y", "", 0],  # new
+            ]
+        )
+
+        result = ChartOfAccountsIOService(db).import_from_excel(TENANT, stream)
+
+        assert result == {
+            "success": True,
+            "imported": 1,
+            "updated": 1,
+            "unchanged": 1,
+            "total": 3,
+            "changes": {
+                "inserted": ["8000"],
+                "updated": [{"account": "1300", "fields": ["AccountName"]}],
+            },
+        }
+        rows = _upserted_rows(db)
+        assert rows == [
+            (2, "1300", "Debiteuren NL", "", "", "1000", "N", "", TENANT, None),
+            (None, "8000", "Omzet", "", "", "8000", "Y", "", TENANT, None),
+        ]
+        assert db.transaction.call_count == 1
+        # One snapshot query; no per-row SELECT/UPDATE/INSERT round trips
+        assert db.execute_query.call_count == 1
+
+    def test_nothing_written_when_all_unchanged(self, db):
+        db.execute_query.return_value = [_existing(1, "1000", "Kas")]
+        stream = _workbook([["1000", "Kas", None, None, "1000", "N", None, 0]])
+
+        result = ChartOfAccountsIOService(db).import_from_excel(TENANT, stream)
+
+        assert result["unchanged"] == 1
+        assert result["total"] == 1
+        db.transaction.assert_not_called()
+
+    def test_repeated_account_last_row_wins(self, db):
+        stream = _workbook(
+            [
+                ["4000", "Kosten", "", "", "4000", "Y", "", 0],
+                ["4000", "Algemene kosten", "", "", "4000", "Y", "", 0],
+            ]
+        )
+
+        result = ChartOfAccountsIOService(db).import_from_excel(TENANT, stream)
+
+        assert result["imported"] == 1
+        assert [row[2] for row in _upserted_rows(db)] == ["Algemene kosten"]
+
+
+class TestParameters:
+
+    def test_bank_account_and_iban_from_file(self, db):
+        stream = _workbook(
+            [["1002", "Bank", "NL00BANK0123456789", "", "1000", "N", "", 1]]
+        )
+
+        ChartOfAccountsIOService(db).import_from_excel(TENANT, stream)
+
+        parameters = json.loads(_upserted_rows(db)[0][-1])
+        assert parameters == {"bank_account": True, "iban": "NL00BANK0123456789"}
+
+    def test_other_parameter_keys_are_preserved(self, db):
+        db.execute_query.return_value = [
+            _existing(
+                5,
+                "2010",
+                "BTW",
+                parent="2000",
+                parameters={"vat_netting": True, "bank_account": True},
+            )
+        ]
+        stream = _workbook([["2010", "BTW", "", "", "2000", "N", "", 0]])
+
+        result = ChartOfAccountsIOService(db).import_from_excel(TENANT, stream)
+
+        assert result["changes"]["updated"] == [
+            {"account": "2010", "fields": ["parameters"]}
+        ]
+        assert json.loads(_upserted_rows(db)[0][-1]) == {"vat_netting": True}
+
+    def test_unchanged_when_parameters_match(self, db):
+        db.execute_query.return_value = [
+            _existing(
+                7,
+                "1002",
+                "Bank",
+                lookup="NL00BANK0123456789",
+                parameters={"iban": "NL00BANK0123456789", "bank_account": True},
+            )
+        ]
+        stream = _workbook(
+            [["1002", "Bank", "NL00BANK0123456789", "", "1000", "N", "", 1]]
+        )
+
+        result = ChartOfAccountsIOService(db).import_from_excel(TENANT, stream)
+
+        assert result["unchanged"] == 1
+        db.transaction.assert_not_called()
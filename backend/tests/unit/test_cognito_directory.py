@@ -0,0 +1,163 @@
+"""
+Unit tests for the Cognito directory index.
+
+Tests cover:
+- One paginated scan serves counts and listings for all tenants
+- TTL expiry triggers a rescan
+- Incremental updates from user-admin writes (set_user_tenants / remove_user)
+- Updates made during a scan force a rescan on the next read
+"""
+
+import json
+from unittest.mock import patch
+
+from services import cognito_directory
+from services.cognito_directory import CognitoDirectoryIndex, parse_tenants
+
+
+class FakeCognitoClient:
+    """Minimal list_users implementation with Cognito-style pagination."""
+
+    def __init__(self, users, page_size=2):
+        self.users = users
+        self.page_size = page_size
+        self.calls = 0
+
+    def list_users(self, UserPoolId, Limit, PaginationToken=None):
+        self.calls += 1
+        start = int(PaginationToken or 0)
+        end = start + self.page_size
+        response = {'Users': self.users[start:end]}
+        if end < len(self.users):
+            response['PaginationToken'] = str(end)
+        return response
+
+
+def _user(username, email, tenants):
+    return {
+        'Username': username,
+        'Attributes': [
+            {'Name': 'email', 'Value': email},
+            {'Name': 'custom:tenants', 'Value': json.dumps(tenants)},
+        ],
+    }
+
+
+def _index(users):
+    client = FakeCognitoClient(users)
+    return CognitoDirectoryIndex(lambda: client, 'pool'), client
+
+
+USERS = [
+    _user('u1', 'a@example.com', ['TenantA', 'TenantB']),
+    _user('u2', 'b@example.com', ['TenantA']),
+    _user('u3', 'c@example.com', ['TenantC']),
+    _user('u4', 'd@example.com', []),
+    _user('u5', 'e@example.com', ['TenantB']),
+]
+
+
+class TestParseTenants:
+
+    def test_json_array(self):
+        assert parse_tenants('["A","B"]') == ['A', 'B']
+
+    def test_escaped_quotes(self):
+        assert parse_tenants('[\\"A\\"]') == ['A']
+
+    def test_plain_value_and_empty(self):
+        assert parse_tenants('A') == ['A']
+        assert parse_tenants(None) == []
+
+
+class TestDirectoryQueries:
+
+    def test_counts_for_all_tenants_from_one_scan(self):
+        index, client = _index(USERS)
+
+        counts = index.user_counts(['TenantA', 'TenantB', 'TenantC', 'Missing'])
+        index.user_count('TenantA')
+        index.tenant_users('TenantB')
+
+        assert counts == {'TenantA': 2, 'TenantB': 2, 'TenantC': 1, 'Missing': 0}
+        # 5 users at page size 2 -> 3 list_users calls for a single scan
+        assert client.calls == 3
+
+    def test_tenant_users_sorted_by_email(self):
+        index, _ = _index(USERS)
+
+        users = index.tenant_users('TenantB')
+
+        assert [u.email for u in users] == ['a@example.com', 'e@example.com']
+        assert users[0].username == 'u1'
+
+    def test_expired_index_rescans(self):
+        index, client = _index(USERS)
+        index.user_count('TenantA')
+
+        with patch.object(cognito_directory.time, 'time',
+                          return_value=cognito_directory.time.time()
+                          + index.ttl_seconds + 1):
+            index.user_count('TenantA')
+
+        assert client.calls == 6
+
+
+class TestIncrementalUpdates:
+
+    def test_set_user_tenants_moves_user(self):
+        index, client = _index(USERS)
+        index.user_count('TenantA')
+
+        index.set_user_tenants('b@example.com', ['TenantC'], email='b@example.com')
+
+        assert index.user_counts(['TenantA', 'TenantC']) == {'TenantA': 1, 'TenantC': 2}
+        assert client.calls == 3
+
+    def test_set_user_tenants_resolves_username_alias(self):
+        index, _ = _index(USERS)
+        index.user_count('TenantA')
+
+        index.set_user_tenants('u3', ['TenantA', 'TenantC'])
+
+        assert index.user_count('TenantA') == 3
+        assert index.user_count('TenantC') == 1
+
+    def test_new_user_is_added(self):
+        index, _ = _index(USERS)
+        index.user_count('TenantA')
+
+        index.set_user_tenants('new@example.com', ['TenantA'], email='new@example.com')
+
+        assert index.user_count('TenantA') == 3
+
+    def test_remove_user(self):
+        index, _ = _index(USERS)
+        index.user_count('TenantA')
+
+        index.remove_user('u1')
+
+        assert index.user_counts(['TenantA', 'TenantB']) == {'TenantA': 1, 'TenantB': 1}
+
+    def test_updates_before_first_load_are_ignored(self):
+        index, client = _index(USERS)
+
+        index.set_user_tenants('x@example.com', ['TenantA'], email='x@example.com')
+
+        assert index.user_count('TenantA') == 2
+        assert client.calls == 3
+
+    def test_update_during_scan_forces_rescan(self):
+        index, client = _index(USERS)
+        original = client.list_users
+
+        def list_users_with_concurrent_write(**kwargs):
+            if client.calls == 0:
+                index.set_user_tenants('b@example.com', [], email='b@example.com')
+            return original(**kwargs)
+
+        client.list_users = list_users_with_concurrent_write
+        index.user_count('TenantA')
+        index.user_count('TenantA')
+
+        assert client.calls == 6
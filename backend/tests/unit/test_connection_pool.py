@@ -0,0 +1,294 @@
+"""
+Unit tests for the managed connection pool (connection_pool.py).
+
+Tests cover:
+- Checkout/return reuse and rollback of open transactions
+- Queueing on a saturated pool and PoolTimeoutError
+- Ping after idle, replacement of dead connections, recycling by age
+- Adaptive sizing between min/max bounds
+- Wait histogram percentiles
+- AdvancedConnectionPool statistics and DatabaseManager.get_connection
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+
+import database
+from connection_pool import ManagedConnectionPool, WaitHistogram
+from db_exceptions import OperationalError, PoolTimeoutError
+from scalability_manager import AdvancedConnectionPool, ScalabilityConfig
+
+
+class FakeConnection:
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.ping_error = None
+
+    def ping(self, reconnect=False):
+        if self.ping_error:
+            raise self.ping_error
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnector:
+
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        conn = FakeConnection(len(self.created))
+        self.created.append(conn)
+        return conn
+
+
+def _pool(min_size=1, max_size=4, **kwargs):
+    connector = FakeConnector()
+    kwargs.setdefault('checkout_timeout', 1.0)
+    return ManagedConnectionPool('test', connector, min_size, max_size, **kwargs), connector
+
+
+class TestCheckout:
+
+    def test_prefills_min_size_and_reuses_returned_connections(self):
+        pool, connector = _pool(min_size=2)
+        assert len(connector.created) == 2
+
+        conn = pool.checkout()
+        number = conn.number
+        conn.close()
+        again = pool.checkout()
+
+        assert again.number == number
+        assert len(connector.created) == 2
+        assert pool.statistics()['in_use'] == 1
+
+    def test_return_rolls_back_open_transaction(self):
+        pool, connector = _pool()
+        conn = pool.checkout()
+        connector.created[0].in_transaction = True
+
+        conn.close()
+        conn.close()  # Second close is a no-op
+
+        assert connector.created[0].rollbacks == 1
+        assert pool.statistics()['idle'] == 1
+
+    def test_unreachable_database_fails_construction(self):
+        def connect():
+            raise OSError('connection refused')
+
+        with pytest.raises(OSError):
+            ManagedConnectionPool('test', connect, min_size=1, max_size=2)
+
+    def test_context_manager_returns_connection(self):
+        pool, _connector = _pool()
+        with pool.checkout():
+            assert pool.statistics()['in_use'] == 1
+        assert pool.statistics()['in_use'] == 0
+
+
+class TestQueueing:
+
+    def test_saturated_pool_times_out(self):
+        pool, _connector = _pool(min_size=1, max_size=1)
+        held = pool.checkout()
+
+        with pytest.raises(PoolTimeoutError, match='1/1 in use'):
+            pool.checkout(timeout=0.05)
+
+        stats = pool.statistics()
+        assert stats['timeouts'] == 1
+        assert stats['waited'] == 1
+        assert isinstance(PoolTimeoutError('x'), OperationalError)
+        held.close()
+
+    def test_waiter_gets_released_connection(self):
+        pool, connector = _pool(min_size=1, max_size=1)
+        held = pool.checkout()
+        result = {}
+
+        def borrow():
+            conn = pool.checkout(timeout=2)
+            result['number'] = conn.number
+            conn.close()
+
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        time.sleep(0.05)
+        held.close()
+        thread.join(2)
+
+        assert result == {'number': 0}
+        assert len(connector.created) == 1
+        assert pool.wait_histogram.count == 2
+        assert pool.wait_histogram.max >= 0.04
+
+
+class TestHealthChecks:
+
+    def test_idle_connection_is_pinged_and_replaced_when_dead(self):
+        pool, connector = _pool(idle_ping_seconds=0)
+        connector.created[0].ping_error = OSError('server has gone away')
+
+        conn = pool.checkout()
+
+        assert conn.number == 1
+        assert connector.created[0].closed
+        stats = pool.statistics()
+        assert stats['pings'] == 1
+        assert stats['ping_failures'] == 1
+
+    def test_recently_used_connection_is_not_pinged(self):
+        pool, connector = _pool(idle_ping_seconds=60)
+        connector.created[0].ping_error = OSError('not expected')
+
+        assert pool.checkout().number == 0
+        assert pool.statistics()['pings'] == 0
+
+    def test_old_connection_is_recycled(self):
+        pool, connector = _pool(recycle_seconds=0)
+
+        conn = pool.checkout()
+
+        assert conn.number == 1
+        assert connector.created[0].closed
+        assert pool.statistics()['recycled'] == 1
+
+
+class TestAdaptiveSizing:
+
+    def test_grows_when_callers_waited(self):
+        pool, _connector = _pool(min_size=1, max_size=4)
+        held = pool.checkout()
+        with pytest.raises(PoolTimeoutError):
+            pool.checkout(timeout=0.01)
+
+        assert pool.adapt() == 2
+        second = pool.checkout(timeout=0.01)  # Fits under the new limit
+
+        held.close()
+        second.close()
+
+    def test_shrinks_to_min_and_closes_idle_connections(self):
+        pool, connector = _pool(min_size=1, max_size=8)
+        pool.limit = 8
+        conns = [pool.checkout() for _ in range(8)]
+        for conn in conns:
+            conn.close()
+        pool.adapt()  # Window saw full utilization: stays at max
+
+        limits = [pool.adapt() for _ in range(6)]
+
+        assert limits[-1] == 1
+        assert limits == sorted(limits, reverse=True)
+        assert pool.statistics()['open'] == 1
+        assert sum(conn.closed for conn in connector.created) == 7
+
+    def test_never_exceeds_max(self):
+        pool, _connector = _pool(min_size=2, max_size=2)
+        a, b = pool.checkout(), pool.checkout()
+
+        assert pool.adapt() == 2
+        a.close()
+        b.close()
+
+
+class TestWaitHistogram:
+
+    def test_percentiles_use_bucket_bounds(self):
+        histogram = WaitHistogram()
+        for _ in range(90):
+            histogram.observe(0.0005)
+        for _ in range(10):
+            histogram.observe(0.2)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot['count'] == 100
+        assert snapshot['p50_ms'] == 1.0
+        assert snapshot['p95_ms'] == 250.0
+        assert snapshot['buckets']['<=250ms'] == 10
+
+    def test_empty_histogram(self):
+        assert WaitHistogram().snapshot()['p99_ms'] is None
+
+
+class TestAdvancedConnectionPool:
+
+    def _pool(self):
+        config = ScalabilityConfig(
+            db_pool_size=10, db_pool_min_size=2, monitoring_interval_seconds=3600
+        )
+        with patch('scalability_manager.mysql.connector.connect',
+                   side_effect=lambda **kw: FakeConnection(0)) as connect:
+            pool = AdvancedConnectionPool(config, {'host': 'db'})
+        return pool, connect
+
+    def test_pools_use_plain_connections_without_pool_arguments(self):
+        pool, connect = self._pool()
+
+        assert set(pool.pools) == {'primary', 'readonly', 'analytics'}
+        assert pool.pools['primary'].max_size == 10
+        kwargs = connect.call_args_list[0].kwargs
+        assert kwargs['host'] == 'db'
+        assert 'pool_recycle' not in kwargs and 'pool_size' not in kwargs
+
+    def test_statistics_keep_existing_keys_and_add_wait_histograms(self):
+        pool, _connect = self._pool()
+        with pool.get_connection('readonly'):
+            pass
+        with pool.get_connection('unknown'):
+            pass
+
+        stats = pool.get_pool_statistics()
+
+        for key in ('pools', 'total_connections_used', 'total_errors',
+                    'avg_response_time', 'pool_count', 'monitoring_active'):
+            assert key in stats
+        assert stats['total_connections_used'] == 2
+        assert stats['pools']['primary']['checkout_wait']['count'] == 1
+        assert stats['pools']['readonly']['connections_used'] == 1
+
+    def test_timeouts_are_counted_as_errors(self):
+        pool, _connect = self._pool()
+        pool.pools['analytics'].checkout_timeout = 0.01
+        held = pool.checkout('analytics')  # Analytics starts at one connection
+
+        with pytest.raises(PoolTimeoutError):
+            pool.checkout('analytics')
+
+        stats = pool.get_pool_statistics()
+        assert stats['total_errors'] == 1
+        assert stats['total_timeouts'] == 1
+        held.close()
+
+
+class TestDatabaseManagerGetConnection:
+
+    def test_returns_pooled_connection_and_does_not_fall_back_on_timeout(self):
+        db = database.DatabaseManager.__new__(database.DatabaseManager)
+        db.config = {}
+        manager = MagicMock()
+        manager.connection_pool.checkout.side_effect = PoolTimeoutError('saturated')
+
+        with patch.object(type(db), '_scalability_manager', new_callable=PropertyMock,
+                          return_value=manager), \
+             patch('database.mysql.connector.connect') as connect:
+            with pytest.raises(PoolTimeoutError):
+                db.get_connection('readonly')
+
+        manager.connection_pool.checkout.assert_called_once_with('readonly')
+        connect.assert_not_called()
@@ -0,0 +1,187 @@
+"""
+Unit tests for CredentialService encryption and its process-wide caches.
+
+Tests cover:
+- Round trips with the master key and tenant-derived keys
+- Derived ciphers cached per (master key, tenant): no PBKDF2 after warm-up
+- Short-TTL cache of decrypted credentials and its invalidation
+- Lazy migration from master-key to tenant-key encryption
+"""
+
+import base64
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services import credential_service
+from services.credential_service import (
+    CredentialDecryptionError,
+    CredentialService,
+    clear_cipher_cache,
+)
+
+KEY = "unit-test-master-key"
+TENANT = "TestTenant"
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    clear_cipher_cache()
+    yield
+    clear_cipher_cache()
+
+
+@pytest.fixture
+def db():
+    db = MagicMock()
+    db.config = {"database": "testfinance"}
+    return db
+
+
+def _stored(value):
+    return [{"encrypted_value": value}]
+
+
+class TestEncryption:
+
+    def test_tenant_round_trip(self, db):
+        service = CredentialService(db, KEY)
+
+        encrypted = service.encrypt_credential({"token": "abc"}, tenant=TENANT)
+
+        assert service.decrypt_credential(encrypted, tenant=TENANT) == {"token": "abc"}
+
+    def test_tenant_keys_are_isolated(self, db):
+        service = CredentialService(db, KEY)
+        encrypted = service.encrypt_credential("secret", tenant=TENANT)
+
+        with pytest.raises(CredentialDecryptionError):
+            service.decrypt_credential(encrypted, tenant="OtherTenant")
+
+    def test_master_key_fallback(self, db):
+        service = CredentialService(db, KEY)
+        encrypted = service.encrypt_credential("legacy")
+
+        assert service.decrypt_credential(encrypted, tenant=TENANT) == "legacy"
+
+
+class TestCipherCache:
+
+    def test_no_key_derivation_after_warm_up(self, db):
+        CredentialService(db, KEY).encrypt_credential("x", tenant=TENANT)
+
+        with patch.object(credential_service, "PBKDF2HMAC") as kdf:
+            service = CredentialService(db, KEY)
+            encrypted = service.encrypt_credential("y", tenant=TENANT)
+            service.decrypt_credential(encrypted, tenant=TENANT)
+
+        kdf.assert_not_called()
+
+    def test_ciphers_are_per_master_key_and_tenant(self, db):
+        first = CredentialService(db, KEY)
+        other_key = CredentialService(db, "another-master-key")
+
+        assert first._tenant_cipher(TENANT) is first._tenant_cipher(TENANT)
+        assert first._tenant_cipher(TENANT) is not first._tenant_cipher("Other")
+        assert first._tenant_cipher(TENANT) is not other_key._tenant_cipher(TENANT)
+        encrypted = first.encrypt_credential("secret", tenant=TENANT)
+        with pytest.raises(CredentialDecryptionError):
+            other_key.decrypt_credential(encrypted, tenant=TENANT)
+
+    def test_cache_keys_do_not_contain_the_master_key(self, db):
+        CredentialService(db, KEY).encrypt_credential("x", tenant=TENANT)
+
+        for fingerprint, _tenant in credential_service._cipher_cache:
+            assert KEY not in fingerprint
+
+
+class TestCredentialCache:
+
+    def test_get_credential_served_from_cache(self, db):
+        service = CredentialService(db, KEY)
+        db.execute_query.return_value = _stored(
+            service.encrypt_credential({"token": "abc"}, tenant=TENANT)
+        )
+
+        first = service.get_credential(TENANT, "google_drive_token")
+        first["token"] = "mutated by caller"
+        second = CredentialService(db, KEY).get_credential(
+            TENANT, "google_drive_token"
+        )
+
+        assert second == {"token": "abc"}
+        assert db.execute_query.call_count == 1
+
+    def test_entries_expire(self, db):
+        service = CredentialService(db, KEY)
+        db.execute_query.return_value = _stored(
+            service.encrypt_credential("v", tenant=TENANT)
+        )
+
+        with patch.object(credential_service.time, "monotonic", return_value=0.0):
+            service.get_credential(TENANT, "s3")
+        with patch.object(
+            credential_service.time, "monotonic", return_value=service.cache_ttl + 1
+        ):
+            service.get_credential(TENANT, "s3")
+
+        assert db.execute_query.call_count == 2
+
+    def test_store_and_delete_invalidate(self, db):
+        service = CredentialService(db, KEY)
+        db.execute_query.return_value = _stored(
+            service.encrypt_credential("old", tenant=TENANT)
+        )
+        assert service.get_credential(TENANT, "s3") == "old"
+
+        service.store_credential(TENANT, "s3", "new")
+        db.execute_query.return_value = _stored(
+            service.encrypt_credential("new", tenant=TENANT)
+        )
+        assert service.get_credential(TENANT, "s3") == "new"
+
+        db.execute_query.return_value = 1
+        service.delete_credential(TENANT, "s3")
+        db.execute_query.return_value = []
+        assert service.get_credential(TENANT, "s3") is None
+
+    def test_cache_can_be_disabled(self, db):
+        service = CredentialService(db, KEY)
+        service.cache_ttl = 0
+        db.execute_query.return_value = _stored(
+            service.encrypt_credential("v", tenant=TENANT)
+        )
+
+        service.get_credential(TENANT, "s3")
+        service.get_credential(TENANT, "s3")
+
+        assert db.execute_query.call_count == 2
+
+    def test_cache_is_per_database(self, db):
+        service = CredentialService(db, KEY)
+        db.execute_query.return_value = _stored(
+            service.encrypt_credential("prod", tenant=TENANT)
+        )
+        service.get_credential(TENANT, "s3")
+
+        test_db = MagicMock()
+        test_db.config = {"database": "finance"}
+        test_db.execute_query.return_value = _stored(
+            service.encrypt_credential("other", tenant=TENANT)
+        )
+
+        assert CredentialService(test_db, KEY).get_credential(TENANT, "s3") == "other"
+
+
+class TestLazyMigration:
+
+    def test_master_key_credential_is_reencrypted(self, db):
+        service = CredentialService(db, KEY)
+        db.execute_query.return_value = _stored(service.encrypt_credential("legacy"))
+
+        assert service.get_credential(TENANT, "s3") == "legacy"
+
+        update = db.execute_query.call_args_list[-1]
+        assert "UPDATE tenant_credentials" in update.args[0]
+        migrated = base64.b64decode(update.args[1][0])
+        assert service._tenant_cipher(TENANT).decrypt(migrated) == b"legacy"
@@ -0,0 +1,125 @@
+"""Unit tests for db_batch.py and DatabaseManager.execute_batch_queries.
+
+Tests cover:
+- Grouping of consecutive statements with identical SQL
+- Packet-size chunking of parameter rows
+- Single-transaction batch execution with per-statement row counts
+- Parallel mode restricted to read-only queries
+"""
+
+import pytest
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import database
+from db_batch import chunk_params, executemany_chunked, group_statements, is_read_query
+
+INSERT = "INSERT INTO t (a, b) VALUES (%s, %s)"
+UPDATE = "UPDATE t SET b = %s WHERE a = %s"
+
+
+class TestGroupStatements:
+
+    def test_groups_only_adjacent_statements(self):
+        groups = group_statements([
+            (INSERT, (1, 'x')), (INSERT, (2, 'y')), (UPDATE, ('z', 1)), (INSERT, (3, 'w')),
+        ])
+        assert [(q, len(p), idx) for q, p, idx in groups] == [
+            (INSERT, 2, [0, 1]), (UPDATE, 1, [2]), (INSERT, 1, [3]),
+        ]
+
+
+class TestChunkParams:
+
+    def test_respects_packet_size(self):
+        rows = [('a' * 100,)] * 10
+        chunks = list(chunk_params("INSERT INTO t VALUES (%s)", rows, max_packet_bytes=350))
+        assert [len(c) for c in chunks] == [3, 3, 3, 1]
+
+    def test_respects_row_limit_and_oversized_rows(self):
+        assert [len(c) for c in chunk_params("Q", [(1,)] * 5, max_rows=2)] == [2, 2, 1]
+        assert [len(c) for c in chunk_params("Q", [('x' * 50,)] * 2, max_packet_bytes=10)] == [1, 1]
+
+    def test_executemany_chunked_sums_rowcounts(self):
+        cursor = MagicMock()
+        cursor.rowcount = 2
+        assert executemany_chunked(cursor, INSERT, [(1, 'a')] * 4, max_rows=2) == 4
+        assert cursor.executemany.call_count == 2
+
+    def test_is_read_query(self):
+        assert is_read_query("  select 1")
+        assert not is_read_query("DELETE FROM t")
+
+
+@pytest.fixture
+def batch_db():
+    cursor = MagicMock()
+    cursor.with_rows = False
+    conn = MagicMock()
+    db = database.DatabaseManager.__new__(database.DatabaseManager)
+
+    @contextmanager
+    def fake_cursor(*args, **kwargs):
+        yield cursor, conn
+
+    db.get_cursor = fake_cursor
+    return db, cursor, conn
+
+
+class TestExecuteBatchQueries:
+
+    def test_inserts_use_executemany_in_one_transaction(self, batch_db):
+        db, cursor, conn = batch_db
+        executemany_sizes = []
+
+        def executemany(query, chunk):
+            executemany_sizes.append(len(chunk))
+            cursor.rowcount = len(chunk)
+
+        def execute(query, params):
+            cursor.rowcount = 3
+
+        cursor.executemany.side_effect = executemany
+        cursor.execute.side_effect = execute
+
+        results = db.execute_batch_queries(
+            [(INSERT, (1, 'a')), (INSERT, (2, 'b')), (UPDATE, ('c', 1))]
+        )
+
+        assert results == [1, 1, 3]
+        assert executemany_sizes == [2]
+        cursor.execute.assert_called_once_with(UPDATE, ('c', 1))
+        conn.commit.assert_called_once()
+        conn.rollback.assert_not_called()
+
+    def test_unattributable_insert_counts_are_none(self, batch_db):
+        db, cursor, conn = batch_db
+        upsert = INSERT + " ON DUPLICATE KEY UPDATE b = VALUES(b)"
+        cursor.executemany.side_effect = lambda q, chunk: setattr(cursor, 'rowcount', 3)
+
+        assert db.execute_batch_queries([(upsert, (1, 'a')), (upsert, (2, 'b'))]) == [None, None]
+
+    def test_commit_false_rolls_back(self, batch_db):
+        db, cursor, conn = batch_db
+        db.execute_batch_queries([(UPDATE, ('c', 1))], commit=False)
+        conn.commit.assert_not_called()
+        conn.rollback.assert_called_once()
+
+    def test_empty_batch(self, batch_db):
+        db, _, _ = batch_db
+        assert db.execute_batch_queries([]) == []
+
+    def test_parallel_reads_reject_writes(self, batch_db):
+        db, _, _ = batch_db
+        with pytest.raises(ValueError):
+            db.execute_batch_queries([("SELECT 1", None), (UPDATE, ('c', 1))], parallel_reads=True)
+
+    def test_parallel_reads_return_rows_in_order(self, batch_db, monkeypatch):
+        db, _, _ = batch_db
+        monkeypatch.setattr(database.DatabaseManager, '_scalability_manager', None)
+        db.execute_query = MagicMock(side_effect=lambda q, p, fetch: [{'q': q}])
+
+        results = db.execute_batch_queries(
+            [("SELECT 1", None), ("SELECT 2", None)], parallel_reads=True
+        )
+        assert results == [[{'q': 'SELECT 1'}], [{'q': 'SELECT 2'}]]
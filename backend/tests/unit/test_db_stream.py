@@ -0,0 +1,100 @@
+"""Unit tests for db_stream.py.
+
+Tests cover:
+- Column typing from cursor descriptions
+- Chunked iteration over an unbuffered cursor
+- Merging of per-chunk categoricals in read_frame
+- Plain dict-row chunks from iter_rows
+"""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+from mysql.connector.constants import FieldType
+
+from db_stream import iter_frames, iter_rows, read_frame
+
+DESCRIPTION = [
+    ('Amount', FieldType.NEWDECIMAL),
+    ('jaar', FieldType.LONGLONG),
+    ('TransactionDate', FieldType.DATE),
+    ('Reknum', FieldType.VAR_STRING),
+]
+
+ROWS = [
+    (Decimal('10.50'), 2025, date(2025, 1, 1), '1000'),
+    (Decimal('-3.25'), 2025, date(2025, 2, 1), '4000'),
+    (None, 2024, None, '1000'),
+]
+
+
+def _conn(rows, description=DESCRIPTION):
+    cursor = MagicMock()
+    cursor.description = description
+    cursor.fetchmany.side_effect = lambda size: [
+        rows.pop(0) for _ in range(min(size, len(rows)))
+    ]
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    conn.unread_result = False
+    return conn, cursor
+
+
+class TestIterFrames:
+
+    def test_chunks_are_typed(self):
+        conn, cursor = _conn(list(ROWS))
+        frames = list(iter_frames(conn, 'SELECT 1', chunk_size=2))
+
+        assert [len(f) for f in frames] == [2, 1]
+        first = frames[0]
+        assert first['Amount'].dtype == np.float64
+        assert first['jaar'].dtype == np.int32
+        assert first['TransactionDate'].dtype == 'datetime64[ns]'
+        assert isinstance(first['Reknum'].dtype, pd.CategoricalDtype)
+        conn.cursor.assert_called_once_with(buffered=False)
+        cursor.close.assert_called_once()
+
+    def test_nulls_become_nan_and_nat(self):
+        conn, _ = _conn([ROWS[2]])
+        frame = next(iter_frames(conn, 'SELECT 1', categorize_strings=False))
+        assert np.isnan(frame['Amount'].iat[0])
+        assert pd.isna(frame['TransactionDate'].iat[0])
+        assert frame['Reknum'].dtype == object
+
+    def test_empty_result_keeps_columns(self):
+        conn, _ = _conn([])
+        frames = list(iter_frames(conn, 'SELECT 1'))
+        assert len(frames) == 1
+        assert list(frames[0].columns) == ['Amount', 'jaar', 'TransactionDate', 'Reknum']
+        assert frames[0].empty
+
+
+class TestReadFrame:
+
+    def test_merges_chunks_and_categories(self):
+        conn, _ = _conn(list(ROWS))
+        frame = read_frame(conn, 'SELECT 1', chunk_size=1)
+
+        assert list(frame.columns) == ['Amount', 'jaar', 'TransactionDate', 'Reknum']
+        assert list(frame['Reknum']) == ['1000', '4000', '1000']
+        assert isinstance(frame['Reknum'].dtype, pd.CategoricalDtype)
+        assert frame['Amount'].iloc[:2].tolist() == [10.5, -3.25]
+        assert frame['jaar'].tolist() == [2025, 2025, 2024]
+
+
+class TestIterRows:
+
+    def test_yields_dict_row_chunks_from_unbuffered_cursor(self):
+        rows = [{'id': i} for i in range(5)]
+        conn, cursor = _conn(rows)
+
+        chunks = list(iter_rows(conn, 'SELECT 1', ('x',), chunk_size=2))
+
+        assert chunks == [[{'id': 0}, {'id': 1}], [{'id': 2}, {'id': 3}], [{'id': 4}]]
+        conn.cursor.assert_called_once_with(buffered=False, dictionary=True)
+        cursor.execute.assert_called_once_with('SELECT 1', ('x',))
+        cursor.close.assert_called_once()
@@ -16,6 +16,7 @@ from decimal import Decimal
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from duplicate_checker import DuplicateChecker
 from database import DatabaseManager
+from db_exceptions import DatabaseError
 
 
 class TestDuplicateChecker:
@@ -163,6 +164,76 @@ class TestDuplicateChecker:
 
 
 # Property-Based Tests
+class TestDuplicateCheckerBatch:
+    """Tests for DuplicateChecker.check_for_duplicates_batch."""
+
+    @pytest.fixture
+    def mock_db_manager(self):
+        return Mock(spec=DatabaseManager)
+
+    @pytest.fixture
+    def duplicate_checker(self, mock_db_manager):
+        return DuplicateChecker(mock_db_manager)
+
+    def test_resolves_all_candidates_with_one_query(self, duplicate_checker, mock_db_manager):
+        from datetime import date
+        mock_db_manager.execute_query.return_value = [
+            {'ID': 7, 'ReferenceNumber': 'vendor', 'TransactionDate': date(2024, 1, 1),
+             'TransactionAmount': Decimal('100.00')},
+        ]
+        candidates = [
+            ('Vendor', '2024-01-01', 100.0),
+            ('Vendor', '2024-01-01', 21.0),
+            ('Vendor', '2024-01-01', 100.0),
+        ]
+
+        result = duplicate_checker.check_for_duplicates_batch(candidates)
+
+        mock_db_manager.execute_query.assert_called_once()
+        query, params = mock_db_manager.execute_query.call_args[0][:2]
+        assert 'SELECT *' not in query
+        assert '(ReferenceNumber, TransactionDate, TransactionAmount) IN' in query
+        # Identical candidates are only sent once
+        assert params == ['Vendor', '2024-01-01', 100.0, 'Vendor', '2024-01-01', 21.0]
+        assert [row['ID'] for row in result[('Vendor', '2024-01-01', 100.0)]] == [7]
+        assert result[('Vendor', '2024-01-01', 21.0)] == []
+
+    def test_invalid_candidate_raises_validation_error(self, duplicate_checker):
+        from duplicate_checker import ValidationError
+        with pytest.raises(ValidationError):
+            duplicate_checker.check_for_duplicates_batch([('Vendor', '2024-01-01', -5.0)])
+
+    def test_database_error_degrades_to_empty_results(self, duplicate_checker, mock_db_manager):
+        mock_db_manager.execute_query.side_effect = DatabaseError("Database error")
+        result = duplicate_checker.check_for_duplicates_batch([('Vendor', '2024-01-01', 10.0)])
+        assert result == {('Vendor', '2024-01-01', 10.0): []}
+
+    def test_connection_error_degrades_to_empty_results(self, duplicate_checker, mock_db_manager):
+        mock_db_manager.execute_query.side_effect = ConnectionResetError("connection reset")
+        result = duplicate_checker.check_for_duplicates_batch([('Vendor', '2024-01-01', 10.0)])
+        assert result == {('Vendor', '2024-01-01', 10.0): []}
+
+    def test_programming_error_is_raised(self, duplicate_checker, mock_db_manager):
+        mock_db_manager.execute_query.side_effect = AttributeError("bug")
+        with pytest.raises(AttributeError):
+            duplicate_checker.check_for_duplicates_batch([('Vendor', '2024-01-01', 10.0)])
+
+    def test_cache_serves_repeat_checks(self, duplicate_checker, mock_db_manager):
+        from duplicate_query_optimizer import QueryCache
+        mock_db_manager.execute_query.return_value = []
+        cache = QueryCache()
+        with patch('duplicate_checker.get_query_optimizer') as mock_get_optimizer:
+            mock_get_optimizer.return_value.cache = cache
+            duplicate_checker.check_for_duplicates_batch(
+                [('Vendor', '2024-01-01', 10.0)], use_cache=True
+            )
+            duplicate_checker.check_for_duplicates_batch(
+                [('Vendor', '2024-01-01', 10.0)], use_cache=True
+            )
+        mock_db_manager.execute_query.assert_called_once()
+        assert cache.hits == 1
+
+
 class TestDuplicateCheckerProperties:
     """
     **Feature: duplicate-invoice-detection, Property 1: Duplicate Detection Accuracy**
@@ -0,0 +1,170 @@
+"""
+Unit tests for the tenant entitlement cache.
+
+Tests cover:
+- One query per tenant snapshot, cache hits without queries
+- Function toggle overrides and registry defaults
+- Invalidation (single tenant and all tenants)
+- Changes made by other workers picked up through the row signature
+- Loads racing an invalidation are not cached
+- DB errors deny access and are not cached
+
+Requirements: 3.1, 3.2, 3.3, 4.5
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from db_exceptions import DatabaseError
+from services import entitlement_cache
+from services.entitlement_cache import (
+    get_entitlements,
+    invalidate_entitlements,
+)
+
+pytestmark = pytest.mark.usefixtures("reset_entitlement_cache")
+
+
+def _rows():
+    return [
+        {'kind': 'module', 'name': 'FIN', 'is_active': 1},
+        {'kind': 'module', 'name': 'STR', 'is_active': 0},
+        {'kind': 'function', 'name': 'assets', 'is_active': 0},
+    ]
+
+
+@pytest.fixture
+def db():
+    mock_db = Mock()
+    mock_db.execute_query = Mock(return_value=_rows())
+    return mock_db
+
+
+class TestGetEntitlements:
+
+    def test_builds_snapshot_from_single_query(self, db):
+        snapshot = get_entitlements('T1', db=db)
+
+        assert db.execute_query.call_count == 1
+        assert db.execute_query.call_args[0][1] == ('T1', 'T1')
+        assert snapshot.has_module('FIN') is True
+        assert snapshot.has_module('STR') is False
+        assert snapshot.function_enabled('assets') is False
+
+    def test_registry_default_when_no_override(self, db):
+        from services.function_registry import FUNCTION_REGISTRY
+
+        snapshot = get_entitlements('T1', db=db)
+
+        name = next(n for n in FUNCTION_REGISTRY if n != 'assets')
+        assert snapshot.function_enabled(name) == FUNCTION_REGISTRY[name]['default_enabled']
+        assert snapshot.function_enabled('no_such_function') is False
+
+    def test_cache_hit_issues_no_query(self, db):
+        first = get_entitlements('T1', db=db)
+        second = get_entitlements('T1', db=db)
+
+        assert second is first
+        assert db.execute_query.call_count == 1
+
+    def test_tenants_cached_separately(self, db):
+        get_entitlements('T1', db=db)
+        get_entitlements('T2', db=db)
+
+        assert db.execute_query.call_count == 2
+
+    def test_expired_snapshot_is_reloaded(self, db):
+        get_entitlements('T1', db=db)
+        with patch.object(entitlement_cache.time, 'time',
+                          return_value=entitlement_cache.time.time()
+                          + entitlement_cache.CACHE_TTL_SECONDS + 1):
+            get_entitlements('T1', db=db)
+
+        assert db.execute_query.call_count == 2
+
+    def test_db_error_denies_and_is_not_cached(self, db):
+        db.execute_query.side_effect = [DatabaseError('connection lost'), _rows()]
+
+        denied = get_entitlements('T1', db=db)
+        assert denied.has_module('FIN') is False
+
+        assert get_entitlements('T1', db=db).has_module('FIN') is True
+
+
+def _later(seconds):
+    return patch.object(entitlement_cache.time, 'time',
+                        return_value=entitlement_cache.time.time() + seconds)
+
+
+class TestSharedVersionCheck:
+
+    @staticmethod
+    def _route(db, signature):
+        def execute(query, params):
+            if query is entitlement_cache.SIGNATURE_QUERY:
+                return [signature]
+            return _rows()
+
+        db.execute_query.side_effect = execute
+
+    def test_unchanged_signature_keeps_snapshot(self, db):
+        self._route(db, {'row_count': 3, 'active_count': 1, 'updated_at': None})
+        first = get_entitlements('T1', db=db)
+
+        with _later(entitlement_cache.VERSION_CHECK_SECONDS + 1):
+            second = get_entitlements('T1', db=db)
+            third = get_entitlements('T1', db=db)
+
+        assert second is first and third is first
+        queries = [c[0][0] for c in db.execute_query.call_args_list]
+        assert queries == [entitlement_cache.ENTITLEMENT_QUERY,
+                           entitlement_cache.SIGNATURE_QUERY]
+
+    def test_change_by_other_worker_reloads(self, db):
+        # Another worker disabled a module: one row fewer is active
+        self._route(db, {'row_count': 3, 'active_count': 0, 'updated_at': None})
+        first = get_entitlements('T1', db=db)
+
+        with _later(entitlement_cache.VERSION_CHECK_SECONDS + 1):
+            second = get_entitlements('T1', db=db)
+
+        assert second is not first
+        assert db.execute_query.call_count == 3
+
+
+class TestInvalidateEntitlements:
+
+    def test_invalidate_tenant_forces_reload(self, db):
+        get_entitlements('T1', db=db)
+        get_entitlements('T2', db=db)
+
+        invalidate_entitlements('T1')
+        get_entitlements('T1', db=db)
+        get_entitlements('T2', db=db)
+
+        assert db.execute_query.call_count == 3
+
+    def test_invalidate_all_forces_reload(self, db):
+        get_entitlements('T1', db=db)
+        get_entitlements('T2', db=db)
+
+        invalidate_entitlements()
+        get_entitlements('T1', db=db)
+        get_entitlements('T2', db=db)
+
+        assert db.execute_query.call_count == 4
+
+    def test_load_racing_invalidation_is_not_cached(self, db):
+        def load_then_invalidate(*args, **kwargs):
+            # An endpoint changes modules while this load is in flight
+            invalidate_entitlements('T1')
+            return _rows()
+
+        db.execute_query.side_effect = load_then_invalidate
+        get_entitlements('T1', db=db)
+
+        db.execute_query.side_effect = None
+        db.execute_query.return_value = []
+        assert get_entitlements('T1', db=db).has_module('FIN') is False
+        assert db.execute_query.call_count == 2
@@ -0,0 +1,314 @@
+"""
+Unit tests for the per-tenant folder index (services/folder_index.py).
+
+Tests cover:
+- One full Drive listing, then lookups and listings from memory
+- Incremental refresh through the Drive changes feed (add, rename, trash, move)
+- Lookup misses catching up before reporting a folder as missing
+- create_folder / create_s3_folder updating the index in place
+- Relisting when the changes cursor has expired
+- Warm start from the persisted snapshot
+- list_s3_folders served from the same index
+"""
+
+import json
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from db_exceptions import DatabaseError
+from google_drive_service import FOLDER_MIME_TYPE, GoogleDriveService
+from services import folder_index
+from services.folder_index import get_folder_index
+
+pytestmark = pytest.mark.usefixtures("reset_folder_index")
+
+TENANT = "TestTenant"
+PARENT = "facturen_root"
+
+
+class _Request:
+
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result() if callable(self._result) else self._result
+
+
+class FakeDrive:
+    """Just enough of the Drive v3 API for folder listings and the changes feed."""
+
+    def __init__(self, page_size=2):
+        self.page_size = page_size
+        self.files_by_id = {}
+        self.changes_log = []  # list of fileIds, position = change token
+        self.calls = {"files.list": 0, "changes.list": 0, "files.create": 0}
+        self.expired = False
+        self._next_id = 0
+
+    # --- test helpers -------------------------------------------------
+
+    def add_folder(self, name, parent=PARENT):
+        self._next_id += 1
+        file_id = f"f{self._next_id}"
+        self.files_by_id[file_id] = {
+            "id": file_id,
+            "name": name,
+            "mimeType": FOLDER_MIME_TYPE,
+            "parents": [parent],
+            "trashed": False,
+            "webViewLink": f"https://drive/{file_id}",
+        }
+        self.changes_log.append(file_id)
+        return file_id
+
+    def update(self, file_id, **fields):
+        self.files_by_id[file_id].update(fields)
+        self.changes_log.append(file_id)
+
+    # --- API surface --------------------------------------------------
+
+    def files(self):
+        return self
+
+    def changes(self):
+        return _Changes(self)
+
+    def list(self, q, fields, pageSize, pageToken):
+        self.calls["files.list"] += 1
+        folders = sorted(
+            (
+                f
+                for f in self.files_by_id.values()
+                if PARENT in f["parents"] and not f["trashed"]
+            ),
+            key=lambda f: f["id"],
+        )
+        start = int(pageToken or 0)
+        page = folders[start : start + self.page_size]
+        more = start + self.page_size < len(folders)
+        return _Request(
+            {
+                "files": [
+                    {k: f[k] for k in ("id", "name", "webViewLink")} for f in page
+                ],
+                "nextPageToken": str(start + self.page_size) if more else None,
+            }
+        )
+
+    def create(self, body, fields):
+        self.calls["files.create"] += 1
+        file_id = self.add_folder(body["name"], body["parents"][0])
+        return _Request({"id": file_id, "name": body["name"]})
+
+
+class _Changes:
+
+    def __init__(self, drive):
+        self.drive = drive
+
+    def getStartPageToken(self):
+        return _Request(lambda: {"startPageToken": str(len(self.drive.changes_log))})
+
+    def list(self, pageToken, **kwargs):
+        drive = self.drive
+        drive.calls["changes.list"] += 1
+        if drive.expired:
+            raise HttpError(Mock(status=404), b"Invalid page token")
+        position = int(pageToken)
+        changes = [
+            {"fileId": file_id, "removed": False, "file": dict(drive.files_by_id[file_id])}
+            for file_id in drive.changes_log[position:]
+        ]
+        return _Request(
+            {"changes": changes, "newStartPageToken": str(len(drive.changes_log))}
+        )
+
+
+@pytest.fixture
+def drive():
+    return FakeDrive()
+
+
+@pytest.fixture
+def service(drive):
+    with patch.object(GoogleDriveService, "_authenticate", return_value=drive):
+        with patch.dict("os.environ", {"TEST_MODE": "false", "FACTUREN_FOLDER_ID": PARENT}):
+            yield GoogleDriveService(TENANT)
+
+
+@pytest.fixture
+def stale():
+    """Make every index stale on its next use."""
+    with patch.object(folder_index, "FOLDER_INDEX_REFRESH_SECONDS", 0):
+        yield
+
+
+class TestDriveFolderIndex:
+
+    def test_one_listing_serves_later_lookups(self, drive, service):
+        for name in ["Beta", "alpha", "Gamma"]:
+            drive.add_folder(name)
+
+        assert [f["name"] for f in service.list_subfolders()] == [
+            "alpha",
+            "Beta",
+            "Gamma",
+        ]
+        assert service.find_subfolder("Gamma")["id"] == "f3"
+        assert service.list_subfolders()[0]["url"] == "https://drive/f2"
+
+        assert drive.calls["files.list"] == 2  # One paginated listing
+        assert drive.calls["changes.list"] == 0
+
+    def test_stale_index_applies_changes_feed(self, drive, service, stale):
+        keep, rename, trash, move = (drive.add_folder(n) for n in "ABCD")
+        service.list_subfolders()
+
+        drive.add_folder("E")
+        drive.update(rename, name="B2")
+        drive.update(trash, trashed=True)
+        drive.update(move, parents=["elsewhere"])
+        names = [f["name"] for f in service.list_subfolders()]
+
+        assert names == ["A", "B2", "E"]
+        assert drive.calls["files.list"] == 2  # Still only the initial listing
+
+    def test_miss_catches_up_before_giving_up(self, drive, service):
+        drive.add_folder("Existing")
+        service.list_subfolders()
+        drive.add_folder("Created by another worker")
+
+        found = service.find_subfolder("Created by another worker")
+        missing = service.find_subfolder("Nobody")
+
+        assert found["name"] == "Created by another worker"
+        assert missing is None
+        assert drive.calls["changes.list"] == 2
+
+    def test_find_ignoring_case(self, drive, service):
+        drive.add_folder("BTW")
+
+        assert service.find_subfolder("btw") is None
+        assert service.find_subfolder("btw", ignore_case=True)["name"] == "BTW"
+
+    def test_refresh_lists_folders_created_by_another_worker(self, drive, service):
+        drive.add_folder("Existing")
+        service.list_subfolders()
+        drive.add_folder("Created by another worker")
+
+        assert len(service.list_subfolders()) == 1
+        assert len(service.list_subfolders(refresh=True)) == 2
+        assert drive.calls["changes.list"] == 1
+
+    def test_create_folder_updates_index_in_place(self, drive, service):
+        drive.add_folder("Existing")
+        service.list_subfolders()
+
+        created = service.create_folder("New supplier", PARENT)
+
+        assert service.find_subfolder("New supplier") == created
+        assert drive.calls["files.list"] == 1
+        assert drive.calls["changes.list"] == 0
+
+    def test_expired_cursor_relists(self, drive, service, stale):
+        drive.add_folder("A")
+        service.list_subfolders()
+        drive.expired = True
+        drive.add_folder("B")
+
+        assert [f["name"] for f in service.list_subfolders()] == ["A", "B"]
+        assert drive.calls["files.list"] == 2
+
+    def test_listing_error_returns_empty_list(self, service):
+        service.service = Mock()
+        service.service.changes.side_effect = RuntimeError("API Error")
+
+        assert service.list_subfolders() == []
+
+
+class TestPersistence:
+
+    def test_snapshot_saved_and_reused_by_a_new_process(self, drive, service):
+        saved = {}
+        db = MagicMock()
+        db.execute_query.side_effect = lambda query, params=None, **kw: (
+            saved.update(params=params) if "INSERT" in query else []
+        )
+        service.db = db
+        drive.add_folder("A")
+        service.list_subfolders()
+
+        tenant, provider, parent, token, folders, synced_at = saved["params"]
+        assert (tenant, provider, parent) == (TENANT, "google_drive", PARENT)
+        assert json.loads(folders)[0]["name"] == "A"
+
+        # A fresh process loads the snapshot and only asks for changes
+        folder_index.invalidate_folder_index()
+        db.execute_query.side_effect = lambda query, params=None, **kw: (
+            [{"page_token": token, "folders": folders, "synced_at": 0}]
+            if "SELECT" in query
+            else None
+        )
+        drive.add_folder("B")
+
+        assert [f["name"] for f in service.list_subfolders()] == ["A", "B"]
+        assert drive.calls["files.list"] == 1
+        assert drive.calls["changes.list"] == 1
+
+    def test_missing_table_keeps_index_in_memory(self, drive, service):
+        service.db = MagicMock()
+        service.db.execute_query.side_effect = DatabaseError("no such table")
+        drive.add_folder("A")
+
+        assert service.find_subfolder("A")["id"] == "f1"
+
+
+class TestS3FolderIndex:
+
+    @pytest.fixture
+    def storage(self):
+        storage = Mock()
+        storage.bucket = "bucket"
+        storage.parameter_service = None
+        storage._client.list_objects_v2.return_value = {
+            "CommonPrefixes": [{"Prefix": f"{TENANT}/invoices/Supplier1/"}],
+            "Contents": [],
+            "IsTruncated": False,
+        }
+        with patch("services.storage_resolver.get_s3_storage", return_value=storage):
+            yield storage
+
+    def test_list_s3_folders_uses_the_index(self, storage):
+        from services.storage_resolver import list_s3_folders
+
+        assert list_s3_folders(TENANT) == ["Supplier1"]
+        assert list_s3_folders(TENANT) == ["Supplier1"]
+        assert storage._client.list_objects_v2.call_count == 1
+
+    def test_refresh_relists_s3_folders(self, storage):
+        from services.storage_resolver import list_s3_folders
+
+        list_s3_folders(TENANT)
+        list_s3_folders(TENANT, refresh=True)
+
+        assert storage._client.list_objects_v2.call_count == 2
+
+    def test_create_s3_folder_adds_to_index(self, storage):
+        from services.storage_resolver import create_s3_folder, list_s3_folders
+
+        list_s3_folders(TENANT)
+        create_s3_folder(TENANT, "Supplier2")
+
+        assert list_s3_folders(TENANT) == ["Supplier1", "Supplier2"]
+        assert storage._client.list_objects_v2.call_count == 1
+
+    def test_indexes_are_per_tenant_and_parent(self):
+        assert get_folder_index("google_drive", "A", "x") is get_folder_index(
+            "google_drive", "A", "x"
+        )
+        assert get_folder_index("google_drive", "A", "x") is not get_folder_index(
+            "google_drive", "B", "x"
+        )
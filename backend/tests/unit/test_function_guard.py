@@ -19,6 +19,18 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from services.function_guard import function_guard
 
+pytestmark = pytest.mark.usefixtures("reset_entitlement_cache")
+
+
+def _module_row(name, is_active=True):
+    """Entitlement query row for a tenant_modules entry."""
+    return {'kind': 'module', 'name': name, 'is_active': is_active}
+
+
+def _function_row(name, is_active):
+    """Entitlement query row for a tenant_functions override."""
+    return {'kind': 'function', 'name': name, 'is_active': is_active}
+
 
 class TestFunctionGuardNoTenant:
     """Step 1: Returns 403 when tenant context is missing."""
@@ -110,11 +122,10 @@ class TestFunctionGuardFunctionCheck:
         with app.test_request_context():
             with patch('database.DatabaseManager') as MockDB:
                 mock_db = Mock()
-                # First call: has_module check - module is active
-                # Second call: get_function_state - function is disabled
-                mock_db.execute_query = Mock(side_effect=[
-                    [{'is_active': True}],   # has_module returns active
-                    [{'is_active': False}],   # get_function_state returns disabled
+                # Entitlement snapshot: module active, function disabled
+                mock_db.execute_query = Mock(return_value=[
+                    _module_row('FIN'),
+                    _function_row('assets', False),
                 ])
                 MockDB.return_value = mock_db
 
@@ -136,9 +147,9 @@ class TestFunctionGuardFunctionCheck:
         with app.test_request_context():
             with patch('database.DatabaseManager') as MockDB:
                 mock_db = Mock()
-                mock_db.execute_query = Mock(side_effect=[
-                    [{'is_active': True}],   # has_module
-                    [{'is_active': False}],   # get_function_state
+                mock_db.execute_query = Mock(return_value=[
+                    _module_row('FIN'),
+                    _function_row('generate_invoice', False),
                 ])
                 MockDB.return_value = mock_db
 
@@ -162,9 +173,9 @@ class TestFunctionGuardPassThrough:
         with app.test_request_context():
             with patch('database.DatabaseManager') as MockDB:
                 mock_db = Mock()
-                mock_db.execute_query = Mock(side_effect=[
-                    [{'is_active': True}],   # has_module - active
-                    [{'is_active': True}],   # get_function_state - enabled
+                mock_db.execute_query = Mock(return_value=[
+                    _module_row('FIN'),
+                    _function_row('assets', True),
                 ])
                 MockDB.return_value = mock_db
 
@@ -182,9 +193,9 @@ class TestFunctionGuardPassThrough:
         with app.test_request_context():
             with patch('database.DatabaseManager') as MockDB:
                 mock_db = Mock()
-                mock_db.execute_query = Mock(side_effect=[
-                    [{'is_active': True}],
-                    [{'is_active': True}],
+                mock_db.execute_query = Mock(return_value=[
+                    _module_row('FIN'),
+                    _function_row('assets', True),
                 ])
                 MockDB.return_value = mock_db
 
@@ -211,10 +222,8 @@ class TestFunctionGuardPassThrough:
         with app.test_request_context():
             with patch('database.DatabaseManager') as MockDB:
                 mock_db = Mock()
-                mock_db.execute_query = Mock(side_effect=[
-                    [{'is_active': True}],   # has_module - active
-                    [],                       # No override in tenant_functions
-                ])
+                # Module active, no override in tenant_functions
+                mock_db.execute_query = Mock(return_value=[_module_row('FIN')])
                 MockDB.return_value = mock_db
 
                 @function_guard('assets', 'FIN')
@@ -249,14 +258,14 @@ class TestFunctionGuardCheckOrder:
                 MockDB.assert_not_called()
 
     def test_module_check_before_function_check(self):
-        """If module inactive, should not query for function state."""
+        """Module and function state come from a single entitlement query."""
         import flask
         app = flask.Flask(__name__)
 
         with app.test_request_context():
             with patch('database.DatabaseManager') as MockDB:
                 mock_db = Mock()
-                # Only one call: has_module returns inactive
+                # Module inactive
                 mock_db.execute_query = Mock(return_value=[])
                 MockDB.return_value = mock_db
 
@@ -267,5 +276,5 @@ class TestFunctionGuardCheckOrder:
                 result = dummy(tenant='TestTenant')
                 response, status_code = result
                 assert status_code == 403
-                # Only one execute_query call (for module check)
+                # One entitlement query covers module and function state
                 assert mock_db.execute_query.call_count == 1
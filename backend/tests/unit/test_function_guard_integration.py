@@ -20,6 +20,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 from flask import Flask
 from routes.asset_routes import asset_bp
 
+pytestmark = pytest.mark.usefixtures("reset_entitlement_cache")
+
 
 def _make_jwt_token(email='admin@test.com', groups=None, tenants=None):
     """Create a fake JWT token with the given claims."""
@@ -77,11 +79,10 @@ class TestGuardBlocksWhenFunctionDisabled:
         mock_db = MagicMock()
         mock_db_class.return_value = mock_db
 
-        # has_module returns True (FIN module is active)
-        # get_function_state query returns disabled
-        mock_db.execute_query = MagicMock(side_effect=[
-            [{'is_active': True}],    # has_module check in function_guard
-            [{'is_active': False}],   # get_function_state in function_guard
+        # Entitlement query: FIN module active, assets function disabled
+        mock_db.execute_query = MagicMock(return_value=[
+            {'kind': 'module', 'name': 'FIN', 'is_active': True},
+            {'kind': 'function', 'name': 'assets', 'is_active': False},
         ])
 
         response = client.get('/api/assets', headers=auth_headers)
@@ -99,10 +100,10 @@ class TestGuardBlocksWhenFunctionDisabled:
         mock_db = MagicMock()
         mock_db_class.return_value = mock_db
 
-        # has_module returns True, get_function_state returns disabled
-        mock_db.execute_query = MagicMock(side_effect=[
-            [{'is_active': True}],    # has_module in function_guard
-            [{'is_active': False}],   # get_function_state
+        # Entitlement query: module active, function disabled
+        mock_db.execute_query = MagicMock(return_value=[
+            {'kind': 'module', 'name': 'FIN', 'is_active': True},
+            {'kind': 'function', 'name': 'assets', 'is_active': False},
         ])
 
         response = client.post(
@@ -129,10 +130,10 @@ class TestGuardPassesWhenFunctionEnabled:
         mock_db = MagicMock()
         mock_db_class.return_value = mock_db
 
-        # has_module returns True, get_function_state returns True
-        mock_db.execute_query = MagicMock(side_effect=[
-            [{'is_active': True}],    # has_module in function_guard
-            [{'is_active': True}],    # get_function_state in function_guard
+        # Entitlement query: module active, function enabled
+        mock_db.execute_query = MagicMock(return_value=[
+            {'kind': 'module', 'name': 'FIN', 'is_active': True},
+            {'kind': 'function', 'name': 'assets', 'is_active': True},
         ])
 
         # Mock the service layer to return some data
@@ -161,7 +162,7 @@ class TestGuardReturnsModuleError:
         mock_db = MagicMock()
         mock_db_class.return_value = mock_db
 
-        # has_module returns empty (module inactive)
+        # Entitlement query returns no rows (module inactive)
         mock_db.execute_query = MagicMock(return_value=[])
 
         response = client.get('/api/assets', headers=auth_headers)
@@ -180,7 +181,7 @@ class TestGuardReturnsModuleError:
         mock_db = MagicMock()
         mock_db_class.return_value = mock_db
 
-        # has_module returns empty (module inactive)
+        # Entitlement query returns no rows (module inactive)
         mock_db.execute_query = MagicMock(return_value=[])
 
         response = client.get('/api/assets', headers=auth_headers)
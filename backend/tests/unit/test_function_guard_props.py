@@ -11,15 +11,26 @@ Reference: .kiro/specs/tenant-optional-functions/design.md
 import sys
 import os
 import flask
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from hypothesis import given, strategies as st, settings
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
+from services.entitlement_cache import EntitlementSnapshot
 from services.function_registry import FUNCTION_REGISTRY
 from services.function_guard import function_guard
 
 
+def _snapshot(tenant, modules, overrides):
+    """Entitlement snapshot with the given active modules and toggle overrides."""
+    return EntitlementSnapshot(
+        tenant=tenant,
+        version=(0, 0),
+        active_modules=frozenset(modules),
+        function_overrides=overrides,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Strategies
 # ---------------------------------------------------------------------------
@@ -66,15 +77,10 @@ class TestGuardBlocksDisabledFunctions:
         # Create a Flask app and request context for jsonify to work
         app = flask.Flask(__name__)
         with app.test_request_context():
-            mock_db = MagicMock()
-
-            with patch('database.DatabaseManager', return_value=mock_db), \
-                 patch('services.module_registry.has_module', return_value=True), \
-                 patch('services.tenant_function_service.TenantFunctionService') as mock_service_cls:
+            snapshot = _snapshot(tenant, {module_name}, {function_name: False})
 
-                mock_service = MagicMock()
-                mock_service.get_function_state.return_value = False
-                mock_service_cls.return_value = mock_service
+            with patch('services.entitlement_cache.get_entitlements',
+                       return_value=snapshot):
 
                 result = mock_route(tenant=tenant)
 
@@ -124,15 +130,10 @@ class TestGuardPassesEnabledFunctions:
 
         app = flask.Flask(__name__)
         with app.test_request_context():
-            mock_db = MagicMock()
+            snapshot = _snapshot(tenant, {module_name}, {function_name: True})
 
-            with patch('database.DatabaseManager', return_value=mock_db), \
-                 patch('services.module_registry.has_module', return_value=True), \
-                 patch('services.tenant_function_service.TenantFunctionService') as mock_service_cls:
-
-                mock_service = MagicMock()
-                mock_service.get_function_state.return_value = True
-                mock_service_cls.return_value = mock_service
+            with patch('services.entitlement_cache.get_entitlements',
+                       return_value=snapshot):
 
                 result = mock_route(
                     tenant=tenant,
@@ -192,17 +193,12 @@ class TestGuardModulePriority:
         # Create a Flask app and request context for jsonify to work
         app = flask.Flask(__name__)
         with app.test_request_context():
-            mock_db = MagicMock()
-
-            # Patch at source modules where the local imports resolve from
-            with patch('database.DatabaseManager', return_value=mock_db), \
-                 patch('services.module_registry.has_module', return_value=False) as mock_has_module, \
-                 patch('services.tenant_function_service.TenantFunctionService') as mock_service_cls:
+            # Module inactive; function state is random - proves it doesn't matter
+            snapshot = _snapshot(tenant, set(), {function_name: function_state})
 
-                mock_service = MagicMock()
-                # Set function state to a random boolean - proves it doesn't matter
-                mock_service.get_function_state.return_value = function_state
-                mock_service_cls.return_value = mock_service
+            # Patch at the source module where the local import resolves from
+            with patch('services.entitlement_cache.get_entitlements',
+                       return_value=snapshot) as mock_get_entitlements:
 
                 # Call the decorated function with tenant in kwargs
                 result = mock_route(tenant=tenant)
@@ -219,8 +215,5 @@ class TestGuardModulePriority:
                 assert response_data['success'] is False
                 assert module_name in response_data['error']
 
-                # Verify has_module was called (module check happened)
-                mock_has_module.assert_called_once_with(mock_db, tenant, module_name)
-
-                # Verify TenantFunctionService was NOT used (no function check occurred)
-                mock_service.get_function_state.assert_not_called()
+                # Verify the tenant's entitlements were looked up once
+                mock_get_entitlements.assert_called_once_with(tenant)
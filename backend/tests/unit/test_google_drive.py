@@ -7,6 +7,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from google_drive_service import GoogleDriveService
 
+pytestmark = pytest.mark.usefixtures("reset_storage_clients", "reset_folder_index")
+
 class TestGoogleDriveService:
     
     @patch('google_drive_service.build')
@@ -226,9 +226,7 @@ class TestUploadToDriveGoogleDriveUnchanged:
         temp_path, _ = temp_pdf_file
         mock_gdrive = MagicMock()
         mock_gdrive_cls.return_value = mock_gdrive
-        mock_gdrive.list_subfolders.return_value = [
-            {'name': 'VendorX', 'id': 'folder123'}
-        ]
+        mock_gdrive.find_subfolder.return_value = {'name': 'VendorX', 'id': 'folder123'}
         mock_gdrive.check_file_exists.return_value = {'exists': False}
         mock_gdrive.upload_file.return_value = {
             'id': 'gdrive_file_id',
@@ -241,3 +239,5 @@ class TestUploadToDriveGoogleDriveUnchanged:
 
         assert result['id'] == 'gdrive_file_id'
         assert 'drive.google.com' in result['url']
+        mock_gdrive.find_subfolder.assert_called_once_with('VendorX')
+        mock_gdrive.list_subfolders.assert_not_called()
@@ -280,6 +280,59 @@ class TestLandingPagePublishService:
 
         assert body["settings"]["show_share_buttons"] is True
 
+    @staticmethod
+    def _serve_published(mock_s3, only=None):
+        """Make head_object return the hashes of the objects put so far."""
+        published = {
+            c[1]["Key"]: c[1]["Metadata"]
+            for c in mock_s3.put_object.call_args_list
+            if only is None or c[1]["Key"].endswith(only)
+        }
+
+        def head_object(Bucket, Key):
+            if Key not in published:
+                raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+            return {"Metadata": published[Key]}
+
+        mock_s3.head_object.side_effect = head_object
+
+    def test_republish_unchanged_writes_nothing(self, service, mock_s3, mock_asset_svc):
+        """Republishing an unchanged draft skips S3 writes, asset rows and invalidation."""
+        service.cloudfront_distribution_id = "DIST123"
+        service.publish("TestTenant", "admin@acme.nl")
+        self._serve_published(mock_s3)
+        mock_s3.reset_mock(return_value=False, side_effect=False)
+        mock_asset_svc.store_and_register.reset_mock()
+
+        result = service.publish("TestTenant", "admin@acme.nl")
+
+        assert result["success"] is True
+        assert result["changed"] == []
+        mock_s3.put_object.assert_not_called()
+        mock_s3.create_invalidation.assert_not_called()
+        mock_asset_svc.store_and_register.assert_not_called()
+
+    def test_republish_invalidates_only_changed_paths(self, service, mock_s3, mock_asset_svc):
+        """Only the changed artifact is written and invalidated."""
+        service.cloudfront_distribution_id = "DIST123"
+        service.publish("TestTenant", "admin@acme.nl")
+        self._serve_published(mock_s3, only="landing.json")
+        mock_s3.reset_mock(return_value=False, side_effect=False)
+        mock_asset_svc.store_and_register.reset_mock()
+
+        result = service.publish("TestTenant", "admin@acme.nl")
+
+        assert result["changed"] == ["index.html"]
+        assert mock_s3.put_object.call_count == 1
+        assert mock_s3.put_object.call_args[1]["Key"] == "acme-rentals/index.html"
+        assert mock_asset_svc.store_and_register.call_count == 1
+        batch = mock_s3.create_invalidation.call_args[1]["InvalidationBatch"]
+        assert batch["Paths"]["Items"] == [
+            "/acme-rentals/index.html",
+            "/acme-rentals",
+            "/acme-rentals/",
+        ]
+
     # ========================================================================
     # Unpublish tests (Task 1.12)
     # ========================================================================
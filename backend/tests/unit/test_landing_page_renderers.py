@@ -13,7 +13,15 @@ import pytest
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 
-from services.landing_page_renderers import LandingPageRenderers
+from services.landing_page_renderers import LandingPageRenderers, clear_section_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_rendered_sections():
+    """Start every test with an empty section cache."""
+    clear_section_cache()
+    yield
+    clear_section_cache()
 
 
 @pytest.fixture
@@ -656,6 +664,53 @@ class TestRenderSectionsHtml:
         assert "background:" in html
 
 
+class TestSectionCache:
+    """Tests for reuse of rendered section HTML across publishes."""
+
+    SECTIONS = [
+        {"type": "hero", "properties": {"title": "Hero"}, "layout": "default"},
+        {"type": "about", "properties": {"content_md": "About us"}, "layout": ""},
+    ]
+
+    def test_unchanged_sections_are_not_rendered_again(self, renderer):
+        """A second render of the same sections is served from the cache."""
+        first = renderer.render_sections_html(self.SECTIONS, "slug")
+
+        with patch.object(renderer, "render_section") as render_section:
+            second = renderer.render_sections_html(self.SECTIONS, "slug")
+
+        render_section.assert_not_called()
+        assert second == first
+
+    def test_only_changed_section_is_rendered(self, renderer):
+        """Editing one section re-renders only that section."""
+        renderer.render_sections_html(self.SECTIONS, "slug")
+        edited = [self.SECTIONS[0], {**self.SECTIONS[1], "properties": {"content_md": "New"}}]
+
+        with patch.object(
+            renderer, "render_section", wraps=renderer.render_section
+        ) as render_section:
+            html = renderer.render_sections_html(edited, "slug")
+
+        assert render_section.call_count == 1
+        assert render_section.call_args[0][0] == "about"
+        assert "New" in html
+
+    def test_branding_and_layout_are_part_of_the_key(self, renderer):
+        """Sections render again for other branding colours or another layout."""
+        other = LandingPageRenderers(
+            img_base="https://cdn.example.com/images",
+            color_accent="#000000",
+            color_primary="#2D5F8A",
+        )
+        section = self.SECTIONS[0]
+
+        assert renderer.section_key(section, "slug") != other.section_key(section, "slug")
+        assert renderer.section_key(section, "slug") != renderer.section_key(
+            {**section, "layout": "split"}, "slug"
+        )
+
+
 class TestPublishRoundTrip:
     """Task 27: Test publish round-trip — settings saved → published HTML has correct inline styles."""
 
@@ -0,0 +1,133 @@
+"""
+Unit tests for report_generators.ledger_totals
+
+Tests the shared ledger totals used by the BTW and Toeristenbelasting reports:
+- One filtered groupby per tenant, year and account set
+- Opening balance, year-to-date and quarter figures read from the totals
+- SQL fallback when the mutaties cache cannot serve the tenant
+"""
+
+import pytest
+from unittest.mock import Mock
+import pandas as pd
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from db_exceptions import DatabaseError
+from report_generators import ledger_totals
+
+
+VAT_ACCOUNTS = ['2010', '2020', '2021']
+
+
+@pytest.fixture
+def ledger():
+    return pd.DataFrame({
+        'TransactionDate': ['2025-01-01', '2025-02-15', '2025-05-10', '2025-03-01', '2024-02-01', '2025-02-01'],
+        'ReferenceNumber': ['Opening Balance', 'INV-001', 'INV-002', 'INV-003', 'INV-004', 'INV-005'],
+        'jaar': [2025, 2025, 2025, 2025, 2024, 2025],
+        'kwartaal': [1, 1, 2, 1, 1, 1],
+        'administration': ['TestAdmin', 'TestAdmin', 'TestAdmin', 'TestAdmin', 'TestAdmin', 'OtherAdmin'],
+        'Reknum': ['2010', '2020', '2020', '8001', '2020', '2020'],
+        'AccountName': ['BTW af te dragen', 'BTW hoog', 'BTW hoog', 'Omzet', 'BTW hoog', 'BTW hoog'],
+        'Amount': [-100.0, 300.0, 50.0, 1000.0, 999.0, 999.0],
+    })
+
+
+@pytest.fixture
+def totals(ledger):
+    cache = Mock()
+    cache.get_data.return_value = ledger
+    return ledger_totals.account_totals(
+        cache, Mock(), 'TestAdmin', 2025, VAT_ACCOUNTS + ['8001']
+    )
+
+
+class TestAccountTotals:
+    """Test the grouped totals frame"""
+
+    def test_requests_report_year_from_cache(self, ledger):
+        cache = Mock()
+        cache.get_data.return_value = ledger
+        db = Mock()
+
+        ledger_totals.account_totals(cache, db, 'TestAdmin', 2025, VAT_ACCOUNTS)
+
+        cache.get_data.assert_called_once_with(db, tenant='TestAdmin', requested_years=[2025])
+
+    def test_filters_tenant_year_and_accounts(self, totals):
+        assert totals['Amount'].sum() == pytest.approx(1250.0)
+        assert set(totals['Reknum']) == {'2010', '2020', '8001'}
+
+    def test_opening_balance(self, totals):
+        assert ledger_totals.opening_balance(totals, VAT_ACCOUNTS) == -100.0
+        assert ledger_totals.opening_balance(totals, ['8001']) is None
+
+    def test_year_to_date_excludes_opening_and_later_quarters(self, totals):
+        rows = ledger_totals.year_to_date_rows(totals, VAT_ACCOUNTS, 1)
+
+        assert rows == [{'Reknum': '2020', 'AccountName': 'BTW hoog', 'amount': 300.0}]
+
+    def test_quarter_rows(self, totals):
+        rows = ledger_totals.quarter_rows(totals, ['2020', '8001'], 2)
+
+        assert rows == [{'Reknum': '2020', 'AccountName': 'BTW hoog', 'amount': 50.0}]
+
+    def test_quarter_of(self):
+        assert ledger_totals.quarter_of('2025-03-31') == 1
+        assert ledger_totals.quarter_of('2025-12-31') == 4
+
+    def test_quarter_of_rejects_dates_inside_a_quarter(self):
+        with pytest.raises(ValueError, match='not the last day of a quarter'):
+            ledger_totals.quarter_of('2025-05-15')
+
+    def test_cache_error_falls_back_to_sql(self):
+        cache = Mock()
+        cache.get_data.side_effect = DatabaseError('load failed')
+        db = Mock()
+        db.execute_query.return_value = [
+            {'Reknum': '2020', 'AccountName': 'BTW hoog', 'kwartaal': 1,
+             'opening': 0, 'first_day': 0, 'Amount': 300},
+        ]
+
+        totals = ledger_totals.account_totals(cache, db, 'TestAdmin', 2025, VAT_ACCOUNTS)
+
+        params = db.execute_query.call_args[0][1]
+        assert params == ('Opening Balance', '2025-01-01', 'TestAdmin', 2025, *VAT_ACCOUNTS)
+        assert ledger_totals.opening_balance(totals, VAT_ACCOUNTS) is None
+        assert ledger_totals.quarter_rows(totals, VAT_ACCOUNTS, 1)[0]['amount'] == 300.0
+
+
+class TestAccountSums:
+    """Test per-account year sums"""
+
+    def test_sums_with_zero_for_missing_accounts(self, ledger):
+        cache = Mock()
+        cache.get_data.return_value = ledger[ledger['administration'] == 'TestAdmin']
+
+        sums = ledger_totals.account_sums(cache, Mock(), 2025, ['2020', '4007'], tenant='TestAdmin')
+
+        assert sums == {'2020': 350.0, '4007': 0.0}
+
+    def test_cache_error_falls_back_to_sql(self):
+        cache = Mock()
+        cache.get_data.side_effect = DatabaseError('load failed')
+        db = Mock()
+        db.execute_query.return_value = [{'Reknum': '8003', 'Amount': -1200}]
+
+        sums = ledger_totals.account_sums(cache, db, 2025, ['8003', '4007'], tenant='TestAdmin')
+
+        assert sums == {'8003': -1200.0, '4007': 0.0}
+
+    def test_cache_error_without_tenant_raises(self):
+        cache = Mock()
+        cache.get_data.side_effect = DatabaseError('load failed')
+
+        with pytest.raises(DatabaseError):
+            ledger_totals.account_sums(cache, Mock(), 2025, ['8003'])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
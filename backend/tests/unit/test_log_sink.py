@@ -0,0 +1,209 @@
+"""
+Unit tests for the batched audit/usage log writer (log_sink.py).
+
+Tests cover:
+- Synchronous writes while the sink is not started
+- Queued rows flushed as one batch per DatabaseManager
+- Table grouping that keeps INSERT/UPDATE order per table
+- Row-by-row retry of a failed batch and dropped rows
+- Synchronous fallback when the queue is full
+- stop() draining queued rows
+- Callers (AuditLogger, AIUsageTracker, EmailLogService) going through the sink
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from audit_logger import AuditLogger
+from db_exceptions import DatabaseError
+from log_sink import LogSink
+from services.ai_usage_tracker import AIUsageTracker
+from services.email_log_service import EmailLogService
+
+INSERT_AUDIT = "INSERT INTO duplicate_decision_log (decision) VALUES (%s)"
+INSERT_EMAIL = "INSERT INTO email_log (recipient) VALUES (%s)"
+UPDATE_EMAIL = "UPDATE email_log SET status = %s WHERE ses_message_id = %s"
+
+
+class FakeDB:
+
+    def __init__(self, fail_batches=False, bad_params=()):
+        self.batches = []
+        self.rows = []
+        self.fail_batches = fail_batches
+        self.bad_params = set(bad_params)
+        self.lock = threading.Lock()
+
+    def execute_batch_queries(self, queries_with_params):
+        with self.lock:
+            if self.fail_batches:
+                raise DatabaseError("batch failed")
+            self.batches.append(list(queries_with_params))
+            self.rows.extend(queries_with_params)
+        return [1] * len(queries_with_params)
+
+    def execute_query(self, query, params=None, fetch=True, commit=False):
+        with self.lock:
+            if params in self.bad_params:
+                raise DatabaseError("bad row")
+            self.rows.append((query, params))
+        return 42
+
+
+@pytest.fixture
+def sink():
+    sink = LogSink(queue_size=100, batch_size=50, flush_interval=0.02)
+    yield sink
+    sink.stop(timeout=2)
+
+
+class TestSynchronousMode:
+
+    def test_write_executes_immediately_when_not_started(self):
+        db = MagicMock()
+        db.execute_query.return_value = 7
+
+        result = LogSink().write(db, INSERT_AUDIT, ("continue",))
+
+        assert result == 7
+        db.execute_query.assert_called_once_with(
+            INSERT_AUDIT, ("continue",), fetch=False, commit=True
+        )
+
+    def test_synchronous_errors_propagate(self):
+        db = MagicMock()
+        db.execute_query.side_effect = DatabaseError("db down")
+
+        with pytest.raises(DatabaseError):
+            LogSink().write(db, INSERT_AUDIT, ("continue",))
+
+
+class TestBatching:
+
+    def test_queued_rows_are_written_in_one_batch(self, sink):
+        db = FakeDB()
+        sink.start()
+
+        results = [sink.write(db, INSERT_AUDIT, (f"row{i}",)) for i in range(10)]
+
+        assert results == [None] * 10
+        assert sink.flush(timeout=2)
+        assert len(db.rows) == 10
+        assert len(db.batches) == 1
+        assert sink.stats()["written"] == 10
+
+    def test_batches_are_split_per_database_manager(self, sink):
+        first, second = FakeDB(), FakeDB()
+        sink.start()
+
+        sink.write(first, INSERT_AUDIT, ("a",))
+        sink.write(second, INSERT_AUDIT, ("b",))
+        sink.write(first, INSERT_AUDIT, ("c",))
+        sink.flush(timeout=2)
+
+        assert [params for _, params in first.rows] == [("a",), ("c",)]
+        assert [params for _, params in second.rows] == [("b",)]
+
+    def test_rows_are_grouped_by_table_keeping_their_order(self, sink):
+        db = FakeDB()
+        sink.start()
+
+        sink.write(db, INSERT_EMAIL, ("x@example.com",))
+        sink.write(db, INSERT_AUDIT, ("continue",))
+        sink.write(db, UPDATE_EMAIL, ("delivered", "msg-1"))
+        sink.write(db, INSERT_AUDIT, ("cancel",))
+        sink.flush(timeout=2)
+
+        assert [query for query, _ in db.batches[0]] == [
+            INSERT_AUDIT,
+            INSERT_AUDIT,
+            INSERT_EMAIL,
+            UPDATE_EMAIL,
+        ]
+
+    def test_failed_batch_is_retried_row_by_row(self, sink):
+        db = FakeDB(fail_batches=True, bad_params=[("bad",)])
+        sink.start()
+
+        for params in [("a",), ("bad",), ("b",)]:
+            sink.write(db, INSERT_AUDIT, params)
+        sink.flush(timeout=2)
+
+        assert [params for _, params in db.rows] == [("a",), ("b",)]
+        stats = sink.stats()
+        assert stats["written"] == 2
+        assert stats["dropped"] == 1
+
+
+class TestBackpressureAndShutdown:
+
+    def test_full_queue_falls_back_to_synchronous_write(self):
+        sink = LogSink(queue_size=1, enqueue_timeout=0.01)
+        db = FakeDB()
+        sink._enabled = True  # Queueing without a flush thread
+        with patch.object(sink, "_ensure_thread"):
+            assert sink.write(db, INSERT_AUDIT, ("queued",)) is None
+            assert sink.write(db, INSERT_AUDIT, ("sync",)) == 42
+
+        assert db.rows == [(INSERT_AUDIT, ("sync",))]
+        assert sink.stats()["sync_fallbacks"] == 1
+        sink._enabled = False
+        sink._drain()
+        assert db.rows[-1] == (INSERT_AUDIT, ("queued",))
+
+    def test_stop_drains_queue_and_switches_to_synchronous(self):
+        sink = LogSink(flush_interval=5.0)
+        db = FakeDB()
+        sink.start()
+        for i in range(5):
+            sink.write(db, INSERT_AUDIT, (i,))
+
+        sink.stop(timeout=2)
+
+        assert len(db.rows) == 5
+        assert not sink.running
+        assert sink.write(db, INSERT_AUDIT, ("after",)) == 42
+
+
+class TestCallers:
+
+    @pytest.fixture
+    def running_sink(self, sink):
+        sink.start()
+        with (
+            patch("audit_logger.get_log_sink", return_value=sink),
+            patch("services.ai_usage_tracker.get_log_sink", return_value=sink),
+            patch("services.email_log_service.get_log_sink", return_value=sink),
+        ):
+            yield sink
+
+    def test_audit_logger_queues_decision(self, running_sink):
+        db = FakeDB()
+
+        assert AuditLogger(db).log_decision("REF", "2025-01-01", 10.0, "continue")
+        running_sink.flush(timeout=2)
+
+        query, params = db.rows[0]
+        assert "duplicate_decision_log" in query
+        assert params[1:5] == ("REF", "2025-01-01", 10.0, "continue")
+
+    def test_ai_usage_tracker_queues_request(self, running_sink):
+        db = FakeDB()
+
+        assert AIUsageTracker(db).log_ai_request("Tenant", "str_invoice_nl", 1000)
+        running_sink.flush(timeout=2)
+
+        assert db.rows[0][1][:3] == ["Tenant", "template_help_str_invoice_nl", 1000]
+
+    def test_email_log_service_queues_send(self, running_sink):
+        db = FakeDB()
+        service = EmailLogService.__new__(EmailLogService)
+        service.db = db
+
+        assert service.log_sent("x@example.com", "invite", "Tenant", "msg-1") is None
+        assert service.update_status("msg-1", "delivered")
+        running_sink.flush(timeout=2)
+
+        assert [query.split()[0] for query, _ in db.rows] == ["INSERT", "UPDATE"]
@@ -11,6 +11,8 @@ from unittest.mock import MagicMock, patch
 from db_exceptions import IntegrityError
 from services.media_asset_service import MediaAssetService
 
+pytestmark = pytest.mark.usefixtures("reset_storage_clients")
+
 
 @pytest.fixture
 def mock_db():
@@ -730,7 +732,8 @@ class TestDeleteRaw:
         with patch('services.media_asset_service.boto3.client', return_value=mock_s3) as mock_client:
             service._delete_raw('prod-bucket', 'TenantA/invoices/ast_123_doc.pdf')
 
-        mock_client.assert_called_once_with('s3')
+        mock_client.assert_called_once()
+        assert mock_client.call_args.args == ('s3',)
         mock_s3.delete_object.assert_called_once_with(
             Bucket='prod-bucket',
             Key='TenantA/invoices/ast_123_doc.pdf',
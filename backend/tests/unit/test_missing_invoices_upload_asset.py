@@ -44,12 +44,12 @@ def client():
 
 @pytest.fixture(autouse=True)
 def bypass_function_guard():
-    """Mock function_guard's internal DB calls to allow function access."""
-    mock_service = MagicMock()
-    mock_service.get_function_state.return_value = True
+    """Mock function_guard's entitlement lookup to allow function access."""
+    entitlements = MagicMock()
+    entitlements.has_module.return_value = True
+    entitlements.function_enabled.return_value = True
 
-    with patch('services.module_registry.has_module', return_value=True), \
-         patch('services.tenant_function_service.TenantFunctionService', return_value=mock_service):
+    with patch('services.entitlement_cache.get_entitlements', return_value=entitlements):
         yield
 
 
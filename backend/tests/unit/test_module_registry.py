@@ -17,6 +17,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 from services.module_registry import MODULE_REGISTRY, has_module, module_required
 from services.parameter_service import ParameterService
 
+pytestmark = pytest.mark.usefixtures("reset_entitlement_cache")
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -172,7 +174,9 @@ class TestModuleRequiredDecorator:
         with app.test_request_context():
             with patch('database.DatabaseManager') as MockDB:
                 mock_db = Mock()
-                mock_db.execute_query = Mock(return_value=[{'is_active': True}])
+                mock_db.execute_query = Mock(return_value=[
+                    {'kind': 'module', 'name': 'FIN', 'is_active': True},
+                ])
                 MockDB.return_value = mock_db
 
                 @module_required('FIN')
@@ -150,7 +150,7 @@ class TestGetData:
             'Ref3': [''], 'Ref4': ['']
         })
 
-        with patch('mutaties_cache.pd.read_sql', return_value=fresh_data):
+        with patch('mutaties_cache_loader.read_frame', return_value=fresh_data):
             result = cache.get_data(mock_db)
 
         assert cache.last_loaded is not None
@@ -175,7 +175,7 @@ class TestGetData:
             'Ref3': [''], 'Ref4': ['']
         })
 
-        with patch('mutaties_cache.pd.read_sql', return_value=sample_data):
+        with patch('mutaties_cache_loader.read_frame', return_value=sample_data):
             result = cache.get_data(mock_db)
 
         assert cache.data is not None
@@ -210,7 +210,7 @@ class TestGetData:
             'Ref3': [''], 'Ref4': ['']
         })
 
-        with patch('mutaties_cache.pd.read_sql', return_value=new_year_data):
+        with patch('mutaties_cache_loader.read_frame', return_value=new_year_data):
             result = cache.get_data(mock_db, tenant="Admin1", requested_years=[2023])
 
         # Data should now contain both years
@@ -262,7 +262,7 @@ class TestLoadAdditionalYear:
             'Ref3': [''], 'Ref4': ['']
         })
 
-        with patch('mutaties_cache.pd.read_sql', return_value=year_data):
+        with patch('mutaties_cache_loader.read_frame', return_value=year_data):
             result = cache.load_additional_year(mock_db, 2022)
 
         assert result is True
@@ -300,7 +300,7 @@ class TestLoadAdditionalYear:
             'Ref3': [''], 'Ref4': ['']
         })
 
-        with patch('mutaties_cache.pd.read_sql', return_value=year_data):
+        with patch('mutaties_cache_loader.read_frame', return_value=year_data):
             result = cache.load_additional_year(mock_db, 2024)
 
         assert result is True
@@ -432,7 +432,7 @@ class TestRefresh:
             'Ref4': ['', '']
         })
 
-        with patch('mutaties_cache.pd.read_sql', return_value=sample_data):
+        with patch('mutaties_cache_loader.read_frame', return_value=sample_data):
             cache._refresh(mock_db, 'Admin1')
 
         assert cache.data is not None
@@ -459,7 +459,7 @@ class TestRefresh:
             'Ref3': [''], 'Ref4': ['']
         })
 
-        with patch('mutaties_cache.pd.read_sql', return_value=sample_data):
+        with patch('mutaties_cache_loader.read_frame', return_value=sample_data):
             cache._refresh(mock_db, 'Admin1')
 
         assert pd.api.types.is_datetime64_any_dtype(cache.data['TransactionDate'])
@@ -479,7 +479,7 @@ class TestRefresh:
         mock_db.get_connection.return_value = mock_conn
         mock_db.execute_query.return_value = []
 
-        with patch('mutaties_cache.pd.read_sql', side_effect=Exception("DB error")):
+        with patch('mutaties_cache_loader.read_frame', side_effect=Exception("DB error")):
             cache._refresh(mock_db, 'Admin1')
 
         # Old data should be preserved (Admin1 entry should still exist)
@@ -494,7 +494,7 @@ class TestRefresh:
         mock_db.get_connection.return_value = mock_conn
         mock_db.execute_query.return_value = []
 
-        with patch('mutaties_cache.pd.read_sql', side_effect=Exception("DB error")):
+        with patch('mutaties_cache_loader.read_frame', side_effect=Exception("DB error")):
             with pytest.raises(Exception, match="DB error"):
                 cache._refresh(mock_db, 'Admin1')
 
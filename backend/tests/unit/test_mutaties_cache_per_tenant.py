@@ -73,7 +73,7 @@ class TestPerTenantGetData:
 
         tenant_df = _make_df("TenantA", 2025, 5)
 
-        with patch("pandas.read_sql", return_value=tenant_df):
+        with patch("mutaties_cache_loader.read_frame", return_value=tenant_df):
             result = cache.get_data(mock_db, tenant="TenantA")
 
         assert len(result) == 5
@@ -90,7 +90,7 @@ class TestPerTenantGetData:
 
         df_all = pd.concat([_make_df("A", 2025, 3), _make_df("B", 2025, 4)])
 
-        with patch("pandas.read_sql", return_value=df_all):
+        with patch("mutaties_cache_loader.read_frame", return_value=df_all):
             result = cache.get_data(mock_db)
 
         assert result is not None
@@ -137,7 +137,7 @@ class TestPerTenantGetData:
         mock_db.execute_query.return_value = []
 
         new_df = _make_df("TenantA", 2025, 12)
-        with patch("pandas.read_sql", return_value=new_df):
+        with patch("mutaties_cache_loader.read_frame", return_value=new_df):
             result = cache.get_data(mock_db, tenant="TenantA")
 
         assert len(result) == 12
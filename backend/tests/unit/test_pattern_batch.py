@@ -0,0 +1,187 @@
+"""
+Unit tests for batch pattern analysis across administrations.
+
+Tests cover:
+- Chunked, pooled analysis stores the same patterns as a single pass
+- Chunk results pickle across a real process pool
+- Per-tenant progress, timing and failure isolation
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from unittest.mock import MagicMock
+
+from db_exceptions import DatabaseError
+from pattern_analyzer import PatternAnalyzer
+from pattern_batch import PatternBatchAnalyzer, analyze_pattern_chunk
+from pattern_detection import analyze_transaction_patterns
+
+
+def _tx(debet, credit, description, ref, day):
+    return {
+        'Debet': debet,
+        'Credit': credit,
+        'TransactionDescription': description,
+        'ReferenceNumber': ref,
+        'TransactionAmount': 10.0,
+        'TransactionDate': f'2025-02-{day:02d}',
+        'administration': 'TenantA',
+    }
+
+
+TRANSACTIONS = [
+    _tx('4000', '1300', 'PICNIC betaling', 'Picnic', 1),
+    _tx('1300', '8000', 'ANWB Energie 7073498490', 'ANWB', 2),
+    _tx('4000', '1300', 'PICNIC betaling', 'Picnic', 3),
+    _tx('1300', '4010', 'KPN abonnement', 'KPN', 4),
+    _tx(None, '1300', 'Onbekend', '', 5),
+]
+
+
+def _sync_submit(func, *args):
+    future = Future()
+    future.set_result(func(*args))
+    return future
+
+
+def _chunks(rows, size):
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def _analyzer(rows_by_tenant, chunk_size=2):
+    analyzer = MagicMock()
+    analyzer.get_bank_accounts.return_value = {
+        'tenanta_1300': {},
+        'tenantb_1300': {},
+    }
+    analyzer.build_history_query.side_effect = lambda admin, since: ('SELECT', (admin,))
+
+    def stream_rows(query, params, chunk_size):
+        rows = rows_by_tenant[params[0]]
+        if isinstance(rows, Exception):
+            raise rows
+        return iter(_chunks(rows, chunk_size))
+
+    analyzer.db.stream_rows.side_effect = stream_rows
+    analyzer.build_analysis_result.side_effect = partial(
+        PatternAnalyzer.build_analysis_result, analyzer
+    )
+    return analyzer
+
+
+def _is_bank(account, admin):
+    return account == '1300'
+
+
+class TestAnalyzePatternChunk:
+
+    def test_counts_and_statistics(self):
+        counters, counts = analyze_pattern_chunk(
+            TRANSACTIONS, 'TenantA', frozenset({'tenanta_1300'})
+        )
+
+        assert counters.transactions == 5
+        assert counters.finalize() == analyze_transaction_patterns(
+            TRANSACTIONS, 'TenantA', _is_bank
+        )
+        assert counts['missing_fields']['debet'] == 1
+        assert counts['missing_fields']['reference'] == 1
+
+
+class TestPatternBatchAnalyzer:
+
+    def test_stores_single_pass_result_per_tenant(self):
+        analyzer = _analyzer({'TenantA': TRANSACTIONS})
+        batch = PatternBatchAnalyzer(analyzer, submit=_sync_submit, chunk_size=2)
+
+        reports = batch.run(['TenantA'])
+
+        report = reports['TenantA']
+        assert report.status == 'done'
+        assert report.transactions == 5
+        assert report.chunks == 3
+        administration, result = analyzer.save_full_analysis.call_args[0]
+        assert administration == 'TenantA'
+        expected = analyze_transaction_patterns(TRANSACTIONS, 'TenantA', _is_bank)
+        assert result['reference_patterns'] == expected['reference']
+        assert result['debet_patterns'] == expected['debet']
+        assert result['total_transactions'] == 5
+        assert result['statistics']['missing_fields']['debet'] == 1
+        assert report.patterns_discovered == result['patterns_discovered']
+
+    def test_process_pool(self):
+        analyzer = _analyzer({'TenantA': TRANSACTIONS, 'TenantB': TRANSACTIONS[:2]})
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            batch = PatternBatchAnalyzer(
+                analyzer, submit=executor.submit, chunk_size=2, max_pending_chunks=2
+            )
+            reports = batch.run(['TenantA', 'TenantB'])
+
+        assert [r.status for r in reports.values()] == ['done', 'done']
+        assert analyzer.save_full_analysis.call_count == 2
+
+    def test_failed_tenant_does_not_stop_others(self):
+        analyzer = _analyzer({
+            'TenantA': DatabaseError('connection lost'),
+            'TenantB': TRANSACTIONS,
+        })
+        progress = []
+        batch = PatternBatchAnalyzer(analyzer, submit=_sync_submit)
+
+        reports = batch.run(
+            ['TenantA', 'TenantB'],
+            on_progress=lambda r: progress.append((r.administration, r.status)),
+        )
+
+        assert reports['TenantA'].status == 'failed'
+        assert reports['TenantA'].error == 'connection lost'
+        assert reports['TenantB'].status == 'done'
+        assert progress == [
+            ('TenantA', 'running'),
+            ('TenantA', 'failed'),
+            ('TenantB', 'running'),
+            ('TenantB', 'done'),
+        ]
+
+    def test_tenant_stored_before_next_tenant_streams(self):
+        analyzer = _analyzer({'TenantA': TRANSACTIONS, 'TenantB': TRANSACTIONS[:2]})
+        events = []
+        stream_rows = analyzer.db.stream_rows.side_effect
+
+        def recording_stream(query, params, chunk_size):
+            events.append(('streamed', params[0]))
+            return stream_rows(query, params, chunk_size)
+
+        analyzer.db.stream_rows.side_effect = recording_stream
+        analyzer.save_full_analysis.side_effect = (
+            lambda admin, result: events.append(('saved', admin))
+        )
+        batch = PatternBatchAnalyzer(analyzer, submit=_sync_submit, chunk_size=2)
+
+        batch.run(['TenantA', 'TenantB'])
+
+        assert events == [
+            ('streamed', 'TenantA'),
+            ('saved', 'TenantA'),
+            ('streamed', 'TenantB'),
+            ('saved', 'TenantB'),
+        ]
+
+    def test_tenant_without_transactions_keeps_stored_patterns(self):
+        analyzer = _analyzer({'TenantA': []})
+        batch = PatternBatchAnalyzer(analyzer, submit=_sync_submit)
+
+        reports = batch.run(['TenantA'])
+
+        assert reports['TenantA'].status == 'done'
+        analyzer.save_full_analysis.assert_not_called()
+
+    def test_defaults_to_all_tenants(self):
+        analyzer = _analyzer({'TenantA': [], 'TenantB': []})
+        analyzer.db.execute_query.return_value = [
+            {'administration': 'TenantA'},
+            {'administration': 'TenantB'},
+        ]
+        batch = PatternBatchAnalyzer(analyzer, submit=_sync_submit)
+
+        assert list(batch.run()) == ['TenantA', 'TenantB']
@@ -10,6 +10,8 @@ Tests pattern detection against known bank descriptions:
 - analyze_debet_patterns() - Debet pattern analysis
 - analyze_credit_patterns() - Credit pattern analysis
 - analyze_reference_patterns() - Reference/verb pattern analysis
+- description_features() / analyze_transaction_patterns() - Single-pass analysis
+- PatternCounters - Chunked counting and merging
 
 Task 53 of Phase 7: Missing Test Coverage
 """
@@ -30,6 +32,9 @@ from pattern_detection import (
     analyze_debet_patterns,
     analyze_credit_patterns,
     analyze_reference_patterns,
+    analyze_transaction_patterns,
+    description_features,
+    PatternCounters,
 )
 
 
@@ -421,3 +426,122 @@ class TestAnalyzeReferencePatterns:
         # Should have compound key with pipe separator
         has_compound = any('|' in p.get('verb', '') for p in result.values())
         assert has_compound
+
+
+# ── single-pass analysis ───────────────────────────────────────────────────
+
+
+DESCRIPTIONS = [
+    'ANWB Energie B.V. 100431234 NL28BUKK',
+    'BCK*ALBERT HEIJN 1234 AMSTERDAM',
+    'Betaalverzoek PICNIC bestelling',
+    'QG0DBCBZELL92QM4',
+    'Booking.com NO.ABC123/ID.456',
+    'KPN',
+    '',
+    '   ',
+]
+
+
+class TestDescriptionFeatures:
+
+    @pytest.mark.parametrize('description', DESCRIPTIONS)
+    def test_matches_individual_extractors(self, description):
+        """Memoized features equal the individual extraction functions."""
+        features = description_features(description)
+        assert list(features.keywords) == extract_keywords(description)
+        assert features.company == (
+            extract_company_name(description) if description else None
+        )
+        assert features.compound_verb == extract_compound_verb_from_description(
+            description, ''
+        )
+        assert features.verb == extract_verb_from_description(description, '')
+
+
+class TestAnalyzeTransactionPatterns:
+
+    def _only_1300_is_bank(self, account, admin):
+        return account == '1300'
+
+    def test_single_pass_matches_separate_passes(self):
+        transactions = [
+            {
+                'Debet': debet, 'Credit': credit,
+                'TransactionDescription': description,
+                'ReferenceNumber': ref,
+                'TransactionAmount': amount,
+                'TransactionDate': f'2025-0{month}-01',
+            }
+            for month, (debet, credit, description, ref, amount) in enumerate([
+                ('4000', '1300', 'PICNIC betaling', 'Picnic', 50.0),
+                ('1300', '8000', 'ANWB Energie 7073498490', 'ANWB', 89.5),
+                ('4000', '1300', 'PICNIC betaling', 'Picnic', 25.0),
+                ('1300', '4010', 'KPN abonnement', 'KPN', 30.0),
+                ('4500', '1300', 'KPN abonnement', 'KPN', 30.0),
+                ('4000', '8000', 'Memoriaal', '', 10.0),
+            ], start=1)
+        ]
+
+        result = analyze_transaction_patterns(
+            transactions, 'Admin', self._only_1300_is_bank
+        )
+
+        assert result['debet'] == analyze_debet_patterns(
+            transactions, 'Admin', self._only_1300_is_bank
+        )
+        assert result['credit'] == analyze_credit_patterns(
+            transactions, 'Admin', self._only_1300_is_bank
+        )
+        assert result['reference'] == analyze_reference_patterns(
+            transactions, 'Admin', self._only_1300_is_bank
+        )
+        assert len(result['debet']) == 2
+        assert result['reference']['Admin_1300_KPN']['_ambiguous'] is True
+
+    def test_include_limits_output(self):
+        result = analyze_transaction_patterns(
+            [], 'Admin', self._only_1300_is_bank, include=('credit',)
+        )
+        assert result == {'credit': {}}
+
+
+class TestPatternCountersMerge:
+
+    def _only_1300_is_bank(self, account, admin):
+        return account == '1300'
+
+    def test_merged_chunks_equal_single_pass(self):
+        rows = [
+            ('4000', '1300', 'PICNIC betaling', 'Picnic', 50.0),
+            ('1300', '8000', 'ANWB Energie 7073498490', 'ANWB', 89.5),
+            ('4000', '1300', 'PICNIC betaling', 'Picnic', 25.0),
+            ('1300', '4010', 'KPN abonnement', 'KPN', 30.0),
+            ('4500', '1300', 'KPN abonnement', 'KPN', 30.0),
+            ('4000', '1300', 'ASR Schadeverzekering 12345', 'ASR', 12.0),
+            ('4000', '1300', 'ASR Schadeverzekering 12345', 'ASR', 12.5),
+            ('4000', '1300', 'PICNIC bestelling', 'Picnic', 40.0),
+        ]
+        transactions = [
+            {
+                'Debet': debet, 'Credit': credit,
+                'TransactionDescription': description,
+                'ReferenceNumber': ref,
+                'TransactionAmount': amount,
+                'TransactionDate': f'2025-01-{day:02d}',
+            }
+            for day, (debet, credit, description, ref, amount) in enumerate(rows, start=1)
+        ]
+        expected = analyze_transaction_patterns(
+            transactions, 'Admin', self._only_1300_is_bank
+        )
+
+        counters = PatternCounters('Admin')
+        for start in range(0, len(transactions), 3):
+            chunk = PatternCounters('Admin').add(
+                transactions[start:start + 3], self._only_1300_is_bank
+            )
+            counters.merge(chunk)
+
+        assert counters.transactions == len(transactions)
+        assert counters.finalize() == expected
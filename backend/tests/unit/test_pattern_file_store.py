@@ -0,0 +1,136 @@
+"""
+Unit tests for the sharded L3 pattern cache file store.
+
+Tests cover:
+- Round trip with and without memory-mapped reads
+- TTL in the header: expired entries are misses and get removed
+- Atomic writes leave no temp files; concurrent writers never corrupt entries
+- Prefix deletes (per-administration invalidation) read headers only
+- PersistentPatternCache persists and reloads entries through the store
+"""
+
+import threading
+import time
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pattern_file_store
+from pattern_cache import PersistentPatternCache
+from pattern_file_store import FILE_SUFFIX, ShardedFileStore
+
+
+PATTERNS = {
+    'reference_patterns': {
+        'admin_1300_KPN': {'verb': 'KPN', 'last_seen': date(2025, 3, 1)},
+    },
+    'patterns_discovered': 1,
+}
+
+
+@pytest.fixture(params=[True, False], ids=['mmap', 'read'])
+def store(request, tmp_path):
+    return ShardedFileStore(tmp_path / 'patterns', use_mmap=request.param)
+
+
+class TestShardedFileStore:
+
+    def test_round_trip_preserves_types(self, store):
+        store.put('Admin', PATTERNS, ttl_seconds=60)
+
+        assert store.get('Admin') == PATTERNS
+        assert store.get('Other') is None
+
+    def test_one_file_per_key(self, store):
+        store.put('Admin', PATTERNS, ttl_seconds=60)
+        store.put('Admin_ref:KPN', PATTERNS, ttl_seconds=60)
+        store.put('Admin', {'patterns_discovered': 0}, ttl_seconds=60)
+
+        files = list(store.root.rglob('*'))
+        entries = [f for f in files if f.suffix == FILE_SUFFIX]
+        assert len(entries) == 2
+        assert not [f for f in files if f.name.startswith('.tmp-')]
+        assert store.get('Admin') == {'patterns_discovered': 0}
+
+    def test_expired_entry_is_removed(self, store):
+        store.put('Admin', PATTERNS, ttl_seconds=60)
+
+        with patch.object(pattern_file_store.time, 'time', return_value=time.time() + 61):
+            assert store.get('Admin') is None
+
+        assert not store.path_for('Admin').exists()
+
+    def test_corrupt_file_is_a_miss(self, store):
+        path = store.path_for('Admin')
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b'not a cache file')
+
+        assert store.get('Admin') is None
+        assert not path.exists()
+
+    def test_delete_prefix_and_keys(self, store):
+        for key in ('Admin_ref:A', 'Admin_deb:4000', 'Other_ref:A', 'Admin'):
+            store.put(key, PATTERNS, ttl_seconds=60)
+
+        assert store.delete_prefix('Admin_') == 2
+        assert sorted(store.keys()) == ['Admin', 'Other_ref:A']
+
+    def test_purge_expired(self, store):
+        store.put('Old', PATTERNS, ttl_seconds=-1)
+        store.put('New', PATTERNS, ttl_seconds=60)
+
+        assert store.purge_expired() == 1
+        assert store.keys() == ['New']
+        assert list(store) == ['New']
+
+    def test_concurrent_writers_leave_a_complete_entry(self, store):
+        values = [{'writer': i, 'payload': 'x' * 10_000} for i in range(8)]
+        errors = []
+
+        def write_and_read(value):
+            try:
+                for _ in range(20):
+                    store.put('Admin', value, ttl_seconds=60)
+                    assert store.get('Admin') in values
+            except Exception as e:  # pragma: no cover - surfaced below
+                errors.append(e)
+
+        threads = [threading.Thread(target=write_and_read, args=(v,)) for v in values]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert store.get('Admin') in values
+        assert len(list(store.iter_paths())) == 1
+
+
+class TestPersistentPatternCacheFileLevel:
+
+    def _cache(self, tmp_path):
+        db = MagicMock()
+        db.execute_query.return_value = []
+        return PersistentPatternCache(db, cache_dir=str(tmp_path))
+
+    def test_entries_survive_restart(self, tmp_path):
+        cache = self._cache(tmp_path)
+        cache.store_patterns('Admin', PATTERNS, reference_number='KPN')
+
+        restarted = self._cache(tmp_path)
+
+        assert restarted.get_patterns('Admin', reference_number='KPN') == PATTERNS
+        assert restarted.stats['hits']['memory'] == 1
+        assert restarted.get_cache_stats()['cache_levels']['file_cache_exists']
+
+    def test_file_level_hit_and_invalidation(self, tmp_path):
+        cache = self._cache(tmp_path)
+        cache.store_patterns('Admin', PATTERNS, reference_number='KPN')
+        cache._memory_cache.clear()
+
+        assert cache.get_patterns('Admin', reference_number='KPN') == PATTERNS
+        assert cache.stats['hits']['file'] == 1
+
+        cache.invalidate_cache('Admin')
+        assert cache.file_store.keys() == []
@@ -6,6 +6,7 @@ Validates Requirements:
 - 0.2: Stale patterns are deleted after full analysis
 - 0.3: Incremental analysis does NOT delete patterns
 - 0.4: Log output when stale patterns are deleted
+- Patterns and cleanup are written in one batch transaction
 """
 
 import sys
@@ -26,11 +27,24 @@ from pattern_storage import store_verb_patterns_to_database
 def mock_db():
     """Mock DatabaseManager instance."""
     db = MagicMock()
-    # Default: execute_query returns 0 for writes, empty list for reads
+    # Default: execute_query returns the pattern count; the batch (upserts +
+    # stale cleanup) reports no deleted rows
     db.execute_query.return_value = [{"count": 1}]
+    db.execute_batch_queries.return_value = [None, 0]
     return db
 
 
+def _batch_statements(db):
+    """(query, params) statements sent in the single pattern batch."""
+    return db.execute_batch_queries.call_args[0][0]
+
+
+def _delete_statements(db):
+    if not db.execute_batch_queries.called:
+        return []
+    return [st for st in _batch_statements(db) if "DELETE" in st[0]]
+
+
 @pytest.fixture
 def sample_patterns():
     """Single pattern for testing."""
@@ -78,9 +92,8 @@ class TestFullAnalysisReplacesOccurrences:
             is_incremental=False,
         )
 
-        # The first execute_query call is the INSERT/UPSERT for pattern_1
-        insert_call = mock_db.execute_query.call_args_list[0]
-        sql = insert_call[0][0]
+        # The first batch statement is the INSERT/UPSERT for pattern_1
+        sql = _batch_statements(mock_db)[0][0]
 
         # Must use replacement semantics (not accumulation)
         assert "occurrences = VALUES(occurrences)" in sql
@@ -96,8 +109,7 @@ class TestFullAnalysisReplacesOccurrences:
             is_incremental=True,
         )
 
-        insert_call = mock_db.execute_query.call_args_list[0]
-        sql = insert_call[0][0]
+        sql = _batch_statements(mock_db)[0][0]
 
         # Must use accumulation semantics
         assert "occurrences = occurrences + VALUES(occurrences)" in sql
@@ -112,12 +124,7 @@ class TestStalePatternDeletion:
     def test_delete_called_during_full_analysis(self, mock_db, sample_patterns, sample_metadata):
         """Full analysis issues a DELETE for stale patterns."""
         # Make the DELETE call return a count
-        mock_db.execute_query.side_effect = [
-            None,        # INSERT/UPSERT for pattern
-            3,           # DELETE returns 3 rows removed
-            [{"count": 1}],  # SELECT COUNT(*)
-            None,        # metadata INSERT
-        ]
+        mock_db.execute_batch_queries.return_value = [None, 3]  # UPSERT, DELETE
 
         store_verb_patterns_to_database(
             db=mock_db,
@@ -128,14 +135,10 @@ class TestStalePatternDeletion:
         )
 
         # Find the DELETE call
-        delete_calls = [
-            c for c in mock_db.execute_query.call_args_list
-            if "DELETE" in str(c[0][0])
-        ]
+        delete_calls = _delete_statements(mock_db)
         assert len(delete_calls) == 1
 
-        delete_sql = delete_calls[0][0][0]
-        delete_params = delete_calls[0][0][1]
+        delete_sql, delete_params = delete_calls[0]
 
         assert "DELETE FROM pattern_verb_patterns" in delete_sql
         assert "last_seen <" in delete_sql
@@ -148,12 +151,7 @@ class TestStalePatternDeletion:
             "date_range": {"from": "2024-01-01", "to": "2024-12-31"},
         }
 
-        mock_db.execute_query.side_effect = [
-            None,        # INSERT/UPSERT
-            0,           # DELETE returns 0
-            [{"count": 1}],  # SELECT COUNT
-            None,        # metadata INSERT
-        ]
+        mock_db.execute_batch_queries.return_value = [None, 0]  # UPSERT, DELETE
 
         store_verb_patterns_to_database(
             db=mock_db,
@@ -163,22 +161,15 @@ class TestStalePatternDeletion:
             is_incremental=False,
         )
 
-        delete_calls = [
-            c for c in mock_db.execute_query.call_args_list
-            if "DELETE" in str(c[0][0])
-        ]
+        delete_calls = _delete_statements(mock_db)
         assert len(delete_calls) == 1
-        assert delete_calls[0][0][1] == ("OtherAdmin", "2024-01-01")
+        assert delete_calls[0][1] == ("OtherAdmin", "2024-01-01")
 
     def test_no_delete_when_date_range_missing(self, mock_db, sample_patterns):
         """No DELETE issued if analysis_metadata has no date_range.from."""
         metadata = {"total_transactions": 100}
 
-        mock_db.execute_query.side_effect = [
-            None,        # INSERT/UPSERT
-            [{"count": 1}],  # SELECT COUNT
-            None,        # metadata INSERT
-        ]
+        mock_db.execute_batch_queries.return_value = [None]  # UPSERT only
 
         store_verb_patterns_to_database(
             db=mock_db,
@@ -188,10 +179,7 @@ class TestStalePatternDeletion:
             is_incremental=False,
         )
 
-        delete_calls = [
-            c for c in mock_db.execute_query.call_args_list
-            if "DELETE" in str(c[0][0])
-        ]
+        delete_calls = _delete_statements(mock_db)
         assert len(delete_calls) == 0
 
 
@@ -212,10 +200,7 @@ class TestIncrementalNoDeletion:
         )
 
         # Check that no DELETE call was made
-        delete_calls = [
-            c for c in mock_db.execute_query.call_args_list
-            if "DELETE" in str(c[0][0])
-        ]
+        delete_calls = _delete_statements(mock_db)
         assert len(delete_calls) == 0
 
     def test_incremental_still_accumulates_when_metadata_has_date_range(
@@ -231,15 +216,11 @@ class TestIncrementalNoDeletion:
         )
 
         # No DELETE
-        delete_calls = [
-            c for c in mock_db.execute_query.call_args_list
-            if "DELETE" in str(c[0][0])
-        ]
+        delete_calls = _delete_statements(mock_db)
         assert len(delete_calls) == 0
 
         # Verify accumulation in INSERT
-        insert_call = mock_db.execute_query.call_args_list[0]
-        sql = insert_call[0][0]
+        sql = _batch_statements(mock_db)[0][0]
         assert "occurrences = occurrences + VALUES(occurrences)" in sql
 
 
@@ -251,12 +232,7 @@ class TestStaleCleanupLogging:
 
     def test_logs_deleted_count(self, mock_db, sample_patterns, sample_metadata, capsys):
         """Prints removal count when stale patterns are deleted."""
-        mock_db.execute_query.side_effect = [
-            None,        # INSERT/UPSERT
-            7,           # DELETE returns 7 rows removed
-            [{"count": 1}],  # SELECT COUNT
-            None,        # metadata INSERT
-        ]
+        mock_db.execute_batch_queries.return_value = [None, 7]  # UPSERT, DELETE
 
         store_verb_patterns_to_database(
             db=mock_db,
@@ -272,12 +248,7 @@ class TestStaleCleanupLogging:
 
     def test_no_log_when_zero_deleted(self, mock_db, sample_patterns, sample_metadata, capsys):
         """No removal log when DELETE returns 0."""
-        mock_db.execute_query.side_effect = [
-            None,        # INSERT/UPSERT
-            0,           # DELETE returns 0
-            [{"count": 1}],  # SELECT COUNT
-            None,        # metadata INSERT
-        ]
+        mock_db.execute_batch_queries.return_value = [None, 0]  # UPSERT, DELETE
 
         store_verb_patterns_to_database(
             db=mock_db,
@@ -293,12 +264,7 @@ class TestStaleCleanupLogging:
 
     def test_no_log_when_delete_returns_non_int(self, mock_db, sample_patterns, sample_metadata, capsys):
         """No removal log when DELETE returns a non-integer (e.g., None)."""
-        mock_db.execute_query.side_effect = [
-            None,        # INSERT/UPSERT
-            None,        # DELETE returns None
-            [{"count": 1}],  # SELECT COUNT
-            None,        # metadata INSERT
-        ]
+        mock_db.execute_batch_queries.return_value = [None, None]  # UPSERT, DELETE
 
         store_verb_patterns_to_database(
             db=mock_db,
@@ -310,3 +276,45 @@ class TestStaleCleanupLogging:
 
         captured = capsys.readouterr()
         assert "Removed" not in captured.out
+
+
+# ── Batched persistence ────────────────────────────────────────────────────
+
+
+class TestBatchedPersistence:
+    """Upserts and stale cleanup are sent as one execute_batch_queries call."""
+
+    def test_single_batch_with_one_statement_per_pattern(self, mock_db, sample_metadata):
+        patterns = {
+            f"pattern_{i}": {
+                "administration": "TestAdmin",
+                "bank_account": "1300",
+                "verb": f"VENDOR{i}",
+                "occurrences": i,
+                "last_seen": "2024-06-01",
+            }
+            for i in range(3)
+        }
+        patterns["ambiguous"] = {"verb": "MIXED", "_ambiguous": True}
+        mock_db.execute_batch_queries.return_value = [None, None, None, 0]
+
+        store_verb_patterns_to_database(
+            db=mock_db,
+            administration="TestAdmin",
+            verb_patterns=patterns,
+            analysis_metadata=sample_metadata,
+            is_incremental=False,
+        )
+
+        mock_db.execute_batch_queries.assert_called_once()
+        statements = _batch_statements(mock_db)
+        upserts = [st for st in statements if "INSERT INTO pattern_verb_patterns" in st[0]]
+        # Identical SQL for every row, so the batch can send multi-row INSERTs
+        assert len({sql for sql, _ in upserts}) == 1
+        assert [params[2] for _, params in upserts] == ["VENDOR0", "VENDOR1", "VENDOR2"]
+        assert "DELETE" in statements[-1][0]
+        # No per-pattern writes outside the batch
+        assert not any(
+            "pattern_verb_patterns" in c[0][0] and "INSERT" in c[0][0]
+            for c in mock_db.execute_query.call_args_list
+        )
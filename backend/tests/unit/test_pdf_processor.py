@@ -265,10 +265,10 @@ class TestPDFProcessor:
                 mock_duplicate_checker = MagicMock()
                 # Randomly return duplicates or no duplicates to test both paths
                 if random.choice([True, False]):
-                    mock_duplicate_checker.check_for_duplicates.return_value = []
+                    matches = []
                     mock_duplicate_checker.format_duplicate_info.return_value = {'has_duplicates': False}
                 else:
-                    mock_duplicate_checker.check_for_duplicates.return_value = [
+                    matches = [
                         {
                             'ID': 123,
                             'TransactionDate': test_date,
@@ -282,6 +282,9 @@ class TestPDFProcessor:
                         'duplicate_count': 1,
                         'existing_transactions': [{'id': 123}]
                     }
+                mock_duplicate_checker.check_for_duplicates_batch.side_effect = (
+                    lambda candidates: {c: matches for c in candidates}
+                )
                 mock_duplicate_checker_class.return_value = mock_duplicate_checker
                 
                 # Test the _format_vendor_transactions method with duplicate detection integration
@@ -492,5 +495,36 @@ class TestAIOnlyExtraction:
             "pdf_processor.py should not contain 'import vendor_parsers'"
 
 
+class TestDuplicateCheck:
+    """Tests for PDFProcessor._check_for_duplicates."""
+
+    @patch('duplicate_checker.DuplicateChecker')
+    @patch('database.DatabaseManager')
+    def test_main_line_checked_with_one_batch_query(self, mock_db_class, mock_checker_class):
+        checker = mock_checker_class.return_value
+        existing = [{'ID': 7, 'ReferenceNumber': 'Vendor'}]
+        checker.check_for_duplicates_batch.side_effect = (
+            lambda candidates: {c: existing for c in candidates}
+        )
+        checker.format_duplicate_info.return_value = {'has_duplicates': True}
+        transactions = [
+            {'date': '15/01/2024', 'amount': 121.0, 'description': 'Invoice',
+             'debet': '4000', 'credit': '1300'},
+            {'date': '15/01/2024', 'amount': 21.0, 'description': 'VAT - Invoice',
+             'debet': '2010', 'credit': '4000'},
+        ]
+
+        info = PDFProcessor(test_mode=True)._check_for_duplicates(
+            transactions, 'Vendor', {'url': 'u', 'name': 'n'}
+        )
+
+        checker.check_for_duplicates_batch.assert_called_once_with(
+            [('Vendor', '2024-01-15', 121.0)]
+        )
+        checker.check_for_duplicates.assert_not_called()
+        checker.format_duplicate_info.assert_called_once_with(existing)
+        assert info['new_transaction']['TransactionAmount'] == 121.0
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
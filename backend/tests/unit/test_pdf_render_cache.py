@@ -0,0 +1,175 @@
+"""Unit tests for the shared PDF render cache.
+
+Tests cover:
+- Single-pass placeholder rendering of compiled templates
+- Template recompilation when the file changes, inline fallback
+- Logo data URIs fetched once per asset, failed fetches retried
+- Parsed stylesheets reused across documents with the same CSS
+"""
+
+import os
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.pdf_render_cache import (
+    CompiledTemplate,
+    get_compiled_template,
+    get_logo,
+    get_template_path,
+    invalidate_render_cache,
+    write_pdf,
+)
+
+pytestmark = pytest.mark.usefixtures("reset_render_cache")
+
+
+class TestCompiledTemplate:
+    """Tests for CompiledTemplate.render."""
+
+    def test_fills_all_occurrences(self):
+        template = CompiledTemplate('<p>{{name}} / {{name}} - {{total}}</p>')
+
+        html = template.render({'{{name}}': 'Acme', '{{total}}': '€ 10,00'})
+
+        assert html == '<p>Acme / Acme - € 10,00</p>'
+
+    def test_unknown_placeholders_kept(self):
+        template = CompiledTemplate('{{known}} {{unknown}}')
+
+        assert template.render({'{{known}}': 'x'}) == 'x {{unknown}}'
+
+    def test_values_are_not_expanded(self):
+        template = CompiledTemplate('{{a}}{{b}}')
+
+        assert template.render({'{{a}}': '{{b}}', '{{b}}': 'B'}) == '{{b}}B'
+
+
+class TestTemplateCache:
+    """Tests for template path and compiled template caching."""
+
+    def test_path_resolved_once(self):
+        resolve = MagicMock(return_value='/tmp/tpl.html')
+
+        get_template_path('TenantA', 'zzp_invoice', resolve)
+        path = get_template_path('TenantA', 'zzp_invoice', resolve)
+
+        assert path == '/tmp/tpl.html'
+        resolve.assert_called_once()
+
+    def test_reused_until_file_changes(self, tmp_path):
+        path = tmp_path / 'invoice.html'
+        path.write_text('<p>{{v}}</p>', encoding='utf-8')
+
+        first = get_compiled_template('TenantA', str(path), 'fallback')
+        assert get_compiled_template('TenantA', str(path), 'fallback') is first
+
+        path.write_text('<div>{{v}}</div>', encoding='utf-8')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = get_compiled_template('TenantA', str(path), 'fallback')
+
+        assert second is not first
+        assert second.render({'{{v}}': '1'}) == '<div>1</div>'
+
+    def test_missing_file_uses_fallback(self, tmp_path):
+        template = get_compiled_template(
+            'TenantA', str(tmp_path / 'missing.html'), '<i>{{v}}</i>'
+        )
+
+        assert template.render({'{{v}}': 'x'}) == '<i>x</i>'
+
+    def test_unreadable_file_uses_fallback(self, tmp_path):
+        path = tmp_path / 'invoice.html'
+        path.write_bytes(b'<p>\xff\xfe{{v}}</p>')
+
+        template = get_compiled_template('TenantA', str(path), '<i>{{v}}</i>')
+
+        assert template.render({'{{v}}': 'x'}) == '<i>x</i>'
+
+    def test_invalidate_tenant(self):
+        resolve = MagicMock(return_value=None)
+        get_template_path('TenantA', 'zzp_invoice', resolve)
+        get_template_path('TenantB', 'zzp_invoice', resolve)
+
+        invalidate_render_cache('TenantA')
+        get_template_path('TenantA', 'zzp_invoice', resolve)
+        get_template_path('TenantB', 'zzp_invoice', resolve)
+
+        assert resolve.call_count == 3
+
+
+class TestLogoCache:
+    """Tests for get_logo."""
+
+    def test_fetched_once_per_asset(self):
+        fetch = MagicMock(return_value='data:image/png;base64,AAA')
+
+        get_logo(('s3', 'bucket', 'logo.png'), fetch)
+        uri = get_logo(('s3', 'bucket', 'logo.png'), fetch)
+
+        assert uri == 'data:image/png;base64,AAA'
+        fetch.assert_called_once()
+
+    def test_failed_fetch_not_cached(self):
+        fetch = MagicMock(side_effect=[None, 'data:image/png;base64,BBB'])
+
+        assert get_logo(('google_drive', 'f1'), fetch) is None
+        assert get_logo(('google_drive', 'f1'), fetch) == 'data:image/png;base64,BBB'
+
+    def test_invalidate_drops_logos(self):
+        fetch = MagicMock(return_value='data:image/png;base64,AAA')
+        get_logo(('google_drive', 'f1'), fetch)
+
+        invalidate_render_cache('AnyTenant')
+        get_logo(('google_drive', 'f1'), fetch)
+
+        assert fetch.call_count == 2
+
+
+def _fake_weasyprint():
+    module = types.ModuleType('weasyprint')
+    module.HTML = MagicMock()
+    module.HTML.return_value.write_pdf.return_value = b'%PDF-1.7'
+    module.CSS = MagicMock()
+    fonts = types.ModuleType('weasyprint.text.fonts')
+    fonts.FontConfiguration = MagicMock()
+    return module, fonts
+
+
+class TestWritePdf:
+    """Tests for write_pdf stylesheet reuse."""
+
+    @pytest.fixture
+    def weasyprint(self):
+        module, fonts = _fake_weasyprint()
+        with patch.dict(sys.modules, {
+            'weasyprint': module,
+            'weasyprint.text': types.ModuleType('weasyprint.text'),
+            'weasyprint.text.fonts': fonts,
+        }):
+            yield module
+
+    def test_stylesheet_parsed_once(self, weasyprint):
+        doc = '<html><head><style>p { color: red; }</style></head><body>{}</body></html>'
+
+        assert write_pdf(doc.replace('{}', 'one')) == b'%PDF-1.7'
+        write_pdf(doc.replace('{}', 'two'))
+
+        weasyprint.CSS.assert_called_once()
+        assert 'color: red' in weasyprint.CSS.call_args.kwargs['string']
+        html = weasyprint.HTML.call_args.kwargs['string']
+        assert '<style>' not in html and 'two' in html
+
+    def test_without_style_renders_plain(self, weasyprint):
+        write_pdf('<p>plain</p>')
+
+        weasyprint.CSS.assert_not_called()
+        weasyprint.HTML.return_value.write_pdf.assert_called_once_with()
+
+    @patch.dict('sys.modules', {'weasyprint': None})
+    def test_missing_weasyprint_raises_runtime_error(self):
+        with pytest.raises(RuntimeError, match='weasyprint'):
+            write_pdf('<p>x</p>')
@@ -22,6 +22,8 @@ from services.parameter_schema import PARAMETER_SCHEMA
 from services.pdf_generator_service import PDFGeneratorService
 from services.template_service import TemplateService
 
+pytestmark = pytest.mark.usefixtures("reset_render_cache")
+
 
 # ── Helpers ─────────────────────────────────────────────────
 
@@ -0,0 +1,217 @@
+"""
+Unit tests for per-request SQL instrumentation (query_metrics.py).
+
+Tests cover:
+- Statement fingerprinting (literals, placeholders, IN lists, VALUES rows)
+- Cursor proxy counting of queries, rows and DB time
+- N+1 flagging and the process-wide registry
+- DatabaseManager.get_cursor wrapping only while a request is measured
+- X-DB-Queries header and /api/performance/queries endpoint
+"""
+
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+from flask import Flask
+
+import database
+import query_metrics
+from performance_optimizer import performance_middleware, register_performance_endpoints
+from query_metrics import (
+    InstrumentedCursor,
+    QueryMetricsRegistry,
+    RequestQueryStats,
+    fingerprint,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    query_metrics.end_request()
+    query_metrics.registry.reset()
+    yield
+    query_metrics.end_request()
+    query_metrics.registry.reset()
+
+
+class TestFingerprint:
+
+    def test_params_and_literals_share_a_fingerprint(self):
+        a = fingerprint("SELECT * FROM mutaties WHERE ID = %s AND Ref1 = 'x'")
+        b = fingerprint("select * from mutaties\n  where ID = 42 AND Ref1 = 'other'")
+        assert a.lower() == b.lower()
+        assert '%s' not in a and '42' not in b
+
+    def test_in_lists_and_values_rows_collapse(self):
+        assert fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s, %s)') == fingerprint(
+            'SELECT 1 FROM t WHERE id IN (%s)'
+        )
+        assert fingerprint('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)') == (
+            fingerprint('INSERT INTO t (a, b) VALUES (%s, %s)')
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        assert 'table2' in fingerprint('SELECT col1 FROM table2 WHERE x = 5')
+
+
+class TestInstrumentedCursor:
+
+    def test_counts_queries_rows_and_time(self):
+        stats = RequestQueryStats()
+        raw = MagicMock()
+        raw.fetchall.return_value = [{'a': 1}, {'a': 2}]
+        raw.fetchone.return_value = {'a': 3}
+        cursor = InstrumentedCursor(raw, stats)
+
+        cursor.execute('SELECT a FROM t WHERE id = %s', (1,))
+        cursor.fetchall()
+        cursor.execute('SELECT a FROM t WHERE id = %s', (2,))
+        cursor.fetchone()
+
+        assert stats.queries == 2
+        assert stats.rows == 3
+        assert len(stats.fingerprints) == 1
+        raw.execute.assert_called_with('SELECT a FROM t WHERE id = %s', (2,))
+
+    def test_delegates_other_attributes(self):
+        raw = MagicMock()
+        raw.lastrowid = 7
+        cursor = InstrumentedCursor(raw, RequestQueryStats())
+
+        assert cursor.lastrowid == 7
+        cursor.close()
+        raw.close.assert_called_once()
+
+    def test_failed_execute_is_still_counted(self):
+        stats = RequestQueryStats()
+        raw = MagicMock()
+        raw.execute.side_effect = RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            InstrumentedCursor(raw, stats).execute('SELECT 1')
+
+        assert stats.queries == 1
+
+
+class TestNPlusOne:
+
+    def test_repeated_fingerprint_is_flagged(self):
+        stats = RequestQueryStats()
+        for i in range(12):
+            stats.record_query(f'SELECT * FROM rekeningschema WHERE Account = {i}', 0.001)
+        stats.record_query('SELECT COUNT(*) FROM mutaties', 0.001)
+
+        flagged = stats.n_plus_1(threshold=10)
+
+        assert len(flagged) == 1
+        assert flagged[0]['count'] == 12
+        assert 'rekeningschema' in flagged[0]['fingerprint']
+
+    def test_registry_aggregates_per_endpoint(self):
+        registry = QueryMetricsRegistry()
+        stats = RequestQueryStats()
+        for _ in range(query_metrics.N_PLUS_1_THRESHOLD + 1):
+            stats.record_query('SELECT 1 FROM t WHERE id = %s', 0.002)
+        stats.rows = 5
+
+        registry.record('GET /api/items', stats)
+        registry.record('GET /api/items', RequestQueryStats())
+        report = registry.report()
+
+        endpoint = report['endpoints'][0]
+        assert endpoint['requests'] == 2
+        assert endpoint['max_queries'] == query_metrics.N_PLUS_1_THRESHOLD + 1
+        assert report['n_plus_1'][0]['endpoint'] == 'GET /api/items'
+        assert report['n_plus_1'][0]['occurrences'] == 1
+
+
+class TestDatabaseManagerIntegration:
+
+    def _db(self):
+        db = database.DatabaseManager.__new__(database.DatabaseManager)
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.return_value = [{'id': 1}, {'id': 2}]
+        return db, conn
+
+    def test_queries_recorded_during_request(self):
+        db, conn = self._db()
+        with patch.object(type(db), '_scalability_manager', new_callable=PropertyMock,
+                          return_value=None), \
+             patch.object(db, 'get_connection', return_value=conn):
+            stats = query_metrics.start_request()
+            db.execute_query('SELECT id FROM t WHERE x = %s', ('a',), pool_type='readonly')
+            db.execute_query('SELECT id FROM t WHERE x = %s', ('b',), pool_type='readonly')
+            query_metrics.end_request()
+
+        assert stats.queries == 2
+        assert stats.rows == 4
+        assert stats.connections == 2
+
+    def test_cursor_from_get_connection_recorded(self):
+        db, conn = self._db()
+        with patch.object(type(db), '_scalability_manager', new_callable=PropertyMock,
+                          return_value=None), \
+             patch.object(db, '_checkout_connection', return_value=conn):
+            stats = query_metrics.start_request()
+            connection = db.get_connection()
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute('SELECT id FROM t WHERE x = %s', ('a',))
+            cursor.fetchall()
+            cursor.close()
+            connection.close()
+            query_metrics.end_request()
+
+        assert stats.queries == 1
+        assert stats.rows == 2
+        assert stats.connections == 1
+        conn.cursor.assert_called_once_with(dictionary=True)
+        conn.close.assert_called_once()
+
+    def test_cursor_not_wrapped_outside_request(self):
+        db, conn = self._db()
+        with patch.object(type(db), '_scalability_manager', new_callable=PropertyMock,
+                          return_value=None), \
+             patch.object(db, 'get_connection', return_value=conn):
+            with db.get_cursor() as (cursor, _conn):
+                assert cursor is conn.cursor.return_value
+
+
+class TestFlaskIntegration:
+
+    def _app(self, debug):
+        app = Flask(__name__)
+        app.debug = debug
+        performance_middleware(app)
+        register_performance_endpoints(app)
+
+        @app.route('/api/items/<int:item_id>')
+        def item(item_id):
+            stats = query_metrics.current()
+            for _ in range(3):
+                stats.record_query('SELECT * FROM items WHERE id = %s', 0.001)
+            return {'id': item_id}
+
+        return app
+
+    def test_debug_header_and_endpoint_report(self):
+        app = self._app(debug=True)
+        client = app.test_client()
+
+        response = client.get('/api/items/1')
+        client.get('/api/items/2')
+        report = client.get('/api/performance/queries').get_json()['queries']
+
+        assert response.headers['X-DB-Queries'].startswith('count=3;')
+        endpoint = next(
+            e for e in report['endpoints'] if e['endpoint'] == 'GET /api/items/<int:item_id>'
+        )
+        assert endpoint['requests'] == 2
+        assert endpoint['queries'] == 6
+
+    def test_no_header_outside_debug(self, monkeypatch):
+        monkeypatch.delenv('QUERY_METRICS_HEADER', raising=False)
+        app = self._app(debug=False)
+
+        response = app.test_client().get('/api/items/1')
+
+        assert 'X-DB-Queries' not in response.headers
@@ -0,0 +1,235 @@
+"""
+Unit tests for the storage client registry (storage/client_registry.py).
+
+Tests cover:
+- Shared clients built once per key and credential version
+- Per-thread clients (Drive services) built once per thread
+- Invalidation per tenant and for all tenants
+- S3 providers and MediaAssetService reusing one client across requests
+- GoogleDriveService reusing credentials and refreshing before expiry
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from storage.client_registry import (
+    StorageClientRegistry,
+    credential_version,
+    expires_within,
+    get_client_registry,
+)
+
+pytestmark = pytest.mark.usefixtures("reset_storage_clients")
+
+TENANT = "TestTenant"
+
+
+def _param_service(params, credentials=None):
+    ps = Mock()
+    ps.get_param = Mock(side_effect=lambda ns, key, tenant=None: params.get(key))
+    ps.credential_service = Mock()
+    ps.credential_service.get_credential = Mock(return_value=credentials)
+    return ps
+
+
+def _creds(valid=True, expires_in=None, refresh_token="refresh"):
+    creds = Mock()
+    creds.valid = valid
+    creds.expired = not valid
+    creds.refresh_token = refresh_token
+    creds.to_json.return_value = '{"token": "new"}'
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    creds.expiry = now + timedelta(seconds=expires_in) if expires_in else None
+    return creds
+
+
+class TestRegistry:
+
+    def test_shared_client_built_once_per_version(self):
+        registry = StorageClientRegistry()
+        factory = Mock(side_effect=lambda: object())
+
+        first = registry.shared(("s3", TENANT), "v1", factory)
+        again = registry.shared(("s3", TENANT), "v1", factory)
+        rotated = registry.shared(("s3", TENANT), "v2", factory)
+
+        assert first is again
+        assert rotated is not first
+        assert factory.call_count == 2
+
+    def test_per_thread_clients_are_not_shared(self):
+        registry = StorageClientRegistry()
+        factory = Mock(side_effect=lambda: object())
+        clients = []
+
+        def worker():
+            clients.append(registry.per_thread(("drive", TENANT), "v1", factory))
+            clients.append(registry.per_thread(("drive", TENANT), "v1", factory))
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert factory.call_count == 2
+        assert clients[0] is clients[1]
+        assert clients[2] is clients[3]
+        assert clients[0] is not clients[2]
+
+    def test_invalidate_tenant_keeps_other_tenants(self):
+        registry = StorageClientRegistry()
+        factory = Mock(side_effect=lambda: object())
+        mine = registry.shared(("s3", TENANT), "v1", factory)
+        other = registry.shared(("s3", "Other"), "v1", factory)
+        drive = registry.per_thread(("drive", TENANT), "v1", factory)
+
+        registry.invalidate(TENANT)
+
+        assert registry.shared(("s3", TENANT), "v1", factory) is not mine
+        assert registry.shared(("s3", "Other"), "v1", factory) is other
+        assert registry.per_thread(("drive", TENANT), "v1", factory) is not drive
+
+    def test_invalidate_all(self):
+        registry = StorageClientRegistry()
+        registry.store_credentials(("drive", TENANT), "v1", "creds")
+
+        registry.invalidate()
+
+        assert registry.credentials(("drive", TENANT), "v1") is None
+
+    def test_credential_version_changes_with_any_field(self):
+        assert credential_version("AK", "SK") == credential_version("AK", "SK")
+        assert credential_version("AK", "SK") != credential_version("AK", "SK2")
+        assert "SK" not in credential_version("AK", "SK")
+
+    def test_expires_within(self):
+        assert expires_within(_creds(valid=False), 300)
+        assert expires_within(_creds(expires_in=60), 300)
+        assert not expires_within(_creds(expires_in=3600), 300)
+        assert not expires_within(_creds(), 300)
+
+
+class TestS3Clients:
+
+    def test_shared_storage_reuses_client_across_providers(self):
+        from storage.s3_shared_storage import S3SharedStorage
+
+        ps = _param_service({"s3_shared_bucket": "bucket"})
+        with patch("storage.s3_shared_storage.boto3") as mock_boto:
+            first = S3SharedStorage(TENANT, ps)
+            second = S3SharedStorage("Other", ps)
+
+        assert first._client is second._client
+        mock_boto.client.assert_called_once()
+        assert mock_boto.client.call_args.kwargs["config"].max_pool_connections > 10
+
+    def test_tenant_storage_client_follows_credential_version(self):
+        from storage.s3_tenant_storage import S3TenantStorage
+
+        keys = {"aws_access_key_id": "AK", "aws_secret_access_key": "SK"}
+        ps = _param_service({"s3_tenant_bucket": "tenant-bucket"}, keys)
+        with patch("storage.s3_tenant_storage.boto3") as mock_boto:
+            mock_boto.client.side_effect = lambda *a, **kw: MagicMock()
+            first = S3TenantStorage(TENANT, ps)
+            second = S3TenantStorage(TENANT, ps)
+            keys["aws_secret_access_key"] = "rotated"
+            rotated = S3TenantStorage(TENANT, ps)
+
+        assert first._client is second._client
+        assert rotated._client is not first._client
+        assert mock_boto.client.call_count == 2
+
+    def test_media_asset_service_shares_the_default_client(self):
+        from services import media_asset_service
+
+        with patch("services.media_asset_service.boto3.client") as mock_client:
+            client = media_asset_service._s3_client()
+            assert media_asset_service._s3_client() is client
+
+        mock_client.assert_called_once()
+
+
+class TestGoogleDriveCredentials:
+
+    @pytest.fixture
+    def drive(self):
+        """Patch the credential store and Google client libraries."""
+        with (
+            patch("database.DatabaseManager"),
+            patch("services.credential_service.CredentialService") as cs_class,
+            patch("google_drive_service.build") as build,
+            patch("google_drive_service.Credentials") as credentials,
+            patch("google_drive_service.Request"),
+        ):
+            cs = cs_class.return_value
+            oauth = {"installed": {"client_id": "id", "client_secret": "secret"}}
+            token = {"token": "t", "refresh_token": "refresh"}
+            cs.get_credential.side_effect = lambda tenant, kind: dict(
+                oauth if kind == "google_drive_oauth" else token
+            )
+            build.side_effect = lambda *a, **kw: Mock()
+            yield cs, build, credentials
+
+    def test_service_and_credentials_reused(self, drive):
+        from google_drive_service import GoogleDriveService
+
+        cs, build, credentials = drive
+        credentials.from_authorized_user_info.return_value = _creds(expires_in=3600)
+
+        first = GoogleDriveService(TENANT)
+        second = GoogleDriveService(TENANT)
+
+        assert first.service is second.service
+        credentials.from_authorized_user_info.assert_called_once()
+        build.assert_called_once()
+
+    def test_token_refreshed_before_expiry(self, drive):
+        from google_drive_service import GoogleDriveService
+
+        cs, build, credentials = drive
+        creds = _creds(expires_in=60)
+        credentials.from_authorized_user_info.return_value = creds
+
+        GoogleDriveService(TENANT)
+
+        creds.refresh.assert_called_once()
+        cs.store_credential.assert_called_once_with(
+            TENANT, "google_drive_token", {"token": "new"}
+        )
+
+    def test_failed_early_refresh_keeps_valid_token(self, drive):
+        from google_drive_service import GoogleDriveService
+
+        cs, build, credentials = drive
+        creds = _creds(expires_in=60)
+        creds.refresh.side_effect = RuntimeError("invalid_grant")
+        credentials.from_authorized_user_info.return_value = creds
+
+        drive_service = GoogleDriveService(TENANT)
+
+        assert drive_service.service is not None
+        cs.store_credential.assert_not_called()
+
+    def test_new_refresh_token_builds_new_credentials(self, drive):
+        from google_drive_service import GoogleDriveService
+
+        cs, build, credentials = drive
+        credentials.from_authorized_user_info.side_effect = lambda *a: _creds(
+            expires_in=3600
+        )
+        first = GoogleDriveService(TENANT)
+
+        cs.get_credential.side_effect = lambda tenant, kind: (
+            {"installed": {"client_id": "id", "client_secret": "secret"}}
+            if kind == "google_drive_oauth"
+            else {"token": "t2", "refresh_token": "reconnected"}
+        )
+        second = GoogleDriveService(TENANT)
+
+        assert second.service is not first.service
+        assert credentials.from_authorized_user_info.call_count == 2
+        assert get_client_registry().stats()["credentials"] == 1
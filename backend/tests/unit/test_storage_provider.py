@@ -14,6 +14,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from storage.storage_provider import StorageProvider, get_storage_provider, VALID_PROVIDERS
 
+pytestmark = pytest.mark.usefixtures("reset_storage_clients")
+
 
 def make_param_service(provider_type=None, extra=None):
     params = {}
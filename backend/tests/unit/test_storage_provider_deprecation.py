@@ -20,6 +20,8 @@ from unittest.mock import Mock, patch
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
+pytestmark = pytest.mark.usefixtures("reset_storage_clients")
+
 
 def make_param_service(extra=None):
     """Create a mock ParameterService."""
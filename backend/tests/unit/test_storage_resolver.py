@@ -15,6 +15,8 @@ from unittest.mock import Mock, patch, MagicMock
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
+pytestmark = pytest.mark.usefixtures("reset_folder_index")
+
 
 def make_param_service(provider_value=None):
     """Create a mock ParameterService that returns the given provider value."""
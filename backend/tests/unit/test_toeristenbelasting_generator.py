@@ -8,6 +8,7 @@ for tourist tax declaration reports.
 import pytest
 from unittest.mock import Mock, MagicMock
 import pandas as pd
+from db_exceptions import DatabaseError
 from report_generators import toeristenbelasting_generator
 
 
@@ -350,7 +351,7 @@ class TestToeristenbelastingGenerator:
         
         # Mock BNB cache that raises exception
         bnb_cache = Mock()
-        bnb_cache.query_by_year.side_effect = Exception("BNB cache error")
+        bnb_cache.query_by_year.side_effect = DatabaseError("BNB cache error")
         
         result = toeristenbelasting_generator.generate_toeristenbelasting_report(
             cache=cache,
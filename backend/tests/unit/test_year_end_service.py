@@ -478,14 +478,13 @@ class TestCreateOpeningBalances:
         """Test creating opening balances"""
         # Setup mocks
         mock_cursor = Mock()
-        mock_cursor.fetchone.side_effect = [
-            {'count': 0},  # No existing opening balance
-            {'vat_netting': None},  # VAT netting check for account 1000
-            {'vat_netting': None},  # VAT netting check for account 2000
-        ]
-        mock_cursor.fetchall.return_value = [
-            {'account': '1000', 'account_name': 'Cash', 'balance': 5000.00},
-            {'account': '2000', 'account_name': 'Accounts Payable', 'balance': -3000.00}
+        mock_cursor.fetchone.return_value = {'count': 0}  # No existing opening balance
+        mock_cursor.fetchall.side_effect = [
+            [
+                {'account': '1000', 'account_name': 'Cash', 'balance': 5000.00},
+                {'account': '2000', 'account_name': 'Accounts Payable', 'balance': -3000.00}
+            ],
+            [],  # No VAT netting accounts
         ]
         mock_config_service.get_account_by_purpose.return_value = {'Account': '3080'}  # equity account
         
@@ -496,19 +495,49 @@ class TestCreateOpeningBalances:
         # Verify transaction created
         assert transaction_number == 'OpeningBalance 2024'
         
-        # Verify calls: 1 check query + 1 balance query + 2 vat_netting checks + 2 inserts
-        assert mock_cursor.execute.call_count == 6
+        # Verify calls: 1 check query + 1 balance query + 1 vat_netting query + 1 multi-row insert
+        assert mock_cursor.execute.call_count == 4
+        insert_query, insert_params = mock_cursor.execute.call_args[0]
+        assert insert_query.count('(%s') == 2
+        assert insert_params[4] == '1000'   # Row 1 debit: Cash
+        assert insert_params[13] == '2000'  # Row 2 credit: Accounts Payable
+    
+    def test_create_opening_balances_nets_vat_accounts(self, service, mock_config_service, test_administration):
+        """VAT netting flags for all accounts come from one query and net into vat_primary"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = {'count': 0}  # No existing opening balance
+        mock_cursor.fetchall.side_effect = [
+            [
+                {'account': '1000', 'account_name': 'Cash', 'balance': 5000.00},
+                {'account': '2010', 'account_name': 'BTW te betalen', 'balance': -800.00},
+                {'account': '2020', 'account_name': 'BTW te vorderen', 'balance': 300.00},
+            ],
+            [
+                {'Account': '2010', 'vat_netting': 'true', 'vat_primary': '"2010"'},
+                {'Account': '2020', 'vat_netting': 1, 'vat_primary': None},
+                {'Account': '2030', 'vat_netting': 'false', 'vat_primary': None},
+            ],
+        ]
+        mock_config_service.get_account_by_purpose.return_value = {'Account': '3080'}  # equity account
+        
+        service.journal_helper.create_opening_balances(test_administration, 2024, mock_cursor)
+        
+        assert mock_cursor.execute.call_count == 4
+        insert_params = mock_cursor.execute.call_args[0][1]
+        entries = [insert_params[i:i + 8] for i in range(0, len(insert_params), 8)]
+        assert len(entries) == 2
+        # Netted VAT: -800 + 300 = -500 (payable) → Debit equity, Credit vat_primary
+        assert entries[0][2:6] == ['Opening balance 2024 for BTW (netted)', 500.00, '3080', '2010']
+        assert entries[1][4:6] == ['1000', '3080']
     
     def test_create_opening_balances_positive_balance(self, service, mock_config_service, test_administration):
         """Test opening balance for positive balance (asset)"""
         # Setup mocks
         mock_cursor = Mock()
-        mock_cursor.fetchone.side_effect = [
-            {'count': 0},  # No existing opening balance
-            {'vat_netting': None},  # VAT netting check for account 1000
-        ]
-        mock_cursor.fetchall.return_value = [
-            {'account': '1000', 'account_name': 'Cash', 'balance': 5000.00}
+        mock_cursor.fetchone.return_value = {'count': 0}  # No existing opening balance
+        mock_cursor.fetchall.side_effect = [
+            [{'account': '1000', 'account_name': 'Cash', 'balance': 5000.00}],
+            [],  # No VAT netting accounts
         ]
         mock_config_service.get_account_by_purpose.return_value = {'Account': '3080'}  # equity account
         
@@ -527,12 +556,10 @@ class TestCreateOpeningBalances:
         """Test opening balance for negative balance (liability)"""
         # Setup mocks
         mock_cursor = Mock()
-        mock_cursor.fetchone.side_effect = [
-            {'count': 0},  # No existing opening balance
-            {'vat_netting': None},  # VAT netting check for account 2000
-        ]
-        mock_cursor.fetchall.return_value = [
-            {'account': '2000', 'account_name': 'Accounts Payable', 'balance': -3000.00}
+        mock_cursor.fetchone.return_value = {'count': 0}  # No existing opening balance
+        mock_cursor.fetchall.side_effect = [
+            [{'account': '2000', 'account_name': 'Accounts Payable', 'balance': -3000.00}],
+            [],  # No VAT netting accounts
         ]
         mock_config_service.get_account_by_purpose.return_value = {'Account': '3080'}  # equity account
         
@@ -623,7 +650,6 @@ class TestCloseYear:
             [{'first_date': datetime(2023, 1, 1)}],  # First year (_get_first_year)
             [{'net_result': -10000}],  # Net P&L result (negative = profit)
             [{'count': 2}],  # Balance sheet accounts count
-            [{'net_result': -10000}],  # Net P&L result (called again in _create_closure_transaction)
         ]
         mock_config_service.validate_configuration.return_value = {'valid': True, 'errors': []}
         
@@ -631,12 +657,10 @@ class TestCloseYear:
         mock_conn = Mock()
         mock_cursor = Mock()
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.side_effect = [
-            {'count': 0},  # _get_ending_balances: check if OpeningBalance 2024 exists
-            {'vat_netting': None},  # _is_vat_netting_account: VAT netting check for account 1000
-        ]
-        mock_cursor.fetchall.return_value = [
-            {'account': '1000', 'account_name': 'Cash', 'balance': 5000.00}
+        mock_cursor.fetchone.return_value = {'count': 0}  # _get_ending_balances: check if OpeningBalance 2024 exists
+        mock_cursor.fetchall.side_effect = [
+            [{'account': '1000', 'account_name': 'Cash', 'balance': 5000.00}],
+            [],  # _get_vat_netting_accounts: no VAT netting accounts
         ]
         mock_db.get_connection.return_value = mock_conn
         
@@ -647,7 +671,8 @@ class TestCloseYear:
         ]
         
         # Execute
-        result = service.close_year(test_administration, 2023, 'user@example.com', 'Test notes')
+        with patch('mutaties_cache.invalidate_cache') as invalidate_cache:
+            result = service.close_year(test_administration, 2023, 'user@example.com', 'Test notes')
         
         # Verify success
         assert result['success'] is True
@@ -657,6 +682,16 @@ class TestCloseYear:
         
         # Verify commit called
         mock_conn.commit.assert_called_once()
+        
+        # Closure and opening entries share one multi-row INSERT into mutaties
+        inserts = [c[0] for c in mock_cursor.execute.call_args_list if 'INSERT INTO mutaties' in c[0][0]]
+        assert len(inserts) == 1
+        assert inserts[0][0].count('(%s') == 2
+        assert inserts[0][1][0] == 'YearClose 2023'
+        assert inserts[0][1][8] == 'OpeningBalance 2024'
+        
+        # Only this tenant's ledger cache is dropped
+        invalidate_cache.assert_called_once_with(test_administration)
     
     def test_close_year_rollback_on_error(self, service, mock_db, mock_config_service, test_administration):
         """Test rollback when error occurs during closure"""
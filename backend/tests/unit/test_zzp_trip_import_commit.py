@@ -34,6 +34,14 @@ def service(mock_db):
     return TripImportService(db=mock_db)
 
 
+def _set_rowcount(cursor, query, params):
+    """Report every inserted trip as inserted and re-selected for the audit log."""
+    if "zzp_trip_audit" in query:
+        cursor.rowcount = (len(params) - 4) // 3
+    else:
+        cursor.rowcount = len(params) // 19
+
+
 @pytest.fixture
 def mock_db_with_transaction():
     """Create a mock database with transaction context manager support."""
@@ -41,6 +49,9 @@ def mock_db_with_transaction():
     db.execute_query.return_value = []
     mock_cursor = MagicMock()
     mock_cursor.lastrowid = 1
+    mock_cursor.execute.side_effect = lambda query, params: _set_rowcount(
+        mock_cursor, query, params
+    )
     mock_conn = MagicMock()
     # Make transaction() work as context manager
     db.transaction.return_value.__enter__ = MagicMock(return_value=(mock_cursor, mock_conn))
@@ -131,8 +142,8 @@ class TestCommitImportValidRows:
         assert result["skipped"] == 0
         assert result["errors"] == []
 
-    def test_insert_called_for_each_valid_row(self, commit_service):
-        """cursor.execute is called twice per valid row (INSERT + audit)."""
+    def test_valid_rows_inserted_with_one_multi_row_insert(self, commit_service):
+        """cursor.execute is called once for the trips and once for the audit rows."""
         service, mock_cursor, _ = commit_service
         mock_cursor.lastrowid = 1
 
@@ -142,8 +153,37 @@ class TestCommitImportValidRows:
         ]
         service.commit_import("tenant1", 1, rows, "user@test.com")
 
-        # 2 rows × 2 execute calls each (insert + audit) = 4
-        assert mock_cursor.execute.call_count == 4
+        # 1 multi-row INSERT into zzp_trips + 1 INSERT ... SELECT into zzp_trip_audit
+        assert mock_cursor.execute.call_count == 2
+        insert_query, insert_params = mock_cursor.execute.call_args_list[0][0]
+        assert "zzp_trips" in insert_query
+        assert insert_query.count("(%s") == 2
+        assert len(insert_params) == 2 * 19
+
+    def test_large_import_inserted_in_chunks(self, commit_service):
+        """Rows are split into chunks of IMPORT_INSERT_CHUNK_ROWS per INSERT."""
+        service, mock_cursor, _ = commit_service
+        first_ids = iter([100, 102, 104])
+
+        def execute(query, params):
+            _set_rowcount(mock_cursor, query, params)
+            if "INSERT INTO zzp_trips" in query:
+                mock_cursor.lastrowid = next(first_ids)
+
+        mock_cursor.execute.side_effect = execute
+
+        rows = [make_import_row(_row_number=i) for i in range(1, 6)]
+        with patch("services.zzp_trip_import_service.IMPORT_INSERT_CHUNK_ROWS", 2):
+            result = service.commit_import("tenant1", 1, rows, "user@test.com")
+
+        assert result["imported"] == 5
+        calls = mock_cursor.execute.call_args_list
+        assert len(calls) == 6
+        audit_calls = [c[0] for c in calls if "zzp_trip_audit" in c[0][0]]
+        # Each chunk's audit rows start at that chunk's first generated ID
+        assert [params[3] for _query, params in audit_calls] == [100, 102, 104]
+        assert [(len(params) - 4) // 3 for _query, params in audit_calls] == [2, 2, 1]
+        service.db.transaction.assert_called_once()
 
     def test_correct_data_inserted_into_zzp_trips(self, commit_service):
         """Verify SQL params for the INSERT into zzp_trips."""
@@ -276,32 +316,55 @@ class TestCommitImportAuditLog:
         ]
         service.commit_import("tenant1", 1, rows, "user@test.com")
 
-        # Each row: 1 INSERT + 1 audit = 2 calls per row = 4 total
-        assert mock_cursor.execute.call_count == 4
+        # 1 multi-row INSERT for the trips + 1 INSERT ... SELECT for the audit rows
+        assert mock_cursor.execute.call_count == 2
 
-        # Check audit calls (every second call)
+        # The audit rows re-select the new trips by vehicle and natural key
         audit_call_1 = mock_cursor.execute.call_args_list[1]
         audit_query_1 = audit_call_1[0][0]
         audit_params_1 = audit_call_1[0][1]
-        assert "zzp_trip_audit" in audit_query_1
+        assert "INSERT INTO zzp_trip_audit" in audit_query_1
+        assert "SELECT" in audit_query_1
         assert "'created'" in audit_query_1
-        assert audit_params_1[0] == "tenant1"       # administration
-        assert audit_params_1[1] == 55              # trip_id from lastrowid
-        assert audit_params_1[2] == 1               # version
-        assert audit_params_1[3] == "user@test.com"  # changed_by
+        assert audit_params_1[0] == "user@test.com"  # changed_by
+        assert audit_params_1[1] == "tenant1"        # administration
+        assert audit_params_1[2] == 1                # vehicle_id
+        assert audit_params_1[3] == 55               # first ID from lastrowid
+        assert audit_params_1[4:] == [
+            "2026-01-15", 45000, 45045,
+            "2026-01-15", 45000, 45045,
+        ]
 
-    def test_audit_log_uses_correct_trip_id(self, commit_service):
-        """Audit log references the correct trip_id from lastrowid."""
+    def test_audit_log_starts_at_first_generated_id(self, commit_service):
+        """Audit rows are only re-selected from the INSERT's first ID on."""
         service, mock_cursor, _ = commit_service
-        # Simulate different lastrowid for each insert
         mock_cursor.lastrowid = 100
 
         rows = [make_import_row()]
         service.commit_import("tenant1", 1, rows, "admin@firm.nl")
 
         audit_call = mock_cursor.execute.call_args_list[1]
-        audit_params = audit_call[0][1]
-        assert audit_params[1] == 100  # trip_id
+        audit_query, audit_params = audit_call[0]
+        assert "t.id >= %s" in audit_query
+        assert audit_params[3] == 100
+
+    def test_audit_mismatch_rolls_back_import(self, commit_service):
+        """If the re-select misses a trip, the import fails and rolls back."""
+        service, mock_cursor, _ = commit_service
+
+        def execute(query, params):
+            _set_rowcount(mock_cursor, query, params)
+            if "zzp_trip_audit" in query:
+                mock_cursor.rowcount -= 1
+
+        mock_cursor.execute.side_effect = execute
+
+        rows = [make_import_row(_row_number=1), make_import_row(_row_number=2)]
+        result = service.commit_import("tenant1", 1, rows, "user@test.com")
+
+        assert result["success"] is False
+        assert result["imported"] == 0
+        assert "Expected 2 imported trips" in result["errors"][0]
 
 
 class TestCommitImportCreatedBy:
@@ -329,7 +392,7 @@ class TestCommitImportCreatedBy:
 
         audit_call = mock_cursor.execute.call_args_list[1]
         audit_params = audit_call[0][1]
-        assert audit_params[3] == "admin@company.nl"
+        assert audit_params[0] == "admin@company.nl"
 
 
 class TestCommitImportDatabaseError:
@@ -485,6 +548,9 @@ class TestEndToEndFlow:
         mock_db.execute_query.return_value = []
         mock_cursor = MagicMock()
         mock_cursor.lastrowid = 1
+        mock_cursor.execute.side_effect = lambda query, params: _set_rowcount(
+            mock_cursor, query, params
+        )
         mock_conn = MagicMock()
         mock_db.transaction.return_value.__enter__ = MagicMock(
             return_value=(mock_cursor, mock_conn)
@@ -543,6 +609,9 @@ class TestEndToEndFlow:
         mock_db.execute_query.return_value = []
         mock_cursor = MagicMock()
         mock_cursor.lastrowid = 1
+        mock_cursor.execute.side_effect = lambda query, params: _set_rowcount(
+            mock_cursor, query, params
+        )
         mock_conn = MagicMock()
         mock_db.transaction.return_value.__enter__ = MagicMock(
             return_value=(mock_cursor, mock_conn)
@@ -6,7 +6,7 @@ Tests CSV/Excel parsing, column mapping, error handling, and data cleaning.
 import io
 import pytest
 import pandas as pd
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import sys
 import os
@@ -366,6 +366,46 @@ class TestMalformedFile:
         assert result["rows"] == []
 
 
+# ---------------------------------------------------------------------------
+# Tests: Chunked parsing
+# ---------------------------------------------------------------------------
+
+class TestChunkedParsing:
+    """Tests for reading large files in chunks with progress reporting."""
+
+    def test_csv_read_in_chunks_with_progress(self, service):
+        """All rows are returned and progress is reported after each chunk."""
+        lines = ["Datum;Begin KM;Eind KM"] + [
+            f"2026-01-{day:02d};{day * 100};{day * 100 + 50}" for day in range(1, 6)
+        ]
+        stream = make_csv_bytes("\n".join(lines) + "\n")
+        progress = []
+
+        with patch("services.zzp_trip_import_service.IMPORT_PARSE_CHUNK_ROWS", 2):
+            result = service.parse_file(
+                stream, "trips.csv", progress_callback=progress.append
+            )
+
+        assert result["success"] is True
+        assert result["total_rows"] == 5
+        assert progress == [2, 4, 5]
+        assert [r["start_odometer"] for r in result["rows"]] == [100, 200, 300, 400, 500]
+        assert result["columns_mapped"] == ["trip_date", "start_odometer", "end_odometer"]
+
+    def test_xlsx_read_in_chunks(self, service):
+        """Excel rows are split into the same chunks."""
+        df = pd.DataFrame({"Datum": ["2026-01-01"] * 3, "Begin KM": ["1", "2", "3"]})
+        progress = []
+
+        with patch("services.zzp_trip_import_service.IMPORT_PARSE_CHUNK_ROWS", 2):
+            result = service.parse_file(
+                make_xlsx_bytes(df), "trips.xlsx", progress_callback=progress.append
+            )
+
+        assert progress == [2, 3]
+        assert [r["start_odometer"] for r in result["rows"]] == [1, 2, 3]
+
+
 # ---------------------------------------------------------------------------
 # Tests: Odometer fields converted to integers
 # ---------------------------------------------------------------------------
@@ -636,9 +676,22 @@ class TestCommitImport:
         mock_db.transaction.return_value.__exit__ = MagicMock(return_value=False)
         # Track lastrowid auto-increment
         mock_cursor.lastrowid = 1
+        mock_cursor.execute.side_effect = self._set_rowcount(mock_cursor)
         service = TripImportService(db=mock_db)
         return service, mock_cursor, mock_conn
 
+    @staticmethod
+    def _set_rowcount(cursor):
+        """execute() side effect matching every inserted trip for the audit log."""
+
+        def execute(query, params):
+            if "zzp_trip_audit" in query:
+                cursor.rowcount = (len(params) - 4) // 3
+            else:
+                cursor.rowcount = len(params) // 19
+
+        return execute
+
     def _make_valid_row(self, **overrides):
         """Create a valid import row with defaults."""
         row = {
@@ -792,10 +845,10 @@ class TestCommitImport:
         audit_query = audit_call[0][0]
         audit_params = audit_call[0][1]
         assert "'created'" in audit_query
-        assert audit_params[0] == "tenant1"     # administration
-        assert audit_params[1] == 55            # trip_id (from lastrowid)
-        assert audit_params[2] == 1             # version
-        assert audit_params[3] == "user@test.com"  # changed_by
+        assert audit_params[0] == "user@test.com"  # changed_by
+        assert audit_params[1] == "tenant1"     # administration
+        assert audit_params[2] == 1             # vehicle_id
+        assert audit_params[3] == 55            # first trip ID (from lastrowid)
 
     def test_commit_import_database_error_returns_failure(self, import_service):
         """DatabaseError during insert returns success=False with error details."""
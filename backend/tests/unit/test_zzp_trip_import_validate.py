@@ -332,6 +332,41 @@ class TestDuplicateDetection:
         assert not any("duplicaat" in msg.lower() for r in result["rows"] for msg in r["_messages"])
 
 
+class TestExistingTripQueries:
+    """Tests for the range-scoped existing trip lookups."""
+
+    def test_duplicate_lookup_limited_to_import_window(self, service, mock_db):
+        """Existing trips are only fetched for the import's dates and start odometers."""
+        rows = [
+            make_valid_row(trip_date="15-03-2024", start_odometer=30000, end_odometer=30040),
+            make_valid_row(trip_date="2023-01-02", start_odometer=10000, end_odometer=10010),
+            make_valid_row(trip_date="2025-12-31", start_odometer=55000, end_odometer=55020),
+            make_valid_row(trip_date="not a date", start_odometer=1, end_odometer=2),
+        ]
+        service.validate_import("tenant1", 7, rows)
+
+        range_query = mock_db.execute_query.call_args_list[0]
+        assert "BETWEEN" in range_query[0][0]
+        assert range_query[0][1] == (
+            "tenant1", 7, "2023-01-02", "2025-12-31", 10000, 55000
+        )
+
+    def test_last_odometer_from_latest_trip_only(self, service, mock_db):
+        """The DB continuity check reads one row: the vehicle's latest trip."""
+        service.validate_import("tenant1", 7, [make_valid_row()])
+
+        last_query = mock_db.execute_query.call_args_list[-1]
+        assert "LIMIT 1" in last_query[0][0]
+        assert last_query[0][1] == ("tenant1", 7)
+
+    def test_no_duplicate_lookup_without_candidate_rows(self, service, mock_db):
+        """Rows without a valid date cannot be duplicates: no range query."""
+        service.validate_import("tenant1", 7, [make_valid_row(trip_date="31-31-2026")])
+
+        assert mock_db.execute_query.call_count == 1
+        assert "LIMIT 1" in mock_db.execute_query.call_args[0][0]
+
+
 # ---------------------------------------------------------------------------
 # Tests: Category/purpose validation
 # ---------------------------------------------------------------------------
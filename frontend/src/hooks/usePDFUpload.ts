@@ -419,7 +419,8 @@ export function usePDFUpload(): UsePDFUploadReturn {
         folderName: newFolderName
       }, { tenant: currentTenant || undefined });
 
-      const response = await authenticatedGet('/api/folders', { tenant: currentTenant || undefined });
+      // refresh: the new folder may have been created by another server worker
+      const response = await authenticatedGet('/api/folders?refresh=true', { tenant: currentTenant || undefined });
       const data = await response.json();
       const uniqueFolders = Array.from(new Set(data)) as string[];
       setAllFolders(uniqueFolders);
@@ -19,7 +19,7 @@ import { Formik, Field, FieldProps } from 'formik';
 import * as Yup from 'yup';
 import { useTypedTranslation } from '../hooks/useTypedTranslation';
 import { BudgetVersion, DimensionType } from '../types/budget';
-import { createVersion, copyBudget, createLine } from '../services/budgetService';
+import { createVersion, copyBudget, bulkUpsertLines } from '../services/budgetService';
 import { authenticatedPost } from '../services/apiService';
 
 interface ProposedLine {
@@ -129,27 +129,41 @@ const BudgetNewVersionModal: React.FC<BudgetNewVersionModalProps> = ({
           const newId = versionResp.data.id;
           const selectedLines = proposedLines.filter((l) => l.selected);
 
-          // Save each selected line
-          for (const line of selectedLines) {
+          // Save all selected lines in one request; rejected lines (e.g. unknown account) are skipped.
+          // The version already exists, so a failed save is reported instead of aborting.
+          let linesAdded = 0;
+          let linesFailed = 0;
+          if (selectedLines.length > 0) {
             try {
-              await createLine(newId, {
-                account_code: line.account_code,
-                period_mode: 'Monthly',
-                amounts: line.amounts as [number, number, number, number, number, number, number, number, number, number, number, number],
-                detail_dimension_type: (line.detail_dimension_type || null) as DimensionType | null,
-                detail_dimension_value: line.detail_dimension_value || null,
-                notes: line.reasoning || null,
-              });
+              const linesResp = await bulkUpsertLines(
+                newId,
+                selectedLines.map((line) => ({
+                  account_code: line.account_code,
+                  period_mode: 'Monthly' as const,
+                  amounts: line.amounts as [number, number, number, number, number, number, number, number, number, number, number, number],
+                  detail_dimension_type: (line.detail_dimension_type || null) as DimensionType | null,
+                  detail_dimension_value: line.detail_dimension_value || null,
+                  notes: line.reasoning || null,
+                }))
+              );
+              if (linesResp.success) {
+                linesAdded = linesResp.data.created + linesResp.data.updated;
+                linesFailed = linesResp.data.failed;
+              } else {
+                linesFailed = selectedLines.length;
+              }
             } catch {
-              // Skip lines that fail (e.g. duplicate)
+              linesFailed = selectedLines.length;
             }
           }
 
           toast({
             title: t('messages.versionCreated'),
-            description: `${selectedLines.length} lines added`,
-            status: 'success',
-            duration: 3000,
+            description: linesFailed > 0
+              ? `${linesAdded} lines added, ${linesFailed} failed`
+              : `${linesAdded} lines added`,
+            status: linesFailed > 0 ? 'warning' : 'success',
+            duration: linesFailed > 0 ? 5000 : 3000,
           });
           onCreated(newId);
         }
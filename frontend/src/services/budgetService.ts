@@ -17,6 +17,7 @@ import {
   StatusTransitionRequest,
   CreateTemplateRequest,
   CreateBudgetLineRequest,
+  BulkUpsertLinesData,
   GenerateDraftRequest,
   GenerateDraftData,
   CopyBudgetRequest,
@@ -216,6 +217,23 @@ export const createLine = async (
   return response.json();
 };
 
+/**
+ * Create or update many budget lines of a version in one request
+ */
+export const bulkUpsertLines = async (
+  versionId: number,
+  lines: CreateBudgetLineRequest[]
+): Promise<ApiResponse<BulkUpsertLinesData>> => {
+  const response = await authenticatedPost(`/api/budget/versions/${versionId}/lines/bulk`, { lines });
+
+  if (!response.ok) {
+    const error = await response.json();
+    throw new Error(error.error || 'Failed to save budget lines');
+  }
+
+  return response.json();
+};
+
 /**
  * Update a budget line's amounts
  */
@@ -358,6 +358,39 @@ export interface CopyBudgetData {
   excluded_accounts: string[];
 }
 
+/** Per-line outcome of a bulk line upsert */
+export interface BulkLineResult {
+  /** Position of the line in the request */
+  index: number;
+
+  /** Ledger account code */
+  account_code: string;
+
+  /** Whether the line was created, updated or rejected */
+  status: 'created' | 'updated' | 'error';
+
+  /** Annual total of the written line */
+  total?: number;
+
+  /** Reason the line was rejected */
+  error?: string;
+}
+
+/** Response data from a bulk line upsert */
+export interface BulkUpsertLinesData {
+  /** One result per requested line, in request order */
+  results: BulkLineResult[];
+
+  /** Number of lines created */
+  created: number;
+
+  /** Number of existing lines updated */
+  updated: number;
+
+  /** Number of lines rejected */
+  failed: number;
+}
+
 // ─── AI Feature Types ────────────────────────────────────────────────────────
 
 /** AI narrative generation response data */
@@ -69,6 +69,7 @@ export interface ImportResponse {
   success: boolean;
   imported: number;   // Number of new accounts created
   updated: number;    // Number of existing accounts updated
+  unchanged?: number; // Accounts identical to the database (not written)
   total: number;      // Total accounts processed
 }
 